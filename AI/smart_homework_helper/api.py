@@ -1,11 +1,12 @@
 import io
 import os
 import shutil
-from fastapi import FastAPI, HTTPException, UploadFile, File
+from fastapi import FastAPI, HTTPException, UploadFile, File, Response
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import List, Optional
 from rag_engine import rag_service
+from utils.telemetry import render_metrics, CONTENT_TYPE_LATEST
 
 # --- نماذج البيانات (Pydantic Models) ---
 
@@ -62,6 +63,13 @@ async def startup_event():
 def read_root():
     return {"status": "online", "message": "Homework Helper API is running. Use /docs to test."}
 
+@app.get("/metrics")
+def metrics():
+    """
+    مقاييس Prometheus: زمن كل مرحلة، عدد استدعاءات LLM، حجم الفهارس...
+    """
+    return Response(content=render_metrics(), media_type=CONTENT_TYPE_LATEST)
+
 @app.post("/answer", response_model=AnswerResponse)
 async def get_answer(request: QueryRequest):
     """
@@ -0,0 +1,463 @@
+"""
+RAG Benchmark - قياس جودة الاسترجاع وزمن كل مرحلة بدون اتصال بالإنترنت
+
+يبني فهرس FAISS من مجموعة ثابتة (benchmark_data/corpus.json) ويطرح أسئلة
+معروفة الإجابة (benchmark_data/questions.json) ثم يحسب:
+  - recall@k و MRR قبل وبعد إعادة الترتيب (rerank gain)
+  - زمن كل مرحلة: correction / embed / search / rerank / generate
+  - استهلاك الذاكرة
+ويكتب النتائج في ملف JSON يمكن مقارنته بين التشغيلات (--compare).
+
+الـ LLM والمصحح مستبدلان بنسخ وهمية حتى تكون النتائج قابلة للتكرار.
+
+مثال:
+    python benchmark_rag.py --chunk-size 500 --initial-k 10 --final-k 3
+    python benchmark_rag.py --index-type hnsw --compare benchmark_results/rag_prev.json
+"""
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+import platform
+import tracemalloc
+from datetime import datetime
+
+# إضافة المسار للـ imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from langchain_core.documents import Document
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+from langchain_huggingface import HuggingFaceEmbeddings
+from langchain_community.vectorstores import FAISS
+from config import Config
+from utils.context_builder import ContextBuilder
+from utils.chunking import SPLITTERS
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CORPUS = os.path.join(BENCHMARK_DIR, "benchmark_data", "corpus.json")
+DEFAULT_QUESTIONS = os.path.join(BENCHMARK_DIR, "benchmark_data", "questions.json")
+DEFAULT_OUTPUT_DIR = os.path.join(BENCHMARK_DIR, "benchmark_results")
+
+STAGES = ["correction", "embed", "search", "rerank", "context", "generate"]
+RECALL_KS = [1, 3, 5, 10]
+
+
+# --- نسخ وهمية من المصحح والـ LLM ---
+
+class MockCorrector:
+    """بديل AICorrector: يعيد النص كما هو مع تأخير اختياري"""
+    def __init__(self, latency_ms=0):
+        self.client = True
+        self.latency_ms = latency_ms
+
+    def correct_text(self, text):
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000.0)
+        return text
+
+
+class MockLLMChain:
+    """بديل qa_chain_template: نفس واجهة invoke لكن بدون أي طلب شبكة"""
+    def __init__(self, latency_ms=0):
+        self.latency_ms = latency_ms
+        self.calls = 0
+
+    def invoke(self, inputs):
+        self.calls += 1
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000.0)
+        context = inputs.get("context", "")
+        return f"[mock answer] {inputs.get('question', '')} ({len(context)} context chars)"
+
+
+# --- تحميل البيانات ---
+
+def load_json(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def file_sha1(path):
+    with open(path, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def build_documents(corpus, chunk_size=None, chunk_overlap=0, chunk_strategy=None, chunk_tokens=256, chunk_token_overlap=32):
+    """
+    كل مقطع في المجموعة له chunk_id ثابت.
+    إذا طُلب chunk_size أو chunk_strategy نعيد التقطيع، وكل قطعة ناتجة ترث chunk_id الأصلي
+    حتى تبقى الإجابات الذهبية صالحة مهما تغيّر حجم التقطيع.
+    """
+    docs = [
+        Document(
+            page_content=item["text"],
+            metadata={"chunk_id": item["chunk_id"], "source": item["source"], "page": item["page"]}
+        )
+        for item in corpus
+    ]
+    if chunk_strategy:
+        splitter = SPLITTERS[chunk_strategy](chunk_tokens, chunk_token_overlap)
+        docs = [chunk for doc in docs for chunk in splitter.split(doc)]
+    elif chunk_size:
+        splitter = RecursiveCharacterTextSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+        docs = splitter.split_documents(docs)
+    return docs
+
+
+def build_index(docs, embeddings, index_type="flat"):
+    vectorstore = FAISS.from_documents(docs, embeddings)
+    if index_type == "hnsw":
+        import faiss
+        flat = vectorstore.index
+        hnsw = faiss.IndexHNSWFlat(flat.d, 32)
+        hnsw.add(flat.reconstruct_n(0, flat.ntotal))
+        vectorstore.index = hnsw
+    return vectorstore
+
+
+def load_reranker(model_name):
+    try:
+        import torch
+        from sentence_transformers import CrossEncoder
+        device = "cuda" if torch.cuda.is_available() else "cpu"
+        return CrossEncoder(model_name, device=device)
+    except Exception as e:
+        print(f"⚠️ Reranker not available ({e}), rerank stage will be skipped.")
+        return None
+
+
+# --- المقاييس ---
+
+def unique_chunk_ids(docs):
+    """ترتيب معرفات المقاطع كما ظهرت، بدون تكرار (عدة قطع قد ترث نفس المعرّف)"""
+    seen = []
+    for d in docs:
+        cid = d.metadata.get("chunk_id")
+        if cid not in seen:
+            seen.append(cid)
+    return seen
+
+
+def recall_at_k(ranked_ids, gold_ids, k):
+    if not gold_ids:
+        return 0.0
+    hits = len(set(ranked_ids[:k]) & set(gold_ids))
+    return hits / len(gold_ids)
+
+
+def reciprocal_rank(ranked_ids, gold_ids):
+    for i, cid in enumerate(ranked_ids):
+        if cid in gold_ids:
+            return 1.0 / (i + 1)
+    return 0.0
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    idx = (len(ordered) - 1) * pct / 100.0
+    lower = int(idx)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (idx - lower)
+
+
+def summarize_latencies(samples):
+    return {
+        "count": len(samples),
+        "mean_ms": round(sum(samples) / len(samples), 3) if samples else 0.0,
+        "p50_ms": round(percentile(samples, 50), 3),
+        "p90_ms": round(percentile(samples, 90), 3),
+        "p95_ms": round(percentile(samples, 95), 3),
+        "p99_ms": round(percentile(samples, 99), 3),
+        "max_ms": round(max(samples), 3) if samples else 0.0,
+    }
+
+
+def max_rss_mb():
+    if not resource:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS يعيد بايت، لينكس يعيد كيلوبايت
+    if platform.system() == "Darwin":
+        return round(rss / (1024 * 1024), 2)
+    return round(rss / 1024, 2)
+
+
+# --- التشغيل ---
+
+def rerank(reranker, query, docs, final_k):
+    """نفس منطق RAGService.rerank_documents"""
+    if not docs or not reranker:
+        return docs[:final_k]
+    pairs = [[query, doc.page_content] for doc in docs]
+    scores = reranker.predict(pairs)
+    scored_docs = sorted(zip(docs, scores), key=lambda x: x[1], reverse=True)
+    return [doc for doc, score in scored_docs[:final_k]]
+
+
+def run_question(question, embeddings, vectorstore, reranker, corrector, llm, context_builder, initial_k, final_k):
+    """
+    تنفيذ نفس مراحل RAGService.answer_text_question مع قياس زمن كل مرحلة.
+    """
+    timings = {}
+
+    t0 = time.perf_counter()
+    final_q = question
+    if corrector.client and len(question.split()) > 3:
+        final_q = corrector.correct_text(question)
+    timings["correction"] = (time.perf_counter() - t0) * 1000
+
+    t0 = time.perf_counter()
+    query_vector = embeddings.embed_query(final_q)
+    timings["embed"] = (time.perf_counter() - t0) * 1000
+
+    t0 = time.perf_counter()
+    initial_docs = vectorstore.similarity_search_by_vector(query_vector, k=initial_k)
+    timings["search"] = (time.perf_counter() - t0) * 1000
+
+    t0 = time.perf_counter()
+    refined_docs = rerank(reranker, final_q, initial_docs, final_k)
+    timings["rerank"] = (time.perf_counter() - t0) * 1000
+
+    t0 = time.perf_counter()
+    context, context_stats = context_builder.build(final_q, refined_docs)
+    timings["context"] = (time.perf_counter() - t0) * 1000
+
+    t0 = time.perf_counter()
+    llm.invoke({"context": context, "question": final_q})
+    timings["generate"] = (time.perf_counter() - t0) * 1000
+
+    return initial_docs, refined_docs, timings, context_stats
+
+
+def run_benchmark(args):
+    corpus = load_json(args.corpus)
+    questions = load_json(args.questions)
+
+    # tracemalloc يبطئ التنفيذ، لذلك نقيس به التحميل والفهرسة فقط وليس الأسئلة
+    rss_before = max_rss_mb()
+    tracemalloc.start()
+
+    print(f"[Benchmark] Loading embedding model: {args.embedding_model}...")
+    t0 = time.perf_counter()
+    embeddings = HuggingFaceEmbeddings(model_name=args.embedding_model)
+    reranker = None if args.no_rerank else load_reranker(args.reranker_model)
+    model_load_ms = (time.perf_counter() - t0) * 1000
+
+    docs = build_documents(corpus, args.chunk_size, args.chunk_overlap,
+                           args.chunk_strategy, args.chunk_tokens, args.chunk_token_overlap)
+    print(f"[Benchmark] Indexing {len(docs)} chunks ({args.index_type})...")
+    t0 = time.perf_counter()
+    vectorstore = build_index(docs, embeddings, args.index_type)
+    index_build_ms = (time.perf_counter() - t0) * 1000
+
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    corrector = MockCorrector(args.correction_latency_ms)
+    llm = MockLLMChain(args.llm_latency_ms)
+    context_builder = ContextBuilder(token_budget=args.context_budget, embeddings=embeddings)
+
+    # تشغيل تمهيدي حتى لا يدخل زمن التهيئة في القياس
+    for q in questions[:args.warmup]:
+        run_question(q["question"], embeddings, vectorstore, reranker, corrector, llm, context_builder,
+                     args.initial_k, args.final_k)
+
+    stage_samples = {stage: [] for stage in STAGES}
+    total_samples = []
+    recall_before = {k: [] for k in RECALL_KS if k <= args.initial_k}
+    recall_after = []
+    rr_before, rr_after = [], []
+    context_tokens = []
+    per_question = []
+
+    for _ in range(args.repeat):
+        for q in questions:
+            initial_docs, refined_docs, timings, context_stats = run_question(
+                q["question"], embeddings, vectorstore, reranker, corrector, llm, context_builder,
+                args.initial_k, args.final_k
+            )
+            context_tokens.append(context_stats["context_tokens"])
+            for stage in STAGES:
+                stage_samples[stage].append(timings[stage])
+            total_samples.append(sum(timings.values()))
+
+            gold = q["gold_chunk_ids"]
+            initial_ids = unique_chunk_ids(initial_docs)
+            refined_ids = unique_chunk_ids(refined_docs)
+            for k in recall_before:
+                recall_before[k].append(recall_at_k(initial_ids, gold, k))
+            recall_after.append(recall_at_k(refined_ids, gold, args.final_k))
+            rr_before.append(reciprocal_rank(initial_ids, gold))
+            rr_after.append(reciprocal_rank(refined_ids, gold))
+
+            if len(per_question) < len(questions):
+                per_question.append({
+                    "id": q["id"],
+                    "gold_chunk_ids": gold,
+                    "retrieved": initial_ids,
+                    "reranked": refined_ids,
+                    "rr_before": round(rr_before[-1], 4),
+                    "rr_after": round(rr_after[-1], 4),
+                })
+
+    def mean(values):
+        return round(sum(values) / len(values), 4) if values else 0.0
+
+    mrr_before = mean(rr_before)
+    mrr_after = mean(rr_after)
+    recall_final_before = mean([
+        recall_at_k(item["retrieved"], item["gold_chunk_ids"], args.final_k) for item in per_question
+    ])
+
+    return {
+        "run": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "config": {
+            "embedding_model": args.embedding_model,
+            "reranker_model": None if args.no_rerank else args.reranker_model,
+            "reranker_loaded": reranker is not None,
+            "index_type": args.index_type,
+            "chunk_size": args.chunk_size,
+            "chunk_overlap": args.chunk_overlap,
+            "chunk_strategy": args.chunk_strategy,
+            "chunk_tokens": args.chunk_tokens,
+            "initial_k": args.initial_k,
+            "final_k": args.final_k,
+            "context_budget": args.context_budget,
+            "repeat": args.repeat,
+            "llm_latency_ms": args.llm_latency_ms,
+            "correction_latency_ms": args.correction_latency_ms,
+            "corpus_sha1": file_sha1(args.corpus),
+            "questions_sha1": file_sha1(args.questions),
+            "corpus_chunks": len(docs),
+            "questions": len(questions),
+        },
+        "retrieval": {
+            "recall_at_k": {str(k): mean(v) for k, v in recall_before.items()},
+            "mrr": mrr_before,
+        },
+        "rerank": {
+            f"recall_at_{args.final_k}_before": recall_final_before,
+            f"recall_at_{args.final_k}_after": mean(recall_after),
+            "mrr_after": mrr_after,
+            "mrr_gain": round(mrr_after - mrr_before, 4),
+        },
+        "latency": {
+            "stages": {stage: summarize_latencies(stage_samples[stage]) for stage in STAGES},
+            "total": summarize_latencies(total_samples),
+            "model_load_ms": round(model_load_ms, 3),
+            "index_build_ms": round(index_build_ms, 3),
+        },
+        "context": {
+            "token_budget": args.context_budget,
+            "mean_tokens": mean(context_tokens),
+            "max_tokens": max(context_tokens) if context_tokens else 0,
+        },
+        "memory": {
+            "load_and_index_peak_mb": round(peak_bytes / (1024 * 1024), 2),
+            "max_rss_before_mb": rss_before,
+            "max_rss_after_mb": max_rss_mb(),
+            "index_vectors": vectorstore.index.ntotal,
+            "index_vector_mb": round(vectorstore.index.ntotal * vectorstore.index.d * 4 / (1024 * 1024), 3),
+        },
+        "per_question": per_question,
+    }
+
+
+def compare_reports(current, previous):
+    """طباعة الفرق بين تقريرين للمقاييس الرئيسية"""
+    rows = [("retrieval.mrr", current["retrieval"]["mrr"], previous["retrieval"]["mrr"])]
+    for k, value in current["retrieval"]["recall_at_k"].items():
+        rows.append((f"retrieval.recall@{k}", value, previous["retrieval"]["recall_at_k"].get(k)))
+    rows.append(("rerank.mrr_gain", current["rerank"]["mrr_gain"], previous["rerank"].get("mrr_gain")))
+    for stage in STAGES:
+        prev = previous["latency"]["stages"].get(stage)
+        rows.append((f"latency.{stage}.p95_ms", current["latency"]["stages"][stage]["p95_ms"],
+                     prev["p95_ms"] if prev else None))
+    rows.append(("latency.total.p95_ms", current["latency"]["total"]["p95_ms"], previous["latency"]["total"]["p95_ms"]))
+    rows.append(("memory.load_and_index_peak_mb", current["memory"]["load_and_index_peak_mb"], previous["memory"].get("load_and_index_peak_mb")))
+
+    print("\n📊 Comparison with previous run:")
+    for name, cur, prev in rows:
+        if prev is None:
+            print(f"   {name:<32} {cur:>10}   (n/a)")
+        else:
+            print(f"   {name:<32} {cur:>10}   was {prev:<10} Δ {round(cur - prev, 4):+}")
+
+
+def print_summary(report):
+    print("\n" + "=" * 50)
+    print("✅ Benchmark Complete")
+    print("=" * 50)
+    print(f"   MRR: {report['retrieval']['mrr']}  ->  after rerank: {report['rerank']['mrr_after']} "
+          f"(gain {report['rerank']['mrr_gain']:+})")
+    for k, value in report["retrieval"]["recall_at_k"].items():
+        print(f"   recall@{k}: {value}")
+    for stage, stats in report["latency"]["stages"].items():
+        print(f"   {stage:<11} p50={stats['p50_ms']}ms p95={stats['p95_ms']}ms")
+    print(f"   Load + index peak memory: {report['memory']['load_and_index_peak_mb']} MB, "
+          f"max RSS: {report['memory']['max_rss_after_mb']} MB")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Offline retrieval-quality and latency benchmark for the RAG stack")
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS)
+    parser.add_argument("--questions", default=DEFAULT_QUESTIONS)
+    parser.add_argument("--output", default=None, help="Report path (default: benchmark_results/rag_<timestamp>.json)")
+    parser.add_argument("--compare", default=None, help="Previous report to compare against")
+    parser.add_argument("--embedding-model", default=Config.EMBEDDING_MODEL_NAME)
+    parser.add_argument("--reranker-model", default=getattr(Config, "RERANKER_MODEL_NAME", "BAAI/bge-reranker-base"))
+    parser.add_argument("--no-rerank", action="store_true")
+    parser.add_argument("--index-type", choices=["flat", "hnsw"], default="flat")
+    parser.add_argument("--chunk-size", type=int, default=None,
+                        help="Re-split the corpus with this chunk size (default: use fixture chunks as-is)")
+    parser.add_argument("--chunk-overlap", type=int, default=Config.CHUNK_OVERLAP)
+    parser.add_argument("--chunk-strategy", choices=sorted(SPLITTERS), default=None,
+                        help="Re-split the corpus with a utils/chunking.py splitter (overrides --chunk-size)")
+    parser.add_argument("--chunk-tokens", type=int, default=getattr(Config, "CHUNK_TOKENS", 256))
+    parser.add_argument("--chunk-token-overlap", type=int, default=getattr(Config, "CHUNK_TOKEN_OVERLAP", 32))
+    parser.add_argument("--initial-k", type=int, default=Config.INITIAL_TOP_K)
+    parser.add_argument("--final-k", type=int, default=Config.FINAL_TOP_K)
+    parser.add_argument("--context-budget", type=int, default=getattr(Config, "CONTEXT_TOKEN_BUDGET", 600))
+    parser.add_argument("--repeat", type=int, default=3, help="Repeat the question set to stabilise percentiles")
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--llm-latency-ms", type=float, default=0, help="Simulated latency of the mocked LLM")
+    parser.add_argument("--correction-latency-ms", type=float, default=0, help="Simulated latency of the mocked corrector")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.chunk_size and args.chunk_overlap >= args.chunk_size:
+        args.chunk_overlap = args.chunk_size // 5
+
+    report = run_benchmark(args)
+
+    output = args.output
+    if not output:
+        os.makedirs(DEFAULT_OUTPUT_DIR, exist_ok=True)
+        output = os.path.join(DEFAULT_OUTPUT_DIR, f"rag_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    print_summary(report)
+    if args.compare:
+        compare_reports(report, load_json(args.compare))
+    print(f"\n💾 Report saved: {output}")
+    return report
+
+
+if __name__ == "__main__":
+    main()
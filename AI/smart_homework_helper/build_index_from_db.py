@@ -2,6 +2,7 @@
 بناء الفهرس من قاعدة البيانات MySQL مباشرة
 """
 import os
+import argparse
 import logging
 from config import Config
 from filters.mysql_loader import MySQLLoader
@@ -16,50 +17,65 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-def build_index():
+def count_batches(batches, counts):
+    """تمرير الدفعات كما هي مع عدّ المستندات حسب النوع"""
+    for batch in batches:
+        for d in batch:
+            doc_type = d.metadata.get('type')
+            counts[doc_type] = counts.get(doc_type, 0) + 1
+        yield batch
+
+def build_index(incremental=False):
     """
     بناء الفهرس من قاعدة البيانات
+    incremental=True: فهرسة الصفوف التي تغيّرت منذ آخر تشغيل فقط ودمجها مع الفهرس الحالي
     """
     print("=" * 70)
     print("🚀 بدء بناء الفهرس من قاعدة البيانات MySQL")
     print("=" * 70)
     
-    # 1. تحميل البيانات من MySQL
-    print("\n📥 المرحلة 1: تحميل البيانات من قاعدة البيانات...")
+    # 1+2. تحميل البيانات من MySQL على دفعات وفهرستها مباشرة
+    # (لا نحمّل كل المستندات في الذاكرة قبل بدء الفهرسة)
+    mode = "تزايدي" if incremental else "كامل"
+    print(f"\n📥 المرحلة 1: تحميل البيانات وبناء فهرس النصوص (وضع {mode})...")
+    counts = {}
     try:
         loader = MySQLLoader()
-        documents = loader.load_data()
+        text_pipeline = TextPipeline(Config)
+        
+        # تمرير الدفعات مباشرة للفهرسة
+        indexed = text_pipeline.index_document_batches(
+            count_batches(loader.iter_batches(incremental=incremental), counts),
+            merge=incremental
+        )
         
-        if not documents:
+        # الصفوف المحذوفة لا تظهر في القراءة التزايدية: نحذفها من الفهرس بمقارنة المفاتيح
+        removed = 0
+        if incremental and loader.live_row_keys is not None:
+            removed = text_pipeline.remove_missing_rows(loader.live_row_keys)
+        
+        if not indexed:
+            if incremental:
+                if removed:
+                    print(f"✅ تم حذف {removed} صف لم يعد موجوداً في قاعدة البيانات")
+                else:
+                    print("✅ لا توجد تغييرات جديدة منذ آخر فهرسة")
+                return True
             print("⚠️ لم يتم العثور على أي مستندات في قاعدة البيانات!")
             print("\n💡 تأكد من:")
             print("   1. وجود بيانات في جدول eduapi_lessoncontent")
             print("   2. وجود بيانات في جدول eduapi_lesson")
             print("   3. صحة الاتصال بقاعدة البيانات")
             return False
-            
-        print(f"✅ تم تحميل {len(documents)} مستند من قاعدة البيانات")
-        
-        # عرض إحصائيات
-        lesson_docs = [d for d in documents if d.metadata.get('type') == 'lesson']
-        qa_docs = [d for d in documents if d.metadata.get('type') == 'qa_explanation']
-        
-        print(f"   📚 محتوى الدروس: {len(lesson_docs)}")
-        print(f"   ❓ أسئلة وأجوبة: {len(qa_docs)}")
-        
-    except Exception as e:
-        print(f"❌ خطأ في تحميل البيانات: {e}")
-        return False
-    
-    # 2. بناء فهرس النصوص
-    print("\n📝 المرحلة 2: بناء فهرس النصوص...")
-    try:
-        text_pipeline = TextPipeline(Config)
         
-        # تمرير المستندات مباشرة للفهرسة
-        text_pipeline.build_index_from_documents(documents)
+        # حفظ الـ high-water mark فقط بعد نجاح الفهرسة
+        loader.save_state()
         
-        print("✅ تم بناء فهرس النصوص بنجاح")
+        print(f"✅ تم فهرسة {indexed} مستند من قاعدة البيانات")
+        print(f"   📚 محتوى الدروس: {counts.get('lesson', 0)}")
+        print(f"   ❓ أسئلة وأجوبة: {counts.get('qa_explanation', 0)}")
+        if removed:
+            print(f"   🗑️ صفوف محذوفة: {removed}")
         
     except Exception as e:
         print(f"❌ خطأ في بناء فهرس النصوص: {e}")
@@ -141,5 +157,9 @@ def build_index():
     return True
 
 if __name__ == "__main__":
-    success = build_index()
+    parser = argparse.ArgumentParser(description="Build the FAISS index from the MySQL database")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Only embed rows changed since the last successful run")
+    args = parser.parse_args()
+    success = build_index(incremental=args.incremental)
     exit(0 if success else 1)
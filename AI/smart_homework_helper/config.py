@@ -26,6 +26,20 @@ class Config:
     # إعدادات التقطيع والاسترجاع
     CHUNK_SIZE = 1000       
     CHUNK_OVERLAP = 200     
+
+    # التقطيع بالتوكنز (utils/chunking.py)
+    CHUNK_TOKENS = int(os.getenv("CHUNK_TOKENS", "256"))
+    CHUNK_TOKEN_OVERLAP = int(os.getenv("CHUNK_TOKEN_OVERLAP", "32"))
+    # نوع المستند -> طريقة التقطيع (token / sentence / paragraph / page / record)
+    CHUNKING_STRATEGIES = {
+        "pdf": "paragraph",
+        "docx": "paragraph",
+        "pptx": "page",
+        "video": "sentence",
+        "lesson": "paragraph",
+        "qa_explanation": "record",
+        "default": "token",
+    }
     
     # استراتيجية المرحلتين:
     # 1. نسترجع عدداً كبيراً بسرعة (Initial Retrieval)
@@ -34,10 +48,23 @@ class Config:
     FINAL_TOP_K = 3        
     TOP_K_RETRIEVAL = 10  # عدد النتائج التي يسترجعها من الفهرس
 
+    # الحد الأقصى لتوكنز السياق المرسل للـ LLM (تُختار الجمل الأكثر صلة فقط)
+    CONTEXT_TOKEN_BUDGET = int(os.getenv("CONTEXT_TOKEN_BUDGET", "600"))
+
+    # عدد الأسئلة المصححة التي نحتفظ بها في الذاكرة لتجنب إعادة استدعاء المصحح
+    CORRECTION_CACHE_SIZE = int(os.getenv("CORRECTION_CACHE_SIZE", "512"))
+
     # مسارات الملفات
     DATA_DIR = "./data"             
     VECTOR_DB_PATH = "./faiss_index"
     
+    # عدد الصفوف التي تُقرأ من MySQL في كل دفعة أثناء الفهرسة
+    DB_BATCH_SIZE = int(os.getenv("DB_BATCH_SIZE", "500"))
+
+    # الوضع التزايدي يعيد قراءة آخر N ثانية قبل الـ high-water mark حتى لا تضيع
+    # الصفوف التي تُثبَّت (commit) متأخرة بطابع updated_at أقدم
+    DB_SYNC_OVERLAP_SECONDS = int(os.getenv("DB_SYNC_OVERLAP_SECONDS", "300"))
+
     # إعدادات قاعدة البيانات MySQL
     mysql_config = {
         'host': os.getenv("MYSQL_HOST", "localhost"),
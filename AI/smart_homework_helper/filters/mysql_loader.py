@@ -1,11 +1,48 @@
+import os
+import copy
+import json
+from datetime import datetime, timedelta
 import mysql.connector
 from langchain_core.documents import Document
 from config import Config
 
 class MySQLLoader:
-    def __init__(self):
+    """
+    تحميل المحتوى التعليمي من MySQL على شكل دفعات (generator).
+
+    - cursor غير مخزّن (unbuffered) = server-side cursor: الصفوف تُقرأ من الخادم
+      دفعة بدفعة بدل تحميل الجدول كاملاً في الذاكرة.
+    - الوضع التزايدي (incremental): نقرأ فقط ما تغيّر منذ آخر تشغيل اعتماداً على
+      high-water mark محفوظ في ملف حالة بجانب الفهرس:
+        * محتوى الدروس: LessonContent.updated_at
+        * الأسئلة والأجوبة: Answer.id الجديد أو Quiz.updated_at (لا يوجد updated_at للسؤال/الجواب)
+      الحالة لا تُحفظ إلا عند استدعاء save_state() بعد نجاح الفهرسة.
+    - المقارنة بـ updated_at ليست صارمة: نعيد قراءة نافذة تداخل (overlap_seconds)
+      قبل الـ high-water mark لأن معاملة بدأت قبل التشغيل السابق قد تُثبَّت بعده
+      بطابع أقدم. الصفوف التي فُهرست بنفس الطابع داخل النافذة تُتخطّى (حسب id).
+    - الحذف: الصف المحذوف أو الذي أُفرغ نصه لا يظهر في أي استعلام تزايدي، لذلك
+      نقرأ في نهاية التشغيل التزايدي أرقام الصفوف الحالية فقط (live_row_keys)
+      ليحذف الفهرس ما لم يعد موجوداً.
+    """
+    # لكل طابع زمني: مفتاح الصفوف المفهرسة حديثاً داخل نافذة التداخل
+    RECENT_KEYS = {
+        "lesson_content_updated_at": "lesson_content_recent",
+        "quiz_updated_at": "answer_recent",
+    }
+
+    def __init__(self, batch_size=None, state_path=None, overlap_seconds=None):
         self.config = Config.mysql_config
-    
+        self.batch_size = batch_size or getattr(Config, "DB_BATCH_SIZE", 500)
+        self.state_path = state_path or os.path.join(Config.VECTOR_DB_PATH, "db_sync_state.json")
+        if overlap_seconds is None:
+            overlap_seconds = getattr(Config, "DB_SYNC_OVERLAP_SECONDS", 300)
+        self.overlap_seconds = overlap_seconds
+        self.state = self.load_state()
+        # أعلى القيم التي رأيناها في هذا التشغيل (تصبح الحالة الجديدة)
+        self.high_water = copy.deepcopy(self.state)
+        # مفاتيح الصفوف الموجودة حالياً (تُملأ في الوضع التزايدي فقط)
+        self.live_row_keys = None
+
     def get_connection(self):
         return mysql.connector.connect(
             host=self.config['host'],
@@ -15,83 +52,239 @@ class MySQLLoader:
             port=self.config['port']
         )
 
-    def load_data(self):
+    # --- حالة المزامنة ---
+
+    def load_state(self):
+        if os.path.exists(self.state_path):
+            try:
+                with open(self.state_path, "r", encoding="utf-8") as f:
+                    return json.load(f)
+            except Exception as e:
+                print(f"⚠️ Could not read sync state {self.state_path}: {e}")
+        return {}
+
+    def save_state(self):
+        """حفظ الـ high-water mark بعد نجاح الفهرسة"""
+        # لا نحتفظ إلا بالصفوف التي ستقع داخل نافذة التداخل في التشغيل القادم
+        for mark_key, recent_key in self.RECENT_KEYS.items():
+            if recent_key in self.high_water and self.high_water.get(mark_key):
+                start = self._overlap_start(self.high_water[mark_key])
+                self.high_water[recent_key] = {
+                    row_id: stamp for row_id, stamp in self.high_water[recent_key].items() if stamp >= start
+                }
+        os.makedirs(os.path.dirname(self.state_path) or ".", exist_ok=True)
+        with open(self.state_path, "w", encoding="utf-8") as f:
+            json.dump(self.high_water, f, indent=2)
+        self.state = copy.deepcopy(self.high_water)
+        marks = {key: value for key, value in self.high_water.items() if key not in self.RECENT_KEYS.values()}
+        print(f"💾 Sync state saved: {marks}")
+
+    @staticmethod
+    def _stamp(value):
+        return value.isoformat(sep=" ") if hasattr(value, "isoformat") else value
+
+    def _overlap_start(self, since):
+        """بداية نافذة التداخل قبل الطابع since"""
+        start = datetime.fromisoformat(since) - timedelta(seconds=self.overlap_seconds)
+        return start.isoformat(sep=" ")
+
+    def _advance(self, key, value):
+        if value is None:
+            return
+        value = self._stamp(value)
+        current = self.high_water.get(key)
+        if current is None or value > current:
+            self.high_water[key] = value
+
+    def _already_indexed(self, mark_key, row_id, value):
         """
-        سحب المحتوى التعليمي من جداول متعددة وتحويلها لمستندات
+        هل فُهرس هذا الصف بنفس الطابع في تشغيل سابق؟ (صف أُعيدت قراءته فقط بسبب نافذة التداخل)
+        ويسجّله كصف حديث ليُتخطّى في التشغيل القادم إن لم يتغيّر.
         """
-        documents = []
-        conn = None
+        recent_key = self.RECENT_KEYS[mark_key]
+        value = self._stamp(value)
+        seen = self.state.get(recent_key, {}).get(str(row_id)) == value
+        self.high_water.setdefault(recent_key, {})[str(row_id)] = value
+        return seen
+
+    # --- القراءة ---
+
+    def _stream(self, conn, query, params=()):
+        """تنفيذ استعلام على cursor غير مخزّن وإرجاع الصفوف دفعة بدفعة"""
+        cursor = conn.cursor(dictionary=True, buffered=False)
         try:
-            conn = self.get_connection()
-            cursor = conn.cursor(dictionary=True)
-
-            print("🔌 Connected to MySQL. Fetching content...")
-
-            # 1. سحب محتوى الدروس (Lesson Content)
-            # نركز على الأعمدة التي تحتوي نصوصاً مفيدة
-            query_lessons = """
-                SELECT 
-                    lc.title, 
-                    lc.text_content, 
-                    lc.description,
-                    l.name as lesson_name,
-                    l.subject,
-                    l.level
-                FROM eduapi_lessoncontent lc
-                JOIN eduapi_lesson l ON lc.lesson_id = l.id
-                WHERE lc.text_content IS NOT NULL AND lc.text_content != ''
-            """
-            cursor.execute(query_lessons)
-            for row in cursor.fetchall():
+            cursor.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(self.batch_size)
+                if not rows:
+                    break
+                yield rows
+        finally:
+            try:
+                cursor.close()
+            except Exception:
+                # cursor غير مخزّن قد يبقى فيه صفوف غير مقروءة إذا توقف المستهلك مبكراً
+                pass
+
+    def _lesson_documents(self, conn, incremental):
+        # 1. سحب محتوى الدروس (Lesson Content)
+        # نركز على الأعمدة التي تحتوي نصوصاً مفيدة
+        query_lessons = """
+            SELECT
+                lc.id,
+                lc.title,
+                lc.text_content,
+                lc.description,
+                lc.updated_at,
+                l.name as lesson_name,
+                l.subject,
+                l.level
+            FROM eduapi_lessoncontent lc
+            JOIN eduapi_lesson l ON lc.lesson_id = l.id
+            WHERE lc.text_content IS NOT NULL AND lc.text_content != ''
+        """
+        params = ()
+        since = self.state.get("lesson_content_updated_at") if incremental else None
+        if since:
+            query_lessons += " AND lc.updated_at >= %s"
+            params = (self._overlap_start(since),)
+        query_lessons += " ORDER BY lc.updated_at, lc.id"
+
+        for rows in self._stream(conn, query_lessons, params):
+            batch = []
+            for row in rows:
+                already_indexed = self._already_indexed("lesson_content_updated_at", row['id'], row['updated_at'])
+                if since and already_indexed:
+                    continue
                 # دمج النصوص لتكوين محتوى غني
                 full_text = f"المادة: {row['subject']}\nالدرس: {row['lesson_name']}\nالعنوان: {row['title']}\n\n{row['description'] or ''}\n\n{row['text_content']}"
-                
+
                 meta = {
                     "source": "database",
                     "type": "lesson",
+                    "row_key": f"lessoncontent:{row['id']}",
                     "title": row['title'],
                     "subject": row['subject'],
                     "level": row['level']
                 }
-                documents.append(Document(page_content=full_text, metadata=meta))
-
-            print(f"   -> Loaded {len(documents)} lesson contents.")
-
-            # 2. سحب الأسئلة والأجوبة والشروحات (Q&A Bank)
-            # هذا مفيد جداً للمساعد ليفهم كيفية حل المسائل
-            query_qa = """
-                SELECT 
-                    q.question_text,
-                    a.answer_text,
-                    a.explanation,
-                    a.is_correct
-                FROM eduapi_question q
-                JOIN eduapi_answer a ON a.question_id = q.id
-                WHERE a.explanation IS NOT NULL AND a.explanation != ''
-            """
-            cursor.execute(query_qa)
-            qa_count = 0
-            for row in cursor.fetchall():
+                batch.append(Document(page_content=full_text, metadata=meta))
+                self._advance("lesson_content_updated_at", row['updated_at'])
+            if batch:
+                yield batch
+
+    def _qa_documents(self, conn, incremental):
+        # 2. سحب الأسئلة والأجوبة والشروحات (Q&A Bank)
+        # هذا مفيد جداً للمساعد ليفهم كيفية حل المسائل
+        query_qa = """
+            SELECT
+                a.id,
+                q.question_text,
+                a.answer_text,
+                a.explanation,
+                a.is_correct,
+                qz.updated_at as quiz_updated_at
+            FROM eduapi_question q
+            JOIN eduapi_answer a ON a.question_id = q.id
+            JOIN eduapi_quiz qz ON q.quiz_id = qz.id
+            WHERE a.explanation IS NOT NULL AND a.explanation != ''
+        """
+        params = ()
+        resuming = incremental and self.state.get("answer_id") is not None
+        if resuming:
+            query_qa += " AND (a.id > %s OR qz.updated_at >= %s)"
+            quiz_since = self.state.get("quiz_updated_at")
+            params = (self.state["answer_id"], self._overlap_start(quiz_since) if quiz_since else "1970-01-01 00:00:00")
+        query_qa += " ORDER BY a.id"
+
+        for rows in self._stream(conn, query_qa, params):
+            batch = []
+            for row in rows:
+                already_indexed = self._already_indexed("quiz_updated_at", row['id'], row['quiz_updated_at'])
+                if resuming and already_indexed:
+                    continue
                 # صياغة النص كنموذج سؤال وجواب تعليمي
                 status = "إجابة صحيحة" if row['is_correct'] else "إجابة خاطئة"
                 full_text = f"سؤال: {row['question_text']}\n{status}: {row['answer_text']}\nالشرح والتعليل: {row['explanation']}"
-                
+
                 meta = {
                     "source": "database",
                     "type": "qa_explanation",
+                    "row_key": f"answer:{row['id']}",
                     "is_correct": row['is_correct']
                 }
-                documents.append(Document(page_content=full_text, metadata=meta))
-                qa_count += 1
-            
+                batch.append(Document(page_content=full_text, metadata=meta))
+                self._advance("answer_id", row['id'])
+                self._advance("quiz_updated_at", row['quiz_updated_at'])
+            if batch:
+                yield batch
+
+    def _live_row_keys(self, conn):
+        """row_key لكل صف يجب أن يبقى في الفهرس (نفس شروط الاستعلامات أعلاه، أرقام فقط)"""
+        queries = (
+            ("lessoncontent", """
+                SELECT lc.id
+                FROM eduapi_lessoncontent lc
+                JOIN eduapi_lesson l ON lc.lesson_id = l.id
+                WHERE lc.text_content IS NOT NULL AND lc.text_content != ''
+            """),
+            ("answer", """
+                SELECT a.id
+                FROM eduapi_question q
+                JOIN eduapi_answer a ON a.question_id = q.id
+                JOIN eduapi_quiz qz ON q.quiz_id = qz.id
+                WHERE a.explanation IS NOT NULL AND a.explanation != ''
+            """),
+        )
+        keys = set()
+        for prefix, query in queries:
+            for rows in self._stream(conn, query):
+                keys.update(f"{prefix}:{row['id']}" for row in rows)
+        return keys
+
+    def iter_batches(self, incremental=False):
+        """
+        مولّد يعيد قوائم Documents بحجم batch_size على الأكثر.
+        incremental=True يعيد فقط الصفوف التي تغيّرت منذ آخر save_state().
+        """
+        conn = None
+        try:
+            conn = self.get_connection()
+            mode = "incremental" if incremental and self.state else "full"
+            print(f"🔌 Connected to MySQL. Streaming content ({mode}, batch={self.batch_size})...")
+
+            lesson_count = 0
+            for batch in self._lesson_documents(conn, incremental):
+                lesson_count += len(batch)
+                yield batch
+            print(f"   -> Loaded {lesson_count} lesson contents.")
+
+            qa_count = 0
+            for batch in self._qa_documents(conn, incremental):
+                qa_count += len(batch)
+                yield batch
             print(f"   -> Loaded {qa_count} Q&A explanations.")
 
-            return documents
+            # بعد قراءة التغييرات: صف أُضيف بعدها يبقى حياً ويُفهرس في التشغيل القادم
+            if mode == "incremental":
+                self.live_row_keys = self._live_row_keys(conn)
 
         except Exception as e:
             print(f"❌ MySQL Error: {e}")
-            return []
+            raise
         finally:
             if conn and conn.is_connected():
-                cursor.close()
-                conn.close()
\ No newline at end of file
+                conn.close()
+
+    def iter_documents(self, incremental=False):
+        for batch in self.iter_batches(incremental=incremental):
+            yield from batch
+
+    def load_data(self, incremental=False):
+        """
+        سحب المحتوى التعليمي من جداول متعددة وتحويلها لمستندات
+        (نسخة تعيد قائمة كاملة، للتوافق مع الاستدعاءات القديمة)
+        """
+        try:
+            return list(self.iter_documents(incremental=incremental))
+        except Exception:
+            return []
@@ -43,6 +43,7 @@ image = (
     .add_local_file("config.py", remote_path="/root/smart_homework_helper/config.py")
     .add_local_dir("filters", remote_path="/root/smart_homework_helper/filters")
     .add_local_dir("pipelines", remote_path="/root/smart_homework_helper/pipelines")
+    .add_local_dir("utils", remote_path="/root/smart_homework_helper/utils")
 )
 
 app = modal.App("homework-helper-db-indexer")
@@ -65,9 +66,10 @@ app = modal.App("homework-helper-db-indexer")
         })
     ]
 )
-def run_cloud_db_indexer():
+def run_cloud_db_indexer(incremental: bool = False, index_zip: bytes = None):
     """
     تشغيل الفهرسة من قاعدة البيانات على السحابة
+    incremental=True: نرسل الفهرس الحالي (مع ملف حالة المزامنة) ونفهرس فقط ما تغيّر
     """
     import sys
     sys.path.append("/root/smart_homework_helper")
@@ -82,6 +84,13 @@ def run_cloud_db_indexer():
     os.makedirs(Config.DATA_DIR, exist_ok=True)
     os.makedirs(Config.VECTOR_DB_PATH, exist_ok=True)
     
+    # استعادة الفهرس المحلي للوضع التزايدي
+    if incremental and index_zip:
+        with open("/root/previous_index.zip", "wb") as f:
+            f.write(index_zip)
+        shutil.unpack_archive("/root/previous_index.zip", Config.VECTOR_DB_PATH)
+        print("📂 Previous index restored for incremental sync")
+    
     from filters.mysql_loader import MySQLLoader
     from pipelines.text_pipeline import TextPipeline
     from pipelines.image_pipeline import ImagePipeline
@@ -92,40 +101,33 @@ def run_cloud_db_indexer():
     start_time = time.time()
     
     # ========================================
-    # المرحلة 1: تحميل البيانات من MySQL
+    # المرحلة 1+2: تحميل البيانات من MySQL على دفعات وبناء فهرس النصوص
     # ========================================
-    print("\n📥 [Phase 1] Loading Data from MySQL Database...")
+    print(f"\n📥 [Phase 1-2] Streaming Data from MySQL into the Text Index ({'incremental' if incremental else 'full'})...")
     try:
         loader = MySQLLoader()
-        documents = loader.load_data()
+        text_pipeline = TextPipeline(Config)
         
-        if not documents:
-            print("⚠️ No documents found in database!")
-            return None
+        counts = {}
+        def counted(batches):
+            for batch in batches:
+                for d in batch:
+                    counts[d.metadata.get('type')] = counts.get(d.metadata.get('type'), 0) + 1
+                yield batch
         
-        print(f"✅ Loaded {len(documents)} documents from database")
+        indexed = text_pipeline.index_document_batches(
+            counted(loader.iter_batches(incremental=incremental)),
+            merge=incremental
+        )
         
-        # إحصائيات
-        lesson_docs = [d for d in documents if d.metadata.get('type') == 'lesson']
-        qa_docs = [d for d in documents if d.metadata.get('type') == 'qa_explanation']
+        if not indexed and not incremental:
+            print("⚠️ No documents found in database!")
+            return None
         
-        print(f"   📚 Lesson content: {len(lesson_docs)}")
-        print(f"   ❓ Q&A explanations: {len(qa_docs)}")
-        
-    except Exception as e:
-        import traceback
-        traceback.print_exc()
-        print(f"❌ Database Loading Error: {e}")
-        return None
-    
-    # ========================================
-    # المرحلة 2: بناء فهرس النصوص
-    # ========================================
-    print("\n📝 [Phase 2] Building Text Index (with OCR support)...")
-    try:
-        text_pipeline = TextPipeline(Config)
-        text_pipeline.build_index_from_documents(documents)
-        print("✅ Text indexing complete.")
+        loader.save_state()
+        print(f"✅ Indexed {indexed} documents from database")
+        print(f"   📚 Lesson content: {counts.get('lesson', 0)}")
+        print(f"   ❓ Q&A explanations: {counts.get('qa_explanation', 0)}")
         
         # عرض إحصائيات الفهرس
         if text_pipeline.vectorstore:
@@ -135,7 +137,7 @@ def run_cloud_db_indexer():
     except Exception as e:
         import traceback
         traceback.print_exc()
-        print(f"❌ Text Pipeline Error: {e}")
+        print(f"❌ Database Indexing Error: {e}")
         return None
     
     # ========================================
@@ -263,9 +265,10 @@ def run_cloud_db_indexer():
     return zip_bytes
 
 @app.local_entrypoint()
-def main():
+def main(incremental: bool = False):
     """
     نقطة الدخول المحلية - تشغيل الفهرسة وتنزيل النتائج
+    modal run modal_db_indexer.py --incremental  (فهرسة التغييرات فقط)
     """
     print("=" * 70)
     print("🌩️  Modal Cloud Database Indexer")
@@ -273,8 +276,20 @@ def main():
     print("\n📤 Triggering cloud indexer...")
     print("⏳ This may take several minutes depending on database size...\n")
     
+    # في الوضع التزايدي نرسل الفهرس الحالي إلى السحابة
+    index_zip = None
+    if incremental:
+        if os.path.exists("faiss_index"):
+            shutil.make_archive("local_index", 'zip', "faiss_index")
+            with open("local_index.zip", "rb") as f:
+                index_zip = f.read()
+            print(f"📤 Uploading current index ({len(index_zip) / (1024*1024):.2f} MB) for incremental sync")
+        else:
+            print("⚠️ No local faiss_index found, running a full build instead")
+            incremental = False
+    
     # تشغيل الفهرسة على السحابة
-    zip_bytes = run_cloud_db_indexer.remote()
+    zip_bytes = run_cloud_db_indexer.remote(incremental=incremental, index_zip=index_zip)
     
     if not zip_bytes:
         print("\n❌ Indexing failed! Check the logs above.")
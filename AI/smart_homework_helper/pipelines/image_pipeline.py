@@ -8,6 +8,7 @@ import pickle
 from PIL import Image
 from sentence_transformers import SentenceTransformer
 from pipelines.base_pipeline import BasePipeline
+from utils.telemetry import NullTrace
 
 # محاولة استيراد pptx
 try:
@@ -184,17 +185,21 @@ class ImagePipeline(BasePipeline):
             else: print("[ImagePipeline] No index found.")
         except: pass
 
-    def search(self, query_image_file):
+    def search(self, query_image_file, trace=None):
         """
         البحث عن صور مشابهة.
         نرجع أفضل النتائج مع درجة الثقة.
         """
+        trace = trace or NullTrace()
         if not self.index or self.index.ntotal == 0: 
             return []
         try:
-            img = Image.open(query_image_file).convert("RGB")
-            vec = self.model.encode(img)
-            distances, indices = self.index.search(np.array([vec]).astype('float32'), 3)
+            with trace.stage("decode"):
+                img = Image.open(query_image_file).convert("RGB")
+            with trace.stage("embed"):
+                vec = self.model.encode(img)
+            with trace.stage("search"):
+                distances, indices = self.index.search(np.array([vec]).astype('float32'), 3)
             
             results = []
             print(f"🔍 Image search distances: {distances[0]}")
@@ -221,5 +226,6 @@ class ImagePipeline(BasePipeline):
             
             return results
         except Exception as e:
+            trace.fail()
             print(f"❌ Image search error: {e}")
             return []
\ No newline at end of file
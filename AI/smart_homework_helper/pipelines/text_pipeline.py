@@ -3,11 +3,11 @@ import re
 import io
 import time
 from langchain_community.document_loaders import PyPDFLoader, Docx2txtLoader
-from langchain_text_splitters import RecursiveCharacterTextSplitter
 from langchain_huggingface import HuggingFaceEmbeddings
 from langchain_community.vectorstores import FAISS
 from langchain_core.documents import Document
 from pipelines.base_pipeline import BasePipeline
+from utils.chunking import ChunkingEngine, index_stats
 
 # استيراد المصحح الذكي (الجديد)
 from utils.ai_corrector import AICorrector
@@ -35,6 +35,7 @@ class TextPipeline(BasePipeline):
         print(f"[TextPipeline] Loading Embedding Model: {config.EMBEDDING_MODEL_NAME}...")
         self.embeddings = HuggingFaceEmbeddings(model_name=config.EMBEDDING_MODEL_NAME)
         self.index_path = os.path.join(config.VECTOR_DB_PATH, "text_index")
+        self.chunker = ChunkingEngine(config)
         
         # ===> إضافة جديدة: تهيئة المصحح <===
         self.ai_helper = AICorrector(api_key=getattr(config, 'GOOGLE_API_KEY', None))
@@ -83,17 +84,88 @@ class TextPipeline(BasePipeline):
 
         if not all_docs: return
 
-        text_splitter = RecursiveCharacterTextSplitter(chunk_size=self.config.CHUNK_SIZE, chunk_overlap=self.config.CHUNK_OVERLAP)
-        splits = text_splitter.split_documents(all_docs)
+        self._index_documents(all_docs, merge=is_update)
 
-        if is_update and os.path.exists(self.index_path):
-             self.vectorstore = FAISS.load_local(self.index_path, self.embeddings, allow_dangerous_deserialization=True)
-             self.vectorstore.merge_from(FAISS.from_documents(splits, self.embeddings))
-        else:
-             self.vectorstore = FAISS.from_documents(splits, self.embeddings)
-        
+    def build_index_from_documents(self, documents, merge=False):
+        """
+        فهرسة مستندات جاهزة (مثل مستندات MySQLLoader) بدون قراءة ملفات.
+        merge=True يضيفها إلى الفهرس الموجود بدل استبداله.
+        """
+        if not documents:
+            print("[TextPipeline] No documents to index.")
+            return
+        self.index_document_batches([documents], merge=merge)
+
+    def index_document_batches(self, batches, merge=False):
+        """
+        فهرسة دفعات متتالية من المستندات (مثل MySQLLoader.iter_batches) مع حفظ الفهرس مرة واحدة في النهاية.
+        عند merge=True: المستندات التي لها row_key موجود مسبقاً في الفهرس تستبدل نسختها القديمة.
+        يعيد عدد المستندات المفهرسة.
+        """
+        self.vectorstore = None
+        if merge and os.path.exists(self.index_path):
+            self.vectorstore = FAISS.load_local(self.index_path, self.embeddings, allow_dangerous_deserialization=True)
+
+        total_docs = 0
+        for i, batch in enumerate(batches):
+            if not batch: continue
+            splits = self.chunker.split_documents(batch, reset=(i == 0))
+            if not splits: continue
+
+            if merge and self.vectorstore:
+                self._remove_rows({d.metadata.get("row_key") for d in batch if d.metadata.get("row_key")})
+
+            batch_store = FAISS.from_documents(splits, self.embeddings)
+            if self.vectorstore is None:
+                self.vectorstore = batch_store
+            else:
+                self.vectorstore.merge_from(batch_store)
+            total_docs += len(batch)
+            print(f"[TextPipeline] Batch {i + 1}: {len(batch)} docs -> {len(splits)} chunks")
+
+        if not self.vectorstore:
+            print("[TextPipeline] No documents to index.")
+            return 0
+
+        self.chunker.print_report("[TextPipeline]")
         self.vectorstore.save_local(self.index_path)
-        print(f"[TextPipeline] Index saved.")
+        stats = index_stats(self.vectorstore)
+        print(f"[TextPipeline] Index saved: {stats['vectors']} vectors (~{stats['size_mb']} MB).")
+        return total_docs
+
+    def _remove_rows(self, row_keys):
+        """حذف القطع القديمة لصفوف قاعدة البيانات التي تغيّرت"""
+        if not row_keys: return
+        stale_ids = [
+            doc_id for doc_id, doc in self.vectorstore.docstore._dict.items()
+            if doc.metadata.get("row_key") in row_keys
+        ]
+        if stale_ids:
+            self.vectorstore.delete(stale_ids)
+            print(f"[TextPipeline] Replaced {len(stale_ids)} stale chunks.")
+
+    def remove_missing_rows(self, live_row_keys):
+        """
+        حذف قطع صفوف قاعدة البيانات التي لم تعد موجودة (حُذفت أو أُفرغ نصها)
+        بعد index_document_batches(merge=True)، ثم حفظ الفهرس إن تغيّر.
+        القطع بلا row_key (ملفات PDF/PPTX) لا تُمس. يعيد عدد الصفوف المحذوفة.
+        """
+        if self.vectorstore is None:
+            if not os.path.exists(self.index_path):
+                return 0
+            self.vectorstore = FAISS.load_local(self.index_path, self.embeddings, allow_dangerous_deserialization=True)
+        missing = {
+            doc.metadata["row_key"] for doc in self.vectorstore.docstore._dict.values()
+            if doc.metadata.get("row_key") and doc.metadata["row_key"] not in live_row_keys
+        }
+        if missing:
+            self._remove_rows(missing)
+            self.vectorstore.save_local(self.index_path)
+            print(f"[TextPipeline] Removed {len(missing)} deleted rows from the index.")
+        return len(missing)
+
+    def _index_documents(self, docs, merge=False):
+        self.index_document_batches([docs], merge=merge)
 
     def _load_pdf_smart(self, file_path):
         """
@@ -1,10 +1,10 @@
 
 import os
 from langchain_core.documents import Document
-from langchain_text_splitters import RecursiveCharacterTextSplitter
 from langchain_huggingface import HuggingFaceEmbeddings
 from langchain_community.vectorstores import FAISS
 from pipelines.base_pipeline import BasePipeline
+from utils.chunking import ChunkingEngine, index_stats
 
 # استيراد المصحح
 from utils.ai_corrector import AICorrector
@@ -80,8 +80,9 @@ class VideoPipeline(BasePipeline):
 
         if not video_docs: return
 
-        text_splitter = RecursiveCharacterTextSplitter(chunk_size=self.config.CHUNK_SIZE, chunk_overlap=self.config.CHUNK_OVERLAP)
-        splits = text_splitter.split_documents(video_docs)
+        chunker = ChunkingEngine(self.config)
+        splits = chunker.split_documents(video_docs)
+        chunker.print_report("[VideoPipeline]")
 
 
 # (نفس كود الفهرسة والحفظ الأصلي)
@@ -97,4 +98,5 @@ class VideoPipeline(BasePipeline):
              self.vectorstore = FAISS.from_documents(splits, self.embeddings)
         
         self.vectorstore.save_local(self.index_path)
-        print(f"[VideoPipeline] Index updated.")
\ No newline at end of file
+        stats = index_stats(self.vectorstore)
+        print(f"[VideoPipeline] Index updated: {stats['vectors']} vectors (~{stats['size_mb']} MB).")
\ No newline at end of file
@@ -1,5 +1,6 @@
 import os
 import torch
+from collections import OrderedDict
 from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
@@ -7,6 +8,8 @@ from sentence_transformers import CrossEncoder
 from pipelines.text_pipeline import TextPipeline
 from pipelines.image_pipeline import ImagePipeline
 from utils.ai_corrector import AICorrector
+from utils.context_builder import ContextBuilder
+from utils.telemetry import traced, record_llm_call, record_cache_lookup, set_index_size, set_model_loaded
 from config import Config
 
 try:
@@ -47,11 +50,35 @@ class RAGService:
         )
         self.qa_chain_template = None
 
+        # بناء السياق ضمن ميزانية التوكنز بدل إرسال القطع كاملة
+        self.context_builder = ContextBuilder(
+            token_budget=getattr(Config, "CONTEXT_TOKEN_BUDGET", 600),
+            embeddings=self.text_pipeline.embeddings
+        )
+
+        # ذاكرة مؤقتة لتصحيح الأسئلة المتكررة (توفر استدعاء LLM)
+        self._correction_cache = OrderedDict()
+
     def load_resources(self):
         print("--- Loading Indexes ---")
         self.text_pipeline.load_index()
         self.image_pipeline.load_index()
         self._setup_generation_chain()
+        self._report_resources()
+
+    def _report_resources(self):
+        """تحديث gauges حجم الفهارس والنماذج المحملة"""
+        text_store = self.text_pipeline.vectorstore
+        set_index_size("text", text_store.index.ntotal if text_store else 0)
+        image_index = self.image_pipeline.index
+        set_index_size("image", image_index.ntotal if image_index else 0)
+
+        set_model_loaded("text_embedding", getattr(self.text_pipeline, "embeddings", None) is not None)
+        set_model_loaded("image_embedding", getattr(self.image_pipeline, "model", None) is not None)
+        set_model_loaded("reranker", self.reranker is not None)
+        set_model_loaded("llm", self.qa_chain_template is not None)
+        set_model_loaded("corrector", self.ai_helper.client is not None)
+        set_model_loaded("whisper", getattr(self.video_pipeline, "video_processor", None) is not None)
 
     def _setup_generation_chain(self):
         template = """
@@ -71,45 +98,83 @@ class RAGService:
         scored_docs = sorted(zip(docs, scores), key=lambda x: x[1], reverse=True)
         return [doc for doc, score in scored_docs[:getattr(Config, "FINAL_TOP_K", 3)]]
 
+    def correct_query(self, text):
+        """تصحيح النص عبر المصحح مع ذاكرة مؤقتة للأسئلة المتكررة"""
+        cached = self._correction_cache.get(text)
+        record_cache_lookup("correction", cached is not None)
+        if cached is not None:
+            self._correction_cache.move_to_end(text)
+            return cached
+
+        record_llm_call("correction")
+        corrected = self.ai_helper.correct_text(text)
+        self._correction_cache[text] = corrected
+        if len(self._correction_cache) > getattr(Config, "CORRECTION_CACHE_SIZE", 512):
+            self._correction_cache.popitem(last=False)
+        return corrected
+
     def answer_text_question(self, question: str):
         if not self.text_pipeline.vectorstore: return "System not ready."
 
-        # ===> تصحيح سؤال الطالب قبل البحث <===
-        final_q = question
-        if self.ai_helper.client and len(question.split()) > 3:
-            corrected = self.ai_helper.correct_text(question)
-            if corrected != question:
-                print(f"✨ Query Corrected (Llama): {question} -> {corrected}")
-                final_q = corrected
-        
-        # 1. Retrieval
-        initial_docs = self.text_pipeline.vectorstore.similarity_search(final_q, k=10)
-        if not initial_docs: return "No documents found."
-        
-        # 2. Re-ranking
-        refined_docs = self.rerank_documents(final_q, initial_docs) if self.reranker else initial_docs[:3]
-        
-        context = "\n\n".join([d.page_content for d in refined_docs])
-        
-        # 3. Generation
-        return self.qa_chain_template.invoke({"context": context, "question": final_q})
+        with traced("answer_text_question", question_chars=len(question)) as trace:
+            # ===> تصحيح سؤال الطالب قبل البحث <===
+            final_q = question
+            if self.ai_helper.client and len(question.split()) > 3:
+                with trace.stage("correction"):
+                    corrected = self.correct_query(question)
+                if corrected != question:
+                    print(f"✨ Query Corrected (Llama): {question} -> {corrected}")
+                    final_q = corrected
 
-    def search_image(self, img): return self.image_pipeline.search(img)
+            # 1. Retrieval
+            with trace.stage("embed"):
+                query_vector = self.text_pipeline.embeddings.embed_query(final_q)
+            with trace.stage("search"):
+                initial_docs = self.text_pipeline.vectorstore.similarity_search_by_vector(
+                    query_vector, k=getattr(Config, "INITIAL_TOP_K", 10)
+                )
+            trace.annotate(retrieved=len(initial_docs))
+            if not initial_docs: return "No documents found."
 
-def transcribe_audio_file(self, path):
-        if self.video_pipeline and self.video_pipeline.video_processor:
-            try:
-                segs = self.video_pipeline.video_processor.transcribe_video(path)
-                if segs:
-                    raw_text = " ".join([s['text'] for s in segs])
-                    
-                    # ===> تصحيح النص الصوتي <===
-                    if self.ai_helper.client:
-                        final_text = self.ai_helper.correct_text(raw_text)
-                        print(f"🎤 Voice Corrected: {raw_text} -> {final_text}")
-                        return final_text
-                    return raw_text
-            except Exception as e: print(f"Error: {e}")
-        return ""
+            # 2. Re-ranking
+            with trace.stage("rerank"):
+                refined_docs = self.rerank_documents(final_q, initial_docs) if self.reranker else initial_docs[:3]
+
+            with trace.stage("context"):
+                context, context_stats = self.context_builder.build(final_q, refined_docs)
+            trace.annotate(**context_stats)
+
+            # 3. Generation
+            with trace.stage("generate"):
+                record_llm_call("generation")
+                return self.qa_chain_template.invoke({"context": context, "question": final_q})
+
+    def search_image(self, img):
+        with traced("search_image") as trace:
+            results = self.image_pipeline.search(img, trace=trace)
+            trace.annotate(results=len(results))
+            return results
+
+    def transcribe_audio_file(self, path):
+        with traced("transcribe_audio_file") as trace:
+            if self.video_pipeline and getattr(self.video_pipeline, "video_processor", None):
+                try:
+                    with trace.stage("transcribe"):
+                        segs = self.video_pipeline.video_processor.transcribe_video(path)
+                    if segs:
+                        raw_text = " ".join([s['text'] for s in segs])
+                        trace.annotate(segments=len(segs), text_chars=len(raw_text))
+
+                        # ===> تصحيح النص الصوتي <===
+                        if self.ai_helper.client:
+                            with trace.stage("correction"):
+                                final_text = self.correct_query(raw_text)
+                            print(f"🎤 Voice Corrected: {raw_text} -> {final_text}")
+                            return final_text
+                        return raw_text
+                except Exception as e:
+                    trace.fail()
+                    print(f"Error: {e}")
+            return ""
 
 rag_service = RAGService()
\ No newline at end of file
@@ -0,0 +1,71 @@
+# Tests for building the LLM context within a token budget
+# Run from AI/smart_homework_helper: python -m unittest discover tests
+import unittest
+from types import SimpleNamespace
+
+from utils.context_builder import ContextBuilder, count_tokens, split_to_budget
+
+
+def doc(text, source="lesson.pdf"):
+    return SimpleNamespace(page_content=text, metadata={"source": source, "page": 1})
+
+
+class TestContextBuilder(unittest.TestCase):
+    def test_text_without_punctuation_still_gives_context(self):
+        # تفريغ فيديو بلا علامات ترقيم: جملة واحدة أكبر من الميزانية
+        transcript = " ".join(f"كلمة{i} عن التفاعل الكيميائي" for i in range(300))
+        builder = ContextBuilder(token_budget=100)
+
+        context, stats = builder.build("ما هو التفاعل الكيميائي", [doc(transcript)])
+
+        self.assertTrue(context)
+        self.assertLessEqual(stats["context_tokens"], 100)
+        self.assertGreater(stats["sentences_total"], 1)
+
+    def test_single_word_longer_than_budget(self):
+        context, stats = ContextBuilder(token_budget=20).build("query", [doc("x" * 2000)])
+
+        self.assertTrue(context)
+        self.assertLessEqual(count_tokens(context), 20)
+
+    def test_short_lines_only(self):
+        lines = "\n".join(f"سطر {i}" for i in range(400))
+
+        context, _ = ContextBuilder(token_budget=30).build("سطر", [doc(lines)])
+
+        self.assertTrue(context)
+
+    def test_split_to_budget_keeps_every_word(self):
+        text = " ".join(f"word{i}" for i in range(200))
+
+        pieces = split_to_budget(text, 25)
+
+        self.assertTrue(all(count_tokens(piece) <= 25 for piece in pieces))
+        self.assertEqual(" ".join(pieces), text)
+
+    def test_punctuated_text_keeps_relevant_sentences(self):
+        text = " ".join(
+            ["Photosynthesis turns light into chemical energy in plants."] +
+            [f"Unrelated filler sentence number {i} about history." for i in range(100)]
+        )
+
+        context, _ = ContextBuilder(token_budget=60).build("photosynthesis light energy", [doc(text)])
+
+        self.assertIn("Photosynthesis turns light", context)
+
+    def test_overlap_fragments_are_dropped(self):
+        # القطعتان تتداخلان: الأولى تنتهي وسط جملة والثانية تبدأ وسط أخرى
+        first = ("Cells divide by mitosis. The nucleus splits into two identical copies during anaphase. "
+                 "Then the cell membrane pinch")
+        second = "s into two identical copies during anaphase. Then the cell membrane pinches inward."
+
+        sentences = ContextBuilder()._collect_sentences([doc(first), doc(second)])
+
+        self.assertEqual([s["text"] for s in sentences], [
+            "Cells divide by mitosis.",
+            "The nucleus splits into two identical copies during anaphase.",
+            "Then the cell membrane pinches inward.",
+        ])
+
+if __name__ == "__main__":
+    unittest.main()
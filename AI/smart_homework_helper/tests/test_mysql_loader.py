@@ -0,0 +1,85 @@
+# Tests for the incremental MySQL sync (overlap window, dedupe by id, deleted rows)
+# Run from AI/smart_homework_helper: python -m unittest discover tests
+import os
+import tempfile
+import unittest
+from datetime import datetime
+from unittest.mock import patch
+
+from filters.mysql_loader import MySQLLoader
+
+
+def lesson_row(row_id, updated_at):
+    return {
+        "id": row_id, "title": f"Content {row_id}", "text_content": "نص", "description": "",
+        "updated_at": updated_at, "lesson_name": "Lesson", "subject": "Math", "level": "10",
+    }
+
+
+class FakeConnection:
+    def is_connected(self):
+        return False
+
+
+class TestIncrementalSync(unittest.TestCase):
+    def setUp(self):
+        self.state_path = os.path.join(tempfile.mkdtemp(), "db_sync_state.json")
+        self.queries = []
+
+    def sync(self, lesson_rows):
+        """One incremental run over the given lesson rows; returns the indexed row keys"""
+        loader = MySQLLoader(batch_size=10, state_path=self.state_path, overlap_seconds=300)
+
+        def stream(conn, query, params=()):
+            self.queries.append((query, params))
+            if "eduapi_lessoncontent" in query:
+                since = params[0] if params else None
+                rows = [row for row in lesson_rows if since is None or row["updated_at"].isoformat(sep=" ") >= since]
+                if rows:
+                    yield rows
+
+        with patch.object(loader, "get_connection", return_value=FakeConnection()), \
+                patch.object(loader, "_stream", side_effect=stream):
+            keys = [doc.metadata["row_key"] for doc in loader.iter_documents(incremental=True)]
+        loader.save_state()
+        self.loader = loader
+        return keys
+
+    def test_late_commit_inside_overlap_is_picked_up(self):
+        first = lesson_row(1, datetime(2026, 1, 1, 10, 0, 0))
+        self.assertEqual(self.sync([first]), ["lessoncontent:1"])
+
+        # Committed after the first run with an updated_at just before its high-water mark
+        late = lesson_row(2, datetime(2026, 1, 1, 9, 58, 0))
+        self.assertEqual(self.sync([late, first]), ["lessoncontent:2"])
+        query, params = [q for q in self.queries if "lc.updated_at >=" in q[0]][-1]
+        self.assertIn(">= %s", query)
+        self.assertEqual(params, ("2026-01-01 09:55:00",))
+
+    def test_unchanged_rows_are_not_indexed_again(self):
+        rows = [lesson_row(1, datetime(2026, 1, 1, 10, 0, 0)), lesson_row(2, datetime(2026, 1, 1, 10, 0, 0))]
+        self.assertEqual(len(self.sync(rows)), 2)
+
+        self.assertEqual(self.sync(rows), [])
+
+        rows[1] = lesson_row(2, datetime(2026, 1, 1, 10, 1, 0))
+        self.assertEqual(self.sync(rows), ["lessoncontent:2"])
+
+    def test_deleted_rows_are_missing_from_live_keys(self):
+        rows = [lesson_row(1, datetime(2026, 1, 1, 10, 0, 0)), lesson_row(2, datetime(2026, 1, 1, 10, 0, 0))]
+        self.sync(rows)
+        # The first run is a full read: the whole index is rebuilt, nothing to compare
+        self.assertIsNone(self.loader.live_row_keys)
+
+        self.assertEqual(self.sync(rows[1:]), [])
+        self.assertEqual(self.loader.live_row_keys, {"lessoncontent:2"})
+
+    def test_recent_rows_outside_the_window_are_forgotten(self):
+        self.sync([lesson_row(1, datetime(2026, 1, 1, 9, 0, 0)), lesson_row(2, datetime(2026, 1, 1, 10, 0, 0))])
+
+        loader = MySQLLoader(state_path=self.state_path, overlap_seconds=300)
+        self.assertEqual(loader.state["lesson_content_recent"], {"2": "2026-01-01 10:00:00"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,185 @@
+import os
+import re
+from langchain_core.documents import Document
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+from utils.context_builder import count_tokens, split_sentences
+
+# فواصل تحترم علامات الترقيم العربية قبل اللجوء إلى المسافات
+SEPARATORS = ["\n\n", "\n", ". ", "؟ ", "? ", "! ", "، ", "; ", "؛ ", ", ", " ", ""]
+
+_PARAGRAPH_SPLIT = re.compile(r'\n\s*\n')
+
+
+class BaseSplitter:
+    """كل splitter يحوّل مستنداً واحداً إلى قائمة قطع مع الاحتفاظ بالـ metadata"""
+    name = "base"
+
+    def __init__(self, max_tokens, overlap_tokens=0):
+        self.max_tokens = max_tokens
+        self.overlap_tokens = overlap_tokens
+
+    def split(self, doc):
+        raise NotImplementedError
+
+    def _make(self, doc, text, index):
+        meta = dict(doc.metadata)
+        meta["chunk_index"] = index
+        meta["chunk_strategy"] = self.name
+        return Document(page_content=text, metadata=meta)
+
+
+class TokenSplitter(BaseSplitter):
+    """تقطيع بعدد التوكنز (وليس الأحرف) مع تداخل صغير"""
+    name = "token"
+
+    def __init__(self, max_tokens, overlap_tokens=0):
+        super().__init__(max_tokens, overlap_tokens)
+        self._splitter = RecursiveCharacterTextSplitter(
+            chunk_size=max_tokens,
+            chunk_overlap=overlap_tokens,
+            length_function=count_tokens,
+            separators=SEPARATORS,
+        )
+
+    def split(self, doc):
+        return [self._make(doc, text, i) for i, text in enumerate(self._splitter.split_text(doc.page_content))]
+
+
+class _PackingSplitter(BaseSplitter):
+    """
+    يجمع وحدات كاملة (جمل أو فقرات) في قطع حتى max_tokens.
+    لا تُقطع وحدة إلا إذا كانت وحدها أكبر من الحد، وعندها نرجع للتقطيع بالتوكنز.
+    التداخل يكون بوحدة كاملة (آخر جملة/فقرة) وليس بعدد ثابت من الأحرف.
+    """
+    joiner = " "
+
+    def units(self, text):
+        raise NotImplementedError
+
+    def split(self, doc):
+        fallback = None
+        chunks, current, current_tokens = [], [], 0
+        for unit in self.units(doc.page_content):
+            tokens = count_tokens(unit)
+            if tokens > self.max_tokens:
+                if current:
+                    chunks.append(self.joiner.join(current))
+                    current, current_tokens = [], 0
+                fallback = fallback or TokenSplitter(self.max_tokens, self.overlap_tokens)
+                chunks.extend(fallback._splitter.split_text(unit))
+                continue
+            if current and current_tokens + tokens > self.max_tokens:
+                chunks.append(self.joiner.join(current))
+                carry = current[-1] if self.overlap_tokens and count_tokens(current[-1]) <= self.overlap_tokens else None
+                current = [carry] if carry else []
+                current_tokens = count_tokens(carry) if carry else 0
+            current.append(unit)
+            current_tokens += tokens
+        if current:
+            chunks.append(self.joiner.join(current))
+        return [self._make(doc, text, i) for i, text in enumerate(chunks)]
+
+
+class SentenceSplitter(_PackingSplitter):
+    name = "sentence"
+
+    def units(self, text):
+        return split_sentences(text, min_chars=1)
+
+
+class ParagraphSplitter(_PackingSplitter):
+    name = "paragraph"
+    joiner = "\n\n"
+
+    def units(self, text):
+        return [p.strip() for p in _PARAGRAPH_SPLIT.split(text) if p.strip()]
+
+
+class PageSplitter(BaseSplitter):
+    """صفحة أو شريحة كاملة = قطعة واحدة، إلا إذا تجاوزت الحد فنقسمها بالفقرات"""
+    name = "page"
+
+    def split(self, doc):
+        if count_tokens(doc.page_content) <= self.max_tokens:
+            return [self._make(doc, doc.page_content, 0)]
+        chunks = ParagraphSplitter(self.max_tokens, self.overlap_tokens).split(doc)
+        for chunk in chunks:
+            chunk.metadata["chunk_strategy"] = self.name
+        return chunks
+
+
+class RecordSplitter(BaseSplitter):
+    """سجل كامل (سؤال + جواب + شرح) لا يُقطع أبداً"""
+    name = "record"
+
+    def split(self, doc):
+        return [self._make(doc, doc.page_content, 0)]
+
+
+SPLITTERS = {
+    "token": TokenSplitter,
+    "sentence": SentenceSplitter,
+    "paragraph": ParagraphSplitter,
+    "page": PageSplitter,
+    "record": RecordSplitter,
+}
+
+
+class ChunkingEngine:
+    """
+    يختار الـ splitter حسب نوع المستند:
+      - metadata["type"] من MySQLLoader (lesson / qa_explanation)
+      - metadata["media_type"] (video)
+      - امتداد الملف في metadata["source"] (pdf / docx / pptx ...)
+    الجدول قابل للتعديل من Config.CHUNKING_STRATEGIES.
+    """
+    def __init__(self, config):
+        self.max_tokens = getattr(config, "CHUNK_TOKENS", 256)
+        self.overlap_tokens = getattr(config, "CHUNK_TOKEN_OVERLAP", 32)
+        self.strategies = dict(getattr(config, "CHUNKING_STRATEGIES", {}))
+        self._splitters = {}
+        self.last_report = {}
+
+    def document_kind(self, doc):
+        meta = doc.metadata
+        if meta.get("type"):
+            return meta["type"]
+        if meta.get("media_type"):
+            return meta["media_type"]
+        ext = os.path.splitext(str(meta.get("source", "")))[1].lower().lstrip(".")
+        return ext or "default"
+
+    def splitter_for(self, doc):
+        strategy = self.strategies.get(self.document_kind(doc), self.strategies.get("default", "token"))
+        if strategy not in self._splitters:
+            self._splitters[strategy] = SPLITTERS[strategy](self.max_tokens, self.overlap_tokens)
+        return self._splitters[strategy]
+
+    def split_documents(self, docs, reset=True):
+        """reset=False يجمع الإحصائيات عبر عدة دفعات"""
+        splits = []
+        report = {} if reset else self.last_report
+        for doc in docs:
+            splitter = self.splitter_for(doc)
+            chunks = splitter.split(doc)
+            splits.extend(chunks)
+
+            stats = report.setdefault(splitter.name, {"documents": 0, "chunks": 0, "tokens": 0})
+            stats["documents"] += 1
+            stats["chunks"] += len(chunks)
+            stats["tokens"] += sum(count_tokens(c.page_content) for c in chunks)
+        self.last_report = report
+        return splits
+
+    def print_report(self, prefix="[Chunking]"):
+        for name, stats in self.last_report.items():
+            avg = stats["tokens"] // stats["chunks"] if stats["chunks"] else 0
+            print(f"{prefix} {name}: {stats['documents']} docs -> {stats['chunks']} chunks (avg {avg} tokens)")
+
+
+def index_stats(vectorstore):
+    """عدد المتجهات والحجم التقريبي للفهرس في الذاكرة"""
+    if not vectorstore:
+        return {"vectors": 0, "size_mb": 0.0}
+    index = vectorstore.index
+    return {"vectors": index.ntotal, "size_mb": round(index.ntotal * index.d * 4 / (1024 * 1024), 2)}
@@ -0,0 +1,194 @@
+import re
+import math
+
+# tiktoken اختياري: بدونه نقدّر عدد التوكنز من عدد الأحرف
+try:
+    import tiktoken
+    _ENCODING = tiktoken.get_encoding("cl100k_base")
+except Exception:
+    _ENCODING = None
+
+# نهاية الجملة: نقطة/علامة استفهام/تعجب (عربية وإنجليزية) أو سطر جديد
+_SENTENCE_SPLIT = re.compile(r'(?<=[.!?؟。])\s+|\n+')
+_WORD = re.compile(r'\w+', re.UNICODE)
+
+# جمل أقصر من هذا غالباً عناوين أو بقايا تقطيع
+MIN_SENTENCE_CHARS = 15
+
+
+def count_tokens(text):
+    if _ENCODING is not None:
+        return len(_ENCODING.encode(text))
+    return max(1, math.ceil(len(text) / 4))
+
+
+def split_sentences(text, min_chars=MIN_SENTENCE_CHARS):
+    return [s.strip() for s in _SENTENCE_SPLIT.split(text) if s and len(s.strip()) >= max(min_chars, 1)]
+
+
+def split_to_budget(text, max_tokens):
+    """
+    يقسم نصاً أطول من max_tokens إلى قطع متتالية لا تتجاوزه، عند حدود الكلمات
+    (وداخل الكلمة فقط إن كانت وحدها أطول من الميزانية)
+    """
+    max_tokens = max(1, max_tokens)
+    if count_tokens(text) <= max_tokens:
+        return [text]
+    pieces, current, used = [], [], 0
+    for word in text.split():
+        # كلمة أطول من الميزانية (نص بلا مسافات): قصّ بالأحرف
+        while count_tokens(word) > max_tokens:
+            cut = max(1, len(word) * max_tokens // count_tokens(word))
+            while cut > 1 and count_tokens(word[:cut]) > max_tokens:
+                cut -= 1
+            if current:
+                pieces.append(" ".join(current))
+                current, used = [], 0
+            pieces.append(word[:cut])
+            word = word[cut:]
+        if not word:
+            continue
+        # المسافة محسوبة مع الكلمة حتى لا يتجاوز مجموع القطعة الميزانية
+        tokens = count_tokens(word + " ")
+        if current and used + tokens > max_tokens:
+            pieces.append(" ".join(current))
+            current, used = [], 0
+        current.append(word)
+        used += tokens
+    if current:
+        pieces.append(" ".join(current))
+    return pieces
+
+
+def _normalize(sentence):
+    return " ".join(_WORD.findall(sentence.lower()))
+
+
+def _cosine(a, b):
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+
+def _lexical_score(query_terms, sentence):
+    terms = set(_WORD.findall(sentence.lower()))
+    if not terms or not query_terms:
+        return 0.0
+    return len(query_terms & terms) / math.sqrt(len(terms))
+
+
+class ContextBuilder:
+    """
+    يبني السياق المرسل للـ LLM من القطع المسترجعة ضمن ميزانية توكنز:
+      1. تقسيم كل قطعة إلى جمل
+      2. حذف الجمل المكررة أو المقطوعة (ناتجة عن تداخل القطع CHUNK_OVERLAP)
+      3. تقييم كل جملة مقابل السؤال (embeddings إن وجدت، وإلا تطابق الكلمات)
+      4. اختيار الأعلى تقييماً حتى امتلاء الميزانية، ثم إعادتها بترتيبها الأصلي
+    """
+    def __init__(self, token_budget=600, embeddings=None, rank_weight=0.05):
+        self.token_budget = token_budget
+        self.embeddings = embeddings
+        # أفضلية بسيطة للقطع التي رتبها الـ reranker أولاً
+        self.rank_weight = rank_weight
+
+    def _units(self, text):
+        """
+        جمل النص، مع تقسيم الجمل الطويلة: نص بلا علامات ترقيم (OCR عربي أو
+        تفريغ فيديو) يخرج جملة واحدة أكبر من الميزانية فلا يُختار منه شيء
+        """
+        limit = max(1, self.token_budget // 4)
+        for sentence in split_sentences(text):
+            yield from split_to_budget(sentence, limit)
+
+    def _collect_sentences(self, docs):
+        """
+        جمل كل القطع بلا تكرار. القطع تتداخل بـ CHUNK_OVERLAP وتبدأ غالباً وسط
+        جملة، فالنسخة المقطوعة ليست مطابقة للأصل بل جزء منه: نحذف كل جملة
+        محتواة في جملة محفوظة، ونستبدل المحفوظة إن ظهرت لاحقاً جملة تحتويها
+        """
+        sentences = []
+        keys = []
+        for doc_rank, doc in enumerate(docs):
+            for position, sentence in enumerate(self._units(doc.page_content)):
+                key = _normalize(sentence)
+                if not key or any(key in kept for kept in keys):
+                    continue
+                entry = {
+                    "text": sentence,
+                    "doc_rank": doc_rank,
+                    "position": position,
+                    "source": doc.metadata.get("source"),
+                    "page": doc.metadata.get("page"),
+                }
+                covered = [i for i, kept in enumerate(keys) if kept in key]
+                if covered:
+                    # الجملة الكاملة تأخذ مكان أول نسخة مقطوعة وتُحذف البقية
+                    sentences[covered[0]], keys[covered[0]] = entry, key
+                    for i in reversed(covered[1:]):
+                        del sentences[i], keys[i]
+                else:
+                    sentences.append(entry)
+                    keys.append(key)
+        return sentences
+
+    def _score(self, query, sentences):
+        texts = [s["text"] for s in sentences]
+        if self.embeddings is not None:
+            try:
+                query_vec = self.embeddings.embed_query(query)
+                sentence_vecs = self.embeddings.embed_documents(texts)
+                return [_cosine(query_vec, vec) for vec in sentence_vecs]
+            except Exception as e:
+                print(f"⚠️ [ContextBuilder] Embedding scoring failed, using lexical overlap: {e}")
+        query_terms = set(_WORD.findall(query.lower()))
+        return [_lexical_score(query_terms, text) for text in texts]
+
+    def build(self, query, docs):
+        """يعيد (context, stats)"""
+        full_text = "\n\n".join(d.page_content for d in docs)
+        full_tokens = count_tokens(full_text) if docs else 0
+
+        # كل شيء يدخل الميزانية: لا داعي للتقييم
+        if full_tokens <= self.token_budget:
+            return full_text, {"input_tokens": full_tokens, "context_tokens": full_tokens,
+                               "sentences_kept": None, "sentences_total": None}
+
+        sentences = self._collect_sentences(docs)
+        scores = self._score(query, sentences)
+        for sentence, score in zip(sentences, scores):
+            sentence["score"] = score - self.rank_weight * sentence["doc_rank"]
+            sentence["tokens"] = count_tokens(sentence["text"])
+
+        selected = []
+        used = 0
+        for sentence in sorted(sentences, key=lambda s: s["score"], reverse=True):
+            if used + sentence["tokens"] > self.token_budget:
+                continue
+            selected.append(sentence)
+            used += sentence["tokens"]
+
+        # سياق فارغ لا يفيد الـ LLM: نقصّ الجملة الأعلى تقييماً لتدخل الميزانية
+        if not selected:
+            if sentences:
+                best = dict(max(sentences, key=lambda s: s["score"]))
+            else:
+                # كل الأسطر أقصر من MIN_SENTENCE_CHARS: بداية أول قطعة
+                best = {"text": " ".join(docs[0].page_content.split()), "doc_rank": 0, "position": 0}
+            best["text"] = split_to_budget(best["text"], self.token_budget)[0]
+            best["tokens"] = count_tokens(best["text"])
+            selected.append(best)
+            used = best["tokens"]
+
+        # إعادة الجمل بترتيب ظهورها حتى يبقى السياق مقروءاً
+        selected.sort(key=lambda s: (s["doc_rank"], s["position"]))
+        blocks = []
+        current_rank = None
+        for sentence in selected:
+            if sentence["doc_rank"] != current_rank:
+                blocks.append([])
+                current_rank = sentence["doc_rank"]
+            blocks[-1].append(sentence["text"])
+        context = "\n\n".join(" ".join(block) for block in blocks)
+
+        return context, {"input_tokens": full_tokens, "context_tokens": used,
+                         "sentences_kept": len(selected), "sentences_total": len(sentences)}
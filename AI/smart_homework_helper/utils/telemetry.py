@@ -0,0 +1,147 @@
+import os
+import json
+import time
+import logging
+from contextlib import contextmanager
+
+# prometheus_client اختياري: بدونه نحتفظ بالتتبع والسجل البطيء فقط
+try:
+    from prometheus_client import Counter, Gauge, Histogram, generate_latest, CONTENT_TYPE_LATEST
+    PROMETHEUS_AVAILABLE = True
+except ImportError:
+    PROMETHEUS_AVAILABLE = False
+    CONTENT_TYPE_LATEST = "text/plain; version=0.0.4; charset=utf-8"
+
+logger = logging.getLogger("rag.telemetry")
+
+# أي طلب يتجاوز هذا الزمن يُسجل مع تفصيل مراحله
+SLOW_QUERY_SECONDS = float(os.getenv("RAG_SLOW_QUERY_SECONDS", "5"))
+
+# حدود الـ buckets تغطي من بحث FAISS السريع (ms) إلى استدعاء LLM البطيء (عشرات الثواني)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 40, 80)
+
+
+class _NoopMetric:
+    """بديل صامت عندما لا تكون prometheus_client مثبتة"""
+    def labels(self, *args, **kwargs): return self
+    def observe(self, *args, **kwargs): pass
+    def inc(self, *args, **kwargs): pass
+    def set(self, *args, **kwargs): pass
+
+
+if PROMETHEUS_AVAILABLE:
+    STAGE_LATENCY = Histogram(
+        "rag_stage_duration_seconds", "Duration of each RAG pipeline stage",
+        ["operation", "stage"], buckets=LATENCY_BUCKETS
+    )
+    REQUEST_LATENCY = Histogram(
+        "rag_request_duration_seconds", "End-to-end duration of RAG operations",
+        ["operation"], buckets=LATENCY_BUCKETS
+    )
+    REQUESTS = Counter("rag_requests_total", "RAG operations by outcome", ["operation", "status"])
+    SLOW_REQUESTS = Counter("rag_slow_requests_total", "RAG operations slower than the slow-query threshold", ["operation"])
+    LLM_CALLS = Counter("rag_llm_calls_total", "Calls made to remote LLMs", ["purpose"])
+    CACHE_LOOKUPS = Counter("rag_cache_lookups_total", "In-process cache lookups", ["cache", "result"])
+    INDEX_SIZE = Gauge("rag_index_vectors", "Number of vectors in each loaded index", ["index"])
+    MODELS_LOADED = Gauge("rag_model_loaded", "1 if the model is loaded in memory, 0 otherwise", ["model"])
+else:
+    STAGE_LATENCY = REQUEST_LATENCY = REQUESTS = SLOW_REQUESTS = _NoopMetric()
+    LLM_CALLS = CACHE_LOOKUPS = INDEX_SIZE = MODELS_LOADED = _NoopMetric()
+
+
+class Trace:
+    """
+    تتبع طلب واحد: كل مرحلة تُقاس بـ trace.stage("name") وتُرسل إلى الـ histogram.
+    عند finish() نسجل الزمن الكلي، وإذا كان الطلب بطيئاً نطبع تفصيل المراحل.
+    """
+    def __init__(self, operation, **attributes):
+        self.operation = operation
+        self.attributes = attributes
+        self.stages = {}
+        self.status = "ok"
+        self._start = time.perf_counter()
+        self.total = None
+
+    @contextmanager
+    def stage(self, name):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - t0
+            # نفس المرحلة قد تتكرر (مثلاً تصحيح النص مرتين)، نجمع أزمنتها
+            self.stages[name] = self.stages.get(name, 0.0) + duration
+            STAGE_LATENCY.labels(self.operation, name).observe(duration)
+
+    def annotate(self, **attributes):
+        self.attributes.update(attributes)
+
+    def fail(self):
+        self.status = "error"
+
+    def finish(self):
+        if self.total is not None:
+            return self.total
+        self.total = time.perf_counter() - self._start
+        REQUEST_LATENCY.labels(self.operation).observe(self.total)
+        REQUESTS.labels(self.operation, self.status).inc()
+        if self.total >= SLOW_QUERY_SECONDS:
+            SLOW_REQUESTS.labels(self.operation).inc()
+            logger.warning("slow %s: %s", self.operation, json.dumps(self.as_dict(), ensure_ascii=False))
+        return self.total
+
+    def as_dict(self):
+        return {
+            "operation": self.operation,
+            "status": self.status,
+            "total_ms": round((self.total or 0) * 1000, 2),
+            "stages_ms": {name: round(value * 1000, 2) for name, value in self.stages.items()},
+            "attributes": self.attributes,
+        }
+
+
+class NullTrace:
+    """تتبع فارغ للاستدعاءات التي لا تمر عبر RAGService (مثل سكربتات الفهرسة)"""
+    @contextmanager
+    def stage(self, name):
+        yield
+
+    def annotate(self, **attributes): pass
+    def fail(self): pass
+    def finish(self): return None
+
+
+@contextmanager
+def traced(operation, **attributes):
+    """with traced("answer_text_question") as trace: ..."""
+    trace = Trace(operation, **attributes)
+    try:
+        yield trace
+    except Exception:
+        trace.fail()
+        raise
+    finally:
+        trace.finish()
+
+
+def record_llm_call(purpose):
+    LLM_CALLS.labels(purpose).inc()
+
+
+def record_cache_lookup(cache, hit):
+    CACHE_LOOKUPS.labels(cache, "hit" if hit else "miss").inc()
+
+
+def set_index_size(index, size):
+    INDEX_SIZE.labels(index).set(size or 0)
+
+
+def set_model_loaded(model, loaded):
+    MODELS_LOADED.labels(model).set(1 if loaded else 0)
+
+
+def render_metrics():
+    """نص الـ metrics بصيغة Prometheus"""
+    if not PROMETHEUS_AVAILABLE:
+        return b"# prometheus_client is not installed\n"
+    return generate_latest()
@@ -5,6 +5,7 @@ from django.contrib import admin
 from django.utils.html import format_html
 from django.urls import reverse
 from django.utils.safestring import mark_safe
+from django.db.models import Count
 from ..models.recurring_sessions_models import (
     SessionTemplate,
     StudentGroup,
@@ -12,6 +13,7 @@ from ..models.recurring_sessions_models import (
     GeneratedSession,
     TemplateGenerationLog
 )
+from ..services import cache_service, stats_service
 
 
 @admin.register(SessionTemplate)
@@ -60,18 +62,30 @@ class SessionTemplateAdmin(admin.ModelAdmin):
     
     actions = ['pause_templates', 'resume_templates', 'end_templates']
     
+    def _set_status(self, queryset, status):
+        """queryset.update() sends no signals: move the status counters here"""
+        moved = list(
+            queryset.exclude(status=status).values('teacher_id', 'status').annotate(n=Count('id')).order_by()
+        )
+        updated = queryset.update(status=status)
+        for row in moved:
+            stats_service.bump(f"{row['status'].lower()}_templates", row['teacher_id'], -row['n'])
+            stats_service.bump(f"{status.lower()}_templates", row['teacher_id'], row['n'])
+        cache_service.invalidate_template_stats()
+        return updated
+    
     def pause_templates(self, request, queryset):
-        updated = queryset.update(status='PAUSED')
+        updated = self._set_status(queryset, 'PAUSED')
         self.message_user(request, f'{updated} templates paused.')
     pause_templates.short_description = 'Pause selected templates'
     
     def resume_templates(self, request, queryset):
-        updated = queryset.update(status='ACTIVE')
+        updated = self._set_status(queryset, 'ACTIVE')
         self.message_user(request, f'{updated} templates resumed.')
     resume_templates.short_description = 'Resume selected templates'
     
     def end_templates(self, request, queryset):
-        updated = queryset.update(status='ENDED')
+        updated = self._set_status(queryset, 'ENDED')
         self.message_user(request, f'{updated} templates ended.')
     end_templates.short_description = 'End selected templates'
 
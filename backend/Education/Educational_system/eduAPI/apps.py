@@ -1,5 +1,7 @@
 from django.apps import AppConfig
+from django.conf import settings
 import os
+import sys
 import threading
 
 
@@ -12,17 +14,35 @@ class EduapiConfig(AppConfig):
         """Import signals when app is ready and start session scheduler"""
         import eduAPI.signals
         
+        if self._should_start_scheduler():
+            self._start_session_scheduler()
+        
+        # خادم التطوير يرسل البريد من الطابور بنفسه؛ في الإنتاج شغّل send_queued_emails --loop
+        if os.environ.get('RUN_MAIN') == 'true':
+            self._start_email_worker()
+    
+    def _should_start_scheduler(self):
         # تجنب التشغيل المزدوج (Django يشغل ready مرتين أحياناً)
         # وتجنب التشغيل في management commands
         if os.environ.get('RUN_MAIN') == 'true':
-            self._start_session_scheduler()
+            return True
+        # WSGI/ASGI workers may opt in: the leader lease keeps a single active scheduler
+        return getattr(settings, 'SESSION_SCHEDULER_AUTOSTART', False) and not sys.argv[0].endswith('manage.py')
     
     def _start_session_scheduler(self):
         """Start the background session generator"""
-        from .services.session_scheduler import SessionScheduler
+        from .services.session_scheduler import get_scheduler
         
         # تشغيل الـ scheduler في thread منفصل
-        scheduler = SessionScheduler()
+        scheduler = get_scheduler()
         scheduler_thread = threading.Thread(target=scheduler.start, daemon=True)
         scheduler_thread.start()
         print("✅ Session Scheduler started automatically")
+    
+    def _start_email_worker(self):
+        """Deliver queued emails in the background while running the dev server"""
+        from .services.email_outbox import run_worker
+        
+        worker_thread = threading.Thread(target=run_worker, daemon=True)
+        worker_thread.start()
+        print("✅ Email worker started automatically")
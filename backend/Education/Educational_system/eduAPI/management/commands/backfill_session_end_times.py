@@ -0,0 +1,38 @@
+# backend/Education/Educational_system/eduAPI/management/commands/backfill_session_end_times.py
+# Management command to fill LiveSession.end_datetime on rows created before the column existed
+
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from ...models.live_sessions_models import LiveSession
+from ...services import schedule_service
+
+BATCH_SIZE = 1000
+
+
+class Command(BaseCommand):
+    help = (
+        "Sets end_datetime = scheduled_datetime + duration_minutes on sessions that have none "
+        "and refreshes their schedule entries; run once after adding the column (safe to re-run)"
+    )
+
+    def handle(self, *args, **options):
+        filled = 0
+        while True:
+            sessions = list(
+                LiveSession.objects.filter(end_datetime__isnull=True)
+                .only('id', 'scheduled_datetime', 'duration_minutes')
+                .order_by('id')[:BATCH_SIZE]
+            )
+            if not sessions:
+                break
+            for session in sessions:
+                session.end_datetime = session.scheduled_datetime + timedelta(minutes=session.duration_minutes)
+            with transaction.atomic():
+                # bulk_update sends no signals: the calendars are refreshed here
+                LiveSession.objects.bulk_update(sessions, ['end_datetime'], batch_size=BATCH_SIZE)
+                schedule_service.refresh_sessions([session.id for session in sessions])
+            filled += len(sessions)
+        self.stdout.write(self.style.SUCCESS(f"Filled the end time of {filled} sessions"))
@@ -0,0 +1,14 @@
+# backend/Education/Educational_system/eduAPI/management/commands/cleanup_uploads.py
+# Management command to discard chunked uploads that were never completed
+
+from django.core.management.base import BaseCommand
+
+from ...services.upload_service import ChunkedUploadService
+
+
+class Command(BaseCommand):
+    help = "Aborts expired chunked uploads and deletes their part files"
+
+    def handle(self, *args, **options):
+        count = ChunkedUploadService.cleanup_expired()
+        self.stdout.write(self.style.SUCCESS(f"Removed {count} expired uploads"))
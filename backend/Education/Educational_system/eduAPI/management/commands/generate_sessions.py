@@ -73,45 +73,47 @@ class Command(BaseCommand):
         total_failed = 0
         total_skipped = 0
         
-        for target_date in target_dates:
+        # All dates are generated in one bulk pass, then reported per date
+        try:
+            results = generator.generate_sessions_for_dates(target_dates)
+        except Exception as e:
+            self.stdout.write(
+                self.style.ERROR(f'  Error processing {target_dates[0]} - {target_dates[-1]}: {str(e)}')
+            )
+            results = []
+            total_failed += len(target_dates)
+        
+        for result in results:
+            target_date = result['date']
             self.stdout.write(f'\nGenerating sessions for {target_date}...')
             
-            try:
-                result = generator.generate_sessions_for_date(target_date)
-                
-                total_generated += result['generated']
-                total_failed += result['failed']
-                total_skipped += result['skipped']
-                
-                if result['generated'] > 0:
-                    self.stdout.write(
-                        self.style.SUCCESS(
-                            f'  ✓ Generated {result["generated"]} sessions'
-                        )
-                    )
-                
-                if result['failed'] > 0:
-                    self.stdout.write(
-                        self.style.ERROR(
-                            f'  ✗ Failed to generate {result["failed"]} sessions'
-                        )
+            total_generated += result['generated']
+            total_failed += result['failed']
+            total_skipped += result['skipped']
+            
+            if result['generated'] > 0:
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f'  ✓ Generated {result["generated"]} sessions'
                     )
-                
-                if result['skipped'] > 0:
-                    self.stdout.write(
-                        self.style.WARNING(
-                            f'  - Skipped {result["skipped"]} templates'
-                        )
+                )
+            
+            if result['failed'] > 0:
+                self.stdout.write(
+                    self.style.ERROR(
+                        f'  ✗ Failed to generate {result["failed"]} sessions'
                     )
-                
-                if result['generated'] == 0 and result['failed'] == 0:
-                    self.stdout.write('  No sessions needed for this date')
-                
-            except Exception as e:
+                )
+            
+            if result['skipped'] > 0:
                 self.stdout.write(
-                    self.style.ERROR(f'  Error processing {target_date}: {str(e)}')
+                    self.style.WARNING(
+                        f'  - Skipped {result["skipped"]} templates'
+                    )
                 )
-                total_failed += 1
+            
+            if result['generated'] == 0 and result['failed'] == 0:
+                self.stdout.write('  No sessions needed for this date')
         
         # Summary
         self.stdout.write('\n' + '='*50)
@@ -0,0 +1,16 @@
+# backend/Education/Educational_system/eduAPI/management/commands/rebuild_performance_stats.py
+# Management command to recompute the materialized student performance tables
+
+from django.core.management.base import BaseCommand
+
+from ...services import performance_service
+
+
+class Command(BaseCommand):
+    help = "Recomputes StudentLessonStats and StudentStats from quiz attempts and enrollments"
+
+    def handle(self, *args, **options):
+        lesson_rows, student_rows = performance_service.rebuild_all()
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt {lesson_rows} student/lesson rows and {student_rows} student rows"
+        ))
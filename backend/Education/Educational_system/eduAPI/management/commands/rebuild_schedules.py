@@ -0,0 +1,14 @@
+# backend/Education/Educational_system/eduAPI/management/commands/rebuild_schedules.py
+# Management command to rebuild the materialized per-user schedules
+
+from django.core.management.base import BaseCommand
+
+from ...services import schedule_service
+
+
+class Command(BaseCommand):
+    help = "Refreshes every user's schedule entries from the live sessions (e.g. after bulk imports or name changes)"
+
+    def handle(self, *args, **options):
+        checked, changed = schedule_service.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Checked {checked} sessions, {changed} calendars changed"))
@@ -0,0 +1,14 @@
+# backend/Education/Educational_system/eduAPI/management/commands/reconcile_stats.py
+# Management command to recount the statistics counters from the source tables
+
+from django.core.management.base import BaseCommand
+
+from ...services import stats_service
+
+
+class Command(BaseCommand):
+    help = "Recounts dashboard statistics counters and rebuilds their recent daily buckets"
+
+    def handle(self, *args, **options):
+        drifted = stats_service.reconcile()
+        self.stdout.write(self.style.SUCCESS(f"Statistics reconciled ({drifted} counters corrected)"))
@@ -0,0 +1,67 @@
+# backend/Education/Educational_system/eduAPI/management/commands/run_load_test.py
+# Management command to load-test a running server with scripted user journeys
+
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ...services import loadtest_data, loadtest_runner
+
+
+class Command(BaseCommand):
+    help = (
+        "Plays student, advisor and teacher journeys against a running server with the accounts from "
+        "seed_load_data and reports throughput and latency percentiles per endpoint"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--base-url', default='http://127.0.0.1:8000', help='Server under test')
+        parser.add_argument('--users', type=int, default=20, help='Concurrent virtual users')
+        parser.add_argument('--duration', type=int, default=60, help='Seconds to run')
+        parser.add_argument('--ramp-up', type=int, default=10, help='Seconds over which the users start')
+        parser.add_argument('--think-min', type=float, default=0.5, help='Shortest pause between journeys')
+        parser.add_argument('--think-max', type=float, default=2.0, help='Longest pause between journeys')
+        parser.add_argument(
+            '--journeys', default=','.join(loadtest_runner.JOURNEYS),
+            help='Comma-separated journeys to play (default: all)'
+        )
+        parser.add_argument('--prefix', default=loadtest_data.DEFAULT_PREFIX, help='Prefix of the seeded dataset')
+        parser.add_argument('--password', default=loadtest_data.DEFAULT_PASSWORD, help='Password of the seeded accounts')
+        parser.add_argument('--seed', type=int, default=None, help='Random seed for repeatable journey choices')
+        parser.add_argument('--json', dest='json_path', help='Also write the report to this JSON file')
+
+    def handle(self, *args, **options):
+        journeys = [name.strip() for name in options['journeys'].split(',') if name.strip()]
+        unknown = set(journeys) - set(loadtest_runner.JOURNEYS)
+        if unknown:
+            raise CommandError(f"Unknown journeys: {', '.join(sorted(unknown))}")
+
+        roster = loadtest_data.roster(options['prefix'])
+        self.stdout.write(
+            f"{options['users']} users for {options['duration']}s against {options['base_url']} "
+            f"({len(roster.students)} students, {len(roster.advisors)} advisors, {len(roster.teachers)} teachers)"
+        )
+        try:
+            rows, elapsed = loadtest_runner.run(
+                options['base_url'], roster, options['password'],
+                users=options['users'],
+                duration=options['duration'],
+                ramp_up=options['ramp_up'],
+                think=(options['think_min'], options['think_max']),
+                journeys=journeys,
+                seed=options['seed']
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(loadtest_runner.format_report(rows))
+        if options['json_path']:
+            with open(options['json_path'], 'w') as output:
+                json.dump({'options': {key: options[key] for key in (
+                    'base_url', 'users', 'duration', 'ramp_up', 'think_min', 'think_max', 'journeys'
+                )}, 'elapsed': elapsed, 'endpoints': rows}, output, indent=2)
+        total = rows[-1]
+        style = self.style.SUCCESS if not total['failures'] else self.style.WARNING
+        self.stdout.write(style(
+            f"{total['requests']} requests in {elapsed:.1f}s ({total['rps']} req/s), {total['failures']} failures"
+        ))
@@ -0,0 +1,37 @@
+# backend/Education/Educational_system/eduAPI/management/commands/seed_load_data.py
+# Management command to seed a realistic dataset for load tests
+
+from dataclasses import fields
+
+from django.core.management.base import BaseCommand
+
+from ...services import loadtest_data
+
+
+class Command(BaseCommand):
+    help = (
+        "Seeds students, teachers, advisors, lessons with quizzes, groups, templates and months of sessions "
+        "for run_load_test (on a fresh SQLite database, create the tables first with migrate --run-syncdb)"
+    )
+
+    def add_arguments(self, parser):
+        for option in fields(loadtest_data.SeedOptions):
+            parser.add_argument(
+                f"--{option.name.replace('_', '-')}", type=option.type,
+                default=option.default, help=f'(default: {option.default})'
+            )
+        parser.add_argument('--reset', action='store_true', help='Delete the dataset with this prefix first')
+
+    def handle(self, *args, **options):
+        if options['reset']:
+            removed = loadtest_data.clear(options['prefix'])
+            self.stdout.write(f"Removed {removed} seeded users with prefix '{options['prefix']}_'")
+        seed_options = loadtest_data.SeedOptions(
+            **{option.name: options[option.name] for option in fields(loadtest_data.SeedOptions)}
+        )
+        counts = loadtest_data.seed(seed_options)
+        for name, count in counts.items():
+            self.stdout.write(f"  {name}: {count}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Seeded load-test data; accounts are {seed_options.prefix}_<role><n>@{loadtest_data.EMAIL_DOMAIN}"
+        ))
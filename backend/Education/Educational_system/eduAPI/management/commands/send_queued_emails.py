@@ -0,0 +1,32 @@
+# backend/Education/Educational_system/eduAPI/management/commands/send_queued_emails.py
+# Management command to deliver emails from the outbound queue
+
+from django.core.management.base import BaseCommand
+
+from ...services import email_outbox
+
+
+class Command(BaseCommand):
+    help = "Delivers queued emails over a reused SMTP connection (use --loop to keep running)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true', help='Keep polling the queue instead of sending one batch')
+        parser.add_argument('--interval', type=int, default=5, help='Seconds to wait when the queue is empty')
+        parser.add_argument('--batch-size', type=int, default=None, help='Messages sent per SMTP connection')
+
+    def handle(self, *args, **options):
+        if options['loop']:
+            self.stdout.write(self.style.SUCCESS("Email worker started"))
+            self.stdout.write(self.style.WARNING("Press Ctrl+C to exit"))
+            try:
+                email_outbox.run_worker(interval=options['interval'], batch_size=options['batch_size'])
+            except KeyboardInterrupt:
+                self.stdout.write(self.style.SUCCESS("Email worker stopped"))
+            return
+
+        result = email_outbox.deliver_batch(options['batch_size'])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Sent: {result['sent']}, retrying: {result['retried']}, failed: {result['failed']}"
+            )
+        )
@@ -0,0 +1,27 @@
+# backend/Education/Educational_system/eduAPI/management/commands/send_session_reminders.py
+# Management command to notify participants of sessions starting soon
+
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from ...services import notification_service
+
+
+class Command(BaseCommand):
+    help = "Creates reminder notifications for sessions starting soon (safe to run every few minutes)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--lead-minutes', type=int,
+            default=int(notification_service.REMINDER_LEAD.total_seconds() // 60),
+            help='Remind about sessions starting within this many minutes'
+        )
+        parser.add_argument('--recount', action='store_true', help='Also rebuild every unread counter')
+
+    def handle(self, *args, **options):
+        created = notification_service.send_reminders(lead=timedelta(minutes=options['lead_minutes']))
+        self.stdout.write(self.style.SUCCESS(f"Created {created} reminder notifications"))
+        if options['recount']:
+            counts = notification_service.recount()
+            self.stdout.write(self.style.SUCCESS(f"Recounted unread notifications for {len(counts)} users"))
@@ -1,17 +1,74 @@
 import re
+import time
+from contextlib import ExitStack
+
 from django.conf import settings
+from django.db import connections
 from django.utils.deprecation import MiddlewareMixin
 
+from .services import metrics_service
+
 
 class DisableCSRFMiddleware(MiddlewareMixin):
     """
     Middleware to disable CSRF protection for API endpoints
     """
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        # One compiled pattern instead of re.match() per pattern and request
+        patterns = getattr(settings, 'CSRF_EXEMPT_URLS', [])
+        self.exempt = re.compile('|'.join(f'(?:{pattern})' for pattern in patterns)) if patterns else None
+
     def process_request(self, request):
         # Check if the request path matches any of the exempt URLs
-        if hasattr(settings, 'CSRF_EXEMPT_URLS'):
-            for pattern in settings.CSRF_EXEMPT_URLS:
-                if re.match(pattern, request.path):
-                    setattr(request, '_dont_enforce_csrf_checks', True)
-                    break
-        return None
\ No newline at end of file
+        if self.exempt is not None and self.exempt.match(request.path):
+            setattr(request, '_dont_enforce_csrf_checks', True)
+        return None
+
+
+class InstrumentationMiddleware:
+    """
+    Measures every request: latency, status, response size and the SQL it ran
+    (count, time, repeated statements), recorded per endpoint in
+    metrics_service. Goes first in MIDDLEWARE so the time includes the rest of
+    the stack.
+    """
+    SKIP_PREFIXES = ('/api/metrics/', '/static/', '/media/')
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, 'INSTRUMENTATION_ENABLED', True)
+
+    def __call__(self, request):
+        if not self.enabled or request.path.startswith(self.SKIP_PREFIXES):
+            return self.get_response(request)
+
+        profile = metrics_service.RequestProfile()
+
+        def timed(execute, sql, params, many, context):
+            started = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                profile.record_query(sql, time.perf_counter() - started)
+
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(timed))
+            response = self.get_response(request)
+        duration = time.perf_counter() - started
+
+        match = getattr(request, 'resolver_match', None)
+        route = '/' + match.route if match and match.route else 'unmatched'
+        metrics_service.record(
+            request.method, route, response.status_code, duration,
+            self._size(response), profile, request.path
+        )
+        return response
+
+    @staticmethod
+    def _size(response):
+        if response.streaming:
+            return int(response.get('Content-Length') or 0)
+        return len(response.content)
@@ -16,12 +16,20 @@ from .live_sessions_models import (
     LiveSessionAssignment,
     LiveSessionMaterial,
     LiveSessionNote,
-    LiveSessionNotification
+    LiveSessionNotification,
+    NotificationCounter,
+    ScheduleEntry,
+    UserSchedule
 )
 from .recurring_sessions_models import (
     SessionTemplate,
     StudentGroup,
     TemplateGroupAssignment,
     GeneratedSession,
-    TemplateGenerationLog
+    TemplateGenerationLog,
+    SchedulerLease
 )
+from .email_models import OutboundEmail
+from .upload_models import ChunkedUpload, UploadedChunk
+from .performance_models import StudentLessonStats, StudentStats
+from .stats_models import StatsTotal, StatsBucket
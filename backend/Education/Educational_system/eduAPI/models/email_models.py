@@ -0,0 +1,59 @@
+# backend/Education/Educational_system/eduAPI/models/email_models.py
+# Outbound email queue - messages are stored here and delivered by a worker
+
+from django.db import models
+from django.utils import timezone
+from .live_sessions_models import LiveSessionNotification
+
+
+class OutboundEmail(models.Model):
+    """
+    A queued email.
+    Requests only insert a row; send_queued_emails delivers PENDING rows over
+    one SMTP connection per batch and retries failures with backoff.
+    """
+
+    STATUS_CHOICES = [
+        ('PENDING', 'Pending'),
+        ('SENDING', 'Sending'),
+        ('SENT', 'Sent'),
+        ('FAILED', 'Failed'),
+    ]
+
+    to_email = models.EmailField()
+    from_email = models.CharField(max_length=255, blank=True, default='')
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    html_body = models.TextField(blank=True, default='')
+
+    # Delivery state
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='PENDING')
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True, default='')
+    sent_at = models.DateTimeField(null=True, blank=True)
+    # Set by the worker that claimed the row; only that worker may record the outcome
+    claim_token = models.UUIDField(null=True, blank=True, editable=False)
+
+    # Notification whose is_sent_email flag follows this message
+    notification = models.ForeignKey(
+        LiveSessionNotification,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='emails'
+    )
+
+    # Timestamps
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['next_attempt_at', 'id']
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at']),
+            models.Index(fields=['to_email', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} -> {self.to_email} ({self.status})"
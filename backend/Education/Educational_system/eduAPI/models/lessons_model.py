@@ -64,7 +64,8 @@ class LessonContent(models.Model):
     title = models.CharField(max_length=255)
     description = models.TextField(blank=True, null=True)
     content_type = models.CharField(max_length=10, choices=TYPE_CHOICES)
-    file = models.FileField(upload_to='lesson_files/', blank=True, null=True)
+    file = models.FileField(upload_to='lesson_files/', blank=True, null=True, db_index=True)
+    file_size = models.BigIntegerField(null=True, blank=True)  # in bytes
     url = models.URLField(blank=True, null=True)
     text_content = models.TextField(blank=True, null=True)
     order = models.IntegerField(default=0)
@@ -178,7 +179,11 @@ class QuizAnswer(models.Model):
     question = models.ForeignKey(Question, on_delete=models.CASCADE)
     selected_answer = models.ForeignKey(Answer, on_delete=models.CASCADE)
     is_correct = models.BooleanField(default=False)
-    
+
+    class Meta:
+        # One answer per question per attempt; batch submission upserts on it
+        unique_together = ('attempt', 'question')
+
     def __str__(self):
         return f"Answer to {self.question.question_text[:30]} in {self.attempt}"
 
@@ -53,6 +53,11 @@ class LiveSession(models.Model):
         default=60,
         validators=[MinValueValidator(15), MaxValueValidator(240)]
     )
+    # scheduled_datetime + duration, stored so overlap checks are range queries
+    # (see services/schedule_conflicts.py); kept in sync by save(). Nullable only
+    # so the column can be added to existing tables: fill it right after with
+    # manage.py backfill_session_end_times
+    end_datetime = models.DateTimeField(editable=False, null=True)
     
     # Jitsi Integration
     jitsi_room_name = models.CharField(max_length=100, unique=True)
@@ -74,6 +79,8 @@ class LiveSession(models.Model):
         ordering = ['-scheduled_datetime']
         indexes = [
             models.Index(fields=['teacher', 'status']),
+            models.Index(fields=['teacher', 'scheduled_datetime']),
+            models.Index(fields=['teacher', 'end_datetime']),
             models.Index(fields=['scheduled_datetime']),
             models.Index(fields=['status', 'scheduled_datetime']),
         ]
@@ -81,6 +88,15 @@ class LiveSession(models.Model):
     def __str__(self):
         return f"{self.title} - {self.subject} (Grade {self.level})"
     
+    def save(self, *args, **kwargs):
+        """Keep end_datetime in step with the start time and duration"""
+        if self.scheduled_datetime:
+            self.end_datetime = self.scheduled_datetime + timezone.timedelta(minutes=int(self.duration_minutes))
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'scheduled_datetime', 'duration_minutes'} & set(update_fields):
+            kwargs['update_fields'] = set(update_fields) | {'end_datetime'}
+        super().save(*args, **kwargs)
+    
     @property
     def is_active(self):
         """Check if session is currently active"""
@@ -167,7 +183,7 @@ class LiveSessionMaterial(models.Model):
     content_type = models.CharField(max_length=10, choices=TYPE_CHOICES)
     
     # File handling - following existing pattern
-    file = models.FileField(upload_to='live_session_materials/', blank=True, null=True)
+    file = models.FileField(upload_to='live_session_materials/', blank=True, null=True, db_index=True)
     url = models.URLField(blank=True, null=True)
     text_content = models.TextField(blank=True, null=True)
     
@@ -255,8 +271,85 @@ class LiveSessionNotification(models.Model):
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['recipient', 'is_read', 'created_at']),
+            # Full inbox, newest first
+            models.Index(fields=['recipient', 'created_at']),
             models.Index(fields=['notification_type', 'created_at']),
         ]
     
     def __str__(self):
-        return f"{self.title} - {self.recipient.get_full_name()}"
\ No newline at end of file
+        return f"{self.title} - {self.recipient.get_full_name()}"
+
+
+class NotificationCounter(models.Model):
+    """
+    Number of unread live-session notifications of a user.
+    Kept up to date by services/notification_service.py so the unread badge
+    does not count the inbox on every page load.
+    """
+    
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='notification_counter'
+    )
+    unread = models.PositiveIntegerField(default=0)
+    
+    def __str__(self):
+        return f"{self.user_id}: {self.unread} unread"
+
+
+class ScheduleEntry(models.Model):
+    """
+    One session on one user's calendar (its teacher or an assigned student).
+    Materialized by services/schedule_service.py so calendars are read
+    without joining sessions through assignments.
+    """
+    
+    ROLE_CHOICES = [
+        ('teacher', 'Teacher'),
+        ('student', 'Student'),
+    ]
+    
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='schedule_entries')
+    session = models.ForeignKey(LiveSession, on_delete=models.CASCADE, related_name='schedule_entries')
+    role = models.CharField(max_length=10, choices=ROLE_CHOICES)
+    
+    # Copied from the session
+    title = models.CharField(max_length=255)
+    subject = models.CharField(max_length=255)
+    level = models.CharField(max_length=2)
+    status = models.CharField(max_length=20)
+    start = models.DateTimeField()
+    end = models.DateTimeField()
+    teacher_name = models.CharField(max_length=255, blank=True)
+    
+    class Meta:
+        unique_together = ('user', 'session')
+        indexes = [
+            models.Index(fields=['user', 'start']),
+        ]
+    
+    def __str__(self):
+        return f"{self.user_id}: {self.title} at {self.start}"
+
+
+class UserSchedule(models.Model):
+    """
+    Calendar revision and private feed token of a user.
+    The revision goes up whenever one of the user's schedule entries changes
+    and is used as the ETag of their calendar.
+    """
+    
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='calendar'
+    )
+    revision = models.PositiveIntegerField(default=0)
+    feed_token = models.CharField(max_length=64, unique=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"{self.user_id}: revision {self.revision}"
@@ -0,0 +1,67 @@
+# backend/Education/Educational_system/eduAPI/models/performance_models.py
+# Materialized student performance, kept current from quiz attempts and enrollments
+
+from django.db import models
+from django.contrib.auth import get_user_model
+from .lessons_model import Lesson
+
+User = get_user_model()
+
+
+class StudentLessonStats(models.Model):
+    """
+    Quiz results and progress of one student in one lesson.
+    Refreshed whenever one of the student's attempts or enrollments for the
+    lesson changes; rebuild_performance_stats recomputes every row.
+    """
+    student = models.ForeignKey(User, on_delete=models.CASCADE, related_name='lesson_stats')
+    lesson = models.ForeignKey(Lesson, on_delete=models.CASCADE, related_name='student_stats')
+    enrolled = models.BooleanField(default=False)
+    progress = models.IntegerField(default=0)
+
+    # Completed attempts only
+    attempts = models.PositiveIntegerField(default=0)
+    passed_attempts = models.PositiveIntegerField(default=0)
+    best_score = models.IntegerField(null=True, blank=True)
+    last_activity = models.DateTimeField(null=True, blank=True)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ('student', 'lesson')
+        indexes = [
+            models.Index(fields=['lesson', 'student']),
+        ]
+
+    def __str__(self):
+        return f"Stats of student {self.student_id} in lesson {self.lesson_id}"
+
+    @property
+    def pass_rate(self):
+        """Percentage of completed attempts that passed"""
+        if not self.attempts:
+            return None
+        return round(self.passed_attempts * 100 / self.attempts)
+
+
+class StudentStats(models.Model):
+    """One row per student summing up their StudentLessonStats"""
+    student = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='performance_stats')
+    lessons = models.PositiveIntegerField(default=0)  # enrolled lessons
+    average_progress = models.IntegerField(default=0)
+    attempts = models.PositiveIntegerField(default=0)
+    passed_attempts = models.PositiveIntegerField(default=0)
+    best_score = models.IntegerField(null=True, blank=True)
+    last_activity = models.DateTimeField(null=True, blank=True)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Stats of student {self.student_id}"
+
+    @property
+    def pass_rate(self):
+        """Percentage of completed attempts that passed"""
+        if not self.attempts:
+            return None
+        return round(self.passed_attempts * 100 / self.attempts)
@@ -136,51 +136,21 @@ class SessionTemplate(models.Model):
     def next_generation_date(self):
         """Calculate the next date when a session should be generated"""
         from datetime import timedelta
+        from ..services import recurrence
         
         if not self.is_active:
             return None
         
         today = timezone.now().date()
         
-        # If never generated before
-        if not self.last_generated:
-            # If start date is today or in the past, and today matches the day_of_week
-            if self.start_date <= today and today.weekday() == self.day_of_week:
-                return today
-            # Otherwise, find the next matching day starting from start_date
-            base_date = max(self.start_date, today)
-            days_ahead = (self.day_of_week - base_date.weekday()) % 7
-            if days_ahead == 0 and base_date > self.start_date:
-                days_ahead = 7
-            return base_date + timedelta(days=days_ahead)
+        # Next occurrence from today, skipping anything already generated
+        on_or_after = today
+        if self.last_generated and self.last_generated >= today:
+            on_or_after = self.last_generated + timedelta(days=1)
         
-        # If already generated, calculate next occurrence based on recurrence type
-        base_date = self.last_generated
-        
-        if self.recurrence_type == 'WEEKLY':
-            next_date = base_date + timedelta(weeks=1)
-        elif self.recurrence_type == 'BIWEEKLY':
-            next_date = base_date + timedelta(weeks=2)
-        elif self.recurrence_type == 'MONTHLY':
-            # Add one month (approximate)
-            next_date = base_date + timedelta(days=30)
-        else:
-            return None
-        
-        # If the calculated next_date is in the past, find the next occurrence from today
-        if next_date < today:
-            # Find the next matching day from today
-            days_ahead = (self.day_of_week - today.weekday()) % 7
-            if days_ahead == 0:
-                # If today is the right day, use today
-                next_date = today
-            else:
-                next_date = today + timedelta(days=days_ahead)
-        
-        # Check if within end date range
-        if self.end_date and next_date > self.end_date:
-            return None
-            
+        next_date = recurrence.next_occurrence(self, on_or_after)
+        while next_date and not recurrence.respects_spacing(self, next_date):
+            next_date = recurrence.next_occurrence(self, next_date + timedelta(days=1))
         return next_date
 
 
@@ -380,4 +350,21 @@ class TemplateGenerationLog(models.Model):
         ]
     
     def __str__(self):
-        return f"{self.template.title} - {self.attempted_date} ({self.status})"
\ No newline at end of file
+        return f"{self.template.title} - {self.attempted_date} ({self.status})"
+
+class SchedulerLease(models.Model):
+    """
+    Leader lease for the session scheduler.
+    Every instance tries to take or renew the row; only the holder whose lease
+    has not expired generates sessions, so N workers/nodes do the work once.
+    wakeup_version is bumped whenever templates or group assignments change
+    so the leader can react before its next planned fire time.
+    """
+    
+    name = models.CharField(max_length=100, unique=True)
+    holder = models.CharField(max_length=255, blank=True, default='')
+    expires_at = models.DateTimeField()
+    wakeup_version = models.PositiveIntegerField(default=0)
+    
+    def __str__(self):
+        return f"{self.name} ({self.holder or 'free'} until {self.expires_at})"
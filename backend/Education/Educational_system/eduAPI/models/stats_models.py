@@ -0,0 +1,32 @@
+# backend/Education/Educational_system/eduAPI/models/stats_models.py
+# Incremental counters with daily history for dashboard statistics
+
+from django.db import models
+
+
+class StatsTotal(models.Model):
+    """Current value of a counter (see services/stats_service.py for the metrics)"""
+    metric = models.CharField(max_length=40)
+    scope = models.PositiveIntegerField(default=0)  # teacher id, 0 for site-wide counters
+    value = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ('metric', 'scope')
+
+    def __str__(self):
+        return f"{self.metric}[{self.scope}] = {self.value}"
+
+
+class StatsBucket(models.Model):
+    """Net change of a counter during one day; trends are read from these"""
+    metric = models.CharField(max_length=40)
+    scope = models.PositiveIntegerField(default=0)
+    day = models.DateField()
+    delta = models.BigIntegerField(default=0)
+
+    class Meta:
+        unique_together = ('metric', 'scope', 'day')
+
+    def __str__(self):
+        return f"{self.metric}[{self.scope}] {self.day}: {self.delta:+d}"
@@ -0,0 +1,94 @@
+# backend/Education/Educational_system/eduAPI/models/upload_models.py
+# Resumable chunked uploads for lesson content and live session materials
+
+import math
+import uuid
+
+from django.db import models
+from django.contrib.auth import get_user_model
+from .lessons_model import Lesson, LessonContent
+from .live_sessions_models import LiveSession, LiveSessionMaterial
+
+User = get_user_model()
+
+
+class ChunkedUpload(models.Model):
+    """
+    One file being uploaded in chunks.
+    Chunks are written at their offset into a part file under MEDIA_ROOT; the
+    complete step moves it into place and creates the target row.
+    """
+
+    TARGET_CHOICES = [
+        ('LESSON_CONTENT', 'Lesson Content'),
+        ('SESSION_MATERIAL', 'Live Session Material'),
+    ]
+
+    STATUS_CHOICES = [
+        ('UPLOADING', 'Uploading'),
+        ('COMPLETE', 'Complete'),
+        ('ABORTED', 'Aborted'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name='chunked_uploads')
+    target = models.CharField(max_length=20, choices=TARGET_CHOICES)
+    lesson = models.ForeignKey(Lesson, on_delete=models.CASCADE, null=True, blank=True)
+    session = models.ForeignKey(LiveSession, on_delete=models.CASCADE, null=True, blank=True)
+
+    # Fields copied onto the created row
+    title = models.CharField(max_length=255)
+    description = models.TextField(blank=True, null=True)
+    content_type = models.CharField(max_length=10)
+
+    # File
+    filename = models.CharField(max_length=255)
+    total_size = models.BigIntegerField()
+    chunk_size = models.PositiveIntegerField()
+    checksum = models.CharField(max_length=64, blank=True, default='')  # optional sha256 of the whole file
+
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='UPLOADING')
+    lesson_content = models.ForeignKey(LessonContent, on_delete=models.SET_NULL, null=True, blank=True)
+    material = models.ForeignKey(LiveSessionMaterial, on_delete=models.SET_NULL, null=True, blank=True)
+
+    # Timestamps
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    expires_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'expires_at']),
+            models.Index(fields=['owner', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.filename} ({self.status})"
+
+    @property
+    def total_chunks(self):
+        return max(1, math.ceil(self.total_size / self.chunk_size))
+
+    def expected_chunk_size(self, index):
+        """Every chunk is chunk_size bytes except the last one"""
+        if index == self.total_chunks - 1:
+            return self.total_size - self.chunk_size * index
+        return self.chunk_size
+
+
+class UploadedChunk(models.Model):
+    """A chunk that arrived and matched its checksum"""
+
+    upload = models.ForeignKey(ChunkedUpload, on_delete=models.CASCADE, related_name='chunks')
+    index = models.PositiveIntegerField()
+    size = models.PositiveIntegerField()
+    checksum = models.CharField(max_length=64)
+    received_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['index']
+        unique_together = ('upload', 'index')
+
+    def __str__(self):
+        return f"Chunk {self.index} of {self.upload_id}"
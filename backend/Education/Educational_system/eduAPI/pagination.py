@@ -0,0 +1,151 @@
+# backend/Education/Educational_system/eduAPI/pagination.py
+# Keyset (cursor) pagination for list endpoints
+#
+# Instead of OFFSET, each page continues after the last row of the previous one:
+#   WHERE (scheduled_datetime, id) < (:last_datetime, :last_id) ORDER BY ... LIMIT n
+# so the cost of a page does not grow with the history behind it and rows
+# inserted meanwhile never shift items between pages.
+#
+# Pagination is opt-in: clients that send ?page_size= or ?cursor= get
+# {"results": [...], "next_cursor": ..., "next": ...}; other clients keep
+# receiving the plain list they expect.
+
+import base64
+import json
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError as DjangoValidationError
+from django.db.models import Q
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """Paginate on a unique ordering; the last field must be unique (usually id)"""
+
+    ordering = ('-id',)
+    page_size = 50
+    max_page_size = 200
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+
+    def __init__(self, ordering=None, page_size=None):
+        if ordering is not None:
+            self.ordering = tuple(ordering)
+        if page_size is not None:
+            self.page_size = page_size
+        self.next_cursor = None
+        self.request = None
+
+    def is_requested(self, request):
+        params = getattr(request, 'query_params', request.GET)
+        return self.cursor_query_param in params or self.page_size_query_param in params
+
+    def get_page_size(self, request):
+        params = getattr(request, 'query_params', request.GET)
+        try:
+            size = int(params.get(self.page_size_query_param, self.page_size))
+        except (TypeError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def _fields(self):
+        return [(name.lstrip('-'), name.startswith('-')) for name in self.ordering]
+
+    def encode_cursor(self, obj):
+        # Full isoformat: DjangoJSONEncoder drops microseconds, which would skip rows
+        values = [getattr(obj, name) for name, _ in self._fields()]
+        values = [value.isoformat() if hasattr(value, 'isoformat') else value for value in values]
+        raw = json.dumps(values).encode('utf-8')
+        return base64.urlsafe_b64encode(raw).decode('ascii')
+
+    def decode_cursor(self, cursor, model):
+        """Turn a cursor back into typed values for the ordering fields"""
+        try:
+            values = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8'))
+            fields = self._fields()
+            if not isinstance(values, list) or len(values) != len(fields):
+                raise ValueError('cursor does not match ordering')
+            return [
+                model._meta.get_field(name).to_python(value)
+                for (name, _), value in zip(fields, values)
+            ]
+        except (ValueError, TypeError, UnicodeError, FieldDoesNotExist, DjangoValidationError):
+            raise ValidationError({self.cursor_query_param: 'Invalid cursor'})
+
+    def after(self, values):
+        """Q object selecting rows that come after the given key in self.ordering"""
+        fields = self._fields()
+        condition = Q()
+        for position, (name, descending) in enumerate(fields):
+            step = Q(**{f"{name}__{'lt' if descending else 'gt'}": values[position]})
+            for (previous, _), value in zip(fields[:position], values[:position]):
+                step &= Q(**{previous: value})
+            condition |= step
+        return condition
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if not self.is_requested(request):
+            return None
+
+        self.request = request
+        size = self.get_page_size(request)
+        queryset = queryset.order_by(*self.ordering)
+
+        params = getattr(request, 'query_params', request.GET)
+        cursor = params.get(self.cursor_query_param)
+        if cursor:
+            queryset = queryset.filter(self.after(self.decode_cursor(cursor, queryset.model)))
+
+        # One extra row tells us whether there is a next page without a COUNT(*)
+        rows = list(queryset[:size + 1])
+        page = rows[:size]
+        self.next_cursor = self.encode_cursor(page[-1]) if len(rows) > size else None
+        return page
+
+    def get_next_link(self):
+        if self.next_cursor is None:
+            return None
+        return replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, self.next_cursor)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'next_cursor': self.next_cursor,
+            'results': data
+        })
+
+
+class SessionKeysetPagination(KeysetPagination):
+    """Live sessions, newest first"""
+    ordering = ('-scheduled_datetime', '-id')
+
+
+class CreatedKeysetPagination(KeysetPagination):
+    """Templates and other rows listed newest first"""
+    ordering = ('-created_at', '-id')
+
+
+class NameKeysetPagination(KeysetPagination):
+    """Groups listed alphabetically"""
+    ordering = ('name', 'id')
+
+
+class StudentKeysetPagination(KeysetPagination):
+    """Students listed by name"""
+    ordering = ('first_name', 'last_name', 'id')
+
+
+class AttemptKeysetPagination(KeysetPagination):
+    """Quiz attempts, latest first"""
+    ordering = ('-start_time', '-id')
+
+
+class NotificationKeysetPagination(KeysetPagination):
+    """Notification inbox, newest first; always paginated (no legacy clients)"""
+    ordering = ('-created_at', '-id')
+    page_size = 20
+
+    def is_requested(self, request):
+        return True
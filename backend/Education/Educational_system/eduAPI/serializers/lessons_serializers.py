@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from eduAPI.models.lessons_model import Lesson, LessonContent, Quiz, Question, Answer, QuizAttempt, QuizAnswer
+from eduAPI.models.lessons_model import Lesson, LessonContent, Quiz, Question, Answer, QuizAttempt, QuizAnswer, StudentEnrollment
 
 class AnswerSerializer(serializers.ModelSerializer):
     class Meta:
@@ -47,7 +47,8 @@ class LessonContentSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = LessonContent
-        fields = ['id', 'content_type', 'content_type_display', 'title', 'file', 'created_at']
+        fields = ['id', 'content_type', 'content_type_display', 'title', 'file', 'file_size', 'created_at']
+        read_only_fields = ['file_size']
         extra_kwargs = {
             'title': {'required': True},
             'content_type': {'required': True}
@@ -70,4 +71,36 @@ class LessonListSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = Lesson
-        fields = ['id', 'name', 'description', 'subject', 'level', 'level_display', 'content_count', 'quiz_count', 'created_at']
\ No newline at end of file
+        fields = ['id', 'name', 'description', 'subject', 'level', 'level_display', 'content_count', 'quiz_count', 'created_at']
+
+class StudentDashboardLessonSerializer(serializers.ModelSerializer):
+    """
+    Light-weight lesson card for the student dashboard, built from a StudentEnrollment.
+    Expects the queryset to select_related('lesson__teacher') and annotate
+    content_count / quiz_count so serialization runs no extra queries.
+    """
+    id = serializers.IntegerField(source='lesson.id', read_only=True)
+    enrollment_id = serializers.IntegerField(source='id', read_only=True)
+    name = serializers.CharField(source='lesson.name', read_only=True)
+    description = serializers.CharField(source='lesson.description', read_only=True)
+    subject = serializers.CharField(source='lesson.subject', read_only=True)
+    level = serializers.CharField(source='lesson.level', read_only=True)
+    level_display = serializers.CharField(source='lesson.get_level_display', read_only=True)
+    teacher = serializers.IntegerField(source='lesson.teacher_id', read_only=True)
+    teacher_name = serializers.SerializerMethodField()
+    content_count = serializers.IntegerField(read_only=True)
+    quiz_count = serializers.IntegerField(read_only=True)
+    created_at = serializers.DateTimeField(source='lesson.created_at', read_only=True)
+    updated_at = serializers.DateTimeField(source='lesson.updated_at', read_only=True)
+    assigned_date = serializers.DateTimeField(source='enrollment_date', read_only=True)
+    last_activity = serializers.DateTimeField(source='last_activity_date', read_only=True)
+
+    class Meta:
+        model = StudentEnrollment
+        fields = ['id', 'enrollment_id', 'name', 'description', 'subject', 'level', 'level_display',
+                  'teacher', 'teacher_name', 'content_count', 'quiz_count', 'created_at', 'updated_at',
+                  'progress', 'assigned_date', 'last_activity']
+
+    def get_teacher_name(self, obj):
+        teacher = obj.lesson.teacher
+        return f"{teacher.first_name} {teacher.last_name}".strip()
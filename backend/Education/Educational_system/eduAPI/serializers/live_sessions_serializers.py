@@ -3,6 +3,7 @@
 
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
+from django.db.models import Count, Q
 from django.utils import timezone
 from datetime import timedelta
 
@@ -13,10 +14,24 @@ from ..models.live_sessions_models import (
     LiveSessionNote,
     LiveSessionNotification
 )
+from ..services import schedule_conflicts
 
 User = get_user_model()
 
 
+def with_assignment_counts(queryset):
+    """
+    Annotate the assignment counts read by the session serializers
+    (instead of one or two COUNT queries per session).
+    Filter by assigned student with `id__in` rather than `assignments__student`,
+    which would join assignments and make the counts cover only that student.
+    """
+    return queryset.select_related('teacher').annotate(
+        assigned_count=Count('assignments', distinct=True),
+        attended_count=Count('assignments', filter=Q(assignments__attended=True), distinct=True)
+    )
+
+
 class UserBasicSerializer(serializers.ModelSerializer):
     """Basic user serializer for nested relationships"""
     
@@ -60,7 +75,10 @@ class LiveSessionSerializer(serializers.ModelSerializer):
         ]
     
     def get_assigned_students_count(self, obj):
-        """Get count of assigned students"""
+        """Get count of assigned students (annotated by with_assignment_counts)"""
+        annotated = getattr(obj, 'assigned_count', None)
+        if annotated is not None:
+            return annotated
         return obj.assignments.count()
     
     def validate_scheduled_datetime(self, value):
@@ -78,22 +96,16 @@ class LiveSessionSerializer(serializers.ModelSerializer):
             teacher = self.context['request'].user
             scheduled_datetime = data.get('scheduled_datetime')
             duration_minutes = data.get('duration_minutes', 60)
-            
-            if scheduled_datetime:
-                # Check for overlapping sessions
-                session_end = scheduled_datetime + timedelta(minutes=duration_minutes)
-                
-                overlapping_sessions = LiveSession.objects.filter(
-                    teacher=teacher,
-                    status__in=['PENDING', 'ASSIGNED', 'ACTIVE'],
-                    scheduled_datetime__lt=session_end,
-                    scheduled_datetime__gte=scheduled_datetime - timedelta(minutes=240)  # Max session duration
-                ).exclude(pk=self.instance.pk if self.instance else None)
-                
-                if overlapping_sessions.exists():
-                    raise serializers.ValidationError(
-                        "You have another session scheduled at this time"
-                    )
+        else:
+            teacher = self.instance.teacher
+            scheduled_datetime = data.get('scheduled_datetime', self.instance.scheduled_datetime)
+            duration_minutes = data.get('duration_minutes', self.instance.duration_minutes)
+        
+        if scheduled_datetime and schedule_conflicts.has_conflict(
+            teacher.id, scheduled_datetime, duration_minutes,
+            exclude_id=self.instance.pk if self.instance else None
+        ):
+            raise serializers.ValidationError(schedule_conflicts.CONFLICT_MESSAGE)
         
         return data
 
@@ -240,18 +252,21 @@ class LiveSessionDetailSerializer(LiveSessionSerializer):
     
     def get_total_assigned_students(self, obj):
         """Get total number of assigned students"""
-        return obj.assignments.count()
+        return self.get_assigned_students_count(obj)
     
     def get_attended_students(self, obj):
-        """Get number of students who attended"""
+        """Get number of students who attended (annotated by with_assignment_counts)"""
+        annotated = getattr(obj, 'attended_count', None)
+        if annotated is not None:
+            return annotated
         return obj.assignments.filter(attended=True).count()
     
     def get_attendance_rate(self, obj):
         """Calculate attendance rate"""
-        total = obj.assignments.count()
+        total = self.get_total_assigned_students(obj)
         if total == 0:
             return 0
-        attended = obj.assignments.filter(attended=True).count()
+        attended = self.get_attended_students(obj)
         return round((attended / total) * 100, 2)
 
 
@@ -43,7 +43,10 @@ class SessionTemplateSerializer(serializers.ModelSerializer):
         read_only_fields = ['teacher', 'last_generated', 'total_generated', 'created_at', 'updated_at']
     
     def get_assigned_groups_count(self, obj):
-        """Get count of assigned groups"""
+        """Get count of assigned groups (annotated by the viewset when listing)"""
+        annotated = getattr(obj, 'active_groups_count', None)
+        if annotated is not None:
+            return annotated
         return obj.group_assignments.filter(is_active=True).count()
     
     def validate(self, data):
@@ -63,7 +66,7 @@ class StudentGroupSerializer(serializers.ModelSerializer):
     """Serializer for StudentGroup model"""
     
     advisor_name = serializers.CharField(source='advisor.get_full_name', read_only=True)
-    student_count = serializers.IntegerField(read_only=True)
+    student_count = serializers.SerializerMethodField()
     students_details = serializers.SerializerMethodField(read_only=True)
     template_assignments_count = serializers.SerializerMethodField()
     
@@ -92,8 +95,18 @@ class StudentGroupSerializer(serializers.ModelSerializer):
             for student in obj.students.all()
         ]
     
+    def get_student_count(self, obj):
+        """Get number of students (annotated by the viewset when listing)"""
+        annotated = getattr(obj, 'students_total', None)
+        if annotated is not None:
+            return annotated
+        return obj.student_count
+    
     def get_template_assignments_count(self, obj):
-        """Get count of template assignments"""
+        """Get count of template assignments (annotated by the viewset when listing)"""
+        annotated = getattr(obj, 'active_template_assignments_count', None)
+        if annotated is not None:
+            return annotated
         return obj.template_assignments.filter(is_active=True).count()
     
     def create(self, validated_data):
@@ -130,7 +143,7 @@ class TemplateGroupAssignmentSerializer(serializers.ModelSerializer):
     template_title = serializers.CharField(source='template.title', read_only=True)
     group_name = serializers.CharField(source='group.name', read_only=True)
     advisor_name = serializers.CharField(source='advisor.get_full_name', read_only=True)
-    student_count = serializers.CharField(source='group.student_count', read_only=True)
+    student_count = serializers.SerializerMethodField()
     
     class Meta:
         model = TemplateGroupAssignment
@@ -144,6 +157,13 @@ class TemplateGroupAssignmentSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['advisor', 'assigned_date', 'sessions_generated', 'last_session_date']
     
+    def get_student_count(self, obj):
+        """Number of students in the group (annotated by the viewset), as a string like before"""
+        annotated = getattr(obj, 'group_student_count', None)
+        if annotated is None:
+            annotated = obj.group.student_count
+        return str(annotated)
+    
     def create(self, validated_data):
         """Create assignment with current user as advisor"""
         validated_data['advisor'] = self.context['request'].user
@@ -188,15 +208,18 @@ class GeneratedSessionSerializer(serializers.ModelSerializer):
         read_only_fields = ['generation_date']
     
     def get_session_details(self, obj):
-        """Get session details"""
+        """Get session details (assignment count annotated by the viewset)"""
         session = obj.session
+        assigned = getattr(obj, 'session_assigned_count', None)
+        if assigned is None:
+            assigned = session.assignments.count()
         return {
             'id': session.id,
             'title': session.title,
             'scheduled_datetime': session.scheduled_datetime,
             'status': session.status,
             'duration_minutes': session.duration_minutes,
-            'assigned_students_count': session.assignments.count()
+            'assigned_students_count': assigned
         }
 
 
@@ -0,0 +1,235 @@
+# backend/Education/Educational_system/eduAPI/services/bulk_assignment.py
+# Assigning many students at once
+#
+# Every operation resolves all requested ids with one query, writes with one
+# bulk statement and reports a status per requested id:
+#   assigned / already_assigned   - for assignments
+#   removed / not_assigned        - for removals
+#   not_found                     - no student with that id
+#   invalid                       - not an id at all
+
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+
+from ..models.live_sessions_models import LiveSessionAssignment
+from ..models.recurring_sessions_models import StudentGroup, TemplateGroupAssignment
+from . import cache_service, notification_service, schedule_service
+
+User = get_user_model()
+
+ASSIGNED = 'assigned'
+ALREADY_ASSIGNED = 'already_assigned'
+REMOVED = 'removed'
+NOT_ASSIGNED = 'not_assigned'
+NOT_FOUND = 'not_found'
+INVALID = 'invalid'
+
+BATCH_SIZE = 500
+
+
+def _requested(student_ids):
+    """Requested ids in order, without duplicates; malformed ones are kept as given"""
+    requested = {}
+    for raw in student_ids or []:
+        try:
+            requested.setdefault(int(raw), None)
+        except (TypeError, ValueError):
+            requested.setdefault(raw, None)
+    return list(requested)
+
+
+def _students(requested):
+    """{id: student} for the requested ids that are students (one query)"""
+    ids = [value for value in requested if isinstance(value, int)]
+    return User.objects.filter(id__in=ids, role='student').only('id', 'first_name', 'last_name').in_bulk()
+
+
+def _results(requested, statuses):
+    """One row per requested id; ids without a status are invalid or unknown"""
+    return [
+        {
+            'student_id': value,
+            'status': statuses.get(value, NOT_FOUND if isinstance(value, int) else INVALID)
+        }
+        for value in requested
+    ]
+
+
+def count(results, status):
+    return sum(1 for row in results if row['status'] == status)
+
+
+def assign_to_session(session, student_ids, advisor, message=''):
+    """Assign students to a live session; returns per-id results"""
+    requested = _requested(student_ids)
+    students = _students(requested)
+    existing = set(
+        LiveSessionAssignment.objects.filter(
+            session=session, student_id__in=list(students)
+        ).values_list('student_id', flat=True)
+    )
+    new_ids = [student_id for student_id in students if student_id not in existing]
+
+    with transaction.atomic():
+        # ignore_conflicts: a concurrent request may have assigned the same student
+        LiveSessionAssignment.objects.bulk_create([
+            LiveSessionAssignment(session=session, student_id=student_id, advisor=advisor, assignment_message=message)
+            for student_id in new_ids
+        ], batch_size=BATCH_SIZE, ignore_conflicts=True)
+        if new_ids:
+            # Saving the session also refreshes the cached schedules of its
+            # teacher and students, which bulk_create does not
+            session.status = 'ASSIGNED'
+            session.save()
+            notification_service.notify_assigned(session, new_ids)
+
+    statuses = {student_id: ALREADY_ASSIGNED for student_id in existing}
+    statuses.update((student_id, ASSIGNED) for student_id in new_ids)
+    return _results(requested, statuses)
+
+
+def unassign_from_session(session, student_ids):
+    """
+    Remove students from a live session; returns (per-id results, names of the removed students).
+    The assignments are removed with a plain DELETE, which skips the per-row
+    post_delete receivers; their schedule refresh and cache invalidation run
+    once for all removed students instead.
+    """
+    requested = _requested(student_ids)
+    ids = [value for value in requested if isinstance(value, int)]
+    assignments = LiveSessionAssignment.objects.filter(session=session, student_id__in=ids)
+    assigned = {
+        student_id: f'{first_name} {last_name}'.strip()
+        for student_id, first_name, last_name in assignments.values_list(
+            'student_id', 'student__first_name', 'student__last_name'
+        )
+    }
+    if assigned:
+        removed_ids = list(assigned)
+        table = connection.ops.quote_name(LiveSessionAssignment._meta.db_table)
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                for offset in range(0, len(removed_ids), BATCH_SIZE):
+                    batch = removed_ids[offset:offset + BATCH_SIZE]
+                    cursor.execute(
+                        f'DELETE FROM {table} WHERE session_id = %s AND student_id IN ({", ".join(["%s"] * len(batch))})',
+                        [session.id, *batch]
+                    )
+            schedule_service.refresh_sessions([session.id], removed_ids)
+        # The teacher's schedule shows the number of assigned students
+        cache_service.invalidate_schedules(removed_ids + [session.teacher_id])
+
+    statuses = dict.fromkeys(ids, NOT_ASSIGNED)
+    statuses.update(dict.fromkeys(assigned, REMOVED))
+    return _results(requested, statuses), list(assigned.values())
+
+
+def add_to_group(group, student_ids):
+    """Add students to a group; returns per-id results"""
+    requested = _requested(student_ids)
+    students = _students(requested)
+    members = set(group.students.filter(id__in=list(students)).values_list('id', flat=True))
+    new_ids = [student_id for student_id in students if student_id not in members]
+    if new_ids:
+        group.students.add(*new_ids)
+        cache_service.invalidate_template_stats()
+
+    statuses = dict.fromkeys(members, ALREADY_ASSIGNED)
+    statuses.update(dict.fromkeys(new_ids, ASSIGNED))
+    return _results(requested, statuses)
+
+
+def remove_from_group(group, student_ids):
+    """Remove students from a group; returns per-id results"""
+    requested = _requested(student_ids)
+    ids = [value for value in requested if isinstance(value, int)]
+    members = list(group.students.filter(id__in=ids).values_list('id', flat=True))
+    if members:
+        group.students.remove(*members)
+        cache_service.invalidate_template_stats()
+
+    statuses = dict.fromkeys(ids, NOT_ASSIGNED)
+    statuses.update(dict.fromkeys(members, REMOVED))
+    return _results(requested, statuses)
+
+
+def _direct_group(template, advisor):
+    """The advisor's group holding the students assigned straight to a template"""
+    group, _ = StudentGroup.objects.get_or_create(
+        name=f'Template #{template.id} direct assignments',
+        advisor=advisor,
+        defaults={'description': f'Students assigned directly to "{template.title}"'}
+    )
+    return group
+
+
+def assign_to_template(template, advisor, student_ids):
+    """
+    Assign students to a template through one group per (template, advisor)
+    instead of a one-student group each; returns per-id results.
+    Students already reached through any active group of the template are
+    reported as already assigned.
+    """
+    requested = _requested(student_ids)
+    students = _students(requested)
+    covered = set(
+        User.objects.filter(
+            id__in=list(students),
+            assigned_groups__template_assignments__template=template,
+            assigned_groups__template_assignments__is_active=True
+        ).values_list('id', flat=True)
+    )
+    new_ids = [student_id for student_id in students if student_id not in covered]
+
+    if new_ids:
+        with transaction.atomic():
+            group = _direct_group(template, advisor)
+            group.students.add(*new_ids)
+            if not group.is_active:
+                group.is_active = True
+                group.save(update_fields=['is_active', 'updated_at'])
+            TemplateGroupAssignment.objects.update_or_create(
+                template=template,
+                group=group,
+                defaults={
+                    'advisor': advisor,
+                    'is_active': True,
+                    'assignment_message': f'Students assigned directly to "{template.title}"'
+                }
+            )
+
+    statuses = dict.fromkeys(covered, ALREADY_ASSIGNED)
+    statuses.update(dict.fromkeys(new_ids, ASSIGNED))
+    return _results(requested, statuses)
+
+
+def unassign_from_template(template, advisor, student_ids):
+    """
+    Undo assign_to_template: remove students from the advisor's direct group
+    and deactivate their one-student groups from before; returns per-id results.
+    """
+    requested = _requested(student_ids)
+    students = _students(requested)
+    removed = set()
+
+    direct = StudentGroup.objects.filter(name=f'Template #{template.id} direct assignments', advisor=advisor).first()
+    if direct:
+        members = list(direct.students.filter(id__in=list(students)).values_list('id', flat=True))
+        direct.students.remove(*members)
+        removed.update(members)
+
+    # Students assigned before the direct group existed each have an individual group
+    individual = {
+        f'Individual - {student.first_name} {student.last_name}': student_id
+        for student_id, student in students.items()
+    }
+    legacy = TemplateGroupAssignment.objects.filter(
+        template=template, advisor=advisor, is_active=True, group__name__in=list(individual)
+    )
+    removed.update(individual[name] for name in legacy.values_list('group__name', flat=True))
+    if legacy.update(is_active=False) or removed:
+        cache_service.invalidate_template_stats()
+
+    statuses = dict.fromkeys(students, NOT_ASSIGNED)
+    statuses.update(dict.fromkeys(removed, REMOVED))
+    return _results(requested, statuses)
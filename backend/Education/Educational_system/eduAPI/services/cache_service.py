@@ -0,0 +1,110 @@
+# backend/Education/Educational_system/eduAPI/services/cache_service.py
+# Versioned cache keys for hot read endpoints
+#
+# Every cached entry is tied to one or more "scopes" (e.g. lesson:12, schedule:7).
+# Each scope has a version counter stored in the cache; the key of an entry embeds
+# the current versions, so bumping a scope makes all of its entries unreachable
+# without having to know or delete them. Stale entries simply expire with CACHE_TTL.
+#
+# Versions are bumped from model signals (see eduAPI/signals/cache_signals.py).
+# queryset.update() and bulk_create() do not send signals - code using them must
+# call the matching invalidate_* helper itself.
+#
+# When settings.CACHE_READS_ENABLED is off (a per-process cache shared by nobody)
+# lookups always miss and nothing is stored, so every read goes to the database.
+
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+KEY_PREFIX = 'eduapi'
+
+
+def lesson_scope(lesson_id):
+    return f'lesson:{lesson_id}'
+
+
+def schedule_scope(user_id):
+    return f'schedule:{user_id}'
+
+
+def teacher_lessons_scope(teacher_id):
+    return f'teacher_lessons:{teacher_id}'
+
+
+TEMPLATE_STATS_SCOPE = 'template_stats'
+
+
+def _version_key(scope):
+    return f'{KEY_PREFIX}:version:{scope}'
+
+
+def _new_version():
+    # Time based so a version evicted from the cache never comes back with an old value
+    return int(time.time() * 1000)
+
+
+def get_versions(scopes):
+    """Return the current version of each scope, creating missing ones"""
+    version_keys = [_version_key(scope) for scope in scopes]
+    versions = cache.get_many(version_keys)
+    for version_key in version_keys:
+        if version_key not in versions:
+            cache.add(version_key, _new_version(), None)
+            versions[version_key] = cache.get(version_key)
+    return [versions[version_key] for version_key in version_keys]
+
+
+def make_key(name, *parts, scopes=()):
+    """Build a cache key such as eduapi:student_lesson:12:v1718000000000"""
+    key = ':'.join([KEY_PREFIX, name] + [str(part) for part in parts])
+    versions = get_versions(scopes) if scopes else []
+    return key + ''.join(f':v{version}' for version in versions)
+
+
+def get_cached(key):
+    if not settings.CACHE_READS_ENABLED:
+        return None
+    return cache.get(key)
+
+
+def set_cached(key, value, timeout=None):
+    if settings.CACHE_READS_ENABLED:
+        cache.set(key, value, timeout if timeout is not None else settings.CACHE_TTL)
+    return value
+
+
+def get_or_build(key, builder, timeout=None):
+    """Return the cached value for key, building and storing it on a miss"""
+    value = get_cached(key)
+    if value is None:
+        value = set_cached(key, builder(), timeout)
+    return value
+
+
+def bump(*scopes):
+    """Invalidate every entry built on any of the given scopes"""
+    for scope in set(scopes):
+        version_key = _version_key(scope)
+        try:
+            cache.incr(version_key)
+        except ValueError:
+            cache.set(version_key, _new_version(), None)
+
+
+def invalidate_lesson(lesson_id, teacher_id=None):
+    if lesson_id is None:
+        return
+    scopes = [lesson_scope(lesson_id)]
+    if teacher_id is not None:
+        scopes.append(teacher_lessons_scope(teacher_id))
+    bump(*scopes)
+
+
+def invalidate_schedules(user_ids):
+    bump(*[schedule_scope(user_id) for user_id in user_ids if user_id is not None])
+
+
+def invalidate_template_stats():
+    bump(TEMPLATE_STATS_SCOPE)
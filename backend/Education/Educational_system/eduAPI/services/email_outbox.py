@@ -0,0 +1,174 @@
+# backend/Education/Educational_system/eduAPI/services/email_outbox.py
+# Outbound email queue
+#
+# Requests call queue_email(), which only inserts an OutboundEmail row, so a
+# slow SMTP server can no longer hold a web worker for EMAIL_TIMEOUT seconds.
+# The send_queued_emails worker claims due rows in batches, sends a whole
+# batch over one SMTP connection, and reschedules failures with exponential
+# backoff until EMAIL_OUTBOX_MAX_ATTEMPTS is reached.
+#
+# Delivery is at-least-once. Claims carry a token and are renewed right before
+# each send, and only the claim holder records the outcome, so two workers
+# never both send a message while they hold valid claims. Claims expire after
+# EMAIL_OUTBOX_CLAIM_SECONDS (ten minutes, or 10 x EMAIL_TIMEOUT if longer), so
+# a worker that dies (or stalls past that) after the SMTP server accepted a
+# message but before the row was marked SENT makes the next claim send it again.
+
+import time
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from ..models.email_models import OutboundEmail
+from ..models.live_sessions_models import LiveSessionNotification
+
+
+
+def queue_email(to_email, subject, body, html_body='', from_email=None, notification=None):
+    """Store a message for the worker to deliver"""
+    return OutboundEmail.objects.create(
+        to_email=to_email,
+        from_email=from_email or '',
+        subject=subject,
+        body=body,
+        html_body=html_body or '',
+        notification=notification
+    )
+
+
+def claim_timeout():
+    """How long a claimed row stays with its worker; a row whose worker died is picked up again after this"""
+    return timedelta(seconds=getattr(settings, 'EMAIL_OUTBOX_CLAIM_SECONDS', 600))
+
+
+def retry_delay(attempts):
+    """Backoff before the next attempt: base, 2x base, 4x base, ... capped"""
+    base = getattr(settings, 'EMAIL_OUTBOX_RETRY_SECONDS', 60)
+    cap = getattr(settings, 'EMAIL_OUTBOX_MAX_RETRY_SECONDS', 3600)
+    return timedelta(seconds=min(base * 2 ** max(attempts - 1, 0), cap))
+
+
+def claim_batch(batch_size):
+    """
+    Mark up to batch_size due messages as SENDING and return them.
+    Rows locked by another worker are skipped, so several workers can run.
+    """
+    now = timezone.now()
+    token = uuid.uuid4()
+    with transaction.atomic():
+        ids = list(
+            OutboundEmail.objects.select_for_update(skip_locked=True)
+            .filter(status__in=['PENDING', 'SENDING'], next_attempt_at__lte=now)
+            .order_by('next_attempt_at', 'id')
+            .values_list('id', flat=True)[:batch_size]
+        )
+        if ids:
+            OutboundEmail.objects.filter(id__in=ids).update(
+                status='SENDING', claim_token=token, next_attempt_at=now + claim_timeout(), updated_at=now
+            )
+    return list(OutboundEmail.objects.filter(id__in=ids, claim_token=token).order_by('id'))
+
+
+def _update_claimed(message, **fields):
+    """Update the row only while message's claim still holds; False once another worker took it over"""
+    return OutboundEmail.objects.filter(
+        id=message.id, status='SENDING', claim_token=message.claim_token
+    ).update(updated_at=timezone.now(), **fields) == 1
+
+
+def _renew_claim(message):
+    return _update_claimed(message, next_attempt_at=timezone.now() + claim_timeout())
+
+
+def _record_failure(message, error, result):
+    attempts = message.attempts + 1
+    if attempts >= getattr(settings, 'EMAIL_OUTBOX_MAX_ATTEMPTS', 5):
+        outcome = {'status': 'FAILED'}
+        counter = 'failed'
+    else:
+        outcome = {'status': 'PENDING', 'next_attempt_at': timezone.now() + retry_delay(attempts)}
+        counter = 'retried'
+    if _update_claimed(message, attempts=attempts, last_error=str(error)[:2000], claim_token=None, **outcome):
+        result[counter] += 1
+
+
+def _build_message(message, connection):
+    email = EmailMultiAlternatives(
+        message.subject,
+        message.body,
+        message.from_email or settings.DEFAULT_FROM_EMAIL,
+        [message.to_email],
+        connection=connection
+    )
+    if message.html_body:
+        email.attach_alternative(message.html_body, 'text/html')
+    return email
+
+
+def deliver_batch(batch_size=None):
+    """Send one batch over a single connection; returns sent/retried/failed counts"""
+    batch_size = batch_size or getattr(settings, 'EMAIL_OUTBOX_BATCH_SIZE', 50)
+    result = {'sent': 0, 'retried': 0, 'failed': 0}
+    messages = claim_batch(batch_size)
+    if not messages:
+        return result
+
+    connection = get_connection(fail_silently=False)
+    try:
+        connection.open()
+    except Exception as e:
+        print(f"❌ Could not connect to the mail server: {str(e)}")
+        for message in messages:
+            _record_failure(message, e, result)
+        return result
+
+    sent_notifications = []
+    try:
+        for message in messages:
+            # Another worker took over a claim that expired while earlier messages were sent
+            if not _renew_claim(message):
+                continue
+            try:
+                _build_message(message, connection).send()
+            except Exception as e:
+                _record_failure(message, e, result)
+                # The server may have dropped us; start the rest on a fresh connection
+                try:
+                    connection.close()
+                    connection.open()
+                except Exception:
+                    pass
+                continue
+
+            if not _update_claimed(
+                message, status='SENT', attempts=message.attempts + 1, last_error='',
+                sent_at=timezone.now(), claim_token=None
+            ):
+                continue
+            result['sent'] += 1
+            if message.notification_id:
+                sent_notifications.append(message.notification_id)
+    finally:
+        connection.close()
+
+    if sent_notifications:
+        LiveSessionNotification.objects.filter(id__in=sent_notifications).update(is_sent_email=True)
+    return result
+
+
+def run_worker(interval=5, batch_size=None):
+    """Deliver queued email forever; full batches are followed immediately by the next one"""
+    batch_size = batch_size or getattr(settings, 'EMAIL_OUTBOX_BATCH_SIZE', 50)
+    while True:
+        close_old_connections()
+        try:
+            result = deliver_batch(batch_size)
+        except Exception as e:
+            print(f"❌ Email worker error: {str(e)}")
+            result = {'sent': 0, 'retried': 0, 'failed': 0}
+        if sum(result.values()) < batch_size:
+            time.sleep(interval)
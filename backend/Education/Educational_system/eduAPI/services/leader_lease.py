@@ -0,0 +1,58 @@
+# backend/Education/Educational_system/eduAPI/services/leader_lease.py
+# Database-backed leader lease
+#
+# Taking or renewing the lease is a single conditional UPDATE:
+#   UPDATE lease SET holder = me, expires_at = now + ttl
+#   WHERE name = :name AND (holder = me OR expires_at <= now)
+# so two instances can never both hold it, and a crashed holder is replaced
+# once its lease runs out. Times come from the database clock (Now()) so
+# nodes with skewed clocks still agree on who holds the lease.
+
+from datetime import timedelta
+
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q
+from django.db.models.functions import Now
+from django.utils import timezone
+
+from ..models.recurring_sessions_models import SchedulerLease
+
+
+class LeaderLease:
+    """A named lease that at most one holder owns at a time"""
+
+    def __init__(self, name, holder, ttl_seconds=180):
+        self.name = name
+        self.holder = holder
+        self.ttl = timedelta(seconds=ttl_seconds)
+
+    def acquire(self):
+        """Take the lease or renew it; True when this holder owns it afterwards"""
+        updated = SchedulerLease.objects.filter(name=self.name).filter(
+            Q(holder=self.holder) | Q(expires_at__lte=Now())
+        ).update(holder=self.holder, expires_at=Now() + self.ttl)
+        if updated:
+            return True
+
+        if SchedulerLease.objects.filter(name=self.name).exists():
+            return False
+
+        # First run: whoever inserts the row wins, the others hit the unique name
+        try:
+            with transaction.atomic():
+                SchedulerLease.objects.create(name=self.name, holder=self.holder, expires_at=timezone.now() + self.ttl)
+            return True
+        except IntegrityError:
+            return False
+
+    def release(self):
+        """Give the lease up so another instance can take over immediately"""
+        SchedulerLease.objects.filter(name=self.name, holder=self.holder).update(holder='', expires_at=Now())
+
+    def wakeup_version(self):
+        return SchedulerLease.objects.filter(name=self.name).values_list('wakeup_version', flat=True).first()
+
+    @staticmethod
+    def wake(name):
+        """Tell the current holder that its work may have changed"""
+        SchedulerLease.objects.filter(name=name).update(wakeup_version=F('wakeup_version') + 1)
@@ -67,7 +67,8 @@ class LessonContentService:
             lesson_id=lesson_id,
             content_type=data['content_type'],
             title=data['title'],
-            file=file
+            file=file,
+            file_size=file.size if file else None
         )
         return content
     
@@ -0,0 +1,426 @@
+# backend/Education/Educational_system/eduAPI/services/loadtest_data.py
+# Seeded dataset for load tests
+#
+# seed() writes a school-sized dataset in bulk: students, teachers and
+# advisors sharing one password, lessons with quizzes, enrollments and
+# finished quiz attempts, student groups attached to weekly session templates,
+# and the live sessions those templates produced over the past months and the
+# coming weeks, with their assignments. Every username starts with the
+# prefix, so a dataset can be removed with clear() and seeded again.
+#
+# bulk_create() sends no signals, so seed() finishes by rebuilding what the
+# signals would have maintained: schedule entries, performance rows and the
+# statistics counters. roster() reads back the accounts and ids the load-test
+# journeys need (see loadtest_runner.py).
+
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, time, timedelta
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from ..models.lessons_model import Answer, Lesson, Question, Quiz, QuizAnswer, QuizAttempt, StudentEnrollment
+from ..models.live_sessions_models import LiveSession, LiveSessionAssignment, ScheduleEntry
+from ..models.recurring_sessions_models import (
+    GeneratedSession,
+    SessionTemplate,
+    StudentGroup,
+    TemplateGenerationLog,
+    TemplateGroupAssignment
+)
+from . import cache_service, performance_service, schedule_service, stats_service
+
+User = get_user_model()
+
+BATCH_SIZE = 1000
+
+DEFAULT_PREFIX = 'load'
+DEFAULT_PASSWORD = 'LoadTest-2024!'
+EMAIL_DOMAIN = 'loadtest.example.com'
+
+LEVELS = ('9', '10', '11', '12')
+SUBJECTS = ('Mathematics', 'Physics', 'Chemistry', 'Biology', 'English', 'History')
+
+
+@dataclass
+class SeedOptions:
+    students: int = 2000
+    teachers: int = 40
+    advisors: int = 20
+    lessons_per_teacher: int = 5
+    quizzes_per_lesson: int = 2
+    questions_per_quiz: int = 5
+    enrollments_per_student: int = 4
+    attempts_per_student: int = 2
+    templates_per_teacher: int = 3
+    groups_per_template: int = 1
+    group_size: int = 25
+    months: int = 3
+    weeks_ahead: int = 4
+    prefix: str = DEFAULT_PREFIX
+    password: str = DEFAULT_PASSWORD
+    seed: int = 42
+
+
+@dataclass
+class Roster:
+    """Seeded accounts and the ids each journey works with"""
+    students: list = field(default_factory=list)  # {'email', 'lessons': [lesson ids]}
+    teachers: list = field(default_factory=list)  # {'email', 'students': [student ids]}
+    advisors: list = field(default_factory=list)  # {'email', 'sessions': [upcoming session ids], 'students': [ids]}
+
+
+def _prefix_filter(prefix):
+    return {'username__startswith': f'{prefix}_'}
+
+
+def _insert(model, objects):
+    """
+    bulk_create() that leaves primary keys set on every backend. MySQL returns
+    no ids from a multi-row INSERT, so they are read back in insertion order;
+    this assumes nothing else writes to the table while seeding.
+    """
+    if not objects:
+        return objects
+    if connection.features.can_return_rows_from_bulk_insert:
+        model.objects.bulk_create(objects, batch_size=BATCH_SIZE)
+        return objects
+    last = model.objects.aggregate(last=Max('pk'))['last'] or 0
+    model.objects.bulk_create(objects, batch_size=BATCH_SIZE)
+    ids = model.objects.filter(pk__gt=last).order_by('pk').values_list('pk', flat=True)
+    for obj, pk in zip(objects, ids):
+        obj.pk = pk
+    return objects
+
+
+def _users(options, role, count, password):
+    return _insert(User, [
+        User(
+            username=f'{options.prefix}_{role}{n}',
+            email=f'{options.prefix}_{role}{n}@{EMAIL_DOMAIN}',
+            password=password,
+            first_name=role.capitalize(),
+            last_name=str(n),
+            role=role,
+            is_email_verified=True,
+            grade_level=LEVELS[n % len(LEVELS)] if role == User.STUDENT else None
+        )
+        for n in range(count)
+    ])
+
+
+def _weekly_dates(first, last, weekday):
+    day = first + timedelta(days=(weekday - first.weekday()) % 7)
+    while day <= last:
+        yield day
+        day += timedelta(days=7)
+
+
+@transaction.atomic
+def seed(options=None):
+    """Write the dataset; returns {model name: rows created}"""
+    options = options or SeedOptions()
+    rng = random.Random(options.seed)
+    now = timezone.now()
+    today = timezone.localdate()
+    # One hash for every account: hashing thousands of passwords would dominate the run
+    password = make_password(options.password)
+
+    students = _users(options, User.STUDENT, options.students, password)
+    teachers = _users(options, User.TEACHER, options.teachers, password)
+    advisors = _users(options, User.ADVISOR, options.advisors, password)
+
+    lessons = _insert(Lesson, [
+        Lesson(
+            name=f'{SUBJECTS[t % len(SUBJECTS)]} unit {n + 1}',
+            description='Seeded for load tests',
+            subject=SUBJECTS[t % len(SUBJECTS)],
+            level=LEVELS[(t + n) % len(LEVELS)],
+            teacher=teacher
+        )
+        for t, teacher in enumerate(teachers)
+        for n in range(options.lessons_per_teacher)
+    ])
+    quizzes = _insert(Quiz, [
+        Quiz(lesson=lesson, title=f'{lesson.name} quiz {n + 1}', time_limit_minutes=20, passing_score=60)
+        for lesson in lessons
+        for n in range(options.quizzes_per_lesson)
+    ])
+    questions = _insert(Question, [
+        Question(quiz=quiz, question_text=f'Question {n + 1} of {quiz.title}', order=n)
+        for quiz in quizzes
+        for n in range(options.questions_per_quiz)
+    ])
+    answers = _insert(Answer, [
+        Answer(question=question, answer_text=f'Option {n + 1}', is_correct=(n == 0))
+        for question in questions
+        for n in range(4)
+    ])
+
+    questions_by_quiz = {}
+    for question in questions:
+        questions_by_quiz.setdefault(question.quiz_id, []).append(question)
+    answers_by_question = {}
+    for answer in answers:
+        answers_by_question.setdefault(answer.question_id, []).append(answer)
+    quizzes_by_lesson = {}
+    for quiz in quizzes:
+        quizzes_by_lesson.setdefault(quiz.lesson_id, []).append(quiz)
+    lessons_by_level = {}
+    for lesson in lessons:
+        lessons_by_level.setdefault(lesson.level, []).append(lesson)
+
+    # Enrollments in lessons of the student's grade, and finished attempts on their quizzes
+    enrollments = []
+    attempts = []
+    chosen_answers = []
+    for student in students:
+        available = lessons_by_level.get(student.grade_level, [])
+        enrolled = rng.sample(available, min(options.enrollments_per_student, len(available)))
+        enrollments.extend(
+            StudentEnrollment(student=student, lesson=lesson, progress=rng.randint(0, 100))
+            for lesson in enrolled
+        )
+        enrolled_quizzes = [quiz for lesson in enrolled for quiz in quizzes_by_lesson.get(lesson.id, [])]
+        for quiz in rng.sample(enrolled_quizzes, min(options.attempts_per_student, len(enrolled_quizzes))):
+            picks = [
+                (question, rng.choice(answers_by_question[question.id]) if rng.random() < 0.4
+                 else answers_by_question[question.id][0])
+                for question in questions_by_quiz.get(quiz.id, [])
+            ]
+            correct = sum(answer.is_correct for _, answer in picks)
+            score = round(100 * correct / len(picks)) if picks else 0
+            attempts.append(QuizAttempt(
+                student=student, quiz=quiz, end_time=now, score=score, passed=score >= quiz.passing_score
+            ))
+            chosen_answers.append(picks)
+    _insert(StudentEnrollment, enrollments)
+    _insert(QuizAttempt, attempts)
+    _insert(QuizAnswer, [
+        QuizAnswer(attempt=attempt, question=question, selected_answer=answer, is_correct=answer.is_correct)
+        for attempt, picks in zip(attempts, chosen_answers)
+        for question, answer in picks
+    ])
+
+    # Groups of one grade each, spread over the advisors
+    groups = []
+    members = []
+    levels = []
+    for level in LEVELS if advisors else ():
+        level_students = [student for student in students if student.grade_level == level]
+        for start in range(0, len(level_students), options.group_size):
+            groups.append(StudentGroup(
+                name=f'{options.prefix} grade {level} group {start // options.group_size + 1}',
+                advisor=advisors[len(groups) % len(advisors)]
+            ))
+            members.append(level_students[start:start + options.group_size])
+            levels.append(level)
+    _insert(StudentGroup, groups)
+    Membership = StudentGroup.students.through
+    Membership.objects.bulk_create([
+        Membership(studentgroup_id=group.id, user_id=student.id)
+        for group, group_students in zip(groups, members)
+        for student in group_students
+    ], batch_size=BATCH_SIZE)
+    groups_by_level = {}
+    for group, group_students, level in zip(groups, members, levels):
+        groups_by_level.setdefault(level, []).append((group, group_students))
+
+    # Weekly templates at distinct hours per teacher, so a teacher's sessions never overlap
+    first_day = today - timedelta(days=30 * options.months)
+    last_day = today + timedelta(weeks=options.weeks_ahead)
+    templates = []
+    for t, teacher in enumerate(teachers):
+        for n in range(options.templates_per_teacher):
+            templates.append(SessionTemplate(
+                title=f'{SUBJECTS[t % len(SUBJECTS)]} live class {n + 1}',
+                subject=SUBJECTS[t % len(SUBJECTS)],
+                level=LEVELS[(t + n) % len(LEVELS)],
+                teacher=teacher,
+                day_of_week=(t + n) % 5,
+                start_time=time(8 + n % 10, 0),
+                duration_minutes=60,
+                recurrence_type='WEEKLY',
+                start_date=first_day,
+                status='ACTIVE'
+            ))
+    _insert(SessionTemplate, templates)
+
+    template_groups = []
+    students_by_template = {}
+    next_group = {}
+    for template in templates:
+        candidates = groups_by_level.get(template.level, [])
+        students_by_template[template.id] = {}
+        for _ in range(min(options.groups_per_template, len(candidates))):
+            position = next_group.get(template.level, 0)
+            next_group[template.level] = position + 1
+            group, group_students = candidates[position % len(candidates)]
+            template_groups.append(TemplateGroupAssignment(template=template, group=group, advisor=group.advisor))
+            for student in group_students:
+                students_by_template[template.id].setdefault(student.id, group.advisor_id)
+    _insert(TemplateGroupAssignment, template_groups)
+
+    sessions = []
+    session_templates = []
+    for template in templates:
+        for day in _weekly_dates(first_day, last_day, template.day_of_week):
+            start = timezone.make_aware(datetime.combine(day, template.start_time))
+            end = start + timedelta(minutes=template.duration_minutes)
+            sessions.append(LiveSession(
+                title=template.title,
+                description=f'Generated from template: {template.title}',
+                subject=template.subject,
+                level=template.level,
+                teacher_id=template.teacher_id,
+                scheduled_datetime=start,
+                end_datetime=end,
+                duration_minutes=template.duration_minutes,
+                jitsi_room_name=f'{options.prefix}-{template.id}-{day:%Y%m%d}',
+                status='COMPLETED' if end < now else 'ASSIGNED',
+                actual_start_time=start if end < now else None,
+                actual_end_time=end if end < now else None
+            ))
+            session_templates.append(template)
+            template.last_generated = day
+            template.total_generated += 1
+    _insert(LiveSession, sessions)
+    SessionTemplate.objects.bulk_update(templates, ['last_generated', 'total_generated'], batch_size=BATCH_SIZE)
+
+    assignments = []
+    for session, template in zip(sessions, session_templates):
+        assignments.extend(
+            LiveSessionAssignment(
+                session=session,
+                student_id=student_id,
+                advisor_id=advisor_id,
+                assignment_message=f'Auto-assigned from template: {template.title}',
+                attended=session.status == 'COMPLETED' and rng.random() < 0.85
+            )
+            for student_id, advisor_id in students_by_template[template.id].items()
+        )
+    _insert(LiveSessionAssignment, assignments)
+    _insert(GeneratedSession, [
+        GeneratedSession(
+            template=template,
+            session=session,
+            generated_by='system',
+            students_assigned=len(students_by_template[template.id]),
+            groups_assigned=options.groups_per_template
+        )
+        for session, template in zip(sessions, session_templates)
+    ])
+
+    # What the skipped signals would have kept up to date
+    session_ids = [session.id for session in sessions]
+    for offset in range(0, len(session_ids), schedule_service.BATCH_SIZE):
+        schedule_service.refresh_sessions(session_ids[offset:offset + schedule_service.BATCH_SIZE])
+    performance_service.rebuild_all()
+    stats_service.reconcile()
+    cache_service.invalidate_template_stats()
+
+    return {
+        'students': len(students),
+        'teachers': len(teachers),
+        'advisors': len(advisors),
+        'lessons': len(lessons),
+        'quizzes': len(quizzes),
+        'questions': len(questions),
+        'enrollments': len(enrollments),
+        'quiz attempts': len(attempts),
+        'groups': len(groups),
+        'templates': len(templates),
+        'sessions': len(sessions),
+        'session assignments': len(assignments),
+    }
+
+
+@transaction.atomic
+def clear(prefix=DEFAULT_PREFIX):
+    """
+    Delete a seeded dataset; returns the number of users removed. The bulky
+    child rows go first with plain DELETE statements: a dataset has tens of
+    thousands of them, and the per-row receivers a cascade would run (schedule
+    refresh, cache and stats bookkeeping) are replaced by the rebuilds below.
+    """
+    users = User.objects.filter(**_prefix_filter(prefix))
+    user_ids = list(users.values_list('id', flat=True))
+    if not user_ids:
+        return 0
+
+    def table(model):
+        return connection.ops.quote_name(model._meta.db_table)
+
+    attempts = f'SELECT id FROM {table(QuizAttempt)} WHERE student_id IN ({{ids}})'
+    templates = f'SELECT id FROM {table(SessionTemplate)} WHERE teacher_id IN ({{ids}})'
+    statements = (
+        f'DELETE FROM {table(ScheduleEntry)} WHERE user_id IN ({{ids}})',
+        f'DELETE FROM {table(LiveSessionAssignment)} WHERE student_id IN ({{ids}})',
+        f'DELETE FROM {table(QuizAnswer)} WHERE attempt_id IN ({attempts})',
+        f'DELETE FROM {table(QuizAttempt)} WHERE student_id IN ({{ids}})',
+        f'DELETE FROM {table(StudentEnrollment)} WHERE student_id IN ({{ids}})',
+        f'DELETE FROM {table(GeneratedSession)} WHERE template_id IN ({templates})',
+        f'DELETE FROM {table(TemplateGenerationLog)} WHERE template_id IN ({templates})',
+    )
+    with connection.cursor() as cursor:
+        for offset in range(0, len(user_ids), BATCH_SIZE // 2):
+            batch = user_ids[offset:offset + BATCH_SIZE // 2]
+            placeholders = ', '.join(['%s'] * len(batch))
+            for statement in statements:
+                cursor.execute(statement.format(ids=placeholders), batch)
+    users.delete()
+    performance_service.rebuild_all()
+    stats_service.reconcile()
+    return len(user_ids)
+
+
+def roster(prefix=DEFAULT_PREFIX, limit=200):
+    """Up to `limit` accounts per role from a seeded dataset"""
+    result = Roster()
+    users = User.objects.filter(**_prefix_filter(prefix)).order_by('id')
+
+    students = list(users.filter(role=User.STUDENT).values_list('id', 'email')[:limit])
+    lessons = {}
+    for student_id, lesson_id in StudentEnrollment.objects.filter(
+        student_id__in=[student_id for student_id, _ in students]
+    ).values_list('student_id', 'lesson_id'):
+        lessons.setdefault(student_id, []).append(lesson_id)
+    result.students = [
+        {'email': email, 'lessons': lessons[student_id]}
+        for student_id, email in students if student_id in lessons
+    ]
+
+    teachers = list(users.filter(role=User.TEACHER).values_list('id', 'email')[:limit])
+    taught = {}
+    for teacher_id, student_id in StudentEnrollment.objects.filter(
+        lesson__teacher_id__in=[teacher_id for teacher_id, _ in teachers]
+    ).values_list('lesson__teacher_id', 'student_id').distinct():
+        taught.setdefault(teacher_id, []).append(student_id)
+    result.teachers = [
+        {'email': email, 'students': taught.get(teacher_id, [])[:limit]}
+        for teacher_id, email in teachers
+    ]
+
+    advisors = list(users.filter(role=User.ADVISOR).values_list('id', 'email')[:limit])
+    advisor_ids = [advisor_id for advisor_id, _ in advisors]
+    advised = {}
+    for advisor_id, student_id in StudentGroup.students.through.objects.filter(
+        studentgroup__advisor_id__in=advisor_ids
+    ).values_list('studentgroup__advisor_id', 'user_id'):
+        advised.setdefault(advisor_id, []).append(student_id)
+    upcoming = {}
+    for advisor_id, session_id in GeneratedSession.objects.filter(
+        template__group_assignments__advisor_id__in=advisor_ids,
+        session__status='ASSIGNED',
+        session__scheduled_datetime__gt=timezone.now()
+    ).values_list('template__group_assignments__advisor_id', 'session_id').distinct():
+        upcoming.setdefault(advisor_id, []).append(session_id)
+    result.advisors = [
+        {'email': email, 'sessions': upcoming.get(advisor_id, [])[:limit], 'students': advised.get(advisor_id, [])}
+        for advisor_id, email in advisors if advised.get(advisor_id)
+    ]
+    return result
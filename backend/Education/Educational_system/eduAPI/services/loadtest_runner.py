@@ -0,0 +1,245 @@
+# backend/Education/Educational_system/eduAPI/services/loadtest_runner.py
+# Locust-style load test against a running server
+#
+# Virtual users are threads. Each one repeatedly picks a journey by weight
+# (student dashboard, quiz taking, schedule, advisor assignment, teacher
+# analytics), plays it over HTTP as a seeded account of the journey's role
+# and waits a random think time. Every request is timed and recorded under
+# its URL pattern, so /api/student/lessons/12/quizzes/ and .../13/quizzes/
+# share a row in the report: requests, failures, throughput and latency
+# percentiles per endpoint.
+#
+# Accounts and ids come from loadtest_data.roster(), read from the same
+# database the server uses. Journeys undo what they change (an advisor
+# unassigns the students they just assigned), so repeated runs see the same
+# dataset; quiz attempts accumulate like they would in production.
+
+import random
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+
+import requests
+
+# Percentiles shown per endpoint
+PERCENTILES = (50, 90, 95, 99)
+
+REQUEST_TIMEOUT = 30
+
+
+def percentile(ordered, p):
+    """Nearest-rank percentile of an ascending list"""
+    if not ordered:
+        return 0.0
+    rank = max(1, -(-len(ordered) * p // 100))
+    return ordered[int(rank) - 1]
+
+
+class Recorder:
+    """Latencies and failures per endpoint, shared by all virtual users"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.failures = defaultdict(int)
+
+    def record(self, name, seconds, ok):
+        with self._lock:
+            self.latencies[name].append(seconds)
+            if not ok:
+                self.failures[name] += 1
+
+    def summary(self, elapsed):
+        """One row per endpoint plus a total row, slowest p95 first"""
+        with self._lock:
+            series = {name: sorted(values) for name, values in self.latencies.items()}
+            failures = dict(self.failures)
+
+        def row(name, ordered, failed):
+            return {
+                'endpoint': name,
+                'requests': len(ordered),
+                'failures': failed,
+                'rps': round(len(ordered) / elapsed, 2) if elapsed else 0.0,
+                'mean_ms': round(1000 * sum(ordered) / len(ordered), 1) if ordered else 0.0,
+                **{f'p{p}_ms': round(1000 * percentile(ordered, p), 1) for p in PERCENTILES},
+                'max_ms': round(1000 * ordered[-1], 1) if ordered else 0.0,
+            }
+
+        rows = [row(name, ordered, failures.get(name, 0)) for name, ordered in series.items()]
+        rows.sort(key=lambda item: item['p95_ms'], reverse=True)
+        everything = sorted(value for ordered in series.values() for value in ordered)
+        rows.append(row('TOTAL', everything, sum(failures.values())))
+        return rows
+
+
+def format_report(rows):
+    columns = ['endpoint', 'requests', 'failures', 'rps', 'mean_ms', *[f'p{p}_ms' for p in PERCENTILES], 'max_ms']
+    widths = {column: max(len(column), *(len(str(row[column])) for row in rows)) for column in columns}
+    lines = ['  '.join(column.ljust(widths[column]) if column == 'endpoint' else column.rjust(widths[column])
+                       for column in columns)]
+    for row in rows:
+        lines.append('  '.join(
+            str(row[column]).ljust(widths[column]) if column == 'endpoint' else str(row[column]).rjust(widths[column])
+            for column in columns
+        ))
+    return '\n'.join(lines)
+
+
+class Client:
+    """A logged-in account; every request is timed into the recorder under `name`"""
+
+    def __init__(self, base_url, recorder, http=None):
+        self.base_url = base_url.rstrip('/')
+        self.recorder = recorder
+        self.http = http or requests.Session()
+
+    def request(self, method, path, name=None, expect=(200, 201), **kwargs):
+        started = time.perf_counter()
+        try:
+            response = self.http.request(method, self.base_url + path, timeout=REQUEST_TIMEOUT, **kwargs)
+        except requests.RequestException:
+            self.recorder.record(f'{method} {name or path}', time.perf_counter() - started, False)
+            return None
+        self.recorder.record(f'{method} {name or path}', time.perf_counter() - started, response.status_code in expect)
+        return response if response.status_code in expect else None
+
+    def get(self, path, name=None, **kwargs):
+        return self.request('GET', path, name, **kwargs)
+
+    def post(self, path, name=None, **kwargs):
+        return self.request('POST', path, name, **kwargs)
+
+    def delete(self, path, name=None, **kwargs):
+        return self.request('DELETE', path, name, **kwargs)
+
+    def login(self, email, password):
+        response = self.post('/api/user/login/', json={'email': email, 'password': password})
+        if response is None:
+            return False
+        self.http.headers['Authorization'] = f"Bearer {response.json()['tokens']['access']}"
+        return True
+
+
+# Journeys: (client, account from the roster, random generator)
+
+def student_dashboard(client, account, rng):
+    client.get('/api/student/dashboard/lessons/')
+    client.get('/api/user/profile/')
+    client.get('/api/live-sessions/notifications/unread-count/')
+
+
+def quiz_taking(client, account, rng):
+    lesson_id = rng.choice(account['lessons'])
+    response = client.get(f'/api/student/lessons/{lesson_id}/quizzes/', '/api/student/lessons/[id]/quizzes/')
+    quizzes = [quiz for quiz in (response.json() if response is not None else []) if quiz.get('questions')]
+    if not quizzes:
+        return
+    quiz = rng.choice(quizzes)
+    response = client.post(f"/api/student/quizzes/{quiz['id']}/attempt/", '/api/student/quizzes/[id]/attempt/')
+    if response is None:
+        return
+    answers = [
+        {'question_id': question['id'], 'answer_id': rng.choice(question['answers'])['id']}
+        for question in quiz['questions'] if question.get('answers')
+    ]
+    client.post(
+        f"/api/student/quiz-attempts/{response.json()['id']}/submit-answers/",
+        '/api/student/quiz-attempts/[id]/submit-answers/',
+        json={'answers': answers, 'complete': True}
+    )
+
+
+def schedule(client, account, rng):
+    client.get('/api/live-sessions/my-schedule/')
+    client.get('/api/live-sessions/calendar/')
+    client.get('/api/live-sessions/notifications/')
+
+
+def advisor_assignment(client, account, rng):
+    client.get('/api/user/advisor/students/')
+    if not account['sessions']:
+        return
+    session_id = rng.choice(account['sessions'])
+    client.get(f'/api/live-sessions/{session_id}/assigned-students/', '/api/live-sessions/[id]/assigned-students/')
+    student_ids = rng.sample(account['students'], min(5, len(account['students'])))
+    response = client.post(
+        f'/api/live-sessions/{session_id}/assign/', '/api/live-sessions/[id]/assign/',
+        json={'student_ids': student_ids}
+    )
+    assigned = [row['student_id'] for row in (response.json().get('results', []) if response is not None else [])
+                if row['status'] == 'assigned']
+    if assigned:
+        client.delete(
+            f'/api/live-sessions/{session_id}/unassign/', '/api/live-sessions/[id]/unassign/',
+            json={'student_ids': assigned}
+        )
+
+
+def teacher_analytics(client, account, rng):
+    client.get('/api/content/dashboard-stats/')
+    client.get('/api/content/lessons/')
+    if account['students']:
+        student_id = rng.choice(account['students'])
+        client.get(f'/api/user/students/{student_id}/quiz-answers/', '/api/user/students/[id]/quiz-answers/')
+
+
+@dataclass
+class Journey:
+    name: str
+    role: str  # roster attribute the account comes from
+    weight: int
+    play: object
+
+
+JOURNEYS = {
+    journey.name: journey for journey in (
+        Journey('student_dashboard', 'students', 4, student_dashboard),
+        Journey('quiz_taking', 'students', 2, quiz_taking),
+        Journey('schedule', 'students', 3, schedule),
+        Journey('advisor_assignment', 'advisors', 1, advisor_assignment),
+        Journey('teacher_analytics', 'teachers', 1, teacher_analytics),
+    )
+}
+
+
+def run(base_url, roster, password, users=10, duration=60, ramp_up=0, think=(0.5, 2.0),
+        journeys=None, seed=None, http_factory=None):
+    """
+    Play the journeys with `users` virtual users for `duration` seconds;
+    returns (summary rows, elapsed seconds). Users start evenly over
+    `ramp_up` seconds. http_factory builds each user's HTTP session.
+    """
+    chosen = [JOURNEYS[name] for name in (journeys or JOURNEYS)]
+    chosen = [journey for journey in chosen if getattr(roster, journey.role)]
+    if not chosen:
+        raise ValueError('No seeded accounts for the selected journeys; run seed_load_data first')
+    recorder = Recorder()
+    started = time.perf_counter()
+    deadline = started + duration
+
+    def virtual_user(number):
+        rng = random.Random(None if seed is None else seed + number)
+        time.sleep(ramp_up * number / users if users else 0)
+        clients = {}
+        while time.perf_counter() < deadline:
+            journey = rng.choices(chosen, weights=[journey.weight for journey in chosen])[0]
+            if journey.role not in clients:
+                # One account per role and user, logged in once like a real browser session
+                account = rng.choice(getattr(roster, journey.role))
+                client = Client(base_url, recorder, http_factory() if http_factory else None)
+                clients[journey.role] = (client, account) if client.login(account['email'], password) else None
+            if clients[journey.role] is None:
+                return
+            client, account = clients[journey.role]
+            journey.play(client, account, rng)
+            time.sleep(max(0.0, min(rng.uniform(*think), deadline - time.perf_counter())))
+
+    threads = [threading.Thread(target=virtual_user, args=(number,), daemon=True) for number in range(users)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    return recorder.summary(elapsed), elapsed
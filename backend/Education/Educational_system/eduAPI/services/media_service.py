@@ -0,0 +1,251 @@
+# backend/Education/Educational_system/eduAPI/services/media_service.py
+# Media file lookup and delivery
+#
+# Django decides whether a file may be served (it must resolve inside
+# MEDIA_ROOT) and then, depending on MEDIA_SERVE_MODE:
+#   - 'x-accel':    returns an empty response with X-Accel-Redirect so nginx
+#                   streams the bytes from an `internal` location
+#   - 'x-sendfile': same idea with X-Sendfile (Apache mod_xsendfile, lighttpd)
+#   - 'django':     streams the file itself, honouring single Range requests,
+#                   If-Range, If-None-Match and If-Modified-Since
+# The front server handles Range/ETag on its own in the first two modes.
+# Either way the caller checks can_access() first: the front server serves
+# whatever X-Accel-Redirect / X-Sendfile points at without asking again.
+#
+# Downloads are plain links and <video>/<iframe> sources, which send no
+# Authorization header. Content responses carry a short-lived download_token
+# (signed user id, see with_download_tokens) that the links append as ?token=.
+
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core import signing
+from django.db.models import Q
+from django.http import FileResponse, HttpResponse, HttpResponseNotModified, StreamingHttpResponse
+from django.utils.http import http_date, parse_http_date_safe
+
+from ..models.lessons_model import LessonContent
+from ..models.live_sessions_models import LiveSessionMaterial
+
+# Shown in the browser instead of downloaded
+INLINE_TYPES = {'application/pdf', 'image/jpeg', 'image/png', 'image/gif'}
+
+CHUNK_SIZE = 64 * 1024
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+DOWNLOAD_TOKEN_SALT = 'eduapi.media.download'
+
+# Upload directories whose files are recorded in an indexed FileField column
+UPLOAD_FIELDS = {
+    'lesson_files': (LessonContent, 'file'),
+    'live_session_materials': (LiveSessionMaterial, 'file'),
+}
+
+
+def media_root():
+    return os.path.realpath(settings.MEDIA_ROOT)
+
+
+def resolve_media_path(relative_path):
+    """Absolute path of an existing file inside MEDIA_ROOT, or None"""
+    root = media_root()
+    absolute_path = os.path.realpath(os.path.join(root, relative_path))
+    if os.path.commonpath([root, absolute_path]) != root:
+        return None
+    return absolute_path if os.path.isfile(absolute_path) else None
+
+
+def find_uploaded_file(directory, base_name, extension=''):
+    """
+    Find an upload whose stored name starts with base_name (Django appends a
+    random suffix on name clashes). Uses a prefix match on the indexed
+    FileField column instead of listing the directory.
+    """
+    target = UPLOAD_FIELDS.get(directory.strip('/'))
+    if target is None or not base_name:
+        return None
+
+    model, field = target
+    names = model.objects.filter(**{f'{field}__startswith': f'{directory.strip("/")}/{base_name}'})
+    if extension:
+        names = names.filter(**{f'{field}__endswith': extension})
+    for name in names.order_by('-id').values_list(field, flat=True)[:5]:
+        absolute_path = resolve_media_path(name)
+        if absolute_path:
+            return absolute_path
+    return None
+
+
+def download_token(user):
+    return signing.TimestampSigner(salt=DOWNLOAD_TOKEN_SALT).sign(str(user.pk))
+
+
+def with_download_tokens(contents, user):
+    """
+    Serialized lesson contents with the requesting user's download_token.
+    Added after any cache read: the token is per user, the cached contents are not.
+    """
+    token = download_token(user)
+    return [{**content, 'download_token': token} for content in contents]
+
+
+def download_user(request):
+    """The signed-in user, or the user a valid, unexpired ?token= was issued to"""
+    if request.user.is_authenticated:
+        return request.user
+    token = request.GET.get('token')
+    if not token:
+        return None
+    try:
+        user_id = signing.TimestampSigner(salt=DOWNLOAD_TOKEN_SALT).unsign(
+            token, max_age=settings.MEDIA_TOKEN_MAX_AGE
+        )
+    except signing.BadSignature:
+        return None
+    return get_user_model().objects.filter(pk=user_id, is_active=True).first()
+
+
+def can_access(user, absolute_path):
+    """
+    Whether user may download a file inside MEDIA_ROOT. Lesson files belong to
+    the lesson's teacher and its enrolled or assigned students, session
+    materials to the session's teacher, the uploader and assigned students;
+    advisors and admins see every upload. Other media (profile and cover
+    images) only needs a signed-in user.
+    """
+    relative_path = os.path.relpath(absolute_path, media_root()).replace(os.sep, '/')
+    directory = relative_path.split('/', 1)[0]
+    if directory not in UPLOAD_FIELDS:
+        return True
+    if user.is_admin or user.role == 'advisor':
+        return True
+
+    if directory == 'lesson_files':
+        return LessonContent.objects.filter(file=relative_path).filter(
+            Q(lesson__teacher=user)
+            | Q(lesson__enrollments__student=user)
+            | Q(lesson__assigned_to__student=user)
+        ).exists()
+    return LiveSessionMaterial.objects.filter(file=relative_path).filter(
+        Q(session__teacher=user) | Q(uploaded_by=user) | Q(session__assignments__student=user)
+    ).exists()
+
+
+def file_etag(stat):
+    return f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"'
+
+
+def _is_not_modified(request, etag, mtime):
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+    if if_none_match is not None:
+        tags = [tag.strip().removeprefix('W/') for tag in if_none_match.split(',')]
+        return '*' in tags or etag in tags
+    since = parse_http_date_safe(request.META.get('HTTP_IF_MODIFIED_SINCE', ''))
+    return since is not None and int(mtime) <= since
+
+
+def _range_is_current(request, etag, mtime):
+    """If-Range: only honour Range when the client's partial copy is still current"""
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if not if_range:
+        return True
+    if if_range.startswith('"'):
+        return if_range == etag
+    return parse_http_date_safe(if_range) == int(mtime)
+
+
+def parse_range(header, size):
+    """
+    Inclusive (start, end) for a single byte range, None to send the whole
+    file (no/multiple/malformed ranges), or False when it cannot be satisfied.
+    """
+    match = RANGE_RE.match(header.strip())
+    if not match:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+
+    if first:
+        start = int(first)
+        end = int(last) if last else size - 1
+        if start >= size:
+            return False
+        if end < start:
+            return None
+        return start, min(end, size - 1)
+
+    # Suffix range: the last N bytes
+    length = int(last)
+    if length == 0:
+        return False
+    return max(size - length, 0), size - 1
+
+
+def _read_range(path, start, length):
+    with open(path, 'rb') as f:
+        f.seek(start)
+        remaining = length
+        while remaining > 0:
+            chunk = f.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def _serve_in_process(request, absolute_path, content_type):
+    stat = os.stat(absolute_path)
+    etag = file_etag(stat)
+
+    if _is_not_modified(request, etag, stat.st_mtime):
+        response = HttpResponseNotModified()
+    else:
+        byte_range = None
+        range_header = request.META.get('HTTP_RANGE')
+        if range_header and _range_is_current(request, etag, stat.st_mtime):
+            byte_range = parse_range(range_header, stat.st_size)
+
+        if byte_range is False:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{stat.st_size}'
+        elif byte_range:
+            start, end = byte_range
+            length = end - start + 1
+            response = StreamingHttpResponse(
+                _read_range(absolute_path, start, length), status=206, content_type=content_type
+            )
+            response['Content-Length'] = str(length)
+            response['Content-Range'] = f'bytes {start}-{end}/{stat.st_size}'
+        else:
+            response = FileResponse(open(absolute_path, 'rb'), content_type=content_type)
+
+    response['Accept-Ranges'] = 'bytes'
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(stat.st_mtime)
+    return response
+
+
+def file_response(request, absolute_path, disposition=None):
+    """Response delivering absolute_path according to MEDIA_SERVE_MODE"""
+    content_type = mimetypes.guess_type(absolute_path)[0] or 'application/octet-stream'
+    if disposition is None:
+        disposition = 'inline' if content_type in INLINE_TYPES else 'attachment'
+
+    mode = getattr(settings, 'MEDIA_SERVE_MODE', 'django')
+    if mode == 'x-accel':
+        relative_path = os.path.relpath(absolute_path, media_root()).replace(os.sep, '/')
+        response = HttpResponse(content_type=content_type)
+        response['X-Accel-Redirect'] = f"{settings.MEDIA_ACCEL_PREFIX.rstrip('/')}/{quote(relative_path)}"
+    elif mode == 'x-sendfile':
+        response = HttpResponse(content_type=content_type)
+        response['X-Sendfile'] = absolute_path
+    else:
+        response = _serve_in_process(request, absolute_path, content_type)
+
+    response['Content-Disposition'] = f'{disposition}; filename="{os.path.basename(absolute_path)}"'
+    return response
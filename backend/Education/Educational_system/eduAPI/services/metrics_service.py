@@ -0,0 +1,187 @@
+# backend/Education/Educational_system/eduAPI/services/metrics_service.py
+# Request metrics collected by InstrumentationMiddleware
+#
+# Per endpoint (HTTP method + URL pattern, so /api/live-sessions/12/ and
+# /api/live-sessions/13/ share a series) the registry keeps request counts by
+# status, a latency histogram, SQL query count and time, repeated queries and
+# response bytes. render() prints them in the Prometheus text format.
+#
+# The numbers live in the memory of each worker process, like the default
+# Prometheus client: scrape every worker, or run one. Requests slower than
+# INSTRUMENTATION_SLOW_REQUEST_MS, or running one SQL statement at least
+# INSTRUMENTATION_REPEAT_THRESHOLD times (the N+1 pattern), are logged to the
+# 'eduAPI.performance' logger with their most repeated statements and kept in
+# a short in-memory list for the slow-requests endpoint.
+
+import logging
+import threading
+from collections import Counter, defaultdict, deque
+
+from django.conf import settings
+from django.utils import timezone
+
+logger = logging.getLogger('eduAPI.performance')
+
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+TOP_STATEMENTS = 5
+STATEMENT_LENGTH = 300
+
+_lock = threading.Lock()
+
+
+def slow_request_ms():
+    return getattr(settings, 'INSTRUMENTATION_SLOW_REQUEST_MS', 500)
+
+
+def repeat_threshold():
+    return getattr(settings, 'INSTRUMENTATION_REPEAT_THRESHOLD', 10)
+
+
+class EndpointStats:
+    def __init__(self):
+        self.statuses = Counter()
+        self.buckets = [0] * len(LATENCY_BUCKETS)
+        self.duration = 0.0
+        self.queries = 0
+        self.query_time = 0.0
+        self.repeated_queries = 0
+        self.n_plus_one = 0
+        self.response_bytes = 0
+
+    def snapshot(self):
+        return {**vars(self), 'statuses': dict(self.statuses), 'buckets': list(self.buckets)}
+
+
+class RequestProfile:
+    """What one request did; filled in by the middleware"""
+
+    def __init__(self):
+        self.statements = Counter()
+        self.query_time = 0.0
+
+    def record_query(self, sql, duration):
+        self.statements[sql] += 1
+        self.query_time += duration
+
+    @property
+    def queries(self):
+        return sum(self.statements.values())
+
+    @property
+    def repeated_queries(self):
+        """Executions of a statement beyond its first"""
+        return sum(count - 1 for count in self.statements.values() if count > 1)
+
+    def top_statements(self, limit=TOP_STATEMENTS):
+        return [
+            {'count': count, 'sql': sql[:STATEMENT_LENGTH]}
+            for sql, count in self.statements.most_common(limit)
+            if count > 1
+        ]
+
+
+_endpoints = defaultdict(EndpointStats)
+_slow_requests = deque(maxlen=getattr(settings, 'INSTRUMENTATION_SLOW_LOG_SIZE', 100))
+
+
+def record(method, route, status_code, duration, response_bytes, profile, path=''):
+    """Add one finished request to the registry; slow or N+1 requests are logged"""
+    n_plus_one = bool(profile.statements) and max(profile.statements.values()) >= repeat_threshold()
+    with _lock:
+        stats = _endpoints[(method, route)]
+        stats.statuses[status_code] += 1
+        for index, bound in enumerate(LATENCY_BUCKETS):
+            if duration <= bound:
+                stats.buckets[index] += 1
+        stats.duration += duration
+        stats.queries += profile.queries
+        stats.query_time += profile.query_time
+        stats.repeated_queries += profile.repeated_queries
+        stats.n_plus_one += n_plus_one
+        stats.response_bytes += response_bytes
+
+    if duration * 1000 < slow_request_ms() and not n_plus_one:
+        return
+    entry = {
+        'time': timezone.now().isoformat(),
+        'method': method,
+        'route': route,
+        'path': path,
+        'status': status_code,
+        'duration_ms': round(duration * 1000, 1),
+        'queries': profile.queries,
+        'query_time_ms': round(profile.query_time * 1000, 1),
+        'repeated_queries': profile.repeated_queries,
+        'n_plus_one': n_plus_one,
+        'response_bytes': response_bytes,
+        'top_statements': profile.top_statements()
+    }
+    with _lock:
+        _slow_requests.append(entry)
+    logger.warning(
+        "Slow request %s %s -> %s in %.1f ms, %d queries (%.1f ms, %d repeated)%s",
+        method, path or route, status_code, entry['duration_ms'], entry['queries'],
+        entry['query_time_ms'], entry['repeated_queries'],
+        ''.join(f"\n  {row['count']}x {row['sql']}" for row in entry['top_statements'])
+    )
+
+
+def slow_requests():
+    """Most recent slow requests, newest first"""
+    with _lock:
+        return list(reversed(_slow_requests))
+
+
+def reset():
+    with _lock:
+        _endpoints.clear()
+        _slow_requests.clear()
+
+
+def _escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(**labels):
+    return '{' + ','.join(f'{name}="{_escape_label(value)}"' for name, value in labels.items()) + '}'
+
+
+def render():
+    """All series in the Prometheus text exposition format"""
+    with _lock:
+        snapshot = [(key, stats.snapshot()) for key, stats in sorted(_endpoints.items())]
+
+    lines = []
+
+    def family(name, kind, help_text):
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {kind}')
+
+    family('eduapi_http_requests_total', 'counter', 'Requests by endpoint and status code')
+    for (method, route), stats in snapshot:
+        for status_code, count in sorted(stats['statuses'].items()):
+            lines.append(f'eduapi_http_requests_total{_labels(method=method, route=route, status=status_code)} {count}')
+
+    family('eduapi_http_request_duration_seconds', 'histogram', 'Request latency')
+    for (method, route), stats in snapshot:
+        total = sum(stats['statuses'].values())
+        for bound, count in zip(LATENCY_BUCKETS, stats['buckets']):
+            lines.append(f'eduapi_http_request_duration_seconds_bucket{_labels(method=method, route=route, le=bound)} {count}')
+        lines.append(f'eduapi_http_request_duration_seconds_bucket{_labels(method=method, route=route, le="+Inf")} {total}')
+        lines.append(f'eduapi_http_request_duration_seconds_sum{_labels(method=method, route=route)} {stats["duration"]:.6f}')
+        lines.append(f'eduapi_http_request_duration_seconds_count{_labels(method=method, route=route)} {total}')
+
+    for name, field, kind, help_text, fmt in (
+        ('eduapi_db_queries_total', 'queries', 'counter', 'SQL statements executed', '{}'),
+        ('eduapi_db_query_seconds_total', 'query_time', 'counter', 'Time spent in SQL statements', '{:.6f}'),
+        ('eduapi_db_repeated_queries_total', 'repeated_queries', 'counter',
+         'Executions of a statement already run in the same request', '{}'),
+        ('eduapi_n_plus_one_requests_total', 'n_plus_one', 'counter',
+         'Requests running one statement at least INSTRUMENTATION_REPEAT_THRESHOLD times', '{}'),
+        ('eduapi_http_response_bytes_total', 'response_bytes', 'counter', 'Response body bytes', '{}'),
+    ):
+        family(name, kind, help_text)
+        for (method, route), stats in snapshot:
+            lines.append(f'{name}{_labels(method=method, route=route)} {fmt.format(stats[field])}')
+
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,183 @@
+# backend/Education/Educational_system/eduAPI/services/notification_service.py
+# Live-session notifications: fan-out, unread counters and the inbox
+#
+# An event (a session assigned, starting soon or cancelled) becomes one
+# LiveSessionNotification per recipient, written with bulk_create in batches,
+# so notifying a 500-student session costs a couple of INSERTs instead of 500.
+# NotificationCounter keeps each user's number of unread notifications so the
+# badge is a primary-key read rather than a COUNT over the inbox. Counters move
+# with the writes below (fan_out, mark_read, forget_session); recount()
+# rebuilds them from the notifications table.
+
+from collections import Counter, defaultdict
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Count, Exists, F, OuterRef
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from ..models.live_sessions_models import (
+    LiveSession,
+    LiveSessionAssignment,
+    LiveSessionNotification,
+    NotificationCounter
+)
+
+BATCH_SIZE = 500
+
+# Reminders go out for sessions starting within this window
+REMINDER_LEAD = timedelta(minutes=60)
+
+MESSAGES = {
+    'SESSION_ASSIGNED': (
+        'New session: {title}',
+        'You have been assigned to "{title}" on {when}.'
+    ),
+    'SESSION_REMINDER': (
+        'Starting soon: {title}',
+        '"{title}" starts at {when}.'
+    ),
+    'SESSION_CANCELLED': (
+        'Session cancelled: {title}',
+        '"{title}" scheduled for {when} has been cancelled.'
+    ),
+}
+
+
+def _render(notification_type, session):
+    title, message = MESSAGES[notification_type]
+    when = timezone.localtime(session.scheduled_datetime).strftime('%Y-%m-%d %H:%M')
+    values = {'title': session.title, 'when': when}
+    return title.format(**values)[:255], message.format(**values)
+
+
+def _add_unread(per_user):
+    """Apply {user_id: delta}; users sharing a delta are updated with one statement"""
+    per_user = {user_id: delta for user_id, delta in per_user.items() if delta}
+    if not per_user:
+        return
+    NotificationCounter.objects.bulk_create(
+        [NotificationCounter(user_id=user_id) for user_id in per_user],
+        batch_size=BATCH_SIZE,
+        ignore_conflicts=True
+    )
+    users_by_delta = defaultdict(list)
+    for user_id, delta in per_user.items():
+        users_by_delta[delta].append(user_id)
+    for delta, user_ids in users_by_delta.items():
+        NotificationCounter.objects.filter(user_id__in=user_ids).update(
+            unread=Greatest(F('unread') + delta, 0)
+        )
+
+
+def fan_out(notification_type, events):
+    """
+    Notify every recipient of every event.
+    events: iterable of (session, recipient ids). Returns the number of notifications created.
+    """
+    notifications = []
+    for session, recipient_ids in events:
+        title, message = _render(notification_type, session)
+        notifications.extend(
+            LiveSessionNotification(
+                recipient_id=recipient_id,
+                notification_type=notification_type,
+                title=title,
+                message=message,
+                session=session
+            )
+            for recipient_id in set(recipient_ids)
+        )
+    if not notifications:
+        return 0
+
+    LiveSessionNotification.objects.bulk_create(notifications, batch_size=BATCH_SIZE)
+    _add_unread(Counter(notification.recipient_id for notification in notifications))
+    return len(notifications)
+
+
+def notify_assigned(session, student_ids):
+    return fan_out('SESSION_ASSIGNED', [(session, student_ids)])
+
+
+def notify_cancelled(session):
+    """Tell the students assigned to a session that it will not take place"""
+    student_ids = LiveSessionAssignment.objects.filter(session=session).values_list('student_id', flat=True)
+    return fan_out('SESSION_CANCELLED', [(session, list(student_ids))])
+
+
+def send_reminders(now=None, lead=REMINDER_LEAD):
+    """
+    Remind students and teachers of the sessions starting within `lead`.
+    Sessions that already got a reminder are skipped, so this can run as often
+    as wanted. Returns the number of notifications created.
+    """
+    now = now or timezone.now()
+    already_reminded = LiveSessionNotification.objects.filter(
+        session=OuterRef('pk'), notification_type='SESSION_REMINDER'
+    )
+    sessions = list(
+        LiveSession.objects.filter(
+            status='ASSIGNED',
+            scheduled_datetime__gt=now,
+            scheduled_datetime__lte=now + lead
+        ).exclude(Exists(already_reminded)).only('id', 'title', 'teacher_id', 'scheduled_datetime')
+    )
+    if not sessions:
+        return 0
+
+    recipients = {session.id: [session.teacher_id] for session in sessions}
+    for session_id, student_id in LiveSessionAssignment.objects.filter(
+        session_id__in=list(recipients)
+    ).values_list('session_id', 'student_id'):
+        recipients[session_id].append(student_id)
+    return fan_out('SESSION_REMINDER', [(session, recipients[session.id]) for session in sessions])
+
+
+def forget_session(session_id):
+    """Take a session's unread notifications off the counters before they are deleted with it"""
+    unread = (
+        LiveSessionNotification.objects.filter(session_id=session_id, is_read=False)
+        .values('recipient_id').annotate(count=Count('id'))
+    )
+    _add_unread({row['recipient_id']: -row['count'] for row in unread})
+
+
+def unread_count(user):
+    return NotificationCounter.objects.filter(user=user).values_list('unread', flat=True).first() or 0
+
+
+def inbox(user, unread_only=False):
+    """The user's notifications; order and paginate with NotificationKeysetPagination"""
+    notifications = LiveSessionNotification.objects.filter(recipient=user).select_related('session')
+    if unread_only:
+        notifications = notifications.filter(is_read=False)
+    return notifications
+
+
+def mark_read(user, notification_ids=None):
+    """
+    Mark the given notifications (all of them when None) as read with one UPDATE.
+    Returns how many changed; the counter drops by exactly that much.
+    """
+    notifications = LiveSessionNotification.objects.filter(recipient=user, is_read=False)
+    if notification_ids is not None:
+        notifications = notifications.filter(id__in=notification_ids)
+    updated = notifications.update(is_read=True, read_at=timezone.now())
+    _add_unread({user.id: -updated})
+    return updated
+
+
+@transaction.atomic
+def recount(user_ids=None):
+    """Rebuild unread counters from the notifications table"""
+    counters = NotificationCounter.objects.all()
+    unread = LiveSessionNotification.objects.filter(is_read=False)
+    if user_ids is not None:
+        counters = counters.filter(user_id__in=user_ids)
+        unread = unread.filter(recipient_id__in=user_ids)
+    counts = dict(unread.values('recipient_id').annotate(count=Count('id')).values_list('recipient_id', 'count'))
+    counters.update(unread=0)
+    _add_unread(counts)
+    return counts
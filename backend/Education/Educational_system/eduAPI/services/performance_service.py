@@ -0,0 +1,164 @@
+# backend/Education/Educational_system/eduAPI/services/performance_service.py
+# Materialized student performance
+#
+# Overview pages used to walk every enrollment and attempt of every student
+# on each request. StudentLessonStats keeps one row per (student, lesson) and
+# StudentStats one row per student. A write to an attempt or an enrollment
+# re-aggregates only the affected (student, lesson) pair and then the
+# student's row, which reads that student's lesson rows and not their attempts.
+# rebuild_all() recomputes everything with grouped queries.
+
+from django.db import transaction
+from django.db.models import Avg, Count, Exists, Max, OuterRef, Q, Sum
+
+from ..models.lessons_model import QuizAttempt, StudentEnrollment
+from ..models.performance_models import StudentLessonStats, StudentStats
+
+BATCH_SIZE = 1000
+
+
+def _latest(*values):
+    values = [value for value in values if value is not None]
+    return max(values) if values else None
+
+
+def refresh_lesson_stats(student_id, lesson_id):
+    """Recompute one (student, lesson) row; removes it when nothing is left"""
+    totals = QuizAttempt.objects.filter(
+        student_id=student_id, quiz__lesson_id=lesson_id, end_time__isnull=False
+    ).aggregate(
+        attempts=Count('id'),
+        passed_attempts=Count('id', filter=Q(passed=True)),
+        best_score=Max('score'),
+        last_attempt=Max('end_time')
+    )
+    enrollment = StudentEnrollment.objects.filter(
+        student_id=student_id, lesson_id=lesson_id
+    ).values('progress', 'last_activity_date').first()
+
+    if enrollment is None and not totals['attempts']:
+        StudentLessonStats.objects.filter(student_id=student_id, lesson_id=lesson_id).delete()
+        return None
+
+    stats, _ = StudentLessonStats.objects.update_or_create(
+        student_id=student_id,
+        lesson_id=lesson_id,
+        defaults={
+            'enrolled': enrollment is not None,
+            'progress': enrollment['progress'] if enrollment else 0,
+            'attempts': totals['attempts'],
+            'passed_attempts': totals['passed_attempts'],
+            'best_score': totals['best_score'],
+            'last_activity': _latest(totals['last_attempt'], enrollment and enrollment['last_activity_date'])
+        }
+    )
+    return stats
+
+
+def _student_totals(queryset):
+    return queryset.annotate(
+        lesson_count=Count('id', filter=Q(enrolled=True)),
+        avg_progress=Avg('progress', filter=Q(enrolled=True)),
+        attempt_count=Sum('attempts'),
+        passed_count=Sum('passed_attempts'),
+        best=Max('best_score'),
+        last=Max('last_activity')
+    )
+
+
+def _student_defaults(row):
+    return {
+        'lessons': row['lesson_count'],
+        'average_progress': round(row['avg_progress'] or 0),
+        'attempts': row['attempt_count'] or 0,
+        'passed_attempts': row['passed_count'] or 0,
+        'best_score': row['best'],
+        'last_activity': row['last']
+    }
+
+
+def refresh_student_stats(student_id):
+    """Recompute a student's summary row from their lesson rows"""
+    row = _student_totals(
+        StudentLessonStats.objects.filter(student_id=student_id).values('student_id')
+    ).order_by('student_id').first()
+    if row is None:
+        StudentStats.objects.filter(student_id=student_id).delete()
+        return None
+    stats, _ = StudentStats.objects.update_or_create(student_id=student_id, defaults=_student_defaults(row))
+    return stats
+
+
+def refresh(student_id, lesson_id):
+    """Bring both tables up to date after a change for this student and lesson"""
+    if student_id is None or lesson_id is None:
+        return
+    refresh_lesson_stats(student_id, lesson_id)
+    refresh_student_stats(student_id)
+
+
+def fill_missing_for_teacher(teacher_id):
+    """Create rows for the teacher's enrollments that have none yet, e.g. on a
+    database that predates the stats tables; returns how many were filled"""
+    missing = list(
+        StudentEnrollment.objects
+        .filter(lesson__teacher_id=teacher_id)
+        .exclude(Exists(StudentLessonStats.objects.filter(
+            student_id=OuterRef('student_id'), lesson_id=OuterRef('lesson_id')
+        )))
+        .values_list('student_id', 'lesson_id')
+    )
+    for student_id, lesson_id in missing:
+        refresh_lesson_stats(student_id, lesson_id)
+    for student_id in {student_id for student_id, _ in missing}:
+        refresh_student_stats(student_id)
+    return len(missing)
+
+
+def rebuild_all():
+    """Recompute every row in bulk; returns (lesson rows, student rows)"""
+    rows = {}
+
+    def row(student_id, lesson_id):
+        key = (student_id, lesson_id)
+        if key not in rows:
+            rows[key] = StudentLessonStats(student_id=student_id, lesson_id=lesson_id)
+        return rows[key]
+
+    attempts = (
+        QuizAttempt.objects
+        .filter(end_time__isnull=False)
+        .values('student_id', 'quiz__lesson_id')
+        .annotate(
+            attempt_count=Count('id'),
+            passed_count=Count('id', filter=Q(passed=True)),
+            best=Max('score'),
+            last=Max('end_time')
+        )
+    )
+    for totals in attempts.iterator():
+        stats = row(totals['student_id'], totals['quiz__lesson_id'])
+        stats.attempts = totals['attempt_count']
+        stats.passed_attempts = totals['passed_count']
+        stats.best_score = totals['best']
+        stats.last_activity = totals['last']
+
+    enrollments = StudentEnrollment.objects.values_list('student_id', 'lesson_id', 'progress', 'last_activity_date')
+    for student_id, lesson_id, progress, last_activity in enrollments.iterator():
+        stats = row(student_id, lesson_id)
+        stats.enrolled = True
+        stats.progress = progress
+        stats.last_activity = _latest(stats.last_activity, last_activity)
+
+    with transaction.atomic():
+        StudentLessonStats.objects.all().delete()
+        StudentLessonStats.objects.bulk_create(rows.values(), batch_size=BATCH_SIZE)
+
+        StudentStats.objects.all().delete()
+        students = [
+            StudentStats(student_id=totals['student_id'], **_student_defaults(totals))
+            for totals in _student_totals(StudentLessonStats.objects.values('student_id')).iterator()
+        ]
+        StudentStats.objects.bulk_create(students, batch_size=BATCH_SIZE)
+
+    return len(rows), len(students)
@@ -0,0 +1,158 @@
+# backend/Education/Educational_system/eduAPI/services/quiz_service.py
+# Quiz submission and scoring
+#
+# A whole quiz is submitted in one request: every (question, answer) pair is
+# validated with one query, written with one upsert on (attempt, question),
+# scored with one aggregate, and lesson progress is recomputed with one
+# grouped query instead of an exists() per quiz.
+
+from django.db import connections
+from django.db.models import Count, FilteredRelation, Prefetch, Q
+from django.utils import timezone
+
+from ..models.lessons_model import Lesson, Quiz, Question, Answer, QuizAttempt, QuizAnswer, StudentEnrollment
+from . import performance_service, stats_service
+
+PASS_THRESHOLD = 70  # percent
+
+
+class QuizSubmissionError(Exception):
+    """Invalid submission; message is returned as the detail"""
+
+
+class QuizService:
+    @staticmethod
+    def submit_answers(attempt, answers):
+        """
+        Save a list of {'question_id', 'answer_id'} pairs for an attempt.
+        A question answered twice keeps the last answer. Returns the number saved.
+        """
+        if attempt.end_time:
+            raise QuizSubmissionError("Quiz attempt is already completed")
+        if not isinstance(answers, list) or not answers:
+            raise QuizSubmissionError("answers must be a non-empty list")
+
+        selected = {}
+        try:
+            for item in answers:
+                selected[int(item['question_id'])] = int(item['answer_id'])
+        except (KeyError, TypeError, ValueError):
+            raise QuizSubmissionError("Each answer needs a question_id and an answer_id")
+
+        # One query: the answers, restricted to this quiz's questions
+        valid = {
+            answer_id: (question_id, is_correct)
+            for answer_id, question_id, is_correct in Answer.objects.filter(
+                id__in=selected.values(), question__quiz_id=attempt.quiz_id
+            ).values_list('id', 'question_id', 'is_correct')
+        }
+        invalid = [
+            question_id for question_id, answer_id in selected.items()
+            if valid.get(answer_id, (None,))[0] != question_id
+        ]
+        if invalid:
+            raise QuizSubmissionError(f"Answers do not belong to questions {sorted(invalid)} of this quiz")
+
+        upsert = {'update_conflicts': True, 'update_fields': ['selected_answer', 'is_correct']}
+        # PostgreSQL and SQLite need the conflict target; MySQL's ON DUPLICATE KEY
+        # UPDATE takes none and Django refuses unique_fields there
+        if connections[QuizAnswer.objects.db].features.supports_update_conflicts_with_target:
+            upsert['unique_fields'] = ['attempt', 'question']
+        QuizAnswer.objects.bulk_create(
+            [
+                QuizAnswer(
+                    attempt=attempt,
+                    question_id=question_id,
+                    selected_answer_id=answer_id,
+                    is_correct=valid[answer_id][1]
+                )
+                for question_id, answer_id in selected.items()
+            ],
+            **upsert
+        )
+        return len(selected)
+
+    @staticmethod
+    def score_attempt(attempt):
+        """Percentage of the quiz's questions answered correctly, in one query"""
+        totals = (
+            Question.objects
+            .filter(quiz_id=attempt.quiz_id)
+            .annotate(answer=FilteredRelation('quizanswer', condition=Q(quizanswer__attempt=attempt)))
+            .aggregate(
+                total=Count('id'),
+                correct=Count('answer', filter=Q(answer__is_correct=True))
+            )
+        )
+        if not totals['total']:
+            return 0
+        return int(totals['correct'] * 100 / totals['total'])
+
+    @staticmethod
+    def complete_attempt(attempt):
+        """
+        Score and close an attempt, then raise lesson progress.
+        Only the request that actually closes the attempt updates progress.
+        """
+        if attempt.end_time:
+            return attempt
+
+        score = QuizService.score_attempt(attempt)
+        end_time = timezone.now()
+        closed = QuizAttempt.objects.filter(id=attempt.id, end_time__isnull=True).update(
+            score=score, passed=score >= PASS_THRESHOLD, end_time=end_time
+        )
+        if not closed:
+            attempt.refresh_from_db()
+            return attempt
+
+        attempt.score = score
+        attempt.passed = score >= PASS_THRESHOLD
+        attempt.end_time = end_time
+        QuizService.update_lesson_progress(attempt.student_id, attempt.quiz.lesson_id)
+        # The queryset updates above send no signals
+        performance_service.refresh(attempt.student_id, attempt.quiz.lesson_id)
+        teacher_id = Lesson.objects.filter(id=attempt.quiz.lesson_id).values_list('teacher_id', flat=True).first()
+        if teacher_id is not None:
+            stats_service.bump('completed_attempts', teacher_id)
+        return attempt
+
+    @staticmethod
+    def update_lesson_progress(student_id, lesson_id):
+        """Progress is the share of the lesson's quizzes the student has passed"""
+        totals = (
+            Quiz.objects
+            .filter(lesson_id=lesson_id)
+            .annotate(passed_attempt=FilteredRelation('attempts', condition=Q(
+                attempts__student_id=student_id,
+                attempts__passed=True,
+                attempts__end_time__isnull=False
+            )))
+            .aggregate(
+                total=Count('id', distinct=True),
+                passed=Count('passed_attempt__quiz', distinct=True)
+            )
+        )
+        if not totals['total']:
+            return None
+
+        progress = min(100, round(totals['passed'] * 100 / totals['total']))
+        # Progress only ever goes up; the filter makes concurrent completions safe
+        StudentEnrollment.objects.filter(
+            student_id=student_id, lesson_id=lesson_id, progress__lt=progress
+        ).update(progress=progress, last_activity_date=timezone.now())
+        return progress
+
+    @staticmethod
+    def get_attempt_with_answers(attempt_id, student):
+        """Attempt with everything QuizAttemptSerializer reads, in a fixed number of queries"""
+        return (
+            QuizAttempt.objects
+            .select_related('quiz', 'student')
+            .prefetch_related(Prefetch(
+                'quiz_answers',
+                queryset=QuizAnswer.objects.select_related('question', 'selected_answer')
+            ))
+            .filter(pk=attempt_id, student=student)
+            .first()
+        )
@@ -0,0 +1,112 @@
+# backend/Education/Educational_system/eduAPI/services/recurrence.py
+# Recurrence rules for session templates
+#
+# Every template is anchored on its first occurrence: the first date on or after
+# start_date that falls on day_of_week. From there:
+#   - WEEKLY:   anchor + 7 * k days
+#   - BIWEEKLY: anchor + 14 * k days
+#   - MONTHLY:  the same ordinal weekday every calendar month as the anchor
+#               (e.g. "2nd Tuesday"); an anchor in the 5th week means "last <day>"
+# Occurrences never go past end_date.
+
+import calendar
+from datetime import date, timedelta
+
+PERIOD_DAYS = {
+    'WEEKLY': 7,
+    'BIWEEKLY': 14,
+}
+
+# Smallest gap allowed between two generated sessions of the same template.
+# Guards against a manually generated session followed by a scheduled one.
+MIN_GAP_DAYS = {
+    'WEEKLY': 7,
+    'BIWEEKLY': 14,
+    'MONTHLY': 28,
+}
+
+LAST = -1
+
+
+def first_occurrence(template):
+    """First date on or after start_date that falls on the template's weekday"""
+    days_ahead = (template.day_of_week - template.start_date.weekday()) % 7
+    return template.start_date + timedelta(days=days_ahead)
+
+
+def _month_ordinal(day):
+    """1..4 for the n-th weekday of the month, LAST for a 5th-week date"""
+    ordinal = (day.day - 1) // 7 + 1
+    return LAST if ordinal == 5 else ordinal
+
+
+def _nth_weekday(year, month, weekday, ordinal):
+    days_in_month = calendar.monthrange(year, month)[1]
+    if ordinal == LAST:
+        last_day = date(year, month, days_in_month)
+        return last_day - timedelta(days=(last_day.weekday() - weekday) % 7)
+    first_day = date(year, month, 1)
+    return first_day + timedelta(days=(weekday - first_day.weekday()) % 7 + 7 * (ordinal - 1))
+
+
+def _add_months(year, month, count):
+    month_index = year * 12 + (month - 1) + count
+    return month_index // 12, month_index % 12 + 1
+
+
+def occurrences(template, start, end):
+    """All occurrence dates of the template in [start, end], in order"""
+    anchor = first_occurrence(template)
+    if template.end_date and template.end_date < end:
+        end = template.end_date
+    start = max(start, anchor)
+    if start > end:
+        return []
+
+    if template.recurrence_type == 'MONTHLY':
+        ordinal = _month_ordinal(anchor)
+        dates = []
+        year, month = start.year, start.month
+        while date(year, month, 1) <= end:
+            day = _nth_weekday(year, month, template.day_of_week, ordinal)
+            if start <= day <= end:
+                dates.append(day)
+            year, month = _add_months(year, month, 1)
+        return dates
+
+    period = PERIOD_DAYS.get(template.recurrence_type)
+    if period is None:
+        return []
+    # Jump straight to the first occurrence inside the window
+    steps = -(-(start - anchor).days // period)
+    day = anchor + timedelta(days=steps * period)
+    dates = []
+    while day <= end:
+        dates.append(day)
+        day += timedelta(days=period)
+    return dates
+
+
+def is_occurrence(template, day):
+    return occurrences(template, day, day) == [day]
+
+
+def next_occurrence(template, on_or_after):
+    """Next occurrence on or after the given date, or None once the template has ended"""
+    # Two months always contain an occurrence for every supported rule
+    window_end = on_or_after + timedelta(days=62)
+    dates = occurrences(template, on_or_after, window_end)
+    return dates[0] if dates else None
+
+
+def respects_spacing(template, day, last_generated=None):
+    """
+    False when day is too close to the last generated session.
+    Dates before last_generated are allowed as long as they are far enough
+    away, so a missing earlier occurrence can still be backfilled.
+    """
+    last_generated = last_generated if last_generated is not None else template.last_generated
+    if not last_generated:
+        return True
+    gap = abs((day - last_generated).days)
+    return gap == 0 or gap >= MIN_GAP_DAYS.get(template.recurrence_type, 0)
@@ -0,0 +1,86 @@
+# backend/Education/Educational_system/eduAPI/services/schedule_conflicts.py
+# Teacher scheduling-conflict detection
+#
+# Two sessions of a teacher overlap when each starts before the other ends.
+# LiveSession stores end_datetime next to scheduled_datetime and both are
+# indexed with the teacher, so the existing sessions that can clash with a set
+# of proposed slots are fetched with one range query per call: per teacher,
+# the sessions starting before the latest proposed end and ending after the
+# earliest proposed start. Exact slot-by-slot matching happens in memory.
+
+from bisect import bisect_left
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db.models import Q
+
+from ..models.live_sessions_models import LiveSession
+
+# Sessions in these states occupy the teacher's time
+BLOCKING_STATUSES = ('PENDING', 'ASSIGNED', 'ACTIVE')
+
+CONFLICT_MESSAGE = "You have another session scheduled at this time"
+
+
+class Slot:
+    """A proposed session: teacher, start and duration"""
+
+    def __init__(self, teacher_id, start, duration_minutes):
+        self.teacher_id = teacher_id
+        self.start = start
+        self.end = start + timedelta(minutes=int(duration_minutes))
+
+    def overlaps(self, start, end):
+        return self.start < end and start < self.end
+
+    def __repr__(self):
+        return f"Slot(teacher={self.teacher_id}, {self.start:%Y-%m-%d %H:%M}-{self.end:%H:%M})"
+
+
+def find_conflicts(slots, exclude_ids=()):
+    """
+    Existing sessions overlapping each proposed slot, in a single query.
+    Returns {slot index: [LiveSession, ...]} for the slots that clash;
+    sessions whose id is in exclude_ids (e.g. the one being edited) are ignored.
+    """
+    slots = list(slots)
+    if not slots:
+        return {}
+
+    windows = {}
+    for slot in slots:
+        earliest, latest = windows.get(slot.teacher_id, (slot.start, slot.end))
+        windows[slot.teacher_id] = (min(earliest, slot.start), max(latest, slot.end))
+    candidates = Q()
+    for teacher_id, (earliest, latest) in windows.items():
+        candidates |= Q(teacher_id=teacher_id, scheduled_datetime__lt=latest, end_datetime__gt=earliest)
+
+    sessions = defaultdict(list)
+    queryset = (
+        LiveSession.objects
+        .filter(candidates, status__in=BLOCKING_STATUSES)
+        .exclude(id__in=list(exclude_ids))
+        .only('id', 'title', 'teacher_id', 'scheduled_datetime', 'end_datetime')
+        .order_by('scheduled_datetime')
+    )
+    for session in queryset:
+        sessions[session.teacher_id].append(session)
+
+    conflicts = {}
+    for index, slot in enumerate(slots):
+        teacher_sessions = sessions.get(slot.teacher_id, [])
+        # Only sessions starting before the slot ends can overlap it
+        starts = [session.scheduled_datetime for session in teacher_sessions]
+        clashing = [
+            session for session in teacher_sessions[:bisect_left(starts, slot.end)]
+            if session.end_datetime > slot.start
+        ]
+        if clashing:
+            conflicts[index] = clashing
+    return conflicts
+
+
+def has_conflict(teacher_id, start, duration_minutes, exclude_id=None):
+    """Whether a single proposed session clashes with the teacher's schedule"""
+    exclude_ids = [exclude_id] if exclude_id is not None else []
+    return bool(find_conflicts([Slot(teacher_id, start, duration_minutes)], exclude_ids))
@@ -0,0 +1,256 @@
+# backend/Education/Educational_system/eduAPI/services/schedule_service.py
+# Materialized per-user schedules and the iCalendar feed
+#
+# ScheduleEntry holds one row per (user, session) for every session a user
+# sees on their calendar: the teacher of the session and each assigned
+# student. The rows carry what a calendar shows (title, times, teacher name),
+# so a calendar window is one indexed range scan on (user, start) with no
+# joins through assignments.
+#
+# refresh_sessions() recomputes the rows of some sessions and writes only the
+# difference. Model signals call it for single saves and deletes (see
+# eduAPI/signals/schedule_signals.py); bulk_create(), update() and raw deletes
+# send no signals, so code using them must call it itself.
+#
+# Every change bumps the revision of the affected users' UserSchedule row.
+# The revision is the ETag of their calendar, so a client polling with
+# If-None-Match costs one primary-key read until something really changes.
+
+import secrets
+from datetime import timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from ..models.live_sessions_models import LiveSession, LiveSessionAssignment, ScheduleEntry, UserSchedule
+from . import cache_service
+
+# Sessions in these states appear on calendars
+VISIBLE_STATUSES = ('ASSIGNED', 'ACTIVE', 'COMPLETED')
+
+# The iCalendar feed covers this much history and everything after it
+FEED_PAST_DAYS = 30
+
+# Largest window the JSON calendar returns in one response
+MAX_WINDOW_DAYS = 120
+
+BATCH_SIZE = 500
+
+# Denormalized fields compared when refreshing
+ENTRY_FIELDS = ('role', 'title', 'subject', 'level', 'status', 'start', 'end', 'teacher_name')
+
+
+def _desired_entries(session_ids, user_ids=None):
+    """{(user_id, session_id): ScheduleEntry} the given sessions should have (for user_ids only, if given)"""
+    sessions = list(
+        LiveSession.objects.filter(id__in=session_ids, status__in=VISIBLE_STATUSES)
+        .select_related('teacher')
+        .only('id', 'title', 'subject', 'level', 'status', 'scheduled_datetime', 'duration_minutes', 'end_datetime',
+              'teacher__id', 'teacher__first_name', 'teacher__last_name')
+    )
+    by_id = {session.id: session for session in sessions}
+
+    def entry(user_id, session, role):
+        return ScheduleEntry(
+            user_id=user_id,
+            session_id=session.id,
+            role=role,
+            title=session.title,
+            subject=session.subject,
+            level=session.level,
+            status=session.status,
+            start=session.scheduled_datetime,
+            # Rows not yet backfilled (backfill_session_end_times) have no end_datetime
+            end=session.end_datetime or session.scheduled_datetime + timedelta(minutes=session.duration_minutes),
+            teacher_name=session.teacher.get_full_name()
+        )
+
+    desired = {
+        (session.teacher_id, session.id): entry(session.teacher_id, session, 'teacher')
+        for session in sessions
+        if user_ids is None or session.teacher_id in user_ids
+    }
+    assignments = LiveSessionAssignment.objects.filter(session_id__in=list(by_id))
+    if user_ids is not None:
+        assignments = assignments.filter(student_id__in=user_ids)
+    for session_id, student_id in assignments.values_list('session_id', 'student_id'):
+        desired.setdefault((student_id, session_id), entry(student_id, by_id[session_id], 'student'))
+    return desired
+
+
+@transaction.atomic
+def refresh_sessions(session_ids, user_ids=None):
+    """
+    Bring the schedule rows of these sessions up to date, only for user_ids if
+    given (e.g. the students just assigned). Returns the ids of users whose
+    calendar changed.
+    """
+    session_ids = list(set(session_ids))
+    if not session_ids:
+        return set()
+    if user_ids is not None:
+        user_ids = set(user_ids)
+
+    desired = _desired_entries(session_ids, user_ids)
+    existing_rows = ScheduleEntry.objects.filter(session_id__in=session_ids)
+    if user_ids is not None:
+        existing_rows = existing_rows.filter(user_id__in=user_ids)
+    existing = {(entry.user_id, entry.session_id): entry for entry in existing_rows}
+
+    stale = [entry for key, entry in existing.items() if key not in desired]
+    new = [entry for key, entry in desired.items() if key not in existing]
+    changed = []
+    for key, entry in desired.items():
+        current = existing.get(key)
+        if current and any(getattr(current, field) != getattr(entry, field) for field in ENTRY_FIELDS):
+            for field in ENTRY_FIELDS:
+                setattr(current, field, getattr(entry, field))
+            changed.append(current)
+
+    if stale:
+        ScheduleEntry.objects.filter(id__in=[entry.id for entry in stale]).delete()
+    ScheduleEntry.objects.bulk_create(new, batch_size=BATCH_SIZE, ignore_conflicts=True)
+    ScheduleEntry.objects.bulk_update(changed, ENTRY_FIELDS, batch_size=BATCH_SIZE)
+
+    affected = {entry.user_id for entry in stale + new + changed}
+    bump_revisions(affected)
+    return affected
+
+
+def forget_session(session_id):
+    """Bump the calendars of a session's users before its rows are deleted with it"""
+    bump_revisions(ScheduleEntry.objects.filter(session_id=session_id).values_list('user_id', flat=True))
+
+
+def bump_revisions(user_ids):
+    user_ids = list(set(user_ids))
+    if not user_ids:
+        return
+    _ensure_schedules(user_ids)
+    UserSchedule.objects.filter(user_id__in=user_ids).update(revision=F('revision') + 1, updated_at=timezone.now())
+
+
+def _ensure_schedules(user_ids):
+    UserSchedule.objects.bulk_create(
+        [UserSchedule(user_id=user_id, feed_token=secrets.token_urlsafe(24)) for user_id in user_ids],
+        batch_size=BATCH_SIZE,
+        ignore_conflicts=True
+    )
+
+
+def get_schedule(user):
+    """The user's UserSchedule (revision and feed token), created on first use"""
+    schedule = UserSchedule.objects.filter(user=user).first()
+    if schedule is None:
+        _ensure_schedules([user.id])
+        schedule = UserSchedule.objects.get(user=user)
+    return schedule
+
+
+def rotate_feed_token(user):
+    schedule = get_schedule(user)
+    schedule.feed_token = secrets.token_urlsafe(24)
+    schedule.save(update_fields=['feed_token', 'updated_at'])
+    return schedule
+
+
+def etag(schedule, *parts):
+    return '"' + '-'.join(str(part) for part in [schedule.user_id, schedule.revision, *parts]) + '"'
+
+
+def window(user, start, end):
+    """Calendar rows of a user overlapping [start, end), earliest first"""
+    return ScheduleEntry.objects.filter(user=user, start__lt=end, end__gt=start).order_by('start', 'session_id')
+
+
+def entry_data(entry):
+    return {
+        'session_id': entry.session_id,
+        'role': entry.role,
+        'title': entry.title,
+        'subject': entry.subject,
+        'level': entry.level,
+        'status': entry.status,
+        'start': entry.start.isoformat(),
+        'end': entry.end.isoformat(),
+        'teacher_name': entry.teacher_name
+    }
+
+
+# iCalendar (RFC 5545)
+
+def _escape(text):
+    return (
+        str(text).replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,')
+        .replace('\r\n', '\\n').replace('\n', '\\n')
+    )
+
+
+def _fold(line):
+    """Split content lines longer than 75 octets, continuing with a space"""
+    encoded = line.encode('utf-8')
+    if len(encoded) <= 75:
+        return line
+    parts = []
+    while encoded:
+        limit = 75 if not parts else 74
+        cut = min(limit, len(encoded))
+        # Do not split a multi-byte character
+        while cut < len(encoded) and (encoded[cut] & 0xC0) == 0x80:
+            cut -= 1
+        parts.append(encoded[:cut].decode('utf-8'))
+        encoded = encoded[cut:]
+    return '\r\n '.join(parts)
+
+
+def _ics_time(value):
+    return value.astimezone(dt_timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+
+
+def render_ics(schedule, entries):
+    host = getattr(settings, 'CALENDAR_UID_DOMAIN', 'edutrack')
+    lines = [
+        'BEGIN:VCALENDAR',
+        'VERSION:2.0',
+        'PRODID:-//EduTrack//Live Sessions//EN',
+        'CALSCALE:GREGORIAN',
+        'METHOD:PUBLISH',
+        'X-WR-CALNAME:EduTrack sessions',
+    ]
+    stamp = _ics_time(schedule.updated_at)
+    for entry in entries:
+        lines.extend([
+            'BEGIN:VEVENT',
+            f'UID:session-{entry.session_id}@{host}',
+            f'DTSTAMP:{stamp}',
+            f'DTSTART:{_ics_time(entry.start)}',
+            f'DTEND:{_ics_time(entry.end)}',
+            f'SUMMARY:{_escape(entry.title)}',
+            f'DESCRIPTION:{_escape(f"{entry.subject} - Grade {entry.level} - {entry.teacher_name}")}',
+            'STATUS:CONFIRMED',
+            'END:VEVENT',
+        ])
+    lines.append('END:VCALENDAR')
+    return '\r\n'.join(_fold(line) for line in lines) + '\r\n'
+
+
+def feed(schedule):
+    """iCalendar text of a user's schedule, cached per revision"""
+    def build():
+        since = timezone.now() - timedelta(days=FEED_PAST_DAYS)
+        entries = ScheduleEntry.objects.filter(user_id=schedule.user_id, end__gt=since).order_by('start', 'session_id')
+        return render_ics(schedule, entries)
+
+    key = cache_service.make_key('calendar_feed', schedule.user_id, schedule.revision)
+    return cache_service.get_or_build(key, build)
+
+
+def rebuild(chunk_size=BATCH_SIZE):
+    """Refresh the schedule rows of every session; returns (sessions checked, users changed)"""
+    session_ids = list(LiveSession.objects.order_by('id').values_list('id', flat=True))
+    affected = set()
+    for offset in range(0, len(session_ids), chunk_size):
+        affected |= refresh_sessions(session_ids[offset:offset + chunk_size])
+    return len(session_ids), len(affected)
@@ -2,10 +2,13 @@
 # Service for generating sessions from templates
 
 import uuid
-from datetime import datetime, timedelta, date
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta, date, time
 from django.utils import timezone
-from django.db import transaction
+from django.db import transaction, connection
+from django.db.models import Prefetch
 from django.core.exceptions import ValidationError
+from django.contrib.auth import get_user_model
 
 from ..models.recurring_sessions_models import (
     SessionTemplate,
@@ -14,6 +17,12 @@ from ..models.recurring_sessions_models import (
     TemplateGenerationLog
 )
 from ..models.live_sessions_models import LiveSession, LiveSessionAssignment
+from . import cache_service, notification_service, recurrence, schedule_conflicts, schedule_service, stats_service
+
+User = get_user_model()
+
+# Rows per INSERT/UPDATE statement in bulk operations
+BULK_BATCH_SIZE = 500
 
 
 class SessionGeneratorService:
@@ -34,43 +43,311 @@ class SessionGeneratorService:
         
         print(f"DEBUG: Generating sessions for date: {target_date}")
         
+        summary = self.generate_sessions_for_dates([target_date])[0]
+        
+        print(f"DEBUG: Generation summary: {summary}")
+        return summary
+    
+    def generate_sessions_for_dates(self, target_dates):
+        """
+        Generate sessions for several dates in one pass.
+        
+        Templates, their active group assignments and the group students are
+        loaded with a few prefetch queries, generation is decided in memory and
+        sessions, tracking rows, student assignments and logs are written with
+        bulk_create; counters are written back with bulk_update.
+        Returns one summary per date, in date order.
+        """
+        dates = sorted(set(target_dates))
+        summaries = {
+            target_date: {'date': target_date, 'generated': 0, 'failed': 0, 'skipped': 0, 'total_processed': 0}
+            for target_date in dates
+        }
+        
         # Reset counters
         self.generated_count = 0
         self.failed_count = 0
         self.skipped_count = 0
         
-        # Get active templates that might need sessions
-        active_templates = SessionTemplate.objects.filter(
-            status='ACTIVE',
-            start_date__lte=target_date
-        ).exclude(
-            end_date__lt=target_date
-        )
+        if not dates:
+            return []
         
-        print(f"DEBUG: Found {active_templates.count()} active templates")
+        templates = self._load_active_templates(dates[0], dates[-1])
+        print(f"DEBUG: Found {len(templates)} active templates for {dates[0]} - {dates[-1]}")
         
-        for template in active_templates:
+        # Every occurrence of every template over the horizon, computed in one pass,
+        # minus what GeneratedSession already has (a single query)
+        requested = set(dates)
+        wanted = {
+            (template.id, day)
+            for template in templates
+            for day in recurrence.occurrences(template, dates[0], dates[-1])
+            if day in requested
+        }
+        missing = wanted - self._existing_generated_dates(dates[0], dates[-1])
+        
+        # Teachers must not be double-booked: one query finds the existing
+        # sessions clashing with any candidate, clashes between sessions
+        # planned in this run are caught in memory below
+        by_id = {template.id: template for template in templates}
+        candidates = sorted(missing, key=lambda key: (key[1], key[0]))
+        slots = {key: self._slot(by_id[key[0]], key[1]) for key in candidates}
+        clashing = {
+            candidates[index]
+            for index in schedule_conflicts.find_conflicts([slots[key] for key in candidates])
+        }
+        planned_slots = defaultdict(list)
+        conflicts = []
+        
+        # last_generated is advanced in memory so the spacing guard also applies
+        # between sessions planned in this run
+        original_state = {t.id: (t.last_generated, t.total_generated) for t in templates}
+        planned = []
+        for target_date in dates:
+            summary = summaries[target_date]
+            for template in templates:
+                if template.start_date > target_date or (template.end_date and template.end_date < target_date):
+                    continue
+                summary['total_processed'] += 1
+                
+                if ((template.id, target_date) not in missing
+                        or not recurrence.respects_spacing(template, target_date)
+                        or not template.active_assignments):
+                    summary['skipped'] += 1
+                    continue
+                
+                slot = slots[(template.id, target_date)]
+                if (template.id, target_date) in clashing or any(
+                    slot.overlaps(other.start, other.end) for other in planned_slots[template.teacher_id]
+                ):
+                    conflicts.append((template, target_date))
+                    summary['skipped'] += 1
+                    continue
+                planned_slots[template.teacher_id].append(slot)
+                
+                planned.append((template, target_date))
+                if not template.last_generated or target_date > template.last_generated:
+                    template.last_generated = target_date
+                template.total_generated += 1
+                summary['generated'] += 1
+        
+        if planned:
             try:
-                if self.should_generate_session(template, target_date):
-                    self.create_session_from_template(template, target_date)
-                    self.generated_count += 1
-                else:
-                    self.skipped_count += 1
+                self._bulk_create_sessions(planned, templates)
             except Exception as e:
-                print(f"ERROR: Failed to generate session for template {template.id}: {str(e)}")
-                self.log_generation_attempt(template, target_date, 'FAILED', str(e))
-                self.failed_count += 1
-        
-        summary = {
-            'date': target_date,
-            'generated': self.generated_count,
-            'failed': self.failed_count,
-            'skipped': self.skipped_count,
-            'total_processed': active_templates.count()
-        }
+                # Fall back to one transaction per session so a bad row only fails itself
+                print(f"ERROR: Bulk generation failed, retrying per template: {str(e)}")
+                for template in templates:
+                    template.last_generated, template.total_generated = original_state[template.id]
+                self._create_sessions_one_by_one(planned, summaries)
+        if conflicts:
+            self._log_conflicts(conflicts)
+        
+        for summary in summaries.values():
+            self.generated_count += summary['generated']
+            self.failed_count += summary['failed']
+            self.skipped_count += summary['skipped']
+        
+        return [summaries[target_date] for target_date in dates]
+    
+    def _load_active_templates(self, first_date, last_date):
+        """Active templates with their active group assignments and students prefetched"""
+        active_assignments = TemplateGroupAssignment.objects.filter(
+            is_active=True
+        ).select_related('group').prefetch_related(
+            Prefetch('group__students', queryset=User.objects.only('id'))
+        ).order_by('id')
+        
+        return list(
+            SessionTemplate.objects.filter(
+                status='ACTIVE',
+                start_date__lte=last_date
+            ).exclude(
+                end_date__lt=first_date
+            ).prefetch_related(
+                Prefetch('group_assignments', queryset=active_assignments, to_attr='active_assignments')
+            ).order_by('id')
+        )
+    
+    def _existing_generated_dates(self, first_date, last_date):
+        """(template_id, local date) pairs that already have a generated session"""
+        window_start = timezone.make_aware(datetime.combine(first_date, time.min))
+        window_end = timezone.make_aware(datetime.combine(last_date + timedelta(days=1), time.min))
+        rows = GeneratedSession.objects.filter(
+            session__scheduled_datetime__gte=window_start,
+            session__scheduled_datetime__lt=window_end
+        ).values_list('template_id', 'session__scheduled_datetime')
+        return {(template_id, timezone.localtime(scheduled).date()) for template_id, scheduled in rows}
+    
+    def _slot(self, template, session_date):
+        """The teacher's time a session generated for this date would take"""
+        return schedule_conflicts.Slot(
+            template.teacher_id,
+            timezone.make_aware(datetime.combine(session_date, template.start_time)),
+            template.duration_minutes
+        )
+    
+    def _log_conflicts(self, conflicts):
+        """
+        Record the occurrences skipped because the teacher was already booked.
+        A skipped occurrence stays missing and is planned again on every pass
+        over the horizon, so it is only logged the first time.
+        """
+        logged = set(
+            TemplateGenerationLog.objects.filter(
+                status='SKIPPED',
+                template_id__in={template.id for template, _ in conflicts},
+                attempted_date__in={session_date for _, session_date in conflicts}
+            ).values_list('template_id', 'attempted_date')
+        )
+        new_conflicts = [
+            (template, session_date) for template, session_date in conflicts
+            if (template.id, session_date) not in logged
+        ]
+        TemplateGenerationLog.objects.bulk_create([
+            TemplateGenerationLog(
+                template=template,
+                attempted_date=session_date,
+                status='SKIPPED',
+                message=f"Teacher already has a session at {template.start_time.strftime('%H:%M')} on {session_date}",
+                students_assigned=0
+            )
+            for template, session_date in new_conflicts
+        ], batch_size=BULK_BATCH_SIZE)
+        if new_conflicts:
+            print(f"DEBUG: Skipped {len(new_conflicts)} sessions that would double-book a teacher")
+    
+    def _students_for(self, template):
+        """(student_id, advisor_id) for every student of the template's active groups, first group wins"""
+        students = {}
+        for assignment in template.active_assignments:
+            for student in assignment.group.students.all():
+                students.setdefault(student.id, assignment.advisor_id)
+        return students
+    
+    def _build_session(self, template, session_date, has_students):
+        # bulk_create skips save(), so end_datetime is filled in here
+        slot = self._slot(template, session_date)
+        return LiveSession(
+            title=template.title,
+            description=template.description or f"Generated from template: {template.title}",
+            subject=template.subject,
+            level=template.level,
+            teacher_id=template.teacher_id,
+            scheduled_datetime=slot.start,
+            end_datetime=slot.end,
+            duration_minutes=template.duration_minutes,
+            max_participants=template.max_participants,
+            jitsi_room_name=f"template-{template.id}-{session_date.strftime('%Y%m%d')}-{uuid.uuid4().hex[:8]}",
+            status='ASSIGNED' if has_students else 'PENDING'
+        )
+    
+    @transaction.atomic
+    def _bulk_create_sessions(self, planned, templates):
+        now = timezone.now()
+        students_by_template = {}
+        sessions = []
+        for template, session_date in planned:
+            if template.id not in students_by_template:
+                students_by_template[template.id] = self._students_for(template)
+            sessions.append(self._build_session(template, session_date, bool(students_by_template[template.id])))
+        
+        LiveSession.objects.bulk_create(sessions, batch_size=BULK_BATCH_SIZE)
+        if not connection.features.can_return_rows_from_bulk_insert:
+            # MySQL does not hand back ids from a multi-row INSERT; room names are unique
+            ids = dict(
+                LiveSession.objects.filter(
+                    jitsi_room_name__in=[s.jitsi_room_name for s in sessions]
+                ).values_list('jitsi_room_name', 'id')
+            )
+            for session in sessions:
+                session.id = ids[session.jitsi_room_name]
+        
+        generated_sessions = []
+        session_assignments = []
+        logs = []
+        assignment_updates = {}
+        for (template, session_date), session in zip(planned, sessions):
+            students = students_by_template[template.id]
+            generated_sessions.append(GeneratedSession(
+                template=template,
+                session=session,
+                generated_by='system',
+                students_assigned=len(students),
+                groups_assigned=len(template.active_assignments)
+            ))
+            session_assignments.extend(
+                LiveSessionAssignment(
+                    session=session,
+                    student_id=student_id,
+                    advisor_id=advisor_id,
+                    assignment_message=f"Auto-assigned from template: {template.title}"
+                )
+                for student_id, advisor_id in students.items()
+            )
+            logs.append(TemplateGenerationLog(
+                template=template,
+                attempted_date=session_date,
+                status='SUCCESS',
+                message=f"Generated session with {len(students)} students assigned",
+                session_created=session,
+                students_assigned=len(students)
+            ))
+            for assignment in template.active_assignments:
+                assignment.sessions_generated += 1
+                assignment.last_session_date = session_date
+                assignment_updates[assignment.id] = assignment
+        
+        GeneratedSession.objects.bulk_create(generated_sessions, batch_size=BULK_BATCH_SIZE)
+        LiveSessionAssignment.objects.bulk_create(session_assignments, batch_size=BULK_BATCH_SIZE)
+        TemplateGenerationLog.objects.bulk_create(logs, batch_size=BULK_BATCH_SIZE)
+        notification_service.fan_out('SESSION_ASSIGNED', [
+            (session, students_by_template[template.id].keys())
+            for (template, _), session in zip(planned, sessions)
+        ])
+        
+        TemplateGroupAssignment.objects.bulk_update(
+            list(assignment_updates.values()),
+            ['sessions_generated', 'last_session_date'],
+            batch_size=BULK_BATCH_SIZE
+        )
+        generated_template_ids = {template.id for template, _ in planned}
+        updated_templates = [t for t in templates if t.id in generated_template_ids]
+        for template in updated_templates:
+            template.updated_at = now
+        SessionTemplate.objects.bulk_update(
+            updated_templates,
+            ['last_generated', 'total_generated', 'updated_at'],
+            batch_size=BULK_BATCH_SIZE
+        )
         
-        print(f"DEBUG: Generation summary: {summary}")
-        return summary
+        # bulk_create/bulk_update skip model signals, so invalidate cached reads here
+        affected_users = {template.teacher_id for template, _ in planned}
+        affected_users.update(a.student_id for a in session_assignments)
+        cache_service.invalidate_schedules(affected_users)
+        cache_service.invalidate_template_stats()
+        schedule_service.refresh_sessions([session.id for session in sessions])
+        sessions_per_teacher = Counter(template.teacher_id for template, _ in planned)
+        for teacher_id, count in sessions_per_teacher.items():
+            stats_service.bump('sessions', teacher_id, count)
+            stats_service.bump('generated_sessions', teacher_id, count)
+        
+        print(f"DEBUG: Bulk generated {len(sessions)} sessions with {len(session_assignments)} student assignments")
+    
+    def _create_sessions_one_by_one(self, planned, summaries):
+        """Slow path used when the bulk insert fails"""
+        for template, session_date in planned:
+            try:
+                if self.date_matches_template_schedule(template, session_date):
+                    self.create_session_from_template(template, session_date)
+                    continue
+                summaries[session_date]['generated'] -= 1
+                summaries[session_date]['skipped'] += 1
+            except Exception as e:
+                print(f"ERROR: Failed to generate session for template {template.id}: {str(e)}")
+                self.log_generation_attempt(template, session_date, 'FAILED', str(e))
+                summaries[session_date]['generated'] -= 1
+                summaries[session_date]['failed'] += 1
     
     def should_generate_session(self, template, target_date):
         """
@@ -107,30 +384,11 @@ class SessionGeneratorService:
         if target_date < template.start_date:
             return False
         
-        # If no previous generation, allow generation on start date or any matching day after
-        if not template.last_generated:
-            return True
-        
-        # Check recurrence pattern
-        if template.recurrence_type == 'WEEKLY':
-            # For weekly, check if it's been at least a week since last generation
-            days_since_last = (target_date - template.last_generated).days
-            if days_since_last < 7:
-                return False
-        
-        elif template.recurrence_type == 'BIWEEKLY':
-            # For bi-weekly, check if it's been at least 2 weeks
-            days_since_last = (target_date - template.last_generated).days
-            if days_since_last < 14:
-                return False
-        
-        elif template.recurrence_type == 'MONTHLY':
-            # For monthly, check if it's been at least 4 weeks (28 days)
-            days_since_last = (target_date - template.last_generated).days
-            if days_since_last < 28:
-                return False
-        
-        return True
+        # Weekly / bi-weekly / calendar-month rule, then keep a minimum gap to the
+        # last generated session
+        if not recurrence.is_occurrence(template, target_date):
+            return False
+        return recurrence.respects_spacing(template, target_date)
     
     @transaction.atomic
     def create_session_from_template(self, template, session_date):
@@ -143,6 +401,8 @@ class SessionGeneratorService:
         session_datetime = timezone.make_aware(
             datetime.combine(session_date, template.start_time)
         )
+        if schedule_conflicts.find_conflicts([self._slot(template, session_date)]):
+            raise ValidationError(f"Teacher already has a session at {session_datetime}")
         
         # Create unique room name
         room_name = f"template-{template.id}-{session_date.strftime('%Y%m%d')}-{uuid.uuid4().hex[:8]}"
@@ -171,41 +431,48 @@ class SessionGeneratorService:
         )
         
         # Auto-assign groups
-        total_students_assigned = 0
-        active_assignments = template.group_assignments.filter(is_active=True)
-        
+        active_assignments = list(
+            template.group_assignments.filter(is_active=True).select_related('group').prefetch_related(
+                Prefetch('group__students', queryset=User.objects.only('id'))
+            )
+        )
+        template.active_assignments = active_assignments
+        students = self._students_for(template)
+        
+        LiveSessionAssignment.objects.bulk_create([
+            LiveSessionAssignment(
+                session=session,
+                student_id=student_id,
+                advisor_id=advisor_id,
+                assignment_message=f"Auto-assigned from template: {template.title}"
+            )
+            for student_id, advisor_id in students.items()
+        ], batch_size=BULK_BATCH_SIZE)
+        total_students_assigned = len(students)
+        
+        # Update assignment tracking
         for assignment in active_assignments:
-            students_in_group = assignment.group.students.all()
-            
-            for student in students_in_group:
-                # Create LiveSessionAssignment
-                LiveSessionAssignment.objects.create(
-                    session=session,
-                    student=student,
-                    advisor=assignment.advisor,
-                    assignment_message=f"Auto-assigned from template: {template.title}"
-                )
-                total_students_assigned += 1
-            
-            # Update assignment tracking
             assignment.sessions_generated += 1
             assignment.last_session_date = session_date
-            assignment.save()
+        TemplateGroupAssignment.objects.bulk_update(active_assignments, ['sessions_generated', 'last_session_date'])
         
         # Update session status to ASSIGNED if students were assigned
         if total_students_assigned > 0:
             session.status = 'ASSIGNED'
-            session.save()
+            session.save(update_fields=['status', 'updated_at'])
+            notification_service.notify_assigned(session, students.keys())
+        cache_service.invalidate_schedules(students.keys())
         
         # Update template tracking
-        template.last_generated = session_date
+        if not template.last_generated or session_date > template.last_generated:
+            template.last_generated = session_date
         template.total_generated += 1
-        template.save()
+        template.save(update_fields=['last_generated', 'total_generated', 'updated_at'])
         
         # Update generated session tracking
         generated_session.students_assigned = total_students_assigned
-        generated_session.groups_assigned = active_assignments.count()
-        generated_session.save()
+        generated_session.groups_assigned = len(active_assignments)
+        generated_session.save(update_fields=['students_assigned', 'groups_assigned'])
         
         # Log successful generation
         self.log_generation_attempt(
@@ -213,20 +480,20 @@ class SessionGeneratorService:
             session_date, 
             'SUCCESS', 
             f"Generated session with {total_students_assigned} students assigned",
-            session
+            session,
+            students_assigned=total_students_assigned
         )
         
         print(f"DEBUG: Successfully generated session {session.id} with {total_students_assigned} students")
         
         return session
     
-    def log_generation_attempt(self, template, attempted_date, status, message, session=None):
+    def log_generation_attempt(self, template, attempted_date, status, message, session=None, students_assigned=None):
         """
         Log a generation attempt for debugging and monitoring
         """
-        students_assigned = 0
-        if session:
-            students_assigned = session.assignments.count()
+        if students_assigned is None:
+            students_assigned = session.assignments.count() if session else 0
         
         TemplateGenerationLog.objects.create(
             template=template,
@@ -239,17 +506,10 @@ class SessionGeneratorService:
     
     def generate_upcoming_sessions(self, days_ahead=7):
         """
-        Generate sessions for the next N days
+        Generate every missing session over the next N days in a single pass
         """
         today = timezone.now().date()
-        results = []
-        
-        for i in range(days_ahead):
-            target_date = today + timedelta(days=i)
-            result = self.generate_sessions_for_date(target_date)
-            results.append(result)
-        
-        return results
+        return self.generate_sessions_for_dates([today + timedelta(days=i) for i in range(days_ahead)])
     
     def cleanup_old_logs(self, days_to_keep=30):
         """
@@ -1,95 +1,211 @@
 # backend/Education/Educational_system/eduAPI/services/session_scheduler.py
 # Background scheduler for automatic session generation
+#
+# One scheduler for the whole deployment:
+#   - every web worker / node may run it, but only the holder of the database
+#     lease (see leader_lease.py) generates sessions
+#   - the leader keeps a priority queue of the moment each active template's
+#     next occurrence enters the generation horizon and sleeps until the
+#     earliest one instead of running a full pass every minute
+#   - template and group assignment changes wake it early: immediately in the
+#     same process, and through the lease row's wakeup_version elsewhere
 
+import heapq
+import os
+import socket
 import time
 import threading
+import uuid
 from datetime import datetime, timedelta
+from datetime import time as dt_time
+from django.db import close_old_connections
 from django.utils import timezone
 
+from .leader_lease import LeaderLease
+
+LEASE_NAME = 'session-scheduler'
+
 
 class SessionScheduler:
     """
     Background scheduler that automatically generates sessions
     - يشتغل تلقائياً لما يبدأ السيرفر
-    - يولد الجلسات لليوم الحالي
-    - يتحقق كل ساعة من جلسات جديدة
+    - نسخة واحدة فقط (القائد) تولد الجلسات
+    - ينام حتى موعد أقرب جلسة قادمة أو حتى يتغير قالب
     """
-    
+
     def __init__(self):
         self.running = False
-        self.check_interval = 60  # كل ساعة (بالثواني)
+        self.check_interval = 60  # نبضة تجديد القيادة (بالثواني)
+        self.horizon_days = 7  # كم يوماً للأمام نولّد
         self.last_generation_date = None
-    
+        self.last_reconcile_date = None
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.lease = LeaderLease(LEASE_NAME, self.owner, ttl_seconds=self.check_interval * 3)
+        self.is_leader = False
+        self.queue = []  # heap of (fire_at, template_id)
+        self.changed = False
+        self.seen_version = None
+        self.wakeup = threading.Event()
+
     def start(self):
         """Start the scheduler"""
         self.running = True
-        print(f"🚀 Session Scheduler starting at {timezone.now()}")
-        
+        print(f"🚀 Session Scheduler starting at {timezone.now()} as {self.owner}")
+
         # انتظر قليلاً للتأكد من جاهزية Django
         time.sleep(5)
-        
-        # توليد الجلسات فوراً عند بدء السيرفر
-        self._generate_sessions_safe()
-        
-        # حلقة التحقق الدوري
+
         while self.running:
-            time.sleep(self.check_interval)
-            self._check_and_generate()
-    
+            self.wakeup.clear()
+            timeout = self._tick()
+            self.wakeup.wait(timeout)
+
     def stop(self):
         """Stop the scheduler"""
         self.running = False
+        self.wakeup.set()
+        if self.is_leader:
+            try:
+                self.lease.release()
+            except Exception as e:
+                print(f"❌ Could not release scheduler lease: {str(e)}")
+            self.is_leader = False
         print("🛑 Session Scheduler stopped")
-    
+
+    def notify(self):
+        """Templates changed: recompute the queue on the next wake-up"""
+        self.changed = True
+        self.wakeup.set()
+
+    def run_once(self):
+        """Single horizon pass if this instance can take the lease; returns whether it ran"""
+        if not self.lease.acquire():
+            return False
+        try:
+            self._generate_sessions_safe()
+        finally:
+            self.lease.release()
+        return True
+
+    def _tick(self):
+        """Renew the lease, run any due work and return how long to sleep"""
+        close_old_connections()
+        try:
+            leader = self.lease.acquire()
+        except Exception as e:
+            print(f"❌ Scheduler lease error: {str(e)}")
+            return self.check_interval
+
+        if not leader:
+            if self.is_leader:
+                print(f"⚠️ {self.owner} lost the scheduler lease")
+            self.is_leader = False
+            self.queue = []
+            return self.check_interval
+
+        if not self.is_leader:
+            print(f"👑 {self.owner} is now the session scheduler leader")
+            self.is_leader = True
+            self.changed = True
+
+        # تغييرات من نسخ أخرى تصل عبر صف القيادة
+        version = self.lease.wakeup_version()
+        if version != self.seen_version:
+            if self.seen_version is not None:
+                self.changed = True
+            self.seen_version = version
+
+        self._check_and_generate()
+        return self._seconds_until_next()
+
     def _check_and_generate(self):
-        """Check if we need to generate sessions"""
+        """Generate when the day changed, a template fire time is due or templates changed"""
         today = timezone.now().date()
-        
+        due = bool(self.queue) and self.queue[0][0] <= timezone.now()
+
+        # مرة يومياً: صحّح عدادات الإحصائيات من الجداول
+        if self.last_reconcile_date != today:
+            self._reconcile_stats_safe(today)
+
         # إذا تغير اليوم، ولّد جلسات جديدة
         if self.last_generation_date != today:
             print(f"📅 New day detected: {today}")
-            self._generate_sessions_safe()
-    
+        elif not (due or self.changed):
+            return
+
+        self.changed = False
+        self._generate_sessions_safe()
+        self._rebuild_queue()
+
+    def _rebuild_queue(self):
+        """
+        Queue the moment each active template's next uncovered occurrence
+        enters the horizon (local midnight of occurrence - horizon_days).
+        """
+        from ..models.recurring_sessions_models import SessionTemplate
+        from . import recurrence
+
+        try:
+            today = timezone.now().date()
+            first_uncovered = today + timedelta(days=self.horizon_days + 1)
+            queue = []
+            templates = SessionTemplate.objects.filter(status='ACTIVE').only(
+                'id', 'day_of_week', 'start_date', 'end_date', 'recurrence_type'
+            )
+            for template in templates:
+                occurrence = recurrence.next_occurrence(template, first_uncovered)
+                if occurrence is None:
+                    continue
+                fire_date = occurrence - timedelta(days=self.horizon_days)
+                queue.append((timezone.make_aware(datetime.combine(fire_date, dt_time.min)), template.id))
+            heapq.heapify(queue)
+            self.queue = queue
+        except Exception as e:
+            print(f"❌ Could not rebuild scheduler queue: {str(e)}")
+            self.queue = []
+
+    def _seconds_until_next(self):
+        """Sleep until the next fire time, but never past the lease heartbeat"""
+        if not self.queue:
+            return self.check_interval
+        remaining = (self.queue[0][0] - timezone.now()).total_seconds()
+        return max(0, min(self.check_interval, remaining))
+
     def _generate_sessions_safe(self):
         """Generate sessions with error handling"""
         try:
             from .session_generator import SessionGeneratorService
-            
+
             generator = SessionGeneratorService()
             today = timezone.now().date()
-            
-            print(f"⏳ Generating sessions for {today}...")
-            result = generator.generate_sessions_for_date(today)
-            
+
+            # اليوم + الأيام السبعة القادمة في تمريرة واحدة
+            print(f"⏳ Generating sessions for {today} + {self.horizon_days} days...")
+            horizon = [today + timedelta(days=i) for i in range(self.horizon_days + 1)]
+            results = generator.generate_sessions_for_dates(horizon)
+
             self.last_generation_date = today
-            
+
             print(f"✅ Session generation complete:")
-            print(f"   - Generated: {result['generated']}")
-            print(f"   - Skipped: {result['skipped']}")
-            print(f"   - Failed: {result['failed']}")
-            
-            # توليد جلسات الأسبوع القادم (اختياري)
-            self._generate_upcoming_week(generator)
-            
+            print(f"   - Generated: {sum(r['generated'] for r in results)}")
+            print(f"   - Skipped: {sum(r['skipped'] for r in results)}")
+            print(f"   - Failed: {sum(r['failed'] for r in results)}")
+
         except Exception as e:
             print(f"❌ Session generation error: {str(e)}")
-    
-    def _generate_upcoming_week(self, generator):
-        """Generate sessions for the upcoming week"""
+
+
+    def _reconcile_stats_safe(self, today):
+        """Recount the dashboard statistics counters (once a day, on the leader)"""
+        self.last_reconcile_date = today
         try:
-            today = timezone.now().date()
-            total_generated = 0
-            
-            for i in range(1, 8):  # الأيام السبعة القادمة
-                future_date = today + timedelta(days=i)
-                result = generator.generate_sessions_for_date(future_date)
-                total_generated += result['generated']
-            
-            if total_generated > 0:
-                print(f"📆 Generated {total_generated} sessions for upcoming week")
-                
+            from . import stats_service
+
+            drifted = stats_service.reconcile()
+            print(f"📊 Statistics reconciled ({drifted} counters corrected)")
         except Exception as e:
-            print(f"⚠️ Upcoming week generation error: {str(e)}")
+            print(f"❌ Statistics reconcile error: {str(e)}")
 
 
 # Singleton instance
@@ -101,3 +217,13 @@ def get_scheduler():
     if _scheduler_instance is None:
         _scheduler_instance = SessionScheduler()
     return _scheduler_instance
+
+
+def notify_template_change():
+    """
+    Wake the scheduler after a template or group assignment change:
+    right away in this process, at the next heartbeat on other instances.
+    """
+    LeaderLease.wake(LEASE_NAME)
+    if _scheduler_instance is not None:
+        _scheduler_instance.notify()
@@ -0,0 +1,244 @@
+# backend/Education/Educational_system/eduAPI/services/stats_service.py
+# Incremental statistics counters
+#
+# Each metric below is a count of rows of one model, optionally matching a
+# condition and scoped to a teacher. StatsTotal holds the current value and
+# StatsBucket the net change per day, so a dashboard reads a handful of rows
+# instead of counting tables, and week/month trends compare the total with
+# the total N days ago (total minus the changes since then).
+#
+# Counters move from model signals (see eduAPI/signals/stats_signals.py).
+# queryset.update() and bulk_create() do not send signals - code using them
+# must call bump() itself. reconcile() recounts everything from the source
+# tables; the session scheduler leader runs it once a day and it is also
+# available as the reconcile_stats management command.
+
+from datetime import datetime, time, timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from ..models.lessons_model import Lesson, StudentEnrollment, QuizAttempt
+from ..models.live_sessions_models import LiveSession
+from ..models.recurring_sessions_models import SessionTemplate, GeneratedSession
+from ..models.stats_models import StatsTotal, StatsBucket
+
+User = get_user_model()
+
+SITE = 0  # scope of counters that are not per teacher
+WEEK_DAYS = 7
+MONTH_DAYS = 30
+
+
+class Metric:
+    """
+    Rows of `model` matching `condition` (field lookups usable both as a
+    queryset filter and against an instance), counted per `scope` (path to
+    the teacher id) and bucketed by `date_field` when reconciling.
+    `watch` lists fields whose change on update can move a row between counters.
+    """
+
+    def __init__(self, name, model, condition=None, scope=None, date_field=None, watch=()):
+        self.name = name
+        self.model = model
+        self.condition = condition or {}
+        self.scope = scope
+        self.date_field = date_field
+        self.watch = set(watch)
+
+    def matches(self, instance):
+        for lookup, expected in self.condition.items():
+            if lookup.endswith('__isnull'):
+                if (getattr(instance, lookup[:-len('__isnull')]) is None) != expected:
+                    return False
+            elif getattr(instance, lookup) != expected:
+                return False
+        return True
+
+    def scope_of(self, instance):
+        """Teacher id of an instance; related paths cost one query"""
+        if self.scope is None:
+            return SITE
+        if '__' not in self.scope:
+            return getattr(instance, self.scope)
+        first, rest = self.scope.split('__', 1)
+        related = self.model._meta.get_field(first).related_model
+        return related.objects.filter(
+            pk=getattr(instance, f'{first}_id')
+        ).values_list(rest, flat=True).first()
+
+
+METRICS = [
+    Metric('students', User, {'role': 'student'}, date_field='date_joined', watch=('role',)),
+    Metric('advisors', User, {'role': 'advisor'}, date_field='date_joined', watch=('role',)),
+    Metric('active_advisors', User, {'role': 'advisor', 'is_active': True}, watch=('role', 'is_active')),
+    Metric('lessons', Lesson, scope='teacher_id', date_field='created_at', watch=('teacher',)),
+    Metric('enrollments', StudentEnrollment, scope='lesson__teacher_id', date_field='enrollment_date'),
+    Metric('quiz_attempts', QuizAttempt, scope='quiz__lesson__teacher_id', date_field='start_time'),
+    Metric('completed_attempts', QuizAttempt, {'end_time__isnull': False}, scope='quiz__lesson__teacher_id',
+           date_field='end_time', watch=('end_time',)),
+    Metric('sessions', LiveSession, scope='teacher_id', date_field='created_at', watch=('teacher',)),
+    Metric('completed_sessions', LiveSession, {'status': 'COMPLETED'}, scope='teacher_id', watch=('status', 'teacher')),
+    Metric('templates', SessionTemplate, scope='teacher_id', date_field='created_at', watch=('teacher',)),
+    Metric('active_templates', SessionTemplate, {'status': 'ACTIVE'}, scope='teacher_id', watch=('status', 'teacher')),
+    Metric('paused_templates', SessionTemplate, {'status': 'PAUSED'}, scope='teacher_id', watch=('status', 'teacher')),
+    Metric('ended_templates', SessionTemplate, {'status': 'ENDED'}, scope='teacher_id', watch=('status', 'teacher')),
+    Metric('generated_sessions', GeneratedSession, scope='template__teacher_id', date_field='generation_date'),
+]
+
+
+def metrics_for(model):
+    return [metric for metric in METRICS if metric.model is model]
+
+
+def counted(instance):
+    """The (metric, scope) counters an instance currently adds one to"""
+    keys = set()
+    scopes = {}
+    for metric in metrics_for(type(instance)):
+        if not metric.matches(instance):
+            continue
+        if metric.scope not in scopes:
+            scopes[metric.scope] = metric.scope_of(instance)
+        if scopes[metric.scope] is not None:
+            keys.add((metric.name, scopes[metric.scope]))
+    return keys
+
+
+def _add(model, field, key, delta):
+    """Atomic `field += delta` on the row identified by key, creating it if needed"""
+    if model.objects.filter(**key).update(**{field: F(field) + delta}):
+        return
+    try:
+        with transaction.atomic():
+            model.objects.create(**key, **{field: delta})
+    except IntegrityError:
+        # Created concurrently
+        model.objects.filter(**key).update(**{field: F(field) + delta})
+
+
+def bump(metric, scope, delta=1):
+    """Move a counter and today's bucket by delta"""
+    if not delta:
+        return
+    _add(StatsTotal, 'value', {'metric': metric, 'scope': scope}, delta)
+    _add(StatsBucket, 'delta', {'metric': metric, 'scope': scope, 'day': timezone.localdate()}, delta)
+
+
+def apply_change(before, after):
+    """Bump counters for an instance that moved from the `before` set of keys to `after`"""
+    for metric, scope in after - before:
+        bump(metric, scope, 1)
+    for metric, scope in before - after:
+        bump(metric, scope, -1)
+
+
+def _trend(total, change):
+    """Percentage change against the total `change` ago"""
+    previous = total - change
+    if not previous:
+        return 0.0
+    return round(change / previous * 100, 1)
+
+
+def snapshot(keys):
+    """
+    {(metric, scope): {'total', 'week_change', 'week_trend', 'month_change', 'month_trend'}}
+    Two queries whatever the size of the underlying tables.
+    """
+    keys = list(keys)
+    selected = Q()
+    for metric, scope in keys:
+        selected |= Q(metric=metric, scope=scope)
+
+    totals = dict.fromkeys(keys, 0)
+    for metric, scope, value in StatsTotal.objects.filter(selected).values_list('metric', 'scope', 'value'):
+        totals[(metric, scope)] = value
+
+    today = timezone.localdate()
+    week_start = today - timedelta(days=WEEK_DAYS - 1)
+    month_start = today - timedelta(days=MONTH_DAYS - 1)
+    changes = {}
+    for row in (
+        StatsBucket.objects
+        .filter(selected, day__gte=month_start)
+        .values('metric', 'scope')
+        .annotate(week=Sum('delta', filter=Q(day__gte=week_start)), month=Sum('delta'))
+        .order_by()
+    ):
+        changes[(row['metric'], row['scope'])] = (row['week'] or 0, row['month'] or 0)
+
+    result = {}
+    for key in keys:
+        total = totals[key]
+        week, month = changes.get(key, (0, 0))
+        result[key] = {
+            'total': total,
+            'week_change': week,
+            'week_trend': _trend(total, week),
+            'month_change': month,
+            'month_trend': _trend(total, month),
+        }
+    return result
+
+
+def _recount(metric, since):
+    """Current totals per scope and per-day counts of rows dated from `since`, from the source table"""
+    rows = metric.model.objects.filter(**metric.condition).order_by()
+    group = [metric.scope] if metric.scope else []
+
+    totals = {}
+    if group:
+        for row in rows.values(*group).annotate(n=Count('pk')):
+            if row[metric.scope] is not None:
+                totals[row[metric.scope]] = row['n']
+    else:
+        totals[SITE] = rows.count()
+
+    buckets = {}
+    if metric.date_field:
+        recent = (
+            rows.filter(**{f'{metric.date_field}__gte': since})
+            .annotate(bucket_day=TruncDate(metric.date_field))
+            .values(*group, 'bucket_day')
+            .annotate(n=Count('pk'))
+        )
+        for row in recent:
+            scope = row[metric.scope] if metric.scope else SITE
+            if scope is not None:
+                buckets[(scope, row['bucket_day'])] = row['n']
+    return totals, buckets
+
+
+def reconcile():
+    """
+    Recount every metric from its source table and overwrite the counters.
+    Metrics with a date field get their recent buckets rebuilt from the row
+    dates; the others keep their buckets and only have their totals fixed.
+    Returns the number of counters that had drifted.
+    """
+    drifted = 0
+    month_start = timezone.localdate() - timedelta(days=MONTH_DAYS)
+    since = timezone.make_aware(datetime.combine(month_start, time.min))
+    for metric in METRICS:
+        totals, buckets = _recount(metric, since)
+        with transaction.atomic():
+            current = dict(
+                StatsTotal.objects.filter(metric=metric.name).values_list('scope', 'value')
+            )
+            drifted += sum(1 for scope in set(current) | set(totals) if current.get(scope, 0) != totals.get(scope, 0))
+
+            StatsTotal.objects.filter(metric=metric.name).exclude(scope__in=list(totals)).delete()
+            for scope, value in totals.items():
+                StatsTotal.objects.update_or_create(metric=metric.name, scope=scope, defaults={'value': value})
+
+            if metric.date_field:
+                StatsBucket.objects.filter(metric=metric.name, day__gte=month_start).delete()
+                StatsBucket.objects.bulk_create([
+                    StatsBucket(metric=metric.name, scope=scope, day=day, delta=count)
+                    for (scope, day), count in buckets.items()
+                ])
+    return drifted
@@ -0,0 +1,239 @@
+# backend/Education/Educational_system/eduAPI/services/upload_service.py
+# Resumable chunked uploads
+#
+# Protocol:
+#   1. POST   uploads/                        -> upload id, chunk_size, total_chunks
+#   2. PUT    uploads/<id>/chunks/<index>/    raw bytes, X-Chunk-SHA256 header
+#   3. GET    uploads/<id>/                   -> received chunk indexes (resume after a drop)
+#   4. POST   uploads/<id>/complete/          -> creates LessonContent / LiveSessionMaterial
+# Each chunk is streamed from the request straight to its offset in a sparse
+# part file under MEDIA_ROOT, so neither a chunk nor the whole file is held in
+# memory, and the complete step only renames the part file into place.
+
+import hashlib
+import os
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils import timezone
+from django.utils.text import get_valid_filename
+
+from ..models.lessons_model import Lesson, LessonContent
+from ..models.live_sessions_models import LiveSession, LiveSessionMaterial
+from ..models.upload_models import ChunkedUpload, UploadedChunk
+
+READ_SIZE = 64 * 1024
+
+UPLOAD_TO = {
+    'LESSON_CONTENT': 'lesson_files/',
+    'SESSION_MATERIAL': 'live_session_materials/',
+}
+
+
+class UploadError(Exception):
+    """Client error in the upload protocol; message is returned as the detail"""
+
+
+class ChunkedUploadService:
+    @staticmethod
+    def part_path(upload):
+        directory = os.path.join(settings.MEDIA_ROOT, getattr(settings, 'CHUNKED_UPLOAD_DIR', 'chunked_uploads'))
+        os.makedirs(directory, exist_ok=True)
+        return os.path.join(directory, f'{upload.id}.part')
+
+    @staticmethod
+    def start_upload(user, data):
+        """Validate the target and reserve a part file of the final size"""
+        target = data.get('target')
+        if target not in UPLOAD_TO:
+            raise UploadError("target must be LESSON_CONTENT or SESSION_MATERIAL")
+
+        lesson = session = None
+        if target == 'LESSON_CONTENT':
+            lesson = Lesson.objects.filter(id=data.get('lesson_id'), teacher=user).first()
+            if lesson is None:
+                raise UploadError("Lesson not found.")
+        else:
+            session = LiveSession.objects.filter(id=data.get('session_id'), teacher=user).first()
+            if session is None:
+                raise UploadError("Session not found.")
+
+        try:
+            total_size = int(data.get('total_size'))
+        except (TypeError, ValueError):
+            raise UploadError("total_size is required")
+        if total_size <= 0 or total_size > settings.CHUNKED_UPLOAD_MAX_SIZE:
+            raise UploadError(f"total_size must be between 1 and {settings.CHUNKED_UPLOAD_MAX_SIZE} bytes")
+
+        filename = get_valid_filename(os.path.basename(data.get('filename') or ''))
+        if not filename or not data.get('title'):
+            raise UploadError("filename and title are required")
+
+        model = LessonContent if target == 'LESSON_CONTENT' else LiveSessionMaterial
+        if data.get('content_type') not in dict(model.TYPE_CHOICES):
+            raise UploadError("Invalid content_type")
+
+        upload = ChunkedUpload.objects.create(
+            owner=user,
+            target=target,
+            lesson=lesson,
+            session=session,
+            title=data['title'],
+            description=data.get('description'),
+            content_type=data['content_type'],
+            filename=filename,
+            total_size=total_size,
+            chunk_size=settings.CHUNKED_UPLOAD_CHUNK_SIZE,
+            checksum=(data.get('checksum') or '').lower(),
+            expires_at=timezone.now() + timedelta(hours=settings.CHUNKED_UPLOAD_EXPIRY_HOURS)
+        )
+
+        # Sparse file: chunks can arrive in any order and be written in place
+        with open(ChunkedUploadService.part_path(upload), 'wb') as part:
+            part.truncate(total_size)
+        return upload
+
+    @staticmethod
+    def get_upload(upload_id, user):
+        return ChunkedUpload.objects.filter(id=upload_id, owner=user).first()
+
+    @staticmethod
+    def received_chunks(upload):
+        return list(upload.chunks.values_list('index', flat=True))
+
+    @staticmethod
+    def write_chunk(upload, index, stream, checksum):
+        """
+        Stream one chunk from the request into the part file while hashing it.
+        The chunk is only recorded when its size and sha256 match; a failed
+        write also forgets an earlier copy of the chunk.
+        """
+        if upload.status != 'UPLOADING':
+            raise UploadError("Upload is not in progress.")
+        if index >= upload.total_chunks:
+            raise UploadError(f"Chunk index must be below {upload.total_chunks}")
+        if not checksum:
+            raise UploadError("X-Chunk-SHA256 header is required")
+
+        # The bytes below overwrite whatever this chunk held; until they are
+        # verified the chunk counts as missing, so a bad resend cannot leave a
+        # recorded chunk with corrupt bytes behind
+        UploadedChunk.objects.filter(upload=upload, index=index).delete()
+
+        expected = upload.expected_chunk_size(index)
+        digest = hashlib.sha256()
+        written = 0
+        with open(ChunkedUploadService.part_path(upload), 'r+b') as part:
+            part.seek(index * upload.chunk_size)
+            while written <= expected:
+                data = stream.read(min(READ_SIZE, expected + 1 - written))
+                if not data:
+                    break
+                if written + len(data) > expected:
+                    raise UploadError(f"Chunk {index} must be {expected} bytes")
+                part.write(data)
+                digest.update(data)
+                written += len(data)
+
+        if written != expected:
+            raise UploadError(f"Chunk {index} must be {expected} bytes, got {written}")
+        if digest.hexdigest() != checksum.lower():
+            raise UploadError(f"Checksum mismatch for chunk {index}")
+
+        UploadedChunk.objects.update_or_create(
+            upload=upload, index=index,
+            defaults={'size': written, 'checksum': digest.hexdigest()}
+        )
+        return written
+
+    @staticmethod
+    def _file_checksum(path):
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for data in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(data)
+        return digest.hexdigest()
+
+    @staticmethod
+    def complete_upload(upload_id, user):
+        """Move the assembled file into place and create the target row"""
+        with transaction.atomic():
+            upload = ChunkedUpload.objects.select_for_update().filter(id=upload_id, owner=user).first()
+            if upload is None:
+                return None
+            if upload.status == 'COMPLETE':
+                return upload
+            if upload.status != 'UPLOADING':
+                raise UploadError("Upload is not in progress.")
+
+            missing = set(range(upload.total_chunks)) - set(ChunkedUploadService.received_chunks(upload))
+            if missing:
+                raise UploadError(f"Missing chunks: {sorted(missing)[:20]}")
+
+            part_path = ChunkedUploadService.part_path(upload)
+            if upload.checksum and ChunkedUploadService._file_checksum(part_path) != upload.checksum:
+                raise UploadError("File checksum mismatch")
+
+            model = LessonContent if upload.target == 'LESSON_CONTENT' else LiveSessionMaterial
+            name = default_storage.get_available_name(
+                UPLOAD_TO[upload.target] + upload.filename,
+                max_length=model._meta.get_field('file').max_length
+            )
+            final_path = default_storage.path(name)
+            os.makedirs(os.path.dirname(final_path), exist_ok=True)
+            os.replace(part_path, final_path)
+
+            try:
+                if upload.target == 'LESSON_CONTENT':
+                    upload.lesson_content = LessonContent.objects.create(
+                        lesson=upload.lesson,
+                        title=upload.title,
+                        description=upload.description,
+                        content_type=upload.content_type,
+                        file=name,
+                        file_size=upload.total_size
+                    )
+                else:
+                    upload.material = LiveSessionMaterial.objects.create(
+                        session=upload.session,
+                        title=upload.title,
+                        description=upload.description,
+                        content_type=upload.content_type,
+                        file=name,
+                        file_size=upload.total_size,
+                        uploaded_by=user
+                    )
+                upload.status = 'COMPLETE'
+                upload.save(update_fields=['lesson_content', 'material', 'status', 'updated_at'])
+                upload.chunks.all().delete()
+            except BaseException:
+                # The rows roll back; put the bytes back so completing can be retried
+                os.replace(final_path, part_path)
+                raise
+        return upload
+
+    @staticmethod
+    def abort_upload(upload):
+        upload.status = 'ABORTED'
+        upload.save(update_fields=['status', 'updated_at'])
+        upload.chunks.all().delete()
+        ChunkedUploadService._remove_part(upload)
+
+    @staticmethod
+    def _remove_part(upload):
+        try:
+            os.remove(ChunkedUploadService.part_path(upload))
+        except FileNotFoundError:
+            pass
+
+    @staticmethod
+    def cleanup_expired():
+        """Abort uploads that were never completed; returns how many"""
+        expired = ChunkedUpload.objects.filter(status='UPLOADING', expires_at__lt=timezone.now())
+        count = 0
+        for upload in expired.iterator():
+            ChunkedUploadService.abort_upload(upload)
+            count += 1
+        return count
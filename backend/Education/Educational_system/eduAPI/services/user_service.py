@@ -1,17 +1,14 @@
 import random
 import string
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
 from django.conf import settings
 from rest_framework_simplejwt.tokens import RefreshToken, TokenError
 from eduAPI.models import User
 from datetime import datetime, timedelta
 import secrets
 from django.utils import timezone
-from django.core.mail import send_mail
 from django.template.loader import render_to_string
 from django.utils.html import strip_tags
+from .email_outbox import queue_email
 
 
 def generate_verification_code():
@@ -34,14 +31,8 @@ def send_verification_email(user):
     from_email = settings.EMAIL_HOST_USER
     to_email = user.email
     
-    send_mail(
-        subject,
-        plain_message,
-        from_email,
-        [to_email],
-        html_message=html_message,
-        fail_silently=False
-    )
+    # Delivered by the send_queued_emails worker, not inside the request
+    queue_email(to_email, subject, plain_message, html_body=html_message, from_email=from_email)
 
 
 def verify_email(user, verification_code):
@@ -90,71 +81,20 @@ def initiate_password_reset(email):
         user.password_reset_expires = timezone.now() + timedelta(hours=24)
         user.save()
         
-        # Send reset password email - use direct email approach first
+        # Queue the reset email; the send_queued_emails worker delivers and retries it
         reset_link = f"{settings.FRONTEND_URL}/reset-password/{token}"
         
         print(f"Generating password reset for {email} with token {token}")
         print(f"Reset link: {reset_link}")
         
-        try:
-            # Try django's send_mail first
-            subject = 'Password Reset - Complementary Education System'
-            html_message = render_to_string('password_reset_email.html', {
-                'user': user,
-                'reset_link': reset_link
-            })
-            plain_message = strip_tags(html_message)
-            from_email = settings.EMAIL_HOST_USER
-            
-            send_mail(
-                subject,
-                plain_message,
-                from_email,
-                [email],
-                html_message=html_message,
-                fail_silently=False
-            )
-            print(f"Password reset email sent via Django's send_mail")
-        except Exception as email_error:
-            print(f"Error sending email via Django's send_mail: {email_error}")
-            
-            # Fallback to SMTP directly
-            try:
-                sender_email = settings.EMAIL_HOST_USER
-                password = settings.EMAIL_HOST_PASSWORD
-
-                message = MIMEMultipart("alternative")
-                message["Subject"] = "Password Reset - Complementary Education System"
-                message["From"] = sender_email
-                message["To"] = email
-
-                # Create the plain-text version of your message
-                text = f"""
-                Hello {user.first_name},
-                
-                We received a request to reset your password for your account at the Complementary Education System.
-                To reset your password, click on the following link:
-                
-                {reset_link}
-                
-                If you didn't request a password reset, you can ignore this email. Your password will remain unchanged.
-                
-                The password reset link is valid for 24 hours.
-                
-                Best regards,
-                The Complementary Education System Team
-                """
-                
-                part1 = MIMEText(text, "plain")
-                message.attach(part1)
-
-                with smtplib.SMTP_SSL(settings.EMAIL_HOST, settings.EMAIL_PORT) as server:
-                    server.login(sender_email, password)
-                    server.sendmail(sender_email, email, message.as_string())
-                print(f"Password reset email sent via direct SMTP")
-            except Exception as smtp_error:
-                print(f"Error sending email via SMTP: {smtp_error}")
-                # Don't fail - the token is still saved, user can be given the link directly
+        subject = 'Password Reset - Complementary Education System'
+        html_message = render_to_string('password_reset_email.html', {
+            'user': user,
+            'reset_link': reset_link
+        })
+        plain_message = strip_tags(html_message)
+        queue_email(email, subject, plain_message, html_body=html_message, from_email=settings.EMAIL_HOST_USER)
+        print(f"Password reset email queued for {email}")
         
         return True, "Password reset instructions sent to your email"
     except User.DoesNotExist:
@@ -1,6 +1,36 @@
 # backend/Education/Educational_system/eduAPI/signals/__init__.py
 # Import signals to register them
 
-from .recurring_sessions_signals import auto_generate_first_session
+from .recurring_sessions_signals import auto_generate_first_session, wake_session_scheduler
+from .cache_signals import (
+    invalidate_lesson_cache,
+    invalidate_lesson_child_cache,
+    invalidate_quiz_question_cache,
+    invalidate_live_session_cache,
+    invalidate_assignment_cache,
+    invalidate_template_cache
+)
+from .performance_signals import refresh_attempt_performance, refresh_enrollment_performance
+from .stats_signals import remember_counted, count_saved, count_deleted
+from .notification_signals import forget_session_notifications
+from .schedule_signals import refresh_session_schedule, forget_session_schedule, refresh_assignment_schedule
 
-__all__ = ['auto_generate_first_session']
+__all__ = [
+    'auto_generate_first_session',
+    'wake_session_scheduler',
+    'invalidate_lesson_cache',
+    'invalidate_lesson_child_cache',
+    'invalidate_quiz_question_cache',
+    'invalidate_live_session_cache',
+    'invalidate_assignment_cache',
+    'invalidate_template_cache',
+    'refresh_attempt_performance',
+    'refresh_enrollment_performance',
+    'remember_counted',
+    'count_saved',
+    'count_deleted',
+    'forget_session_notifications',
+    'refresh_session_schedule',
+    'forget_session_schedule',
+    'refresh_assignment_schedule'
+]
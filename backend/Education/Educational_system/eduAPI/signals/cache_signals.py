@@ -0,0 +1,62 @@
+# backend/Education/Educational_system/eduAPI/signals/cache_signals.py
+# Signals that invalidate cached reads when the underlying rows change
+
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from ..models.lessons_model import Lesson, LessonContent, Quiz, Question, Answer
+from ..models.live_sessions_models import LiveSession, LiveSessionAssignment
+from ..models.recurring_sessions_models import (
+    SessionTemplate,
+    TemplateGroupAssignment,
+    GeneratedSession
+)
+from ..services import cache_service
+
+
+@receiver([post_save, post_delete], sender=Lesson)
+def invalidate_lesson_cache(sender, instance, **kwargs):
+    cache_service.invalidate_lesson(instance.id, instance.teacher_id)
+
+
+@receiver([post_save, post_delete], sender=LessonContent)
+@receiver([post_save, post_delete], sender=Quiz)
+def invalidate_lesson_child_cache(sender, instance, **kwargs):
+    cache_service.invalidate_lesson(instance.lesson_id)
+
+
+@receiver([post_save, post_delete], sender=Question)
+@receiver([post_save, post_delete], sender=Answer)
+def invalidate_quiz_question_cache(sender, instance, **kwargs):
+    """Quizzes are serialized with their questions and answers"""
+    if sender is Answer:
+        lesson_ids = Question.objects.filter(id=instance.question_id).values_list('quiz__lesson_id', flat=True)
+    else:
+        lesson_ids = Quiz.objects.filter(id=instance.quiz_id).values_list('lesson_id', flat=True)
+    for lesson_id in lesson_ids:
+        cache_service.invalidate_lesson(lesson_id)
+
+
+@receiver([post_save, post_delete], sender=LiveSession)
+def invalidate_live_session_cache(sender, instance, **kwargs):
+    student_ids = list(
+        LiveSessionAssignment.objects.filter(session_id=instance.id).values_list('student_id', flat=True)
+    )
+    cache_service.invalidate_schedules([instance.teacher_id] + student_ids)
+    cache_service.invalidate_template_stats()
+
+
+@receiver([post_save, post_delete], sender=LiveSessionAssignment)
+def invalidate_assignment_cache(sender, instance, **kwargs):
+    # The teacher's schedule shows the number of assigned students
+    teacher_ids = list(
+        LiveSession.objects.filter(id=instance.session_id).values_list('teacher_id', flat=True)
+    )
+    cache_service.invalidate_schedules([instance.student_id] + teacher_ids)
+
+
+@receiver([post_save, post_delete], sender=SessionTemplate)
+@receiver([post_save, post_delete], sender=TemplateGroupAssignment)
+@receiver([post_save, post_delete], sender=GeneratedSession)
+def invalidate_template_cache(sender, instance, **kwargs):
+    cache_service.invalidate_template_stats()
@@ -0,0 +1,14 @@
+# backend/Education/Educational_system/eduAPI/signals/notification_signals.py
+# Signals that keep unread notification counters in step with deletions
+
+from django.db.models.signals import pre_delete
+from django.dispatch import receiver
+
+from ..models.live_sessions_models import LiveSession
+from ..services import notification_service
+
+
+@receiver(pre_delete, sender=LiveSession)
+def forget_session_notifications(sender, instance, **kwargs):
+    # The session's notifications are deleted by cascade without touching the counters
+    notification_service.forget_session(instance.id)
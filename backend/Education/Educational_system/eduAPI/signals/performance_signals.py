@@ -0,0 +1,38 @@
+# backend/Education/Educational_system/eduAPI/signals/performance_signals.py
+# Signals that keep the materialized student performance rows current
+
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from ..models.lessons_model import Quiz, QuizAttempt, StudentEnrollment
+from ..services import performance_service
+
+
+def _schedule(student_id, lesson_id, deleted):
+    # Deletes can be part of a cascade (a lesson or a user going away); by
+    # commit time the rows are gone and the refresh just drops the stats
+    if deleted:
+        transaction.on_commit(partial(performance_service.refresh, student_id, lesson_id))
+    else:
+        performance_service.refresh(student_id, lesson_id)
+
+
+@receiver([post_save, post_delete], sender=QuizAttempt)
+def refresh_attempt_performance(sender, instance, created=False, raw=False, **kwargs):
+    if raw:
+        return
+    # A started attempt changes no results until it is completed
+    if created and instance.end_time is None:
+        return
+    lesson_id = Quiz.objects.filter(id=instance.quiz_id).values_list('lesson_id', flat=True).first()
+    _schedule(instance.student_id, lesson_id, kwargs.get('signal') is post_delete)
+
+
+@receiver([post_save, post_delete], sender=StudentEnrollment)
+def refresh_enrollment_performance(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    _schedule(instance.student_id, instance.lesson_id, kwargs.get('signal') is post_delete)
@@ -1,11 +1,16 @@
 # backend/Education/Educational_system/eduAPI/signals/recurring_sessions_signals.py
 # Signals for automatic session generation
 
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from django.utils import timezone
-from ..models.recurring_sessions_models import SessionTemplate
+from ..models.recurring_sessions_models import SessionTemplate, TemplateGroupAssignment
 from ..services.session_generator import SessionGeneratorService
+from ..services.session_scheduler import notify_template_change
+
+# Fields the generator itself writes back; saving only these must not wake the scheduler
+GENERATOR_FIELDS = {'last_generated', 'total_generated', 'updated_at', 'sessions_generated', 'last_session_date'}
 
 
 @receiver(post_save, sender=SessionTemplate)
@@ -36,3 +41,15 @@ def auto_generate_first_session(sender, instance, created, **kwargs):
             print(f"DEBUG: Auto-generation result: {result}")
         except Exception as e:
             print(f"ERROR: Failed to auto-generate session: {str(e)}")
+
+
+@receiver([post_save, post_delete], sender=SessionTemplate)
+@receiver([post_save, post_delete], sender=TemplateGroupAssignment)
+def wake_session_scheduler(sender, instance, **kwargs):
+    """Let the scheduler recompute its next fire times once the change is committed"""
+    if kwargs.get('raw'):
+        return
+    update_fields = kwargs.get('update_fields')
+    if update_fields and set(update_fields) <= GENERATOR_FIELDS:
+        return
+    transaction.on_commit(notify_template_change)
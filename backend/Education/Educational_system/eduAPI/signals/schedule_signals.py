@@ -0,0 +1,36 @@
+# backend/Education/Educational_system/eduAPI/signals/schedule_signals.py
+# Signals that keep the materialized per-user schedules current
+
+from django.db.models.signals import post_save, post_delete, pre_delete
+from django.dispatch import receiver
+
+from ..models.live_sessions_models import LiveSession, LiveSessionAssignment
+from ..services import schedule_service
+
+# Saving only other fields (e.g. actual_start_time) leaves calendars unchanged
+CALENDAR_FIELDS = {
+    'title', 'subject', 'level', 'status', 'teacher', 'teacher_id',
+    'scheduled_datetime', 'duration_minutes', 'end_datetime'
+}
+
+
+@receiver(post_save, sender=LiveSession)
+def refresh_session_schedule(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    if update_fields is not None and not CALENDAR_FIELDS & set(update_fields):
+        return
+    schedule_service.refresh_sessions([instance.id])
+
+
+@receiver(pre_delete, sender=LiveSession)
+def forget_session_schedule(sender, instance, **kwargs):
+    # The entries go with the session by cascade; their users' calendars still change
+    schedule_service.forget_session(instance.id)
+
+
+@receiver([post_save, post_delete], sender=LiveSessionAssignment)
+def refresh_assignment_schedule(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    schedule_service.refresh_sessions([instance.session_id], [instance.student_id])
@@ -0,0 +1,65 @@
+# backend/Education/Educational_system/eduAPI/signals/stats_signals.py
+# Signals that move the statistics counters
+
+from django.contrib.auth import get_user_model
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from ..models.lessons_model import Lesson, StudentEnrollment, QuizAttempt
+from ..models.live_sessions_models import LiveSession
+from ..models.recurring_sessions_models import SessionTemplate, GeneratedSession
+from ..services import stats_service
+
+User = get_user_model()
+
+
+def _watched(model):
+    fields = set()
+    for metric in stats_service.metrics_for(model):
+        fields |= metric.watch
+    return fields | {f'{name}_id' for name in fields}
+
+
+@receiver(pre_save, sender=User)
+@receiver(pre_save, sender=Lesson)
+@receiver(pre_save, sender=QuizAttempt)
+@receiver(pre_save, sender=LiveSession)
+@receiver(pre_save, sender=SessionTemplate)
+def remember_counted(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Before an update that can move counters, note what the stored row counts toward"""
+    if raw or instance._state.adding:
+        return
+    watched = _watched(sender)
+    if not watched or (update_fields is not None and not watched & set(update_fields)):
+        return
+    previous = sender._base_manager.filter(pk=instance.pk).first()
+    instance._stats_counted = stats_service.counted(previous) if previous else set()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_save, sender=Lesson)
+@receiver(post_save, sender=StudentEnrollment)
+@receiver(post_save, sender=QuizAttempt)
+@receiver(post_save, sender=LiveSession)
+@receiver(post_save, sender=SessionTemplate)
+@receiver(post_save, sender=GeneratedSession)
+def count_saved(sender, instance, created=False, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        stats_service.apply_change(set(), stats_service.counted(instance))
+    elif '_stats_counted' in instance.__dict__:
+        before = instance.__dict__.pop('_stats_counted')
+        stats_service.apply_change(before, stats_service.counted(instance))
+
+
+@receiver(post_delete, sender=User)
+@receiver(post_delete, sender=Lesson)
+@receiver(post_delete, sender=StudentEnrollment)
+@receiver(post_delete, sender=QuizAttempt)
+@receiver(post_delete, sender=LiveSession)
+@receiver(post_delete, sender=SessionTemplate)
+@receiver(post_delete, sender=GeneratedSession)
+def count_deleted(sender, instance, **kwargs):
+    # Cascades delete children first, so related scope lookups still resolve
+    stats_service.apply_change(stats_service.counted(instance), set())
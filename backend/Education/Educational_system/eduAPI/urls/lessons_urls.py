@@ -9,6 +9,10 @@ from eduAPI.views.lessons_views import (
     filter_lessons,
     assign_lesson_to_student
 )
+from eduAPI.views.upload_views import (
+    ChunkedUploadListView, ChunkedUploadDetailView,
+    ChunkedUploadChunkView, ChunkedUploadCompleteView
+)
 
 urlpatterns = [
     # Dashboard statistics
@@ -22,6 +26,12 @@ urlpatterns = [
     path('lessons/<int:lesson_id>/contents/', LessonContentListView.as_view(), name='lesson-content-list'),
     path('contents/<int:content_id>/', LessonContentDetailView.as_view(), name='lesson-content-detail'),
     
+    # Resumable chunked uploads (lesson content and live session materials)
+    path('uploads/', ChunkedUploadListView.as_view(), name='chunked-upload-list'),
+    path('uploads/<uuid:upload_id>/', ChunkedUploadDetailView.as_view(), name='chunked-upload-detail'),
+    path('uploads/<uuid:upload_id>/chunks/<int:index>/', ChunkedUploadChunkView.as_view(), name='chunked-upload-chunk'),
+    path('uploads/<uuid:upload_id>/complete/', ChunkedUploadCompleteView.as_view(), name='chunked-upload-complete'),
+    
     # Quiz routes
     path('lessons/<int:lesson_id>/quizzes/', QuizListView.as_view(), name='quiz-list'),
     path('quizzes/<int:quiz_id>/', QuizDetailView.as_view(), name='quiz-detail'),
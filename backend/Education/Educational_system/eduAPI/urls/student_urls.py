@@ -6,6 +6,7 @@ from eduAPI.views.student_views import (
     get_student_lesson_quizzes,
     start_quiz_attempt,
     submit_quiz_answer,
+    submit_quiz_answers,
     complete_quiz_attempt
 )
 
@@ -22,5 +23,6 @@ urlpatterns = [
     # Quiz attempt routes
     path('quizzes/<int:quiz_id>/attempt/', start_quiz_attempt, name='start-quiz-attempt'),
     path('quiz-attempts/<int:attempt_id>/submit-answer/', submit_quiz_answer, name='submit-quiz-answer'),
+    path('quiz-attempts/<int:attempt_id>/submit-answers/', submit_quiz_answers, name='submit-quiz-answers'),
     path('quiz-attempts/<int:attempt_id>/complete/', complete_quiz_attempt, name='complete-quiz-attempt'),
 ] 
\ No newline at end of file
@@ -8,6 +8,7 @@ from django.views.decorators.csrf import csrf_exempt
 import secrets
 import string
 from ..models.user_model import User
+from ..services import stats_service
 
 @staff_member_required
 @require_POST
@@ -42,8 +43,9 @@ def reset_advisor_password(request, user_id):
 @staff_member_required
 def advisor_stats(request):
     """Get advisor statistics"""
-    total_advisors = User.objects.filter(role='advisor').count()
-    active_advisors = User.objects.filter(role='advisor', is_active=True).count()
+    counters = stats_service.snapshot([('advisors', stats_service.SITE), ('active_advisors', stats_service.SITE)])
+    total_advisors = counters[('advisors', stats_service.SITE)]['total']
+    active_advisors = counters[('active_advisors', stats_service.SITE)]['total']
     inactive_advisors = total_advisors - active_advisors
     
     return JsonResponse({
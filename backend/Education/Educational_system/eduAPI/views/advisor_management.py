@@ -9,6 +9,7 @@ import json
 import secrets
 import string
 from ..models.user_model import User
+from ..services import stats_service
 
 def superuser_required(user):
     return user.is_authenticated and (user.is_superuser or user.role == 'admin')
@@ -122,9 +123,9 @@ def toggle_advisor_status(request, advisor_id):
 @user_passes_test(superuser_required)
 def advisor_stats(request):
     """Get advisor statistics as JSON"""
-    advisors = User.objects.filter(role='advisor')
-    total = advisors.count()
-    active = advisors.filter(is_active=True).count()
+    counters = stats_service.snapshot([('advisors', stats_service.SITE), ('active_advisors', stats_service.SITE)])
+    total = counters[('advisors', stats_service.SITE)]['total']
+    active = counters[('active_advisors', stats_service.SITE)]['total']
     inactive = total - active
     
     return JsonResponse({
@@ -7,6 +7,7 @@ from django.db.models import Q
 
 from ..models.user_model import User
 from ..models.lessons_model import Lesson, StudentEnrollment, LessonAssignment, Quiz, QuizAttempt, StudentFeedback
+from ..models.performance_models import StudentLessonStats
 from eduAPI.serializers.lessons_serializers import QuizAttemptSerializer
 import logging
 
@@ -87,11 +88,16 @@ def get_student_lessons(request, student_id):
         
         # Get lessons assigned to this student (using StudentEnrollment or LessonAssignment)
         try:
-            lesson_assignments = LessonAssignment.objects.filter(student=student)
+            lesson_assignments = LessonAssignment.objects.filter(student=student).select_related('lesson', 'advisor')
+            # Progress and quiz results come from the materialized per-lesson rows
+            lesson_stats = {
+                stats.lesson_id: stats for stats in StudentLessonStats.objects.filter(student=student)
+            }
             
             lessons_data = []
             for assignment in lesson_assignments:
                 lesson = assignment.lesson
+                stats = lesson_stats.get(lesson.id)
                 lessons_data.append({
                     'id': lesson.id,
                     'name': lesson.name,
@@ -101,7 +107,10 @@ def get_student_lessons(request, student_id):
                     'assigned_date': assignment.assigned_date.isoformat() if assignment.assigned_date else None,
                     'due_date': assignment.due_date.isoformat() if assignment.due_date else None,
                     'completed': assignment.completed,
-                    'advisor_name': f"{assignment.advisor.first_name} {assignment.advisor.last_name}"
+                    'advisor_name': f"{assignment.advisor.first_name} {assignment.advisor.last_name}",
+                    'progress': stats.progress if stats else 0,
+                    'best_score': stats.best_score if stats else None,
+                    'pass_rate': stats.pass_rate if stats else None
                 })
             
         except Exception as e:
@@ -16,6 +16,7 @@ from eduAPI.services.lessons_service import (
     LessonService, LessonContentService, 
     QuizService, QuestionService, AnswerService
 )
+from eduAPI.services import media_service
 from ..models.user_model import User
 import datetime
 
@@ -45,8 +46,9 @@ class LessonDetailView(APIView):
         if not lesson:
             return Response({"detail": "Lesson not found."}, status=status.HTTP_404_NOT_FOUND)
         
-        serializer = LessonSerializer(lesson)
-        return Response(serializer.data)
+        data = LessonSerializer(lesson).data
+        data['contents'] = media_service.with_download_tokens(data['contents'], request.user)
+        return Response(data)
     
     def put(self, request, lesson_id):
         """Update a lesson."""
@@ -80,7 +82,7 @@ class LessonContentListView(APIView):
         
         contents = LessonContentService.get_lesson_contents(lesson_id)
         serializer = LessonContentSerializer(contents, many=True)
-        return Response(serializer.data)
+        return Response(media_service.with_download_tokens(serializer.data, request.user))
     
     def post(self, request, lesson_id):
         """Create new lesson content."""
@@ -310,38 +312,33 @@ def dashboard_stats(request):
                 'message': 'Only teachers can access dashboard statistics'
             }, status=status.HTTP_403_FORBIDDEN)
         
-        # Get counts from the database
-        from ..models.lessons_model import Lesson
-        from django.db.models import Count, Sum, Avg
-        
-        # Count total students
-        total_students = User.objects.filter(role='student').count()
-        
-        # Calculate student trend (placeholder - for a real app, compare to previous period)
-        students_last_month = total_students - 2  # Placeholder, simulate an increase
-        students_trend = (total_students - students_last_month) / max(students_last_month, 1) * 100 if students_last_month else 0
-        
-        # Count lessons by this teacher
-        total_lessons = Lesson.objects.filter(teacher=request.user.id).count()
-        
-        # Calculate lesson trend
-        # For a real app, you would compare to lessons created last week/month
-        lessons_last_week = total_lessons - 1  # Placeholder, simulate an increase
-        lessons_trend = (total_lessons - lessons_last_week) / max(lessons_last_week, 1) * 100 if lessons_last_week else 0
+        # Counters maintained by signals (see services/stats_service.py): a
+        # few rows are read whatever the size of the tables, so no caching
+        from ..services import stats_service
         
-        # Assignments data
-        # This is placeholder - replace with your real assignment model counts
-        graded_assignments = 0
-        pending_assignments = 0
+        teacher = request.user.id
+        metrics = ['lessons', 'enrollments', 'quiz_attempts', 'completed_attempts', 'sessions']
+        keys = [('students', stats_service.SITE)] + [(metric, teacher) for metric in metrics]
+        counters = stats_service.snapshot(keys)
+        students = counters[('students', stats_service.SITE)]
+        lessons = counters[('lessons', teacher)]
+        attempts = counters[('quiz_attempts', teacher)]
+        completed = counters[('completed_attempts', teacher)]
         
         # Compile stats
         stats = {
-            'total_students': total_students,
-            'students_trend': round(students_trend, 1),
-            'total_lessons': total_lessons,
-            'lessons_trend': round(lessons_trend, 1),
-            'graded_assignments': graded_assignments,
-            'pending_assignments': pending_assignments
+            'total_students': students['total'],
+            'students_trend': students['month_trend'],  # month over month
+            'total_lessons': lessons['total'],
+            'lessons_trend': lessons['week_trend'],  # week over week
+            'graded_assignments': completed['total'],
+            'pending_assignments': max(attempts['total'] - completed['total'], 0),
+            'total_enrollments': counters[('enrollments', teacher)]['total'],
+            'total_sessions': counters[('sessions', teacher)]['total'],
+            'trends': {
+                metric: {'week': counter['week_trend'], 'month': counter['month_trend']}
+                for (metric, _), counter in counters.items()
+            }
         }
         
         return Response(stats, status=status.HTTP_200_OK)
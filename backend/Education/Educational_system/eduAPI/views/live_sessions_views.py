@@ -12,7 +12,8 @@ from ..models.live_sessions_models import LiveSession, LiveSessionAssignment, Li
 from ..serializers.live_sessions_serializers import (
     LiveSessionSerializer,
     SessionAssignmentSerializer,
-    LiveSessionMaterialSerializer
+    LiveSessionMaterialSerializer,
+    with_assignment_counts
 )
 
 
@@ -27,17 +28,18 @@ class LiveSessionViewSet(viewsets.ModelViewSet):
         
         if user.role == 'TEACHER':
             # Teachers see their own sessions
-            return LiveSession.objects.filter(teacher=user).order_by('-scheduled_datetime')
+            sessions = LiveSession.objects.filter(teacher=user)
         elif user.role == 'ADVISOR':
             # Advisors see all sessions
-            return LiveSession.objects.all().order_by('-scheduled_datetime')
+            sessions = LiveSession.objects.all()
         elif user.role == 'STUDENT':
             # Students see assigned sessions
-            return LiveSession.objects.filter(
-                assignments__student=user
-            ).order_by('-scheduled_datetime')
+            sessions = LiveSession.objects.filter(
+                id__in=LiveSessionAssignment.objects.filter(student=user).values('session_id')
+            )
         else:
             return LiveSession.objects.none()
+        return with_assignment_counts(sessions).order_by('-scheduled_datetime')
 
     def perform_create(self, serializer):
         """Set teacher when creating session"""
@@ -52,7 +54,7 @@ class LiveSessionViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        sessions = LiveSession.objects.filter(status='PENDING').order_by('-created_at')
+        sessions = with_assignment_counts(LiveSession.objects.filter(status='PENDING')).order_by('-created_at')
         serializer = self.get_serializer(sessions, many=True)
         return Response(serializer.data)
 
@@ -63,16 +65,17 @@ class LiveSessionViewSet(viewsets.ModelViewSet):
         
         if user.role == 'STUDENT':
             sessions = LiveSession.objects.filter(
-                assignments__student=user,
+                id__in=LiveSessionAssignment.objects.filter(student=user).values('session_id'),
                 status__in=['ASSIGNED', 'ACTIVE']
-            ).order_by('scheduled_datetime')
+            )
         elif user.role == 'TEACHER':
             sessions = LiveSession.objects.filter(
                 teacher=user,
                 status__in=['ASSIGNED', 'ACTIVE']
-            ).order_by('scheduled_datetime')
+            )
         else:
             sessions = LiveSession.objects.none()
+        sessions = with_assignment_counts(sessions).order_by('scheduled_datetime')
         
         serializer = self.get_serializer(sessions, many=True)
         return Response(serializer.data)
@@ -0,0 +1,42 @@
+# backend/Education/Educational_system/eduAPI/views/metrics_views.py
+# Metrics and slow-request log collected by InstrumentationMiddleware
+#
+# Plain Django views rather than DRF ones: Prometheus sends the metrics token
+# as a Bearer credential, which the JWT authentication would reject. Access is
+# granted with that token (METRICS_TOKEN) or to staff logged in to the admin.
+
+import secrets
+
+from django.conf import settings
+from django.http import HttpResponse, JsonResponse
+from django.views.decorators.http import require_GET
+
+from ..services import metrics_service
+
+
+def _allowed(request):
+    token = getattr(settings, 'METRICS_TOKEN', None)
+    header = request.headers.get('Authorization', '')
+    if token and header.startswith('Bearer ') and secrets.compare_digest(header[len('Bearer '):], token):
+        return True
+    return request.user.is_authenticated and request.user.is_staff
+
+
+@require_GET
+def metrics(request):
+    """Prometheus text format"""
+    if not _allowed(request):
+        return HttpResponse('Forbidden', status=403, content_type='text/plain')
+    return HttpResponse(metrics_service.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+@require_GET
+def slow_requests(request):
+    """Recent slow or N+1 requests with their most repeated SQL statements"""
+    if not _allowed(request):
+        return JsonResponse({'error': 'Forbidden'}, status=403)
+    return JsonResponse({
+        'slow_request_ms': metrics_service.slow_request_ms(),
+        'repeat_threshold': metrics_service.repeat_threshold(),
+        'requests': metrics_service.slow_requests()
+    })
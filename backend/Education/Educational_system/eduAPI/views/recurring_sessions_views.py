@@ -15,6 +15,8 @@ from ..models.recurring_sessions_models import (
     GeneratedSession,
     TemplateGenerationLog
 )
+from ..models.live_sessions_models import LiveSessionAssignment
+from ..pagination import CreatedKeysetPagination, NameKeysetPagination, StudentKeysetPagination
 from ..serializers.recurring_sessions_serializers import (
     SessionTemplateSerializer,
     StudentGroupSerializer,
@@ -25,6 +27,21 @@ from ..serializers.recurring_sessions_serializers import (
     StudentGroupSimpleSerializer,
     StudentSimpleSerializer
 )
+from ..services import bulk_assignment, cache_service, stats_service
+
+
+def _with_group_counts(assignments):
+    """Assignments with their template, group and advisor joined and the group size annotated"""
+    return assignments.select_related('template', 'group', 'advisor').annotate(
+        group_student_count=Count('group__students', distinct=True)
+    )
+
+
+def _with_session_counts(generated_sessions):
+    """Generated sessions with their session joined and its assignment count annotated"""
+    return generated_sessions.select_related('template', 'session').annotate(
+        session_assigned_count=Count('session__assignments', distinct=True)
+    )
 
 
 class SessionTemplateViewSet(viewsets.ModelViewSet):
@@ -32,6 +49,7 @@ class SessionTemplateViewSet(viewsets.ModelViewSet):
     
     serializer_class = SessionTemplateSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = CreatedKeysetPagination
     
     def get_queryset(self):
         """Filter templates based on user role"""
@@ -42,17 +60,25 @@ class SessionTemplateViewSet(viewsets.ModelViewSet):
         if user.role == 'teacher':
             # Teachers see only their own templates
             queryset = SessionTemplate.objects.filter(teacher=user)
-            print(f"DEBUG: Teacher queryset count: {queryset.count()}")
-            return queryset
         elif user.role == 'advisor':
             # Advisors see all templates for assignment purposes
             queryset = SessionTemplate.objects.all()
-            print(f"DEBUG: Advisor queryset count: {queryset.count()}")
-            return queryset
         else:
             # Students don't manage templates
             print(f"DEBUG: Student/other role - returning empty queryset")
             return SessionTemplate.objects.none()
+        
+        queryset = queryset.select_related('teacher')
+        if getattr(self, 'action', None) in ('list', 'retrieve'):
+            # Counts come from the query instead of one COUNT per template
+            queryset = queryset.annotate(
+                active_groups_count=Count(
+                    'group_assignments',
+                    filter=Q(group_assignments__is_active=True),
+                    distinct=True
+                )
+            )
+        return queryset
     
     def perform_create(self, serializer):
         """Set the teacher to current user"""
@@ -122,7 +148,7 @@ class SessionTemplateViewSet(viewsets.ModelViewSet):
     def generated_sessions(self, request, pk=None):
         """Get sessions generated from this template"""
         template = self.get_object()
-        generated_sessions = GeneratedSession.objects.filter(template=template)
+        generated_sessions = _with_session_counts(GeneratedSession.objects.filter(template=template))
         serializer = GeneratedSessionSerializer(generated_sessions, many=True)
         return Response(serializer.data)
     
@@ -133,10 +159,10 @@ class SessionTemplateViewSet(viewsets.ModelViewSet):
         
         if request.method == 'GET':
             # Get existing assignments
-            assignments = TemplateGroupAssignment.objects.filter(
+            assignments = _with_group_counts(TemplateGroupAssignment.objects.filter(
                 template=template, 
                 is_active=True
-            )
+            ))
             serializer = TemplateGroupAssignmentSerializer(assignments, many=True)
             return Response(serializer.data)
         
@@ -161,71 +187,15 @@ class SessionTemplateViewSet(viewsets.ModelViewSet):
                         status=status.HTTP_400_BAD_REQUEST
                     )
                 
-                # For now, create individual assignments for each student
-                from ..models.user_model import User
-                assigned_count = 0
-                
-                for student_id in student_ids:
-                    try:
-                        print(f"DEBUG: Processing student ID: {student_id}")
-                        student = User.objects.get(id=student_id, role='student')
-                        print(f"DEBUG: Found student: {student.first_name} {student.last_name}")
-                        
-                        # Create or get a group for this student (individual group)
-                        group_name = f"Individual - {student.first_name} {student.last_name}"
-                        group, group_created = StudentGroup.objects.get_or_create(
-                            name=group_name,
-                            advisor=request.user,
-                            defaults={
-                                'description': f'Individual group for {student.first_name} {student.last_name}',
-                                'is_active': True
-                            }
-                        )
-                        print(f"DEBUG: Group {'created' if group_created else 'found'}: {group.name}")
-                        
-                        # Add student to group if not already there
-                        if not group.students.filter(id=student.id).exists():
-                            group.students.add(student)
-                            print(f"DEBUG: Added student to group")
-                        
-                        # Check if assignment already exists
-                        existing_assignment = TemplateGroupAssignment.objects.filter(
-                            template=template,
-                            group=group,
-                            advisor=request.user
-                        ).first()
-                        
-                        if existing_assignment:
-                            if not existing_assignment.is_active:
-                                existing_assignment.is_active = True
-                                existing_assignment.save()
-                                print(f"DEBUG: Reactivated existing assignment")
-                                assigned_count += 1
-                            else:
-                                print(f"DEBUG: Assignment already exists and is active")
-                        else:
-                            # Create new assignment
-                            assignment = TemplateGroupAssignment.objects.create(
-                                template=template,
-                                group=group,
-                                advisor=request.user,
-                                is_active=True,
-                                assignment_message=f'Assigned to {student.first_name} {student.last_name}'
-                            )
-                            print(f"DEBUG: Created new assignment {assignment.id}")
-                            assigned_count += 1
-                            
-                    except User.DoesNotExist:
-                        print(f"DEBUG: Student {student_id} not found")
-                        continue
-                    except Exception as e:
-                        print(f"DEBUG: Error processing student {student_id}: {str(e)}")
-                        continue
+                # Validate all students at once and add them to the template's direct group
+                results = bulk_assignment.assign_to_template(template, request.user, student_ids)
+                assigned_count = bulk_assignment.count(results, bulk_assignment.ASSIGNED)
                 
                 print(f"DEBUG: Successfully assigned to {assigned_count} students")
                 return Response({
                     'message': f'Template assigned to {assigned_count} students',
-                    'assigned_count': assigned_count
+                    'assigned_count': assigned_count,
+                    'results': results
                 })
                 
             except Exception as e:
@@ -285,42 +255,13 @@ class SessionTemplateViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        from ..models.user_model import User
-        unassigned_count = 0
-        
-        for student_id in student_ids:
-            try:
-                student = User.objects.get(id=student_id, role='student')
-                
-                # Find the individual group for this student
-                group_name = f"Individual - {student.first_name} {student.last_name}"
-                group = StudentGroup.objects.filter(
-                    name=group_name,
-                    advisor=request.user
-                ).first()
-                
-                if group:
-                    # Find and deactivate the assignment
-                    assignment = TemplateGroupAssignment.objects.filter(
-                        template=template,
-                        group=group,
-                        advisor=request.user,
-                        is_active=True
-                    ).first()
-                    
-                    if assignment:
-                        assignment.is_active = False
-                        assignment.save()
-                        unassigned_count += 1
-                        print(f"DEBUG: Unassigned student {student.id} from template {template.id}")
-                    
-            except User.DoesNotExist:
-                print(f"DEBUG: Student {student_id} not found")
-                continue
+        results = bulk_assignment.unassign_from_template(template, request.user, student_ids)
+        unassigned_count = bulk_assignment.count(results, bulk_assignment.REMOVED)
         
         return Response({
             'message': f'Unassigned {unassigned_count} students from template',
-            'unassigned_count': unassigned_count
+            'unassigned_count': unassigned_count,
+            'results': results
         })
     
     @action(detail=False, methods=['get'])
@@ -336,6 +277,7 @@ class StudentGroupViewSet(viewsets.ModelViewSet):
     
     serializer_class = StudentGroupSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = NameKeysetPagination
     
     def get_queryset(self):
         """Filter groups based on user role"""
@@ -343,7 +285,18 @@ class StudentGroupViewSet(viewsets.ModelViewSet):
         
         if user.role == 'advisor':
             # Advisors see only their own groups
-            return StudentGroup.objects.filter(advisor=user)
+            queryset = StudentGroup.objects.filter(advisor=user).select_related('advisor')
+            if getattr(self, 'action', None) in ('list', 'retrieve'):
+                # Counts come from the query instead of per-group COUNTs
+                queryset = queryset.prefetch_related('students').annotate(
+                    students_total=Count('students', distinct=True),
+                    active_template_assignments_count=Count(
+                        'template_assignments',
+                        filter=Q(template_assignments__is_active=True),
+                        distinct=True
+                    )
+                )
+            return queryset
         else:
             # Only advisors can manage groups
             return StudentGroup.objects.none()
@@ -364,19 +317,13 @@ class StudentGroupViewSet(viewsets.ModelViewSet):
         group = self.get_object()
         student_ids = request.data.get('student_ids', [])
         
-        added_count = 0
-        for student_id in student_ids:
-            try:
-                from ..models.user_model import User
-                student = User.objects.get(id=student_id, role='student')
-                group.students.add(student)
-                added_count += 1
-            except User.DoesNotExist:
-                continue
+        results = bulk_assignment.add_to_group(group, student_ids)
+        added_count = bulk_assignment.count(results, bulk_assignment.ASSIGNED)
         
         return Response({
             'message': f'Added {added_count} students to group "{group.name}"',
-            'total_students': group.student_count
+            'total_students': group.student_count,
+            'results': results
         })
     
     @action(detail=True, methods=['post'])
@@ -385,29 +332,23 @@ class StudentGroupViewSet(viewsets.ModelViewSet):
         group = self.get_object()
         student_ids = request.data.get('student_ids', [])
         
-        removed_count = 0
-        for student_id in student_ids:
-            try:
-                from ..models.user_model import User
-                student = User.objects.get(id=student_id)
-                group.students.remove(student)
-                removed_count += 1
-            except User.DoesNotExist:
-                continue
+        results = bulk_assignment.remove_from_group(group, student_ids)
+        removed_count = bulk_assignment.count(results, bulk_assignment.REMOVED)
         
         return Response({
             'message': f'Removed {removed_count} students from group "{group.name}"',
-            'total_students': group.student_count
+            'total_students': group.student_count,
+            'results': results
         })
     
     @action(detail=True, methods=['get'])
     def template_assignments(self, request, pk=None):
         """Get template assignments for this group"""
         group = self.get_object()
-        assignments = TemplateGroupAssignment.objects.filter(
+        assignments = _with_group_counts(TemplateGroupAssignment.objects.filter(
             group=group, 
             is_active=True
-        )
+        ))
         serializer = TemplateGroupAssignmentSerializer(assignments, many=True)
         return Response(serializer.data)
     
@@ -431,10 +372,10 @@ class TemplateGroupAssignmentViewSet(viewsets.ModelViewSet):
         
         if user.role == 'advisor':
             # Advisors see only their own assignments
-            return TemplateGroupAssignment.objects.filter(advisor=user)
+            return _with_group_counts(TemplateGroupAssignment.objects.filter(advisor=user))
         elif user.role == 'teacher':
             # Teachers see assignments to their templates
-            return TemplateGroupAssignment.objects.filter(template__teacher=user)
+            return _with_group_counts(TemplateGroupAssignment.objects.filter(template__teacher=user))
         else:
             return TemplateGroupAssignment.objects.none()
     
@@ -493,20 +434,23 @@ class GeneratedSessionViewSet(viewsets.ReadOnlyModelViewSet):
         
         if user.role == 'teacher':
             # Teachers see sessions generated from their templates
-            return GeneratedSession.objects.filter(template__teacher=user)
+            generated = GeneratedSession.objects.filter(template__teacher=user)
         elif user.role == 'advisor':
             # Advisors see sessions from templates they've assigned groups to
-            return GeneratedSession.objects.filter(
-                template__group_assignments__advisor=user,
-                template__group_assignments__is_active=True
-            ).distinct()
+            generated = GeneratedSession.objects.filter(
+                template_id__in=TemplateGroupAssignment.objects.filter(
+                    advisor=user, is_active=True
+                ).values('template_id')
+            )
         elif user.role == 'student':
-            # Students see sessions they're assigned to
-            return GeneratedSession.objects.filter(
-                session__assignments__student=user
+            # Students see sessions they're assigned to (a subquery, so the
+            # assignment count is not narrowed to this student)
+            generated = GeneratedSession.objects.filter(
+                session_id__in=LiveSessionAssignment.objects.filter(student=user).values('session_id')
             )
         else:
             return GeneratedSession.objects.none()
+        return _with_session_counts(generated)
 
 
 class TemplateGenerationLogViewSet(viewsets.ReadOnlyModelViewSet):
@@ -556,8 +500,14 @@ def get_available_students(request):
         )
         print(f"DEBUG: After search filter: {students.count()} students")
     
-    serializer = StudentSimpleSerializer(students, many=True)
-    print(f"DEBUG: Serialized data: {serializer.data}")
+    paginator = StudentKeysetPagination()
+    page = paginator.paginate_queryset(students, request)
+    if page is not None:
+        serializer = StudentSimpleSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
+    
+    serializer = StudentSimpleSerializer(students.order_by(*StudentKeysetPagination.ordering), many=True)
+    print(f"DEBUG: Serialized {len(serializer.data)} students")
     return Response(serializer.data)
 
 
@@ -610,8 +560,25 @@ def get_template_statistics(request):
     user = request.user
     
     if user.role == 'teacher':
-        templates = SessionTemplate.objects.filter(teacher=user)
-        generated_sessions = GeneratedSession.objects.filter(template__teacher=user)
+        # Template and generated-session counts come from the statistics
+        # counters; only the time-dependent session counts need a query
+        metrics = ['templates', 'active_templates', 'paused_templates', 'ended_templates', 'generated_sessions']
+        counters = stats_service.snapshot([(metric, user.id) for metric in metrics])
+        sessions = GeneratedSession.objects.filter(template__teacher=user).aggregate(
+            upcoming=Count('id', filter=Q(session__scheduled_datetime__gt=timezone.now())),
+            completed=Count('id', filter=Q(session__status='COMPLETED'))
+        )
+        return Response({
+            'total_templates': counters[('templates', user.id)]['total'],
+            'active_templates': counters[('active_templates', user.id)]['total'],
+            'paused_templates': counters[('paused_templates', user.id)]['total'],
+            'ended_templates': counters[('ended_templates', user.id)]['total'],
+            'total_generated_sessions': counters[('generated_sessions', user.id)]['total'],
+            'upcoming_sessions': sessions['upcoming'],
+            'completed_sessions': sessions['completed'],
+            'templates_trend': counters[('templates', user.id)]['month_trend'],
+            'generated_sessions_trend': counters[('generated_sessions', user.id)]['week_trend'],
+        })
     elif user.role == 'advisor':
         templates = SessionTemplate.objects.filter(
             group_assignments__advisor=user,
@@ -627,6 +594,11 @@ def get_template_statistics(request):
             status=status.HTTP_403_FORBIDDEN
         )
     
+    cache_key = cache_service.make_key('template_statistics', user.id, scopes=[cache_service.TEMPLATE_STATS_SCOPE])
+    cached_stats = cache_service.get_cached(cache_key)
+    if cached_stats is not None:
+        return Response(cached_stats)
+    
     stats = {
         'total_templates': templates.count(),
         'active_templates': templates.filter(status='ACTIVE').count(),
@@ -641,4 +613,4 @@ def get_template_statistics(request):
         ).count(),
     }
     
-    return Response(stats)
\ No newline at end of file
+    return Response(cache_service.set_cached(cache_key, stats))
\ No newline at end of file
@@ -1,5 +1,5 @@
-from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.decorators import api_view, authentication_classes, permission_classes
+from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
 import uuid
@@ -79,6 +79,14 @@ def get_sessions(request):
                 if scheduled_dt and not django_timezone.is_aware(scheduled_dt):
                     scheduled_dt = django_timezone.make_aware(scheduled_dt)
             
+            # Refuse a slot that overlaps one of the teacher's sessions
+            from ..services import schedule_conflicts
+            if schedule_conflicts.has_conflict(user.id, scheduled_dt, data.get('duration_minutes', 60)):
+                return Response(
+                    {'error': schedule_conflicts.CONFLICT_MESSAGE},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            
             session = LiveSession.objects.create(
                 title=data['title'],
                 description=data.get('description', ''),
@@ -122,28 +130,37 @@ def get_sessions(request):
             )
     
     # GET request - return real data from database
+    from django.db.models import Count
+    from rest_framework.exceptions import ValidationError
+    from ..models.live_sessions_models import LiveSessionAssignment
+    from ..pagination import SessionKeysetPagination
+    
     try:
         print(f"DEBUG: GET sessions for user {user.email} with role {user.role}")
         
         if user.role == 'teacher':
-            sessions = LiveSession.objects.filter(teacher=user).order_by('-scheduled_datetime')
-            print(f"DEBUG: Found {sessions.count()} sessions for teacher")
+            sessions = LiveSession.objects.filter(teacher=user)
         elif user.role == 'advisor':
-            sessions = LiveSession.objects.all().order_by('-scheduled_datetime')
-            print(f"DEBUG: Found {sessions.count()} total sessions for advisor")
+            sessions = LiveSession.objects.all()
         elif user.role == 'student':
-            # Get sessions assigned to this student
+            # Get sessions assigned to this student (subquery keeps the assignment count below unfiltered)
             sessions = LiveSession.objects.filter(
-                assignments__student=user
-            ).order_by('-scheduled_datetime')
-            print(f"DEBUG: Found {sessions.count()} assigned sessions for student")
+                id__in=LiveSessionAssignment.objects.filter(student=user).values('session_id')
+            )
         else:
             sessions = LiveSession.objects.none()
             print(f"DEBUG: Unknown role {user.role}, returning empty queryset")
         
+        sessions = sessions.select_related('teacher').annotate(
+            assigned_count=Count('assignments', distinct=True)
+        ).order_by(*SessionKeysetPagination.ordering)
+        
+        paginator = SessionKeysetPagination()
+        page = paginator.paginate_queryset(sessions, request)
+        
         # Convert to list of dicts
         sessions_data = []
-        for session in sessions:
+        for session in (page if page is not None else sessions):
             sessions_data.append({
                 'id': session.id,
                 'title': session.title,
@@ -155,20 +172,38 @@ def get_sessions(request):
                 'duration_minutes': session.duration_minutes,
                 'teacher_name': session.teacher.get_full_name(),
                 'can_be_modified': session.can_be_modified,
-                'assigned_students_count': session.assignments.count(),
+                'assigned_students_count': session.assigned_count,
                 'created_at': session.created_at.isoformat(),
                 'updated_at': session.updated_at.isoformat()
             })
         
         print(f"DEBUG: Returning {len(sessions_data)} sessions")
+        if page is not None:
+            return paginator.get_paginated_response(sessions_data)
         return Response(sessions_data)
         
+    except ValidationError:
+        raise
     except Exception as e:
         # Return empty array if database query fails
         print(f"DEBUG: Database query failed: {e}")
         print(f"DEBUG: Returning empty array instead of mock data")
         return Response([])
 
+def _with_can_be_modified(sessions_data):
+    """Add can_be_modified to cached schedule entries; it depends on the current time, so it is never cached"""
+    from datetime import datetime
+    from ..models.live_sessions_models import LiveSession
+    
+    return [
+        {**entry, 'can_be_modified': LiveSession(
+            status=entry['status'],
+            scheduled_datetime=datetime.fromisoformat(entry['scheduled_datetime']),
+            duration_minutes=entry['duration_minutes']
+        ).can_be_modified}
+        for entry in sessions_data
+    ]
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_my_schedule(request):
@@ -176,12 +211,19 @@ def get_my_schedule(request):
     user = request.user
     
     try:
-        from ..models.live_sessions_models import LiveSession
+        from ..models.live_sessions_models import LiveSession, LiveSessionAssignment
+        from ..serializers.live_sessions_serializers import with_assignment_counts
+        from ..services import cache_service
+        
+        cache_key = cache_service.make_key('my_schedule', user.id, scopes=[cache_service.schedule_scope(user.id)])
+        cached_schedule = cache_service.get_cached(cache_key)
+        if cached_schedule is not None:
+            return Response(_with_can_be_modified(cached_schedule))
         
         if user.role == 'student':
             # Get sessions assigned to this student
             sessions = LiveSession.objects.filter(
-                assignments__student=user,
+                id__in=LiveSessionAssignment.objects.filter(student=user).values('session_id'),
                 status__in=['ASSIGNED', 'ACTIVE']
             ).order_by('scheduled_datetime')
             print(f"DEBUG: Found {sessions.count()} sessions for student {user.email}")
@@ -198,7 +240,7 @@ def get_my_schedule(request):
         
         # Convert to list of dicts
         sessions_data = []
-        for session in sessions:
+        for session in with_assignment_counts(sessions):
             sessions_data.append({
                 'id': session.id,
                 'title': session.title,
@@ -209,13 +251,12 @@ def get_my_schedule(request):
                 'scheduled_datetime': session.scheduled_datetime.isoformat(),
                 'duration_minutes': session.duration_minutes,
                 'teacher_name': session.teacher.get_full_name(),
-                'can_be_modified': session.can_be_modified,
-                'assigned_students_count': session.assignments.count(),
+                'assigned_students_count': session.assigned_count,
                 'created_at': session.created_at.isoformat(),
                 'updated_at': session.updated_at.isoformat()
             })
         
-        return Response(sessions_data)
+        return Response(_with_can_be_modified(cache_service.set_cached(cache_key, sessions_data)))
         
     except Exception as e:
         print(f"Error in get_my_schedule: {e}")
@@ -248,80 +289,6 @@ def get_pending_sessions(request):
     
     return Response(mock_sessions)
 
-@api_view(['POST'])
-@permission_classes([IsAuthenticated])
-def assign_session(request, session_id):
-    """Assign session to students (advisors only)"""
-    user = request.user
-    
-    # Check if user is advisor
-    if user.role != 'advisor':
-        return Response(
-            {'error': 'Only advisors can assign sessions'}, 
-            status=status.HTTP_403_FORBIDDEN
-        )
-    
-    try:
-        from ..models.live_sessions_models import LiveSession, LiveSessionAssignment
-        from ..models.user_model import User
-        
-        # Get the session
-        session = LiveSession.objects.get(id=session_id)
-        
-        # Get data from request
-        student_ids = request.data.get('student_ids', [])
-        message = request.data.get('message', '')
-        
-        if not student_ids:
-            return Response(
-                {'error': 'No students selected'}, 
-                status=status.HTTP_400_BAD_REQUEST
-            )
-        
-        # Create assignments
-        assignments = []
-        for student_id in student_ids:
-            try:
-                student = User.objects.get(id=student_id, role='student')
-                assignment, created = LiveSessionAssignment.objects.get_or_create(
-                    session=session,
-                    student=student,
-                    defaults={'advisor': user, 'assignment_message': message}
-                )
-                if created:
-                    assignments.append(assignment)
-                    print(f"DEBUG: Created assignment for student {student.email} to session {session.title}")
-                else:
-                    print(f"DEBUG: Assignment already exists for student {student.email} to session {session.title}")
-            except User.DoesNotExist:
-                print(f"DEBUG: Student with id {student_id} not found")
-                continue
-        
-        # Update session status
-        if assignments:
-            session.status = 'ASSIGNED'
-            session.save()
-            print(f"DEBUG: Updated session {session.title} status to ASSIGNED")
-        
-        print(f"DEBUG: Total assignments created: {len(assignments)}")
-        return Response({
-            'message': f'Session assigned to {len(assignments)} students',
-            'assignments': len(assignments),
-            'session_id': session.id,
-            'session_status': session.status
-        })
-        
-    except LiveSession.DoesNotExist:
-        return Response(
-            {'error': 'Session not found'}, 
-            status=status.HTTP_404_NOT_FOUND
-        )
-    except Exception as e:
-        return Response(
-            {'error': f'Failed to assign session: {str(e)}'}, 
-            status=status.HTTP_500_INTERNAL_SERVER_ERROR
-        )
-
 @api_view(['PUT'])
 @permission_classes([IsAuthenticated])
 def update_session(request, session_id):
@@ -380,6 +347,17 @@ def update_session(request, session_id):
             
             session.scheduled_datetime = scheduled_dt
         
+        # A new time or duration must not overlap the teacher's other sessions
+        if 'scheduled_datetime' in data or 'duration_minutes' in data:
+            from ..services import schedule_conflicts
+            if schedule_conflicts.has_conflict(
+                user.id, session.scheduled_datetime, session.duration_minutes, exclude_id=session.id
+            ):
+                return Response(
+                    {'error': schedule_conflicts.CONFLICT_MESSAGE},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+        
         session.save()
         
         return Response({
@@ -438,6 +416,10 @@ def cancel_session(request, session_id):
         session.status = 'CANCELLED'
         session.save()
         
+        # Let the assigned students know
+        from ..services import notification_service
+        notification_service.notify_cancelled(session)
+        
         return Response({
             'message': f'Session "{session.title}" has been cancelled',
             'session_id': session.id
@@ -468,71 +450,39 @@ def assign_session(request, session_id):
         )
     
     try:
-        from ..models.live_sessions_models import LiveSession, LiveSessionAssignment
-        from ..models.user_model import User
-        
+        from ..models.live_sessions_models import LiveSession
+        from ..services import bulk_assignment
+
         # Get the session
         session = LiveSession.objects.get(id=session_id)
-        
+
         # Get data from request
         student_ids = request.data.get('student_ids', [])
         message = request.data.get('message', '')
-        
+
         if not student_ids:
             return Response(
-                {'error': 'No students selected'}, 
+                {'error': 'No students selected'},
                 status=status.HTTP_400_BAD_REQUEST
             )
-        
-        # Create assignments (allow multiple assignments)
-        assignments = []
-        existing_assignments = []
-        
-        for student_id in student_ids:
-            try:
-                student = User.objects.get(id=student_id, role='student')
-                
-                # Check if assignment already exists
-                existing_assignment = LiveSessionAssignment.objects.filter(
-                    session=session,
-                    student=student
-                ).first()
-                
-                if existing_assignment:
-                    existing_assignments.append(student.get_full_name())
-                    print(f"DEBUG: Assignment already exists for student {student.email}")
-                else:
-                    # Create new assignment
-                    assignment = LiveSessionAssignment.objects.create(
-                        session=session,
-                        student=student,
-                        advisor=user,
-                        assignment_message=message
-                    )
-                    assignments.append(assignment)
-                    print(f"DEBUG: Created new assignment for student {student.email}")
-                    
-            except User.DoesNotExist:
-                print(f"DEBUG: Student with id {student_id} not found")
-                continue
-        
-        # Update session status if new assignments were created
-        if assignments:
-            session.status = 'ASSIGNED'
-            session.save()
-            print(f"DEBUG: Updated session {session.title} status to ASSIGNED")
-        
-        response_message = f'Session assigned to {len(assignments)} new students'
-        if existing_assignments:
-            response_message += f'. {len(existing_assignments)} students were already assigned'
-        
-        print(f"DEBUG: Total new assignments created: {len(assignments)}")
+
+        # Validate all students and create the missing assignments in bulk
+        results = bulk_assignment.assign_to_session(session, student_ids, user, message)
+        new_count = bulk_assignment.count(results, bulk_assignment.ASSIGNED)
+        existing_count = bulk_assignment.count(results, bulk_assignment.ALREADY_ASSIGNED)
+
+        response_message = f'Session assigned to {new_count} new students'
+        if existing_count:
+            response_message += f'. {existing_count} students were already assigned'
+
+        print(f"DEBUG: Total new assignments created: {new_count}")
         return Response({
             'message': response_message,
-            'new_assignments': len(assignments),
-            'existing_assignments': len(existing_assignments),
+            'new_assignments': new_count,
+            'existing_assignments': existing_count,
             'session_id': session.id,
-            'session_status': session.status
+            'session_status': session.status,
+            'results': results
         })
         
     except LiveSession.DoesNotExist:
@@ -617,8 +567,9 @@ def debug_sessions(request):
     """Debug endpoint to see all sessions in database"""
     try:
         from ..models.live_sessions_models import LiveSession
+        from ..serializers.live_sessions_serializers import with_assignment_counts
         
-        sessions = LiveSession.objects.all()
+        sessions = with_assignment_counts(LiveSession.objects.all())
         sessions_data = []
         
         for session in sessions:
@@ -628,7 +579,7 @@ def debug_sessions(request):
                 'status': session.status,
                 'teacher': session.teacher.email if session.teacher else 'No teacher',
                 'created_at': session.created_at.isoformat(),
-                'assigned_count': session.assignments.count()
+                'assigned_count': session.assigned_count
             })
         
         return Response({
@@ -657,6 +608,7 @@ def unassign_session(request, session_id):
     
     try:
         from ..models.live_sessions_models import LiveSession, LiveSessionAssignment
+        from ..services import bulk_assignment
         
         # Get the session
         session = LiveSession.objects.get(id=session_id)
@@ -670,24 +622,11 @@ def unassign_session(request, session_id):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Remove assignments
-        removed_count = 0
-        removed_students = []
-        for student_id in student_ids:
-            try:
-                assignment = LiveSessionAssignment.objects.get(
-                    session=session,
-                    student_id=student_id
-                )
-                student_name = assignment.student.get_full_name()
-                assignment.delete()
-                removed_count += 1
-                removed_students.append(student_name)
-                print(f"DEBUG: Removed assignment for student {student_name}")
-            except LiveSessionAssignment.DoesNotExist:
-                print(f"DEBUG: No assignment found for student {student_id}")
-                continue
-        
+        # Remove assignments in one statement
+        results, removed_students = bulk_assignment.unassign_from_session(session, student_ids)
+        removed_count = len(removed_students)
+        print(f"DEBUG: Removed {removed_count} assignments from session {session.title}")
+
         # Update session status if no assignments left
         remaining_assignments = LiveSessionAssignment.objects.filter(session=session).count()
         if remaining_assignments == 0:
@@ -700,7 +639,8 @@ def unassign_session(request, session_id):
             'removed_assignments': removed_count,
             'remaining_assignments': remaining_assignments,
             'removed_students': removed_students,
-            'session_status': session.status
+            'session_status': session.status,
+            'results': results
         })
         
     except LiveSession.DoesNotExist:
@@ -893,4 +833,171 @@ def join_session(request, session_id):
                 'title': 'Session',
                 'status': 'ACTIVE'
             }
-        })
\ No newline at end of file
+        })
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def get_notifications(request):
+    """Notification inbox, newest first (cursor-paginated, ?unread=true for unread only)"""
+    from ..pagination import NotificationKeysetPagination
+    from ..services import notification_service
+    
+    user = request.user
+    unread_only = request.query_params.get('unread', '').lower() in ('1', 'true', 'yes')
+    notifications = notification_service.inbox(user, unread_only=unread_only)
+    
+    paginator = NotificationKeysetPagination()
+    page = paginator.paginate_queryset(notifications, request)
+    
+    notifications_data = []
+    for notification in page:
+        session = notification.session
+        notifications_data.append({
+            'id': notification.id,
+            'notification_type': notification.notification_type,
+            'notification_type_display': notification.get_notification_type_display(),
+            'title': notification.title,
+            'message': notification.message,
+            'session_id': notification.session_id,
+            'session_title': session.title if session else None,
+            'session_datetime': session.scheduled_datetime.isoformat() if session else None,
+            'is_read': notification.is_read,
+            'created_at': notification.created_at.isoformat(),
+            'read_at': notification.read_at.isoformat() if notification.read_at else None
+        })
+    
+    response = paginator.get_paginated_response(notifications_data)
+    response.data['unread_count'] = notification_service.unread_count(user)
+    return response
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def get_unread_notification_count(request):
+    """Unread badge, read from the user's counter row"""
+    from ..services import notification_service
+    
+    return Response({'unread_count': notification_service.unread_count(request.user)})
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def mark_notifications_read(request):
+    """Mark notifications as read: {"ids": [...]} or {"all": true}"""
+    from ..services import notification_service
+    
+    user = request.user
+    if request.data.get('all'):
+        notification_ids = None
+    else:
+        notification_ids = request.data.get('ids', [])
+        if not isinstance(notification_ids, list) or not notification_ids:
+            return Response(
+                {'error': 'Provide a list of notification ids or "all": true'}, 
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            notification_ids = [int(notification_id) for notification_id in notification_ids]
+        except (TypeError, ValueError):
+            return Response(
+                {'error': 'Notification ids must be integers'}, 
+                status=status.HTTP_400_BAD_REQUEST
+            )
+    
+    updated = notification_service.mark_read(user, notification_ids)
+    return Response({
+        'updated': updated,
+        'unread_count': notification_service.unread_count(user)
+    })
+
+def _parse_calendar_bound(value):
+    """ISO datetime or date from a query parameter; None if missing, ValueError if malformed"""
+    from django.utils.dateparse import parse_date, parse_datetime
+    from django.utils import timezone as django_timezone
+    
+    if not value:
+        return None
+    parsed = parse_datetime(value)
+    if parsed is None:
+        day = parse_date(value)
+        if day is None:
+            raise ValueError(value)
+        parsed = datetime.combine(day, datetime.min.time())
+    if not django_timezone.is_aware(parsed):
+        parsed = django_timezone.make_aware(parsed)
+    return parsed
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def get_calendar(request):
+    """Calendar window from the user's materialized schedule (?start=&end=, ETag aware)"""
+    from datetime import timedelta
+    from django.utils import timezone as django_timezone
+    from ..services import schedule_service
+    
+    user = request.user
+    try:
+        start = _parse_calendar_bound(request.query_params.get('start'))
+        end = _parse_calendar_bound(request.query_params.get('end'))
+    except ValueError as e:
+        return Response(
+            {'error': f'Invalid date: {e}'}, 
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    if start is None:
+        start = django_timezone.localtime().replace(hour=0, minute=0, second=0, microsecond=0)
+    if end is None:
+        end = start + timedelta(days=30)
+    if end <= start or end - start > timedelta(days=schedule_service.MAX_WINDOW_DAYS):
+        return Response(
+            {'error': f'The window must end after it starts and span at most {schedule_service.MAX_WINDOW_DAYS} days'}, 
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    schedule = schedule_service.get_schedule(user)
+    etag = schedule_service.etag(schedule, int(start.timestamp()), int(end.timestamp()))
+    if request.headers.get('If-None-Match') == etag:
+        return Response(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+    
+    entries = schedule_service.window(user, start, end)
+    return Response({
+        'start': start.isoformat(),
+        'end': end.isoformat(),
+        'revision': schedule.revision,
+        'sessions': [schedule_service.entry_data(entry) for entry in entries]
+    }, headers={'ETag': etag, 'Cache-Control': 'private, max-age=60'})
+
+@api_view(['GET', 'POST'])
+@permission_classes([IsAuthenticated])
+def get_calendar_feed_url(request):
+    """Private iCalendar feed URL of the user; POST issues a new one"""
+    from ..services import schedule_service
+    
+    if request.method == 'POST':
+        schedule = schedule_service.rotate_feed_token(request.user)
+    else:
+        schedule = schedule_service.get_schedule(request.user)
+    
+    return Response({
+        'feed_url': request.build_absolute_uri(f'/api/live-sessions/calendar/{schedule.feed_token}.ics')
+    })
+
+@api_view(['GET'])
+@authentication_classes([])
+@permission_classes([AllowAny])
+def calendar_feed(request, token):
+    """iCalendar feed for calendar apps; the token in the URL identifies the user"""
+    from django.http import HttpResponse
+    from ..models.live_sessions_models import UserSchedule
+    from ..services import schedule_service
+    
+    schedule = UserSchedule.objects.filter(feed_token=token).first()
+    if schedule is None:
+        return HttpResponse('Calendar not found', status=404, content_type='text/plain')
+    
+    etag = schedule_service.etag(schedule, 'ics')
+    if request.headers.get('If-None-Match') == etag:
+        response = HttpResponse(status=304)
+    else:
+        response = HttpResponse(schedule_service.feed(schedule), content_type='text/calendar; charset=utf-8')
+    response['ETag'] = etag
+    response['Cache-Control'] = 'private, max-age=300'
+    return response
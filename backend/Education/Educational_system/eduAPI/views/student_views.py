@@ -4,11 +4,13 @@ from rest_framework.response import Response
 from rest_framework import status
 from eduAPI.models import User, Lesson, StudentEnrollment, LessonAssignment, Quiz, QuizAttempt, QuizAnswer, Question, Answer
 from eduAPI.serializers import LessonSerializer
-from eduAPI.serializers.lessons_serializers import QuizSerializer, QuizAttemptSerializer
+from eduAPI.serializers.lessons_serializers import QuizSerializer, QuizAttemptSerializer, StudentDashboardLessonSerializer
+from eduAPI.services import cache_service, media_service
+from eduAPI.services.quiz_service import QuizService, QuizSubmissionError
 import logging
 from django.conf import settings
 import os
-from django.db.models import Avg
+from django.db.models import Avg, Count
 from django.utils import timezone
 
 logger = logging.getLogger(__name__)
@@ -28,22 +30,20 @@ def get_student_dashboard_lessons(request):
         )
     
     try:
-        # Get all enrollments for the current student
-        enrollments = StudentEnrollment.objects.filter(student=request.user)
+        # One query for every enrollment: lesson and teacher are joined in,
+        # content/quiz counts are annotated instead of serializing full quiz trees
+        enrollments = (
+            StudentEnrollment.objects
+            .filter(student=request.user)
+            .select_related('lesson__teacher')
+            .annotate(
+                content_count=Count('lesson__contents', distinct=True),
+                quiz_count=Count('lesson__quizzes', distinct=True),
+            )
+            .order_by('-enrollment_date')
+        )
         
-        lessons_data = []
-        for enrollment in enrollments:
-            # Create a lesson object with additional data from enrollment
-            lesson_data = LessonSerializer(enrollment.lesson).data
-            
-            # Add enrollment-specific data
-            lesson_data['progress'] = enrollment.progress
-            lesson_data['assigned_date'] = enrollment.enrollment_date
-            lesson_data['last_activity'] = enrollment.last_activity_date
-            
-            lessons_data.append(lesson_data)
-            
-        return Response(lessons_data)
+        return Response(StudentDashboardLessonSerializer(enrollments, many=True).data)
         
     except Exception as e:
         return Response(
@@ -82,6 +82,7 @@ def get_student_lesson_detail(request, lesson_id):
             
             # Serialize and return data
             data = LessonSerializer(lesson).data
+            data['contents'] = media_service.with_download_tokens(data['contents'], request.user)
             data['progress'] = enrollment.progress
             data['assigned_date'] = enrollment.enrollment_date
             data['last_activity'] = enrollment.last_activity_date
@@ -106,26 +107,32 @@ def get_student_lesson_detail(request, lesson_id):
     
     # For any other lesson ID, use the normal code path
     try:
-        # Try to find the lesson
-        try:
-            lesson = Lesson.objects.get(id=lesson_id)
-        except Lesson.DoesNotExist:
-            return Response(
-                {'detail': 'Lesson not found'},
-                status=status.HTTP_404_NOT_FOUND
-            )
+        # The serialized lesson is shared by all students; a hit also proves the lesson exists
+        cache_key = cache_service.make_key('student_lesson', lesson_id, scopes=[cache_service.lesson_scope(lesson_id)])
+        lesson_data = cache_service.get_cached(cache_key)
+        if lesson_data is None:
+            # Try to find the lesson
+            try:
+                lesson = Lesson.objects.get(id=lesson_id)
+            except Lesson.DoesNotExist:
+                return Response(
+                    {'detail': 'Lesson not found'},
+                    status=status.HTTP_404_NOT_FOUND
+                )
+            lesson_data = cache_service.set_cached(cache_key, LessonSerializer(lesson).data)
         
         # Auto-create enrollment for testing
         enrollment = StudentEnrollment.objects.filter(student=request.user, lesson_id=lesson_id).first()
         if not enrollment:
             enrollment = StudentEnrollment.objects.create(
                 student=request.user,
-                lesson=lesson,
+                lesson_id=lesson_id,
                 progress=0
             )
         
         # Return lesson data
-        lesson_data = LessonSerializer(lesson).data
+        lesson_data = dict(lesson_data)
+        lesson_data['contents'] = media_service.with_download_tokens(lesson_data['contents'], request.user)
         lesson_data['progress'] = enrollment.progress
         lesson_data['assigned_date'] = getattr(enrollment, 'enrollment_date', None)
         lesson_data['last_activity'] = getattr(enrollment, 'last_activity_date', None)
@@ -149,14 +156,15 @@ def get_student_lesson_contents(request, lesson_id):
     print(f"Requesting contents for lesson ID: {lesson_id}")
     
     try:
-        # Try to find the lesson
-        try:
-            lesson = Lesson.objects.get(id=lesson_id)
-        except Lesson.DoesNotExist:
-            return Response(
-                {'detail': 'Lesson not found'},
-                status=status.HTTP_404_NOT_FOUND
-            )
+        cache_key = cache_service.make_key('student_lesson_contents', lesson_id, scopes=[cache_service.lesson_scope(lesson_id)])
+        cached_contents = cache_service.get_cached(cache_key)
+        if cached_contents is None:
+            # Try to find the lesson
+            if not Lesson.objects.filter(id=lesson_id).exists():
+                return Response(
+                    {'detail': 'Lesson not found'},
+                    status=status.HTTP_404_NOT_FOUND
+                )
         
         # Check if student is enrolled in the lesson or auto-enroll for testing
         enrollment = StudentEnrollment.objects.filter(student=request.user, lesson_id=lesson_id).first()
@@ -164,10 +172,13 @@ def get_student_lesson_contents(request, lesson_id):
             print(f"Auto-enrolling student {request.user.id} in lesson {lesson_id}")
             enrollment = StudentEnrollment.objects.create(
                 student=request.user,
-                lesson=lesson,
+                lesson_id=lesson_id,
                 progress=0
             )
         
+        if cached_contents is not None:
+            return Response(media_service.with_download_tokens(cached_contents, request.user))
+        
         # Get lesson contents
         from eduAPI.models.lessons_model import LessonContent
         from eduAPI.serializers.lessons_serializers import LessonContentSerializer
@@ -188,7 +199,8 @@ def get_student_lesson_contents(request, lesson_id):
             print(f"  - Media root: {settings.MEDIA_ROOT}")
         
         serializer = LessonContentSerializer(contents, many=True)
-        return Response(serializer.data)
+        cached_contents = cache_service.set_cached(cache_key, serializer.data)
+        return Response(media_service.with_download_tokens(cached_contents, request.user))
         
     except Exception as e:
         print(f"ERROR in get_student_lesson_contents: {str(e)}")
@@ -208,14 +220,15 @@ def get_student_lesson_quizzes(request, lesson_id):
     print(f"Requesting quizzes for lesson ID: {lesson_id}")
     
     try:
-        # Try to find the lesson
-        try:
-            lesson = Lesson.objects.get(id=lesson_id)
-        except Lesson.DoesNotExist:
-            return Response(
-                {'detail': 'Lesson not found'},
-                status=status.HTTP_404_NOT_FOUND
-            )
+        cache_key = cache_service.make_key('student_lesson_quizzes', lesson_id, scopes=[cache_service.lesson_scope(lesson_id)])
+        cached_quizzes = cache_service.get_cached(cache_key)
+        if cached_quizzes is None:
+            # Try to find the lesson
+            if not Lesson.objects.filter(id=lesson_id).exists():
+                return Response(
+                    {'detail': 'Lesson not found'},
+                    status=status.HTTP_404_NOT_FOUND
+                )
         
         # Check if student is enrolled in the lesson or auto-enroll for testing
         enrollment = StudentEnrollment.objects.filter(student=request.user, lesson_id=lesson_id).first()
@@ -223,10 +236,13 @@ def get_student_lesson_quizzes(request, lesson_id):
             print(f"Auto-enrolling student {request.user.id} in lesson {lesson_id}")
             enrollment = StudentEnrollment.objects.create(
                 student=request.user,
-                lesson=lesson,
+                lesson_id=lesson_id,
                 progress=0
             )
         
+        if cached_quizzes is not None:
+            return Response(cached_quizzes)
+        
         # Get lesson quizzes
         from eduAPI.models.lessons_model import Quiz
         from eduAPI.serializers.lessons_serializers import QuizSerializer
@@ -235,7 +251,7 @@ def get_student_lesson_quizzes(request, lesson_id):
         print(f"Found {quizzes.count()} quiz items")
         
         serializer = QuizSerializer(quizzes, many=True)
-        return Response(serializer.data)
+        return Response(cache_service.set_cached(cache_key, serializer.data))
         
     except Exception as e:
         print(f"ERROR in get_student_lesson_quizzes: {str(e)}")
@@ -371,6 +387,48 @@ def submit_quiz_answer(request, attempt_id):
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
 
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def submit_quiz_answers(request, attempt_id):
+    """
+    Submit every answer of a quiz attempt in one request:
+    {"answers": [{"question_id": 1, "answer_id": 3}, ...], "complete": true}
+    With complete, the attempt is also scored and closed.
+    """
+    try:
+        # Check if the requesting user is a student
+        if request.user.role != 'student':
+            return Response(
+                {'detail': 'Only student users can access this endpoint'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+
+        attempt = QuizAttempt.objects.select_related('quiz').filter(pk=attempt_id, student=request.user).first()
+        if not attempt:
+            return Response(
+                {'detail': 'Quiz attempt not found or does not belong to you'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        try:
+            saved = QuizService.submit_answers(attempt, request.data.get('answers'))
+        except QuizSubmissionError as e:
+            return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        if not request.data.get('complete'):
+            return Response({'success': True, 'saved': saved}, status=status.HTTP_200_OK)
+
+        QuizService.complete_attempt(attempt)
+        serializer = QuizAttemptSerializer(QuizService.get_attempt_with_answers(attempt.id, request.user))
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+    except Exception as e:
+        logger.error(f"Error submitting quiz answers: {str(e)}")
+        return Response(
+            {'detail': f'Error submitting answers: {str(e)}'},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def complete_quiz_attempt(request, attempt_id):
@@ -394,57 +452,9 @@ def complete_quiz_attempt(request, attempt_id):
                 status=status.HTTP_404_NOT_FOUND
             )
             
-        # Mark attempt as completed
-        if not attempt.end_time:  # Only if not already completed
-            # Calculate score
-            answers = QuizAnswer.objects.filter(attempt=attempt)
-            correct_answers = answers.filter(is_correct=True).count()
-            total_questions = attempt.quiz.questions.count()
-            
-            if total_questions > 0:
-                score_percentage = (correct_answers / total_questions) * 100
-            else:
-                score_percentage = 0
-                
-            # Update the attempt
-            attempt.score = score_percentage
-            attempt.passed = score_percentage >= 70  # Pass threshold 70%
-            attempt.end_time = timezone.now()
-            attempt.save()
-            
-            # Update lesson progress - find enrollment
-            lesson = attempt.quiz.lesson
-            enrollment = StudentEnrollment.objects.get(student=request.user, lesson=lesson)
-            
-            # Get quiz attempts for this lesson
-            lesson_quizzes = Quiz.objects.filter(lesson=lesson)
-            completed_quizzes = set()
-            
-            # Count completed quizzes
-            for quiz in lesson_quizzes:
-                completed_attempts = QuizAttempt.objects.filter(
-                    student=request.user,
-                    quiz=quiz,
-                    end_time__isnull=False,
-                    passed=True
-                ).exists()
-                
-                if completed_attempts:
-                    completed_quizzes.add(quiz.id)
-            
-            # Calculate progress based on completed quizzes
-            if lesson_quizzes.count() > 0:
-                progress = (len(completed_quizzes) / lesson_quizzes.count()) * 100
-                
-                # Also factor in other progress metrics (e.g., content views)
-                # But ensure quiz completion has significant weight
-                # For now, we'll just use quiz completion directly
-                
-                # Update enrollment progress if higher than current
-                if progress > enrollment.progress:
-                    enrollment.progress = min(100, round(progress))
-                    enrollment.save()
-                    print(f"Updated lesson progress to {enrollment.progress}% for student {request.user.id}")
+        # Score, close and update lesson progress with set-based queries
+        QuizService.complete_attempt(attempt)
+        attempt = QuizService.get_attempt_with_answers(attempt.id, request.user)
             
         # Return serialized attempt
         serializer = QuizAttemptSerializer(attempt)
@@ -0,0 +1,92 @@
+import io
+
+from rest_framework import status
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework.permissions import IsAuthenticated
+
+from eduAPI.serializers.lessons_serializers import LessonContentSerializer
+from eduAPI.serializers.live_sessions_serializers import LiveSessionMaterialSerializer
+from eduAPI.services.upload_service import ChunkedUploadService, UploadError
+
+
+def upload_state(upload):
+    return {
+        'upload_id': str(upload.id),
+        'status': upload.status,
+        'filename': upload.filename,
+        'total_size': upload.total_size,
+        'chunk_size': upload.chunk_size,
+        'total_chunks': upload.total_chunks,
+        'received_chunks': ChunkedUploadService.received_chunks(upload),
+        'expires_at': upload.expires_at,
+    }
+
+
+class ChunkedUploadListView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        """Start a resumable upload for lesson content or a session material."""
+        try:
+            upload = ChunkedUploadService.start_upload(request.user, request.data)
+        except UploadError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(upload_state(upload), status=status.HTTP_201_CREATED)
+
+
+class ChunkedUploadDetailView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, upload_id):
+        """Upload progress; clients resume by sending the chunks not listed yet."""
+        upload = ChunkedUploadService.get_upload(upload_id, request.user)
+        if not upload:
+            return Response({"detail": "Upload not found."}, status=status.HTTP_404_NOT_FOUND)
+        return Response(upload_state(upload))
+
+    def delete(self, request, upload_id):
+        """Abort an upload and discard what was received."""
+        upload = ChunkedUploadService.get_upload(upload_id, request.user)
+        if not upload:
+            return Response({"detail": "Upload not found."}, status=status.HTTP_404_NOT_FOUND)
+        if upload.status == 'UPLOADING':
+            ChunkedUploadService.abort_upload(upload)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class ChunkedUploadChunkView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def put(self, request, upload_id, index):
+        """Receive one chunk as the raw request body (X-Chunk-SHA256: hex digest)."""
+        upload = ChunkedUploadService.get_upload(upload_id, request.user)
+        if not upload:
+            return Response({"detail": "Upload not found."}, status=status.HTTP_404_NOT_FOUND)
+
+        # request.stream is read directly so the body never goes through the upload handlers
+        stream = request.stream or io.BytesIO()
+        try:
+            size = ChunkedUploadService.write_chunk(upload, index, stream, request.META.get('HTTP_X_CHUNK_SHA256'))
+        except UploadError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({'index': index, 'size': size})
+
+
+class ChunkedUploadCompleteView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, upload_id):
+        """Assemble the upload and create the LessonContent or LiveSessionMaterial."""
+        try:
+            upload = ChunkedUploadService.complete_upload(upload_id, request.user)
+        except UploadError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        if not upload:
+            return Response({"detail": "Upload not found."}, status=status.HTTP_404_NOT_FOUND)
+
+        if upload.target == 'LESSON_CONTENT':
+            data = LessonContentSerializer(upload.lesson_content, context={'request': request}).data
+        else:
+            data = LiveSessionMaterialSerializer(upload.material, context={'request': request}).data
+        return Response(data, status=status.HTTP_201_CREATED)
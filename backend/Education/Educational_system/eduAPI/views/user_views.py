@@ -14,6 +14,7 @@ from django.shortcuts import get_object_or_404
 from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework.parsers import MultiPartParser, FormParser
 from rest_framework.views import APIView
+from rest_framework.exceptions import ValidationError
 from ..models.user_model import User
 from django.db.models import Q
 import logging
@@ -403,80 +404,57 @@ def get_students(request):
                 'message': 'Only teachers can access student information'
             }, status=status.HTTP_403_FORBIDDEN)
         
-        # Get teacher's lessons
-        from ..models.lessons_model import Lesson, StudentEnrollment
-        teacher_lessons = Lesson.objects.filter(teacher=request.user.id)
-        
-        # Find students enrolled in these lessons
-        # Since migration might not be complete, handle potential errors
-        try:
-            # The ideal way using the StudentEnrollment model
-            # Get all students enrolled in any of this teacher's lessons
-            student_ids = StudentEnrollment.objects.filter(
-                lesson__in=teacher_lessons
-            ).values_list('student', flat=True).distinct()
-            
-            # Get the actual student user objects, excluding the teacher themselves
-            students = User.objects.filter(id__in=student_ids).exclude(id=request.user.id)
-        except Exception as e:
-            print(f"Error using StudentEnrollment model: {e}")
-            # Fallback: just get a few student users as an example
-            # In production, remove this fallback and rely on enrollments
-            students = User.objects.filter(role='student')[:5]  # Just get first 5 students as example
+        # One materialized row per (student, lesson) of this teacher: progress
+        # and quiz results are read instead of recomputed per enrollment
+        from ..models.performance_models import StudentLessonStats
+        from ..services import performance_service
+        performance_service.fill_missing_for_teacher(request.user.id)
+        lesson_stats = StudentLessonStats.objects.filter(
+            lesson__teacher=request.user,
+            enrolled=True
+        ).exclude(student=request.user).select_related('student', 'lesson').order_by('student_id', 'lesson_id')
+        
+        students = {}
+        for stats in lesson_stats:
+            entry = students.get(stats.student_id)
+            if entry is None:
+                student = stats.student
+                entry = students[stats.student_id] = {
+                    'id': student.id,
+                    'first_name': student.first_name,
+                    'last_name': student.last_name,
+                    'email': student.email,
+                    'grade': student.grade_level,
+                    'enrolled_lessons': [],
+                    'lessons': [],
+                    'progress': [],
+                    'quiz_attempts': 0,
+                    'passed_attempts': 0,
+                    'best_score': None,
+                    'last_activity': None,
+                    'last_login': student.last_login.isoformat() if student.last_login else None
+                }
+            entry['enrolled_lessons'].append(stats.lesson.name)
+            entry['lessons'].append({
+                'id': stats.lesson.id,
+                'name': stats.lesson.name,
+                'subject': stats.lesson.subject
+            })
+            entry['progress'].append(stats.progress)
+            entry['quiz_attempts'] += stats.attempts
+            entry['passed_attempts'] += stats.passed_attempts
+            if stats.best_score is not None:
+                entry['best_score'] = max(entry['best_score'] or 0, stats.best_score)
+            if stats.last_activity and (entry['last_activity'] is None or stats.last_activity > entry['last_activity']):
+                entry['last_activity'] = stats.last_activity
         
-        # Serialize with necessary details
         student_data = []
-        for student in students:
-            # Calculate progress (should be fetched from StudentEnrollment)
-            try:
-                # Try to get average progress from enrollments
-                enrollments = StudentEnrollment.objects.filter(
-                    student=student,
-                    lesson__in=teacher_lessons
-                )
-                
-                if enrollments.exists():
-                    from django.db.models import Avg
-                    progress = enrollments.aggregate(Avg('progress'))['progress__avg'] or 0
-                    progress = round(progress)
-                    
-                    # Get lesson names
-                    enrolled_lesson_names = [e.lesson.name for e in enrollments]
-                    enrolled_lessons = [{
-                        'id': e.lesson.id,
-                        'name': e.lesson.name,
-                        'subject': e.lesson.subject
-                    } for e in enrollments]
-                else:
-                    # No enrollments found
-                    progress = 0
-                    enrolled_lesson_names = []
-                    enrolled_lessons = []
-            except Exception as e:
-                print(f"Error fetching enrollments: {e}")
-                # Placeholder fallback
-                import random
-                progress = random.randint(0, 100)
-                
-                # Get enrolled lessons for this student (fallback)
-                enrolled_lesson_names = [lesson.name for lesson in teacher_lessons[:3]]
-                enrolled_lessons = [{
-                    'id': lesson.id,
-                    'name': lesson.name,
-                    'subject': lesson.subject
-                } for lesson in teacher_lessons[:3]]
-            
-            student_data.append({
-                'id': student.id,
-                'first_name': student.first_name,
-                'last_name': student.last_name,
-                'email': student.email,
-                'grade': student.grade_level,
-                'enrolled_lessons': enrolled_lesson_names,
-                'lessons': enrolled_lessons,
-                'progress': progress,
-                'last_login': student.last_login.isoformat() if student.last_login else None
-            })
+        for entry in students.values():
+            progress = entry['progress']
+            entry['progress'] = round(sum(progress) / len(progress))
+            entry['pass_rate'] = round(entry['passed_attempts'] * 100 / entry['quiz_attempts']) if entry['quiz_attempts'] else None
+            entry['last_activity'] = entry['last_activity'].isoformat() if entry['last_activity'] else None
+            student_data.append(entry)
         
         return Response(student_data, status=status.HTTP_200_OK)
     
@@ -527,6 +505,27 @@ class AdvisorProfileView(APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+def _performance_summary(stats):
+    """Serialize a StudentStats row (None when the student has no activity yet)"""
+    if stats is None:
+        return {
+            'lessons': 0,
+            'average_progress': 0,
+            'quiz_attempts': 0,
+            'best_score': None,
+            'pass_rate': None,
+            'last_activity': None
+        }
+    return {
+        'lessons': stats.lessons,
+        'average_progress': stats.average_progress,
+        'quiz_attempts': stats.attempts,
+        'best_score': stats.best_score,
+        'pass_rate': stats.pass_rate,
+        'last_activity': stats.last_activity.isoformat() if stats.last_activity else None
+    }
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_students_by_grade(request, grade_level=None):
@@ -558,7 +557,8 @@ def get_students_by_grade(request, grade_level=None):
             )
             filters &= search_filters
             
-        students = User.objects.filter(filters).order_by('first_name', 'last_name')
+        # The materialized performance row is joined in: one row per student
+        students = User.objects.filter(filters).select_related('performance_stats').order_by('first_name', 'last_name')
         
         # Serialize student data
         student_data = []
@@ -569,7 +569,8 @@ def get_students_by_grade(request, grade_level=None):
                 'last_name': student.last_name,
                 'email': student.email,
                 'grade_level': student.grade_level,
-                'last_login': student.last_login.isoformat() if student.last_login else None
+                'last_login': student.last_login.isoformat() if student.last_login else None,
+                'performance': _performance_summary(getattr(student, 'performance_stats', None))
             })
         
         return Response(student_data, status=status.HTTP_200_OK)
@@ -601,7 +602,12 @@ def get_student_performance(request, student_id):
         
         # Get student's enrollments and performance data
         from ..models.lessons_model import StudentEnrollment
-        enrollments = StudentEnrollment.objects.filter(student=student)
+        from ..models.performance_models import StudentLessonStats, StudentStats
+        enrollments = StudentEnrollment.objects.filter(student=student).select_related('lesson')
+        lesson_stats = {
+            stats.lesson_id: stats for stats in StudentLessonStats.objects.filter(student=student)
+        }
+        summary = StudentStats.objects.filter(student=student).first()
         
         # Compile performance data
         performance_data = {
@@ -611,12 +617,14 @@ def get_student_performance(request, student_id):
                 'email': student.email,
                 'grade': student.grade_level
             },
+            'summary': _performance_summary(summary),
             'enrollments': []
         }
         
         # Add enrollment data
         for enrollment in enrollments:
             lesson = enrollment.lesson
+            stats = lesson_stats.get(lesson.id)
             
             # Add enrollment details
             performance_data['enrollments'].append({
@@ -626,7 +634,10 @@ def get_student_performance(request, student_id):
                 'grade_level': lesson.level,
                 'progress': enrollment.progress,
                 'enrollment_date': enrollment.enrollment_date.isoformat(),
-                'last_activity': enrollment.last_activity_date.isoformat()
+                'last_activity': enrollment.last_activity_date.isoformat(),
+                'quiz_attempts': stats.attempts if stats else 0,
+                'best_score': stats.best_score if stats else None,
+                'pass_rate': stats.pass_rate if stats else None
             })
         
         return Response(performance_data, status=status.HTTP_200_OK)
@@ -657,80 +668,75 @@ def get_student_quiz_answers(request, student_id):
         student = get_object_or_404(User, id=student_id, role=User.STUDENT)
         
         # Get all quiz attempts by this student for lessons taught by the teacher
-        from ..models.lessons_model import Lesson, QuizAttempt, QuizAnswer, Quiz
-        
-        # First, get all lessons taught by the teacher
-        teacher_lessons = Lesson.objects.filter(teacher=request.user)
+        from django.db.models import Prefetch
+        from ..models.lessons_model import QuizAttempt, QuizAnswer, Answer
+        from ..pagination import AttemptKeysetPagination
         
-        # Get all quizzes associated with these lessons
-        teacher_quizzes = Quiz.objects.filter(lesson__in=teacher_lessons)
-        
-        # Get all quiz attempts for these quizzes by the student
+        # Quiz and lesson are joined in and the answers with their question and
+        # selected option are prefetched, so the query count does not depend on
+        # the number of attempts or answers
         quiz_attempts = QuizAttempt.objects.filter(
             student=student,
-            quiz__in=teacher_quizzes
-        ).order_by('-start_time')  # Latest attempts first
+            quiz__lesson__teacher=request.user
+        ).select_related('quiz__lesson').prefetch_related(
+            Prefetch('quiz_answers', queryset=QuizAnswer.objects.select_related('question', 'selected_answer').order_by('question__order', 'id'))
+        ).order_by(*AttemptKeysetPagination.ordering)  # Latest attempts first
+        
+        # Optional pagination by attempt (?page_size= / ?cursor=)
+        paginator = AttemptKeysetPagination()
+        page = paginator.paginate_queryset(quiz_attempts, request)
+        attempts = page if page is not None else list(quiz_attempts)
         
-        if not quiz_attempts.exists():
+        if not attempts and page is None:
             return Response({
                 'status': 'info',
                 'message': 'No quiz attempts found for this student in your lessons.'
             }, status=status.HTTP_200_OK)
+        
+        # Correct option of every answered question, in one query
+        question_ids = {answer.question_id for attempt in attempts for answer in attempt.quiz_answers.all()}
+        correct_answers = {}
+        for question_id, answer_text in Answer.objects.filter(
+            question_id__in=question_ids, is_correct=True
+        ).order_by('id').values_list('question_id', 'answer_text'):
+            correct_answers.setdefault(question_id, answer_text)
             
         # Structure the response data
         response_data = []
         
-        for attempt in quiz_attempts:
-            try:
-                quiz = attempt.quiz
-                lesson = quiz.lesson
-                
-                # Get all answers for this attempt
-                quiz_answers = QuizAnswer.objects.filter(attempt=attempt)
-                
-                # Serialize the answers
-                answers_data = []
-                for answer in quiz_answers:
-                    try:
-                        correct_answer = next((a.answer_text for a in answer.question.answers.all() if a.is_correct), None)
-                        answers_data.append({
-                            'question_text': answer.question.question_text,
-                            'selected_answer': answer.selected_answer.answer_text,
-                            'is_correct': answer.is_correct,
-                            'correct_answer': correct_answer,
-                        })
-                    except Exception as answer_error:
-                        # Handle potential errors with individual answers
-                        logger.error(f"Error processing answer: {answer_error}")
-                        continue
-                
-                attempt_data = {
-                    'attempt_id': attempt.id,
-                    'quiz_id': quiz.id,
-                    'quiz_title': quiz.title,
-                    'lesson_id': lesson.id,
-                    'lesson_name': lesson.name,
-                    'start_time': attempt.start_time.isoformat(),
-                    'end_time': attempt.end_time.isoformat() if attempt.end_time else None,
-                    'score': attempt.score,
-                    'passed': attempt.passed,
-                    'answers': answers_data
+        for attempt in attempts:
+            quiz = attempt.quiz
+            lesson = quiz.lesson
+            
+            answers_data = [
+                {
+                    'question_text': answer.question.question_text,
+                    'selected_answer': answer.selected_answer.answer_text,
+                    'is_correct': answer.is_correct,
+                    'correct_answer': correct_answers.get(answer.question_id),
                 }
-                
-                response_data.append(attempt_data)
-            except Exception as attempt_error:
-                # Handle potential errors with individual attempts
-                logger.error(f"Error processing quiz attempt {attempt.id}: {attempt_error}")
-                continue
-        
-        if not response_data:
-            return Response({
-                'status': 'warning',
-                'message': 'Could not retrieve quiz answers. Some data may be missing or corrupted.'
-            }, status=status.HTTP_200_OK)
+                for answer in attempt.quiz_answers.all()
+            ]
             
+            response_data.append({
+                'attempt_id': attempt.id,
+                'quiz_id': quiz.id,
+                'quiz_title': quiz.title,
+                'lesson_id': lesson.id,
+                'lesson_name': lesson.name,
+                'start_time': attempt.start_time.isoformat(),
+                'end_time': attempt.end_time.isoformat() if attempt.end_time else None,
+                'score': attempt.score,
+                'passed': attempt.passed,
+                'answers': answers_data
+            })
+        
+        if page is not None:
+            return paginator.get_paginated_response(response_data)
         return Response(response_data, status=status.HTTP_200_OK)
         
+    except ValidationError:
+        raise
     except Exception as e:
         logger.error(f"Error in get_student_quiz_answers: {str(e)}")
         return Response({
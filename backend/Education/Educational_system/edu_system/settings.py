@@ -46,7 +46,6 @@ INSTALLED_APPS = [
     'corsheaders',
     'rest_framework_simplejwt', 
     'rest_framework_simplejwt.token_blacklist',
-    'django_apscheduler',  # For automatic session generation
     # 'django_extensions',  # Commented out temporarily
     
     
@@ -54,6 +53,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'eduAPI.middleware.InstrumentationMiddleware',  # first, so its timing covers the whole stack
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
@@ -101,6 +101,13 @@ DATABASES = {
     }
 }
 
+# Local SQLite database instead of MySQL, e.g. for load tests: DB_ENGINE=sqlite (DB_NAME is the file)
+if os.getenv('DB_ENGINE', 'mysql').lower() == 'sqlite':
+    DATABASES['default'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.getenv('DB_NAME') or BASE_DIR / 'db.sqlite3',
+    }
+
 # Use SQLite for testing (no need for MySQL permissions)
 import sys
 if 'test' in sys.argv or 'pytest' in sys.modules:
@@ -109,6 +116,44 @@ if 'test' in sys.argv or 'pytest' in sys.modules:
         'NAME': BASE_DIR / 'test_db.sqlite3',
     }
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Local memory by default (and always for tests); set REDIS_URL to share the cache between workers.
+# Read caching needs a shared cache, see CACHE_READS_ENABLED below
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'eduapi-default',
+    }
+}
+if os.getenv('REDIS_URL') and not ('test' in sys.argv or 'pytest' in sys.modules):
+    CACHES['default'] = {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.getenv('REDIS_URL'),
+    }
+
+# Seconds a cached read stays valid; model signals invalidate earlier on writes
+CACHE_TTL = int(os.getenv('CACHE_TTL', 300))
+
+# Writes invalidate cached reads by bumping versions in the cache, which only reaches
+# the other workers when they share it. With the per-process LocMem cache the read
+# caches stay off unless CACHE_READS=true says the server runs a single process.
+CACHE_READS_ENABLED = (
+    CACHES['default']['BACKEND'] != 'django.core.cache.backends.locmem.LocMemCache'
+    or os.getenv('CACHE_READS', 'false').lower() == 'true'
+    or 'test' in sys.argv or 'pytest' in sys.modules
+)
+
+# Start the session scheduler in every web worker; only the lease holder generates sessions
+SESSION_SCHEDULER_AUTOSTART = os.getenv('SESSION_SCHEDULER_AUTOSTART', 'false').lower() == 'true'
+
+# Request instrumentation (eduAPI.middleware.InstrumentationMiddleware, served at /api/metrics/)
+INSTRUMENTATION_ENABLED = os.getenv('INSTRUMENTATION_ENABLED', 'true').lower() == 'true'
+INSTRUMENTATION_SLOW_REQUEST_MS = int(os.getenv('INSTRUMENTATION_SLOW_REQUEST_MS', 500))  # log requests slower than this
+INSTRUMENTATION_REPEAT_THRESHOLD = int(os.getenv('INSTRUMENTATION_REPEAT_THRESHOLD', 10))  # same SQL this often = N+1
+INSTRUMENTATION_SLOW_LOG_SIZE = 100  # slow requests kept for /api/metrics/slow-requests/
+METRICS_TOKEN = os.getenv('METRICS_TOKEN')  # Bearer token for Prometheus; staff sessions work without it
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 AUTH_PASSWORD_VALIDATORS = [
@@ -143,6 +188,22 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# How /api/file-serve/ and /download/ deliver bytes once Django has resolved the file:
+#   'django'     - stream from Python (Range, ETag and Last-Modified handled in-process)
+#   'x-accel'    - nginx: X-Accel-Redirect to MEDIA_ACCEL_PREFIX, e.g.
+#                  location /protected-media/ { internal; alias /path/to/media/; }
+#   'x-sendfile' - Apache mod_xsendfile / lighttpd
+MEDIA_SERVE_MODE = os.getenv('MEDIA_SERVE_MODE', 'django')
+MEDIA_ACCEL_PREFIX = os.getenv('MEDIA_ACCEL_PREFIX', '/protected-media/')
+# Seconds a download token (the ?token= on file links, which carry no Authorization header) stays valid
+MEDIA_TOKEN_MAX_AGE = int(os.getenv('MEDIA_TOKEN_MAX_AGE', 3600))
+
+# Resumable chunked uploads (api/content/uploads/)
+CHUNKED_UPLOAD_DIR = 'chunked_uploads'  # part files, relative to MEDIA_ROOT
+CHUNKED_UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+CHUNKED_UPLOAD_MAX_SIZE = 4 * 1024 * 1024 * 1024
+CHUNKED_UPLOAD_EXPIRY_HOURS = 48
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
@@ -174,6 +235,17 @@ EMAIL_HOST_PASSWORD = os.getenv('EMAIL_HOST_PASSWORD')
 DEFAULT_FROM_EMAIL = EMAIL_HOST_USER
 EMAIL_TIMEOUT = 20
 
+# Outbound email queue (delivered by `manage.py send_queued_emails --loop`)
+EMAIL_OUTBOX_BATCH_SIZE = int(os.getenv('EMAIL_OUTBOX_BATCH_SIZE', 50))  # messages per SMTP connection
+EMAIL_OUTBOX_MAX_ATTEMPTS = 5
+EMAIL_OUTBOX_RETRY_SECONDS = 60  # doubles after every failed attempt
+EMAIL_OUTBOX_MAX_RETRY_SECONDS = 3600
+# A claim is renewed before every send; sending one message (connect, TLS, DATA) can take
+# a few EMAIL_TIMEOUTs, so a claim outlives the slowest send by a wide margin.
+# Rows left claimed by a crashed worker are sent again after this: at least ten
+# minutes, or 10 x EMAIL_TIMEOUT when that is longer
+EMAIL_OUTBOX_CLAIM_SECONDS = max(600, 10 * EMAIL_TIMEOUT)
+
 # CORS Configuration
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:3000",
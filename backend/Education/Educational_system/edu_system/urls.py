@@ -12,6 +12,7 @@ from rest_framework.permissions import IsAuthenticated
 from eduAPI.models import Lesson, StudentEnrollment
 from eduAPI.views.media_views import serve_file, direct_download
 from eduAPI.views.admin_views import reset_advisor_password, advisor_stats
+from eduAPI.views import metrics_views
 from eduAPI.views.simple_live_sessions import (
     test_live_sessions,
     test_live_sessions_no_auth,
@@ -24,7 +25,13 @@ from eduAPI.views.simple_live_sessions import (
     get_assigned_students,
     update_session,
     cancel_session,
-    debug_sessions
+    debug_sessions,
+    get_notifications,
+    get_unread_notification_count,
+    mark_notifications_read,
+    get_calendar,
+    get_calendar_feed_url,
+    calendar_feed
 )
 
 # EMERGENCY DEBUG VIEW
@@ -64,6 +71,8 @@ urlpatterns = [
     path('advisors/', include('eduAPI.urls.advisor_urls')),  # Advisor Management Interface
     path('admin/reset-advisor-password/<int:user_id>/', reset_advisor_password, name='reset_advisor_password'),
     path('admin/advisor-stats/', advisor_stats, name='advisor_stats'),
+    path('api/metrics/', metrics_views.metrics, name='metrics'),
+    path('api/metrics/slow-requests/', metrics_views.slow_requests, name='metrics-slow-requests'),
     path('api/', include('eduAPI.urls')),
     path('debug/lesson35/', emergency_lesson_35, name='emergency_lesson_35'),  # EMERGENCY DEBUG ENDPOINT
     
@@ -77,6 +86,12 @@ urlpatterns = [
     path('api/live-sessions/', get_sessions, name='live-sessions-list'),
     path('api/live-sessions/my-schedule/', get_my_schedule, name='my-schedule'),
     path('api/live-sessions/pending/', get_pending_sessions, name='pending-sessions'),
+    path('api/live-sessions/notifications/', get_notifications, name='live-session-notifications'),
+    path('api/live-sessions/notifications/unread-count/', get_unread_notification_count, name='unread-notification-count'),
+    path('api/live-sessions/notifications/mark-read/', mark_notifications_read, name='mark-notifications-read'),
+    path('api/live-sessions/calendar/', get_calendar, name='live-session-calendar'),
+    path('api/live-sessions/calendar/feed/', get_calendar_feed_url, name='live-session-calendar-feed-url'),
+    path('api/live-sessions/calendar/<str:token>.ics', calendar_feed, name='live-session-calendar-feed'),
     path('api/live-sessions/<str:session_id>/', update_session, name='update-session'),
     path('api/live-sessions/<str:session_id>/assign/', assign_session, name='assign-session'),
     path('api/live-sessions/<str:session_id>/unassign/', unassign_session, name='unassign-session'),
@@ -18,6 +18,21 @@ from rest_framework.test import APIClient
 User = get_user_model()
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Cached reads must not leak between tests (rows and ids are rolled back, the cache is not)"""
+    from django.core.cache import cache
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def temp_media_root(settings, tmp_path):
+    """Files uploaded by tests go to a temporary directory, never the real MEDIA_ROOT"""
+    settings.MEDIA_ROOT = str(tmp_path / 'media')
+
+
 @pytest.fixture
 def api_client():
     """Return DRF API test client"""
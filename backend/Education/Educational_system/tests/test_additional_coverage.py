@@ -136,13 +136,14 @@ class TestUserServiceAdditional(TestCase):
             first_name='Test', last_name='User', role='student', is_email_verified=False
         )
     
-    @patch('eduAPI.services.user_service.send_mail')
-    def test_send_verification_email(self, mock_send_mail):
+    def test_send_verification_email(self):
+        from eduAPI.models import OutboundEmail
         from eduAPI.services.user_service import send_verification_email
-        mock_send_mail.return_value = 1
         send_verification_email(self.user)
         self.assertIsNotNone(self.user.verification_code)
-        mock_send_mail.assert_called_once()
+        queued = OutboundEmail.objects.get(to_email=self.user.email)
+        self.assertEqual(queued.status, 'PENDING')
+        self.assertIn(self.user.verification_code, queued.html_body)
     
     def test_verify_email_success(self):
         from eduAPI.services.user_service import verify_email
@@ -171,12 +172,12 @@ class TestUserServiceAdditional(TestCase):
         updated = update_user_profile(self.user, {'first_name': 'Updated'})
         self.assertEqual(updated.first_name, 'Updated')
     
-    @patch('eduAPI.services.user_service.send_mail')
-    def test_initiate_password_reset(self, mock_send_mail):
+    def test_initiate_password_reset(self):
+        from eduAPI.models import OutboundEmail
         from eduAPI.services.user_service import initiate_password_reset
-        mock_send_mail.return_value = 1
         success, message = initiate_password_reset(self.user.email)
         self.assertTrue(success)
+        self.assertTrue(OutboundEmail.objects.filter(to_email=self.user.email).exists())
     
     def test_initiate_password_reset_nonexistent(self):
         from eduAPI.services.user_service import initiate_password_reset
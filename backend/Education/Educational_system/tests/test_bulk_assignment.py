@@ -0,0 +1,153 @@
+# Tests for bulk student assignment: one validation query, bulk writes, per-id results
+from datetime import timedelta
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+from django.contrib.auth import get_user_model
+
+from eduAPI.models.live_sessions_models import LiveSession, LiveSessionAssignment, ScheduleEntry
+from eduAPI.models.recurring_sessions_models import SessionTemplate, StudentGroup, TemplateGroupAssignment
+
+User = get_user_model()
+
+
+class TestBulkAssignment(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.teacher = User.objects.create_user(
+            username='bulk_teacher', email='bulk_teacher@test.com', password='testpass123',
+            first_name='Bulk', last_name='Teacher', role='teacher'
+        )
+        self.advisor = User.objects.create_user(
+            username='bulk_advisor', email='bulk_advisor@test.com', password='testpass123',
+            first_name='Bulk', last_name='Advisor', role='advisor'
+        )
+        self.students = [self.make_student(i) for i in range(12)]
+        self.session = LiveSession.objects.create(
+            title='Bulk Session', subject='Math', level='10', teacher=self.teacher,
+            scheduled_datetime=timezone.now() + timedelta(days=1), duration_minutes=60,
+            jitsi_room_name='bulk-room'
+        )
+        self.template = SessionTemplate.objects.create(
+            title='Bulk Template', teacher=self.teacher, subject='Math', level='10',
+            day_of_week=1, start_time='10:00:00', recurrence_type='WEEKLY',
+            status='ACTIVE', start_date=timezone.now().date()
+        )
+        self.client.force_authenticate(user=self.advisor)
+
+    def make_student(self, index):
+        return User.objects.create_user(
+            username=f'bulk_student{index}', email=f'bulk_student{index}@test.com', password='testpass123',
+            first_name=f'Student{index}', last_name='Bulk', role='student'
+        )
+
+    def ids(self, students):
+        return [student.id for student in students]
+
+    def test_session_assign_reports_each_id(self):
+        LiveSessionAssignment.objects.create(session=self.session, student=self.students[0], advisor=self.advisor)
+
+        response = self.client.post(
+            f'/api/live-sessions/{self.session.id}/assign/',
+            {'student_ids': [self.students[0].id, self.students[1].id, self.teacher.id, 'abc']},
+            format='json'
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['new_assignments'], 1)
+        self.assertEqual(response.data['existing_assignments'], 1)
+        self.assertEqual(response.data['session_status'], 'ASSIGNED')
+        self.assertEqual([row['status'] for row in response.data['results']],
+                         ['already_assigned', 'assigned', 'not_found', 'invalid'])
+        self.assertEqual(self.session.assignments.count(), 2)
+
+    def test_session_assign_query_count_is_constant(self):
+        url = f'/api/live-sessions/{self.session.id}/assign/'
+        with CaptureQueriesContext(connection) as two:
+            self.client.post(url, {'student_ids': self.ids(self.students[:2])}, format='json')
+        with CaptureQueriesContext(connection) as ten:
+            response = self.client.post(url, {'student_ids': self.ids(self.students[2:])}, format='json')
+
+        self.assertEqual(response.data['new_assignments'], 10)
+        self.assertEqual(len(two.captured_queries), len(ten.captured_queries))
+
+    def test_session_unassign_in_bulk(self):
+        for student in self.students[:5]:
+            LiveSessionAssignment.objects.create(session=self.session, student=student, advisor=self.advisor)
+        url = f'/api/live-sessions/{self.session.id}/unassign/'
+
+        response = self.client.delete(url, {'student_ids': self.ids(self.students[:3]) + [self.students[9].id]}, format='json')
+
+        self.assertEqual(response.data['removed_assignments'], 3)
+        self.assertEqual(response.data['remaining_assignments'], 2)
+        self.assertEqual(response.data['results'][-1], {'student_id': self.students[9].id, 'status': 'not_assigned'})
+        self.assertEqual(sorted(response.data['removed_students']), ['Student0 Bulk', 'Student1 Bulk', 'Student2 Bulk'])
+        # The removed students' calendars no longer show the session
+        self.assertFalse(ScheduleEntry.objects.filter(session=self.session, user__in=self.students[:3]).exists())
+        self.assertEqual(ScheduleEntry.objects.filter(session=self.session, role='student').count(), 2)
+
+    def test_session_unassign_query_count_is_constant(self):
+        for student in self.students:
+            LiveSessionAssignment.objects.create(session=self.session, student=student, advisor=self.advisor)
+        url = f'/api/live-sessions/{self.session.id}/unassign/'
+        with CaptureQueriesContext(connection) as two:
+            self.client.delete(url, {'student_ids': self.ids(self.students[:2])}, format='json')
+        # One student stays: emptying the session also resets its status
+        with CaptureQueriesContext(connection) as nine:
+            response = self.client.delete(url, {'student_ids': self.ids(self.students[2:11])}, format='json')
+
+        self.assertEqual(response.data['removed_assignments'], 9)
+        self.assertEqual(len(two.captured_queries), len(nine.captured_queries))
+
+    def test_group_add_and_remove(self):
+        group = StudentGroup.objects.create(name='Bulk Group', advisor=self.advisor)
+        group.students.add(self.students[0])
+        url = f'/api/recurring-sessions/groups/{group.id}/'
+
+        with CaptureQueriesContext(connection) as small:
+            self.client.post(url + 'add_students/', {'student_ids': self.ids(self.students[1:3])}, format='json')
+        with CaptureQueriesContext(connection) as large:
+            added = self.client.post(url + 'add_students/', {'student_ids': self.ids(self.students[:10])}, format='json')
+        removed = self.client.post(url + 'remove_students/', {'student_ids': self.ids(self.students[8:])}, format='json')
+
+        self.assertEqual(added.data['total_students'], 10)
+        self.assertEqual(sum(row['status'] == 'already_assigned' for row in added.data['results']), 3)
+        self.assertEqual(len(small.captured_queries), len(large.captured_queries))
+        self.assertEqual([row['status'] for row in removed.data['results']], ['removed', 'removed', 'not_assigned', 'not_assigned'])
+        self.assertEqual(removed.data['total_students'], 8)
+
+    def test_template_uses_one_group_for_direct_assignments(self):
+        url = f'/api/recurring-sessions/templates/{self.template.id}/'
+        first = self.client.post(url + 'assignments/', {'student_ids': self.ids(self.students[:3])}, format='json')
+        with CaptureQueriesContext(connection) as queries:
+            second = self.client.post(url + 'assignments/', {'student_ids': self.ids(self.students)}, format='json')
+
+        self.assertEqual(first.data['assigned_count'], 3)
+        self.assertEqual(second.data['assigned_count'], 9)
+        self.assertEqual(TemplateGroupAssignment.objects.filter(template=self.template).count(), 1)
+        group = TemplateGroupAssignment.objects.get(template=self.template).group
+        self.assertEqual(group.students.count(), 12)
+        self.assertLess(len(queries.captured_queries), 20)
+
+        response = self.client.post(url + 'unassign/', {'student_ids': self.ids(self.students[:2])}, format='json')
+
+        self.assertEqual(response.data['unassigned_count'], 2)
+        self.assertEqual(group.students.count(), 10)
+
+    def test_template_unassign_deactivates_individual_groups(self):
+        student = self.students[0]
+        group = StudentGroup.objects.create(name=f'Individual - {student.first_name} {student.last_name}', advisor=self.advisor)
+        group.students.add(student)
+        assignment = TemplateGroupAssignment.objects.create(template=self.template, group=group, advisor=self.advisor)
+
+        response = self.client.post(
+            f'/api/recurring-sessions/templates/{self.template.id}/unassign/',
+            {'student_ids': [student.id, self.students[1].id]}, format='json'
+        )
+
+        assignment.refresh_from_db()
+        self.assertFalse(assignment.is_active)
+        self.assertEqual([row['status'] for row in response.data['results']], ['removed', 'not_assigned'])
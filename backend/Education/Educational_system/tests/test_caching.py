@@ -0,0 +1,207 @@
+# Tests for cached read endpoints and their signal based invalidation
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+from django.contrib.auth import get_user_model
+
+from eduAPI.models.lessons_model import Lesson, LessonContent, Quiz, Question, Answer
+from eduAPI.models.live_sessions_models import LiveSession, LiveSessionAssignment
+from eduAPI.models.recurring_sessions_models import SessionTemplate
+from eduAPI.services import cache_service
+
+User = get_user_model()
+
+
+class TestCacheService(TestCase):
+    def test_bump_changes_key(self):
+        key = cache_service.make_key('thing', 1, scopes=[cache_service.lesson_scope(1)])
+        self.assertEqual(key, cache_service.make_key('thing', 1, scopes=[cache_service.lesson_scope(1)]))
+        cache_service.bump(cache_service.lesson_scope(1))
+        self.assertNotEqual(key, cache_service.make_key('thing', 1, scopes=[cache_service.lesson_scope(1)]))
+
+    def test_bump_only_affects_its_scope(self):
+        key = cache_service.make_key('thing', 2, scopes=[cache_service.lesson_scope(2)])
+        cache_service.bump(cache_service.lesson_scope(3))
+        self.assertEqual(key, cache_service.make_key('thing', 2, scopes=[cache_service.lesson_scope(2)]))
+
+    def test_get_or_build_calls_builder_once(self):
+        calls = []
+        key = cache_service.make_key('built')
+        for _ in range(3):
+            value = cache_service.get_or_build(key, lambda: calls.append(1) or {'value': 1})
+        self.assertEqual(value, {'value': 1})
+        self.assertEqual(len(calls), 1)
+
+    def test_reads_not_cached_when_disabled(self):
+        calls = []
+        key = cache_service.make_key('uncached')
+        with override_settings(CACHE_READS_ENABLED=False):
+            for _ in range(3):
+                cache_service.get_or_build(key, lambda: calls.append(1) or {'value': 1})
+        self.assertEqual(len(calls), 3)
+        self.assertIsNone(cache_service.get_cached(key))
+
+
+class TestCachedStudentLessonEndpoints(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.teacher = User.objects.create_user(
+            username='teacher_cache', email='teacher_cache@test.com', password='testpass123',
+            first_name='Test', last_name='Teacher', role='teacher', is_email_verified=True
+        )
+        self.student = User.objects.create_user(
+            username='student_cache', email='student_cache@test.com', password='testpass123',
+            first_name='Test', last_name='Student', role='student', is_email_verified=True
+        )
+        self.lesson = Lesson.objects.create(name='Cached Lesson', subject='Math', level='10', teacher=self.teacher)
+        LessonContent.objects.create(lesson=self.lesson, title='Notes', content_type='TEXT', text_content='x')
+        self.quiz = Quiz.objects.create(lesson=self.lesson, title='Quiz', passing_score=70)
+        self.client.force_authenticate(user=self.student)
+
+    def test_lesson_detail_is_cached(self):
+        url = f'/api/student/lessons/{self.lesson.id}/'
+        with CaptureQueriesContext(connection) as first:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        with CaptureQueriesContext(connection) as second:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['name'], 'Cached Lesson')
+        self.assertEqual(response.data['progress'], 0)
+        # Only the enrollment lookup is left on a hit
+        self.assertLess(len(second), len(first))
+        self.assertEqual(len(second), 1)
+
+    def test_lesson_detail_invalidated_on_lesson_save(self):
+        url = f'/api/student/lessons/{self.lesson.id}/'
+        self.client.get(url)
+        self.lesson.name = 'Renamed Lesson'
+        self.lesson.save()
+        response = self.client.get(url)
+        self.assertEqual(response.data['name'], 'Renamed Lesson')
+
+    def test_lesson_detail_not_found_after_delete(self):
+        url = f'/api/student/lessons/{self.lesson.id}/'
+        self.client.get(url)
+        self.lesson.delete()
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_contents_invalidated_on_content_create_and_delete(self):
+        url = f'/api/student/lessons/{self.lesson.id}/contents/'
+        self.assertEqual(len(self.client.get(url).data), 1)
+
+        content = LessonContent.objects.create(lesson=self.lesson, title='More', content_type='TEXT', text_content='y')
+        self.assertEqual(len(self.client.get(url).data), 2)
+
+        content.delete()
+        self.assertEqual(len(self.client.get(url).data), 1)
+
+    def test_quizzes_invalidated_on_question_and_answer_changes(self):
+        url = f'/api/student/lessons/{self.lesson.id}/quizzes/'
+        self.assertEqual(self.client.get(url).data[0]['questions'], [])
+
+        question = Question.objects.create(quiz=self.quiz, question_text='2+2?', question_type='SINGLE', points=1)
+        self.assertEqual(len(self.client.get(url).data[0]['questions']), 1)
+
+        Answer.objects.create(question=question, answer_text='4', is_correct=True)
+        response = self.client.get(url)
+        self.assertEqual(response.data[0]['questions'][0]['answers'][0]['answer_text'], '4')
+
+    def test_other_lessons_stay_cached(self):
+        other = Lesson.objects.create(name='Other Lesson', subject='Math', level='10', teacher=self.teacher)
+        url = f'/api/student/lessons/{other.id}/contents/'
+        self.client.get(url)
+        LessonContent.objects.create(lesson=self.lesson, title='More', content_type='TEXT', text_content='y')
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(url)
+        self.assertEqual(len(queries), 1)
+
+
+class TestCachedScheduleAndStatistics(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.teacher = User.objects.create_user(
+            username='teacher_cache2', email='teacher_cache2@test.com', password='testpass123',
+            first_name='Test', last_name='Teacher', role='teacher', is_email_verified=True
+        )
+        self.student = User.objects.create_user(
+            username='student_cache2', email='student_cache2@test.com', password='testpass123',
+            first_name='Test', last_name='Student', role='student', is_email_verified=True
+        )
+        self.advisor = User.objects.create_user(
+            username='advisor_cache2', email='advisor_cache2@test.com', password='testpass123',
+            first_name='Test', last_name='Advisor', role='advisor', is_email_verified=True
+        )
+        self.session = LiveSession.objects.create(
+            title='Cached Session', teacher=self.teacher, subject='Math', level='10',
+            scheduled_datetime=timezone.now() + timedelta(days=1), duration_minutes=60,
+            status='ASSIGNED'
+        )
+
+    def test_student_schedule_invalidated_on_assignment(self):
+        self.client.force_authenticate(user=self.student)
+        self.assertEqual(self.client.get('/api/live-sessions/my-schedule/').data, [])
+
+        assignment = LiveSessionAssignment.objects.create(session=self.session, student=self.student, advisor=self.advisor)
+        response = self.client.get('/api/live-sessions/my-schedule/')
+        self.assertEqual([s['title'] for s in response.data], ['Cached Session'])
+
+        assignment.delete()
+        self.assertEqual(self.client.get('/api/live-sessions/my-schedule/').data, [])
+
+    def test_teacher_schedule_invalidated_on_session_update(self):
+        self.client.force_authenticate(user=self.teacher)
+        response = self.client.get('/api/live-sessions/my-schedule/')
+        self.assertEqual(response.data[0]['assigned_students_count'], 0)
+
+        LiveSessionAssignment.objects.create(session=self.session, student=self.student, advisor=self.advisor)
+        response = self.client.get('/api/live-sessions/my-schedule/')
+        self.assertEqual(response.data[0]['assigned_students_count'], 1)
+
+        self.session.title = 'Renamed Session'
+        self.session.save()
+        response = self.client.get('/api/live-sessions/my-schedule/')
+        self.assertEqual(response.data[0]['title'], 'Renamed Session')
+
+    def test_can_be_modified_computed_after_cache_read(self):
+        self.client.force_authenticate(user=self.teacher)
+        self.assertTrue(self.client.get('/api/live-sessions/my-schedule/').data[0]['can_be_modified'])
+
+        # The session starts without any write invalidating the cached schedule
+        started = self.session.scheduled_datetime + timedelta(minutes=5)
+        with patch('django.utils.timezone.now', return_value=started):
+            self.assertFalse(self.client.get('/api/live-sessions/my-schedule/').data[0]['can_be_modified'])
+
+    def test_template_statistics_invalidated_on_template_save(self):
+        self.client.force_authenticate(user=self.teacher)
+        self.assertEqual(self.client.get('/api/recurring-sessions/statistics/').data['total_templates'], 0)
+
+        template = SessionTemplate.objects.create(
+            title='Cached Template', teacher=self.teacher, subject='Math', level='10',
+            day_of_week=1, start_time='10:00:00', recurrence_type='WEEKLY',
+            status='ACTIVE', start_date=timezone.now().date()
+        )
+        stats = self.client.get('/api/recurring-sessions/statistics/').data
+        self.assertEqual(stats['total_templates'], 1)
+        self.assertEqual(stats['active_templates'], 1)
+
+        template.status = 'PAUSED'
+        template.save()
+        stats = self.client.get('/api/recurring-sessions/statistics/').data
+        self.assertEqual(stats['active_templates'], 0)
+        self.assertEqual(stats['paused_templates'], 1)
+
+    def test_dashboard_stats_invalidated_on_lesson_create(self):
+        self.client.force_authenticate(user=self.teacher)
+        self.assertEqual(self.client.get('/api/content/dashboard-stats/').data['total_lessons'], 0)
+
+        Lesson.objects.create(name='New Lesson', subject='Math', level='10', teacher=self.teacher)
+        self.assertEqual(self.client.get('/api/content/dashboard-stats/').data['total_lessons'], 1)
@@ -0,0 +1,177 @@
+# Tests for resumable chunked uploads
+import hashlib
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from unittest import mock
+
+from django.db import DatabaseError
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+from django.contrib.auth import get_user_model
+
+from eduAPI.models import Lesson, LessonContent, LiveSession, ChunkedUpload
+from eduAPI.services.upload_service import ChunkedUploadService
+
+User = get_user_model()
+
+CHUNK = 10
+
+
+def sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+class TestChunkedUploads(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.override = override_settings(MEDIA_ROOT=self.media_root, CHUNKED_UPLOAD_CHUNK_SIZE=CHUNK)
+        self.override.enable()
+
+        self.client = APIClient()
+        self.teacher = User.objects.create_user(
+            username='upload_teacher', email='upload_teacher@test.com', password='testpass123',
+            first_name='Upload', last_name='Teacher', role='teacher'
+        )
+        self.other_teacher = User.objects.create_user(
+            username='upload_other', email='upload_other@test.com', password='testpass123',
+            first_name='Other', last_name='Teacher', role='teacher'
+        )
+        self.lesson = Lesson.objects.create(name='Lesson', subject='Math', level='10', teacher=self.teacher)
+        self.client.force_authenticate(user=self.teacher)
+        self.data = b'0123456789abcdefghijABCDEFGHIJxyz'  # 4 chunks, the last one 3 bytes
+
+    def tearDown(self):
+        self.override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+    def start(self, **overrides):
+        payload = {
+            'target': 'LESSON_CONTENT', 'lesson_id': self.lesson.id, 'title': 'Lecture',
+            'content_type': 'VIDEO', 'filename': 'lecture.mp4', 'total_size': len(self.data)
+        }
+        payload.update(overrides)
+        return self.client.post('/api/content/uploads/', payload, format='json')
+
+    def put_chunk(self, upload_id, index, data=None, checksum=None):
+        if data is None:
+            data = self.data[index * CHUNK:(index + 1) * CHUNK]
+        return self.client.put(
+            f'/api/content/uploads/{upload_id}/chunks/{index}/', data=data,
+            content_type='application/octet-stream', HTTP_X_CHUNK_SHA256=checksum or sha256(data)
+        )
+
+    def test_upload_resume_and_complete(self):
+        response = self.start()
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        upload_id = response.data['upload_id']
+        self.assertEqual(response.data['total_chunks'], 4)
+
+        # Chunks may arrive out of order; a dropped connection leaves a gap
+        self.assertEqual(self.put_chunk(upload_id, 3).status_code, status.HTTP_200_OK)
+        self.assertEqual(self.put_chunk(upload_id, 0).status_code, status.HTTP_200_OK)
+        state = self.client.get(f'/api/content/uploads/{upload_id}/')
+        self.assertEqual(sorted(state.data['received_chunks']), [0, 3])
+
+        # Completing too early is refused
+        response = self.client.post(f'/api/content/uploads/{upload_id}/complete/')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        self.put_chunk(upload_id, 1)
+        self.put_chunk(upload_id, 2)
+        response = self.client.post(f'/api/content/uploads/{upload_id}/complete/')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['file_size'], len(self.data))
+
+        content = LessonContent.objects.get(id=response.data['id'])
+        self.assertEqual(content.lesson, self.lesson)
+        with open(content.file.path, 'rb') as f:
+            self.assertEqual(f.read(), self.data)
+        self.assertFalse(os.listdir(os.path.join(self.media_root, 'chunked_uploads')))
+
+        # Completing again is idempotent
+        again = self.client.post(f'/api/content/uploads/{upload_id}/complete/')
+        self.assertEqual(again.data['id'], content.id)
+
+    def test_chunk_with_bad_checksum_is_not_recorded(self):
+        upload_id = self.start().data['upload_id']
+
+        response = self.put_chunk(upload_id, 0, checksum=sha256(b'something else'))
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get(f'/api/content/uploads/{upload_id}/').data['received_chunks'], [])
+
+    def test_chunk_with_wrong_size_is_rejected(self):
+        upload_id = self.start().data['upload_id']
+        self.assertEqual(self.put_chunk(upload_id, 0, data=b'short').status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.put_chunk(upload_id, 0, data=b'x' * 11).status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_failed_resend_forgets_the_received_chunk(self):
+        upload_id = self.start().data['upload_id']
+        for index in range(4):
+            self.put_chunk(upload_id, index)
+
+        # A truncated resend overwrites part of chunk 1's bytes
+        self.assertEqual(self.put_chunk(upload_id, 1, data=b'trunc').status_code, status.HTTP_400_BAD_REQUEST)
+
+        self.assertEqual(sorted(self.client.get(f'/api/content/uploads/{upload_id}/').data['received_chunks']), [0, 2, 3])
+        self.assertEqual(self.client.post(f'/api/content/uploads/{upload_id}/complete/').status_code, status.HTTP_400_BAD_REQUEST)
+        self.put_chunk(upload_id, 1)
+        content = LessonContent.objects.get(id=self.client.post(f'/api/content/uploads/{upload_id}/complete/').data['id'])
+        with open(content.file.path, 'rb') as f:
+            self.assertEqual(f.read(), self.data)
+
+    def test_complete_can_be_retried_after_the_row_fails(self):
+        upload_id = self.start(filename='l' * 150 + '.mp4').data['upload_id']
+        for index in range(4):
+            self.put_chunk(upload_id, index)
+
+        with mock.patch.object(LessonContent.objects, 'create', side_effect=DatabaseError('insert failed')):
+            with self.assertRaises(DatabaseError):
+                ChunkedUploadService.complete_upload(upload_id, self.teacher)
+        upload = ChunkedUploadService.complete_upload(upload_id, self.teacher)
+
+        self.assertEqual(upload.status, 'COMPLETE')
+        self.assertLessEqual(len(upload.lesson_content.file.name), 100)
+        with open(upload.lesson_content.file.path, 'rb') as f:
+            self.assertEqual(f.read(), self.data)
+
+    def test_session_material_with_file_checksum(self):
+        session = LiveSession.objects.create(
+            title='Live', teacher=self.teacher, subject='Math', level='10',
+            scheduled_datetime=timezone.now() + timedelta(days=1), duration_minutes=60
+        )
+        response = self.start(
+            target='SESSION_MATERIAL', session_id=session.id, content_type='PDF',
+            lesson_id=None, checksum=sha256(self.data)
+        )
+        upload_id = response.data['upload_id']
+        for index in range(4):
+            self.put_chunk(upload_id, index)
+
+        response = self.client.post(f'/api/content/uploads/{upload_id}/complete/')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['file_size'], len(self.data))
+        self.assertEqual(session.materials.get().uploaded_by, self.teacher)
+
+    def test_only_owner_can_upload(self):
+        self.client.force_authenticate(user=self.other_teacher)
+        self.assertEqual(self.start().status_code, status.HTTP_400_BAD_REQUEST)
+
+        self.client.force_authenticate(user=self.teacher)
+        upload_id = self.start().data['upload_id']
+        self.client.force_authenticate(user=self.other_teacher)
+        self.assertEqual(self.put_chunk(upload_id, 0).status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_expired_uploads_are_cleaned_up(self):
+        upload_id = self.start().data['upload_id']
+        ChunkedUpload.objects.filter(id=upload_id).update(expires_at=timezone.now() - timedelta(minutes=1))
+
+        self.assertEqual(ChunkedUploadService.cleanup_expired(), 1)
+
+        self.assertEqual(ChunkedUpload.objects.get(id=upload_id).status, 'ABORTED')
+        self.assertFalse(os.listdir(os.path.join(self.media_root, 'chunked_uploads')))
@@ -0,0 +1,120 @@
+# Tests for the outbound email queue and its worker
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
+
+from django.core import mail
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from django.contrib.auth import get_user_model
+
+from eduAPI.models import OutboundEmail, LiveSessionNotification
+from eduAPI.services import email_outbox
+
+User = get_user_model()
+
+
+class TestEmailOutbox(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='outbox_user', email='outbox_user@test.com', password='testpass123',
+            first_name='Outbox', last_name='User', role='student'
+        )
+
+    def test_registration_email_is_queued_not_sent(self):
+        from eduAPI.services.user_service import send_verification_email
+
+        send_verification_email(self.user)
+
+        self.assertEqual(len(mail.outbox), 0)
+        queued = OutboundEmail.objects.get(to_email=self.user.email)
+        self.assertEqual(queued.status, 'PENDING')
+        self.assertEqual(queued.attempts, 0)
+
+    def test_batch_reuses_one_connection(self):
+        for i in range(3):
+            email_outbox.queue_email(f'person{i}@test.com', f'Subject {i}', 'Body', html_body='<p>Body</p>')
+
+        with patch('eduAPI.services.email_outbox.get_connection', wraps=email_outbox.get_connection) as connections:
+            result = email_outbox.deliver_batch()
+
+        self.assertEqual(result, {'sent': 3, 'retried': 0, 'failed': 0})
+        self.assertEqual(connections.call_count, 1)
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertEqual(mail.outbox[0].alternatives[0][1], 'text/html')
+        self.assertFalse(OutboundEmail.objects.exclude(status='SENT').exists())
+        self.assertEqual(email_outbox.deliver_batch(), {'sent': 0, 'retried': 0, 'failed': 0})
+
+    @override_settings(EMAIL_OUTBOX_MAX_ATTEMPTS=2, EMAIL_OUTBOX_RETRY_SECONDS=60)
+    def test_failures_back_off_then_give_up(self):
+        queued = email_outbox.queue_email('fails@test.com', 'Subject', 'Body')
+
+        with patch('django.core.mail.EmailMessage.send', side_effect=OSError('smtp down')):
+            before = timezone.now()
+            self.assertEqual(email_outbox.deliver_batch()['retried'], 1)
+            queued.refresh_from_db()
+            self.assertEqual(queued.status, 'PENDING')
+            self.assertEqual(queued.last_error, 'smtp down')
+            self.assertGreaterEqual(queued.next_attempt_at, before + timedelta(seconds=60))
+
+            # Not due yet
+            self.assertEqual(email_outbox.deliver_batch()['retried'], 0)
+
+            OutboundEmail.objects.filter(pk=queued.pk).update(next_attempt_at=timezone.now())
+            self.assertEqual(email_outbox.deliver_batch()['failed'], 1)
+
+        queued.refresh_from_db()
+        self.assertEqual(queued.status, 'FAILED')
+        self.assertEqual(queued.attempts, 2)
+
+    def test_stale_claim_is_picked_up_again(self):
+        queued = email_outbox.queue_email('stale@test.com', 'Subject', 'Body')
+        OutboundEmail.objects.filter(pk=queued.pk).update(
+            status='SENDING', next_attempt_at=timezone.now() - timedelta(seconds=1)
+        )
+
+        self.assertEqual(email_outbox.deliver_batch()['sent'], 1)
+
+    def test_claims_last_at_least_ten_minutes(self):
+        self.assertEqual(email_outbox.claim_timeout(), timedelta(minutes=10))
+        with override_settings(EMAIL_OUTBOX_CLAIM_SECONDS=1200):
+            self.assertEqual(email_outbox.claim_timeout(), timedelta(minutes=20))
+
+    def test_taken_over_claim_is_not_sent_or_recorded(self):
+        first = email_outbox.queue_email('first@test.com', 'Subject', 'Body')
+        second = email_outbox.queue_email('second@test.com', 'Subject', 'Body')
+        claimed = email_outbox.claim_batch(10)
+
+        # The claim on the second message expires and another worker sends it
+        OutboundEmail.objects.filter(pk=second.pk).update(next_attempt_at=timezone.now() - timedelta(seconds=1))
+        self.assertEqual([message.to_email for message in email_outbox.claim_batch(10)], ['second@test.com'])
+        with patch('eduAPI.services.email_outbox.claim_batch', return_value=claimed):
+            result = email_outbox.deliver_batch()
+
+        self.assertEqual(result, {'sent': 1, 'retried': 0, 'failed': 0})
+        self.assertEqual([message.to[0] for message in mail.outbox], ['first@test.com'])
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual((first.status, first.attempts, first.claim_token), ('SENT', 1, None))
+        self.assertEqual((second.status, second.attempts), ('SENDING', 0))
+
+    def test_sent_email_marks_notification(self):
+        notification = LiveSessionNotification.objects.create(
+            recipient=self.user, notification_type='SESSION_ASSIGNED', title='Assigned', message='You have a session'
+        )
+        email_outbox.queue_email(self.user.email, 'Assigned', 'You have a session', notification=notification)
+
+        email_outbox.deliver_batch()
+
+        notification.refresh_from_db()
+        self.assertTrue(notification.is_sent_email)
+
+    def test_command_sends_one_batch(self):
+        email_outbox.queue_email('command@test.com', 'Subject', 'Body')
+        out = StringIO()
+
+        call_command('send_queued_emails', stdout=out)
+
+        self.assertIn('Sent: 1', out.getvalue())
+        self.assertEqual(len(mail.outbox), 1)
@@ -0,0 +1,97 @@
+# Tests for the request instrumentation middleware and the metrics endpoints
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from rest_framework.test import APIClient
+
+from eduAPI.middleware import InstrumentationMiddleware
+from eduAPI.services import metrics_service
+
+User = get_user_model()
+
+
+class TestInstrumentation(TestCase):
+    def setUp(self):
+        metrics_service.reset()
+        self.client = APIClient()
+        self.teacher = User.objects.create_user(
+            username='metrics_teacher', email='metrics_teacher@test.com', password='testpass123',
+            first_name='Metrics', last_name='Teacher', role='teacher'
+        )
+        self.staff = User.objects.create_superuser(
+            username='metrics_admin', email='metrics_admin@test.com', password='testpass123'
+        )
+
+    def run_view(self, view, path='/api/probe/'):
+        middleware = InstrumentationMiddleware(view)
+        return middleware(RequestFactory().get(path))
+
+    def test_endpoint_series_use_the_url_pattern(self):
+        self.client.force_authenticate(user=self.teacher)
+        self.client.get('/api/live-sessions/12345/join/')
+        self.client.get('/api/live-sessions/67890/join/')
+        self.client.get('/api/live-sessions/my-schedule/')
+
+        text = metrics_service.render()
+
+        self.assertIn('eduapi_http_requests_total{method="GET",route="/api/live-sessions/<str:session_id>/join/",status="404"} 2', text)
+        self.assertIn('eduapi_http_request_duration_seconds_count{method="GET",route="/api/live-sessions/my-schedule/"} 1', text)
+        self.assertIn('eduapi_db_queries_total{method="GET",route="/api/live-sessions/my-schedule/"}', text)
+
+    @override_settings(INSTRUMENTATION_REPEAT_THRESHOLD=3, INSTRUMENTATION_SLOW_REQUEST_MS=60000)
+    def test_repeated_statements_are_flagged(self):
+        def n_plus_one(request):
+            for user_id in range(4):
+                list(User.objects.filter(id=user_id))
+            list(User.objects.filter(role='teacher'))
+            return HttpResponse('x' * 25)
+
+        with self.assertLogs('eduAPI.performance', level='WARNING') as logs:
+            self.run_view(n_plus_one)
+
+        [entry] = metrics_service.slow_requests()
+        self.assertTrue(entry['n_plus_one'])
+        self.assertEqual((entry['queries'], entry['repeated_queries']), (5, 3))
+        self.assertEqual(entry['response_bytes'], 25)
+        self.assertEqual(entry['top_statements'][0]['count'], 4)
+        self.assertIn('4x SELECT', logs.output[0])
+        self.assertIn('eduapi_n_plus_one_requests_total{method="GET",route="unmatched"} 1', metrics_service.render())
+
+    @override_settings(INSTRUMENTATION_SLOW_REQUEST_MS=60000)
+    def test_fast_requests_are_not_logged(self):
+        self.run_view(lambda request: HttpResponse('ok'))
+
+        self.assertEqual(metrics_service.slow_requests(), [])
+        self.assertIn('eduapi_http_response_bytes_total{method="GET",route="unmatched"} 2', metrics_service.render())
+
+    @override_settings(INSTRUMENTATION_SLOW_REQUEST_MS=0)
+    def test_slow_requests_are_logged(self):
+        with self.assertLogs('eduAPI.performance', level='WARNING'):
+            self.run_view(lambda request: HttpResponse(status=404))
+
+        self.assertEqual(metrics_service.slow_requests()[0]['status'], 404)
+
+    @override_settings(METRICS_TOKEN='scrape-secret')
+    def test_metrics_endpoints_require_token_or_staff(self):
+        anonymous = self.client.get('/api/metrics/')
+        wrong = self.client.get('/api/metrics/', HTTP_AUTHORIZATION='Bearer nope')
+        scraped = self.client.get('/api/metrics/', HTTP_AUTHORIZATION='Bearer scrape-secret')
+        self.client.force_login(self.staff)
+        slow = self.client.get('/api/metrics/slow-requests/')
+
+        self.assertEqual((anonymous.status_code, wrong.status_code), (403, 403))
+        self.assertEqual(scraped.status_code, 200)
+        self.assertTrue(scraped['Content-Type'].startswith('text/plain; version=0.0.4'))
+        self.assertIn('# TYPE eduapi_http_request_duration_seconds histogram', scraped.content.decode())
+        self.assertEqual(slow.status_code, 200)
+        self.assertIn('requests', slow.json())
+        # The metrics endpoints do not measure themselves
+        self.assertNotIn('/api/metrics/', metrics_service.render())
+
+    def test_queries_outside_requests_are_not_recorded(self):
+        self.run_view(lambda request: HttpResponse('ok'))
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+
+        self.assertIn('eduapi_db_queries_total{method="GET",route="unmatched"} 0', metrics_service.render())
@@ -0,0 +1,98 @@
+# Tests for the load-test dataset and the scripted journeys
+from json import dumps
+from random import Random
+from urllib.parse import urlsplit
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from eduAPI.models import LiveSession, LiveSessionAssignment, ScheduleEntry, StudentEnrollment, StudentStats
+from eduAPI.services import loadtest_data, loadtest_runner
+
+User = get_user_model()
+
+SMALL = dict(
+    students=24, teachers=3, advisors=2, lessons_per_teacher=2, quizzes_per_lesson=1, questions_per_quiz=3,
+    enrollments_per_student=2, attempts_per_student=1, templates_per_teacher=2, group_size=6,
+    months=1, weeks_ahead=2, prefix='lt'
+)
+
+
+class InProcessHTTP:
+    """Stands in for requests.Session, sending the journeys' requests through the test client"""
+
+    def __init__(self):
+        self.client = APIClient()
+        self.headers = {}
+
+    def request(self, method, url, timeout=None, json=None):
+        parts = urlsplit(url)
+        path = parts.path + (f'?{parts.query}' if parts.query else '')
+        extra = {'HTTP_AUTHORIZATION': self.headers['Authorization']} if 'Authorization' in self.headers else {}
+        body = '' if json is None else dumps(json)
+        return self.client.generic(method, path, body, content_type='application/json', **extra)
+
+
+class TestLoadTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.counts = loadtest_data.seed(loadtest_data.SeedOptions(**SMALL))
+        cls.roster = loadtest_data.roster('lt')
+
+    def test_seed_builds_a_consistent_dataset(self):
+        self.assertEqual(User.objects.filter(username__startswith='lt_').count(), 29)
+        self.assertEqual((self.counts['lessons'], self.counts['quiz attempts']), (6, 24))
+        self.assertEqual(StudentEnrollment.objects.count(), self.counts['enrollments'])
+        self.assertEqual(self.counts['groups'], 4)
+        self.assertGreater(self.counts['sessions'], 6 * 4)
+        self.assertTrue(LiveSession.objects.filter(status='COMPLETED').exists())
+        self.assertTrue(LiveSession.objects.filter(status='ASSIGNED').exists())
+        # What the signals would have maintained is rebuilt
+        student = User.objects.get(username='lt_student0')
+        self.assertTrue(ScheduleEntry.objects.filter(user=student, role='student').exists())
+        self.assertTrue(StudentStats.objects.filter(student=student).exists())
+        self.assertTrue(student.check_password(loadtest_data.DEFAULT_PASSWORD))
+
+    def test_roster_has_accounts_for_every_journey(self):
+        self.assertEqual(len(self.roster.students), 24)
+        self.assertTrue(all(student['lessons'] for student in self.roster.students))
+        self.assertTrue(self.roster.advisors and all(advisor['sessions'] for advisor in self.roster.advisors))
+        self.assertTrue(any(teacher['students'] for teacher in self.roster.teachers))
+
+    def test_journeys_run_without_failures(self):
+        recorder = loadtest_runner.Recorder()
+        rng = Random(7)
+        assignments = LiveSessionAssignment.objects.count()
+        for journey in loadtest_runner.JOURNEYS.values():
+            client = loadtest_runner.Client('http://testserver', recorder, InProcessHTTP())
+            account = getattr(self.roster, journey.role)[0]
+            self.assertTrue(client.login(account['email'], loadtest_data.DEFAULT_PASSWORD))
+            journey.play(client, account, rng)
+
+        rows = {row['endpoint']: row for row in recorder.summary(elapsed=1.0)}
+        self.assertEqual(rows['TOTAL']['failures'], 0, [name for name, row in rows.items() if row['failures']])
+        self.assertIn('POST /api/student/quiz-attempts/[id]/submit-answers/', rows)
+        self.assertIn('DELETE /api/live-sessions/[id]/unassign/', rows)
+        self.assertEqual(rows['POST /api/user/login/']['requests'], 5)
+        # The advisor journey leaves the assignments as it found them
+        self.assertEqual(LiveSessionAssignment.objects.count(), assignments)
+
+    def test_report_percentiles(self):
+        recorder = loadtest_runner.Recorder()
+        for ms in range(1, 101):
+            recorder.record('GET /a/', ms / 1000, ok=ms != 100)
+
+        [row, total] = recorder.summary(elapsed=10.0)
+
+        self.assertEqual((row['requests'], row['failures'], row['rps']), (100, 1, 10.0))
+        self.assertEqual((row['p50_ms'], row['p95_ms'], row['p99_ms'], row['max_ms']), (50.0, 95.0, 99.0, 100.0))
+        self.assertEqual(total['endpoint'], 'TOTAL')
+        self.assertIn('p95_ms', loadtest_runner.format_report([row, total]).splitlines()[0])
+
+    def test_clear_removes_the_dataset(self):
+        removed = loadtest_data.clear('lt')
+
+        self.assertEqual(removed, 29)
+        self.assertFalse(User.objects.filter(username__startswith='lt_').exists())
+        self.assertFalse(LiveSession.objects.exists())
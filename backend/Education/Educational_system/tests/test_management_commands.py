@@ -288,115 +288,53 @@ class TestGenerateSessionsCommand:
 class TestRunSchedulerCommand:
     """Tests for run_scheduler management command"""
     
-    @patch('eduAPI.management.commands.run_scheduler.BlockingScheduler')
-    def test_scheduler_setup(self, mock_scheduler_class):
-        """Test scheduler is set up correctly"""
+    @patch('eduAPI.management.commands.run_scheduler.get_scheduler')
+    def test_scheduler_started(self, mock_get_scheduler):
+        """Test the shared scheduler is started"""
         mock_scheduler = MagicMock()
-        mock_scheduler_class.return_value = mock_scheduler
+        mock_get_scheduler.return_value = mock_scheduler
         mock_scheduler.start.side_effect = KeyboardInterrupt()
         
         out = StringIO()
         call_command('run_scheduler', stdout=out)
         
-        # Verify scheduler was configured
-        assert mock_scheduler.add_jobstore.called
-        assert mock_scheduler.add_job.called
+        assert mock_scheduler.start.called
     
-    @patch('eduAPI.management.commands.run_scheduler.BlockingScheduler')
-    def test_scheduler_jobs_added(self, mock_scheduler_class):
-        """Test correct jobs are added to scheduler"""
+    @patch('eduAPI.management.commands.run_scheduler.get_scheduler')
+    def test_scheduler_graceful_shutdown(self, mock_get_scheduler):
+        """Test scheduler stops (and releases its lease) on KeyboardInterrupt"""
         mock_scheduler = MagicMock()
-        mock_scheduler_class.return_value = mock_scheduler
+        mock_get_scheduler.return_value = mock_scheduler
         mock_scheduler.start.side_effect = KeyboardInterrupt()
         
         out = StringIO()
         call_command('run_scheduler', stdout=out)
         
-        # Should add 2 jobs
-        assert mock_scheduler.add_job.call_count == 2
+        assert mock_scheduler.stop.called
+        assert 'shut down successfully' in out.getvalue()
     
-    @patch('eduAPI.management.commands.run_scheduler.BlockingScheduler')
-    def test_scheduler_graceful_shutdown(self, mock_scheduler_class):
-        """Test scheduler shuts down gracefully on KeyboardInterrupt"""
+    @patch('eduAPI.management.commands.run_scheduler.get_scheduler')
+    def test_scheduler_once(self, mock_get_scheduler):
+        """Test --once runs a single pass without starting the loop"""
         mock_scheduler = MagicMock()
-        mock_scheduler_class.return_value = mock_scheduler
-        mock_scheduler.start.side_effect = KeyboardInterrupt()
+        mock_get_scheduler.return_value = mock_scheduler
+        mock_scheduler.run_once.return_value = True
         
         out = StringIO()
-        call_command('run_scheduler', stdout=out)
-        
-        assert mock_scheduler.shutdown.called
-
-
-@pytest.mark.django_db
-class TestGenerateSessionsJob:
-    """Tests for generate_sessions_job function"""
-    
-    @patch('eduAPI.management.commands.run_scheduler.SessionGeneratorService')
-    def test_generate_sessions_job_success(self, mock_service_class):
-        """Test successful session generation job"""
-        from eduAPI.management.commands.run_scheduler import generate_sessions_job
-        
-        mock_service = MagicMock()
-        mock_service.generate_sessions_for_date.return_value = {
-            'generated': 5,
-            'failed': 0,
-            'skipped': 2
-        }
-        mock_service_class.return_value = mock_service
-        
-        generate_sessions_job()
-        
-        assert mock_service.generate_sessions_for_date.called
-    
-    @patch('eduAPI.management.commands.run_scheduler.SessionGeneratorService')
-    def test_generate_sessions_job_with_failures(self, mock_service_class):
-        """Test session generation job with failures"""
-        from eduAPI.management.commands.run_scheduler import generate_sessions_job
-        
-        mock_service = MagicMock()
-        mock_service.generate_sessions_for_date.return_value = {
-            'generated': 3,
-            'failed': 2,
-            'skipped': 1
-        }
-        mock_service_class.return_value = mock_service
+        call_command('run_scheduler', '--once', stdout=out)
         
-        generate_sessions_job()
-        
-        assert mock_service.generate_sessions_for_date.called
-    
-    @patch('eduAPI.management.commands.run_scheduler.SessionGeneratorService')
-    def test_generate_sessions_job_exception(self, mock_service_class):
-        """Test session generation job handles exceptions"""
-        from eduAPI.management.commands.run_scheduler import generate_sessions_job
-        
-        mock_service = MagicMock()
-        mock_service.generate_sessions_for_date.side_effect = Exception("Test error")
-        mock_service_class.return_value = mock_service
-        
-        # Should not raise exception
-        generate_sessions_job()
-
-
-@pytest.mark.django_db
-class TestDeleteOldJobExecutions:
-    """Tests for delete_old_job_executions function"""
-    
-    @patch('eduAPI.management.commands.run_scheduler.DjangoJobExecution')
-    def test_delete_old_executions(self, mock_execution):
-        """Test deleting old job executions"""
-        from eduAPI.management.commands.run_scheduler import delete_old_job_executions
-        
-        delete_old_job_executions()
-        
-        assert mock_execution.objects.delete_old_job_executions.called
+        assert mock_scheduler.run_once.called
+        assert not mock_scheduler.start.called
+        assert 'completed' in out.getvalue()
     
-    @patch('eduAPI.management.commands.run_scheduler.DjangoJobExecution')
-    def test_delete_old_executions_custom_age(self, mock_execution):
-        """Test deleting old job executions with custom max age"""
-        from eduAPI.management.commands.run_scheduler import delete_old_job_executions
+    @patch('eduAPI.management.commands.run_scheduler.get_scheduler')
+    def test_scheduler_once_lease_taken(self, mock_get_scheduler):
+        """Test --once reports when another instance is the leader"""
+        mock_scheduler = MagicMock()
+        mock_get_scheduler.return_value = mock_scheduler
+        mock_scheduler.run_once.return_value = False
         
-        delete_old_job_executions(max_age=86400)  # 1 day
+        out = StringIO()
+        call_command('run_scheduler', '--once', stdout=out)
         
-        mock_execution.objects.delete_old_job_executions.assert_called_with(86400)
+        assert 'Another instance holds the scheduler lease' in out.getvalue()
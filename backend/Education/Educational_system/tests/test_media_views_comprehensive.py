@@ -13,6 +13,7 @@ from django.urls import reverse
 from django.conf import settings
 from rest_framework.test import APIClient
 from rest_framework import status
+from django.contrib.auth.models import AnonymousUser
 
 
 def safe_cleanup(path):
@@ -30,8 +31,8 @@ class TestServeFile:
     """Tests for serve_file endpoint"""
     
     @pytest.fixture(autouse=True)
-    def setup(self, api_client):
-        self.client = api_client
+    def setup(self, authenticated_client):
+        self.client = authenticated_client
         self.temp_media = tempfile.mkdtemp()
         self.original_media_root = settings.MEDIA_ROOT
         settings.MEDIA_ROOT = self.temp_media
@@ -158,8 +159,9 @@ class TestDirectDownload:
     """Tests for direct_download endpoint"""
     
     @pytest.fixture(autouse=True)
-    def setup(self, api_client):
+    def setup(self, api_client, admin_user):
         self.client = api_client
+        self.client.force_authenticate(user=admin_user)
         self.temp_media = tempfile.mkdtemp()
         self.original_media_root = settings.MEDIA_ROOT
         settings.MEDIA_ROOT = self.temp_media
@@ -229,24 +231,28 @@ class TestServePdfAlias:
 class TestServeFileUnit:
     """Unit tests for serve_file function"""
     
-    def test_serve_file_function_directly(self):
+    def test_serve_file_function_directly(self, student_user):
         """Test serve_file function directly"""
         from eduAPI.views.media_views import serve_file
         from django.test import RequestFactory
+        from rest_framework.test import force_authenticate
         
         factory = RequestFactory()
         request = factory.get('/api/file-serve/')
+        force_authenticate(request, user=student_user)
         
         response = serve_file(request)
         assert response.status_code == 400
     
-    def test_serve_file_with_file_param(self):
+    def test_serve_file_with_file_param(self, student_user):
         """Test serve_file with file parameter"""
         from eduAPI.views.media_views import serve_file
         from django.test import RequestFactory
+        from rest_framework.test import force_authenticate
         
         factory = RequestFactory()
         request = factory.get('/api/file-serve/', {'file': 'test.pdf'})
+        force_authenticate(request, user=student_user)
         
         response = serve_file(request)
         assert response.status_code in [404, 500]
@@ -269,21 +275,24 @@ class TestDirectDownloadUnit:
         settings.MEDIA_ROOT = self.original_media_root
         safe_cleanup(self.temp_media)
     
-    def test_direct_download_function_directly(self):
+    def test_direct_download_function_directly(self, admin_user):
         """Test direct_download function directly"""
         from eduAPI.views.media_views import direct_download
         from django.test import RequestFactory
+        from rest_framework.test import force_authenticate
         
         factory = RequestFactory()
         request = factory.get('/download/test.pdf')
+        force_authenticate(request, user=admin_user)
         
         response = direct_download(request, 'test.pdf')
         assert response.status_code == 404
     
-    def test_direct_download_with_existing_file(self):
+    def test_direct_download_with_existing_file(self, admin_user):
         """Test direct_download with existing file"""
         from eduAPI.views.media_views import direct_download
         from django.test import RequestFactory
+        from rest_framework.test import force_authenticate
         
         test_file = os.path.join(self.lesson_files_dir, 'existing.pdf')
         with open(test_file, 'wb') as f:
@@ -291,6 +300,223 @@ class TestDirectDownloadUnit:
         
         factory = RequestFactory()
         request = factory.get('/download/existing.pdf')
+        force_authenticate(request, user=admin_user)
         
         response = direct_download(request, 'existing.pdf')
         assert response.status_code == 200
+
+
+@pytest.mark.django_db
+class TestPartialAndConditionalRequests:
+    """Range, ETag and front-server delegation for served files"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, api_client, admin_user):
+        self.client = api_client
+        self.client.force_authenticate(user=admin_user)
+        self.temp_media = tempfile.mkdtemp()
+        self.original_media_root = settings.MEDIA_ROOT
+        settings.MEDIA_ROOT = self.temp_media
+
+        self.lesson_files_dir = os.path.join(self.temp_media, 'lesson_files')
+        os.makedirs(self.lesson_files_dir, exist_ok=True)
+        self.content = bytes(range(256)) * 4
+        with open(os.path.join(self.lesson_files_dir, 'video.mp4'), 'wb') as f:
+            f.write(self.content)
+
+    def teardown_method(self):
+        settings.MEDIA_ROOT = self.original_media_root
+        safe_cleanup(self.temp_media)
+
+    def get(self, **headers):
+        return self.client.get('/api/file-serve/', {'file': '/media/lesson_files/video.mp4'}, **headers)
+
+    def test_full_response_advertises_ranges(self):
+        response = self.get()
+        assert response.status_code == 200
+        assert response['Accept-Ranges'] == 'bytes'
+        assert response['ETag']
+        assert response['Last-Modified']
+        assert b''.join(response.streaming_content) == self.content
+
+    def test_byte_range(self):
+        response = self.get(HTTP_RANGE='bytes=100-199')
+        assert response.status_code == 206
+        assert response['Content-Range'] == f'bytes 100-199/{len(self.content)}'
+        assert response['Content-Length'] == '100'
+        assert b''.join(response.streaming_content) == self.content[100:200]
+
+    def test_suffix_and_open_ended_ranges(self):
+        response = self.get(HTTP_RANGE='bytes=-24')
+        assert b''.join(response.streaming_content) == self.content[-24:]
+
+        response = self.get(HTTP_RANGE='bytes=1000-')
+        assert response['Content-Range'] == f'bytes 1000-1023/{len(self.content)}'
+        assert b''.join(response.streaming_content) == self.content[1000:]
+
+    def test_unsatisfiable_range(self):
+        response = self.get(HTTP_RANGE='bytes=5000-6000')
+        assert response.status_code == 416
+        assert response['Content-Range'] == f'bytes */{len(self.content)}'
+
+    def test_if_none_match_returns_304(self):
+        etag = self.get()['ETag']
+        response = self.get(HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304
+
+    def test_stale_if_range_sends_whole_file(self):
+        response = self.get(HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE='"stale"')
+        assert response.status_code == 200
+
+    def test_x_accel_redirect_mode(self):
+        with override_settings(MEDIA_SERVE_MODE='x-accel', MEDIA_ACCEL_PREFIX='/protected-media/'):
+            response = self.get()
+        assert response.status_code == 200
+        assert response['X-Accel-Redirect'] == '/protected-media/lesson_files/video.mp4'
+        assert response['Content-Type'] == 'video/mp4'
+        assert response.content == b''
+
+    def test_x_sendfile_mode(self):
+        with override_settings(MEDIA_SERVE_MODE='x-sendfile'):
+            response = self.get()
+        assert response['X-Sendfile'].endswith(os.path.join('lesson_files', 'video.mp4'))
+
+    def test_path_outside_media_root_is_rejected(self):
+        with open(os.path.join(os.path.dirname(self.temp_media), 'outside_media.txt'), 'w') as f:
+            f.write('secret')
+        try:
+            response = self.client.get('/api/file-serve/', {'file': '../outside_media.txt'})
+            assert response.status_code == 404
+        finally:
+            os.remove(os.path.join(os.path.dirname(self.temp_media), 'outside_media.txt'))
+
+    def test_suffixed_upload_found_through_index(self, teacher_user):
+        from eduAPI.models import Lesson, LessonContent
+
+        with open(os.path.join(self.lesson_files_dir, 'notes_Ab12Cd.pdf'), 'wb') as f:
+            f.write(b'%PDF-1.4 notes')
+        lesson = Lesson.objects.create(name='Lesson', subject='Math', level='10', teacher=teacher_user)
+        LessonContent.objects.create(
+            lesson=lesson, title='Notes', content_type='PDF', file='lesson_files/notes_Ab12Cd.pdf'
+        )
+
+        response = self.client.get('/download/notes.pdf')
+        assert response.status_code == 200
+        assert 'notes_Ab12Cd.pdf' in response['Content-Disposition']
+
+        response = self.client.get('/api/file-serve/', {'file': 'lesson_files/notes.pdf'})
+        assert response.status_code == 200
+
+
+@pytest.mark.django_db
+class TestMediaAccess:
+    """Uploads are only served to users allowed to see their lesson or session"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, api_client, teacher_user, student_user, advisor_user):
+        from datetime import timedelta
+        from django.utils import timezone
+        from eduAPI.models import Lesson, LessonContent, LiveSession, LiveSessionMaterial
+
+        self.client = api_client
+        self.teacher, self.student, self.advisor = teacher_user, student_user, advisor_user
+        self.temp_media = tempfile.mkdtemp()
+        self.original_media_root = settings.MEDIA_ROOT
+        settings.MEDIA_ROOT = self.temp_media
+        for directory, name in (('lesson_files', 'notes.pdf'), ('live_session_materials', 'slides.pdf')):
+            os.makedirs(os.path.join(self.temp_media, directory), exist_ok=True)
+            with open(os.path.join(self.temp_media, directory, name), 'wb') as f:
+                f.write(b'%PDF-1.4 private')
+
+        self.lesson = Lesson.objects.create(name='Lesson', subject='Math', level='10', teacher=teacher_user)
+        LessonContent.objects.create(
+            lesson=self.lesson, title='Notes', content_type='PDF', file='lesson_files/notes.pdf'
+        )
+        self.session = LiveSession.objects.create(
+            title='Session', teacher=teacher_user, subject='Math', level='10',
+            scheduled_datetime=timezone.now() + timedelta(days=1), duration_minutes=60
+        )
+        LiveSessionMaterial.objects.create(
+            session=self.session, title='Slides', content_type='PDF',
+            file='live_session_materials/slides.pdf', uploaded_by=teacher_user
+        )
+
+    def teardown_method(self):
+        settings.MEDIA_ROOT = self.original_media_root
+        safe_cleanup(self.temp_media)
+
+    def fetch(self, user, path):
+        if user is not None:
+            self.client.force_authenticate(user=user)
+        return self.client.get('/api/file-serve/', {'file': path})
+
+    def test_anonymous_request_is_rejected(self):
+        assert self.fetch(None, 'lesson_files/notes.pdf').status_code == 401
+        assert self.client.get('/download/notes.pdf').status_code == 401
+
+    def test_lesson_file_needs_enrollment(self):
+        from eduAPI.models import StudentEnrollment
+
+        assert self.fetch(self.student, 'lesson_files/notes.pdf').status_code == 403
+        assert self.client.get('/download/notes.pdf').status_code == 403
+
+        StudentEnrollment.objects.create(student=self.student, lesson=self.lesson)
+        assert self.fetch(self.student, 'lesson_files/notes.pdf').status_code == 200
+        assert self.client.get('/download/notes.pdf').status_code == 200
+
+    def test_session_material_needs_assignment(self):
+        from eduAPI.models import LiveSessionAssignment
+
+        assert self.fetch(self.student, 'live_session_materials/slides.pdf').status_code == 403
+
+        LiveSessionAssignment.objects.create(session=self.session, student=self.student, advisor=self.advisor)
+        assert self.fetch(self.student, 'live_session_materials/slides.pdf').status_code == 200
+
+    def test_owner_and_advisor_can_read_uploads(self):
+        assert self.fetch(self.teacher, 'lesson_files/notes.pdf').status_code == 200
+        assert self.fetch(self.teacher, 'live_session_materials/slides.pdf').status_code == 200
+        assert self.fetch(self.advisor, 'lesson_files/notes.pdf').status_code == 200
+
+    def test_link_token_authenticates_without_header(self):
+        from eduAPI.models import StudentEnrollment
+        from eduAPI.services import media_service
+
+        StudentEnrollment.objects.create(student=self.student, lesson=self.lesson)
+        token = media_service.download_token(self.student)
+
+        response = self.client.get('/api/file-serve/', {'file': 'lesson_files/notes.pdf', 'token': token})
+        assert response.status_code == 200
+        assert self.client.get('/download/notes.pdf', {'token': token}).status_code == 200
+        # The token carries the user, not a pass: can_access still applies
+        response = self.client.get('/api/file-serve/', {'file': 'live_session_materials/slides.pdf', 'token': token})
+        assert response.status_code == 403
+
+    def test_tampered_or_expired_token_is_rejected(self):
+        from eduAPI.services import media_service
+
+        token = media_service.download_token(self.teacher)
+        response = self.client.get('/api/file-serve/', {'file': 'lesson_files/notes.pdf', 'token': token + 'x'})
+        assert response.status_code == 401
+        with override_settings(MEDIA_TOKEN_MAX_AGE=-1):
+            response = self.client.get('/api/file-serve/', {'file': 'lesson_files/notes.pdf', 'token': token})
+        assert response.status_code == 401
+
+    def test_content_responses_carry_the_requesting_users_token(self):
+        from eduAPI.services import media_service
+
+        self.client.force_authenticate(user=self.teacher)
+        response = self.client.get(f'/api/student/lessons/{self.lesson.id}/contents/')
+        self.client.force_authenticate(user=self.student)
+        response = self.client.get(f'/api/student/lessons/{self.lesson.id}/contents/')
+
+        assert response.status_code == 200
+        # Served from the cache filled by the teacher's request, with the student's own token
+        token = response.data[0]['download_token']
+        request = type('Request', (), {'user': AnonymousUser(), 'GET': {'token': token}})()
+        assert media_service.download_user(request) == self.student
+
+    def test_front_server_header_only_after_access_check(self):
+        with override_settings(MEDIA_SERVE_MODE='x-accel', MEDIA_ACCEL_PREFIX='/protected-media/'):
+            response = self.fetch(self.student, 'lesson_files/notes.pdf')
+        assert response.status_code == 403
+        assert not response.has_header('X-Accel-Redirect')
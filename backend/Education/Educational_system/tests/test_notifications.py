@@ -0,0 +1,160 @@
+# Tests for live-session notification fan-out, unread counters and the inbox
+from datetime import date, timedelta
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+from django.contrib.auth import get_user_model
+
+from eduAPI.models.live_sessions_models import (
+    LiveSession, LiveSessionAssignment, LiveSessionNotification, NotificationCounter
+)
+from eduAPI.models.recurring_sessions_models import SessionTemplate, StudentGroup, TemplateGroupAssignment
+from eduAPI.services import notification_service
+from eduAPI.services.session_generator import SessionGeneratorService
+
+User = get_user_model()
+
+
+class TestNotifications(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.teacher = User.objects.create_user(
+            username='notify_teacher', email='notify_teacher@test.com', password='testpass123',
+            first_name='Notify', last_name='Teacher', role='teacher'
+        )
+        self.advisor = User.objects.create_user(
+            username='notify_advisor', email='notify_advisor@test.com', password='testpass123',
+            first_name='Notify', last_name='Advisor', role='advisor'
+        )
+        self.students = [
+            User.objects.create_user(
+                username=f'notify_student{i}', email=f'notify_student{i}@test.com', password='testpass123',
+                first_name=f'Student{i}', last_name='Notify', role='student'
+            )
+            for i in range(10)
+        ]
+        self.session = self.make_session('Algebra', timezone.now() + timedelta(days=1))
+
+    def make_session(self, title, start, status='PENDING'):
+        return LiveSession.objects.create(
+            title=title, subject='Math', level='10', teacher=self.teacher,
+            scheduled_datetime=start, duration_minutes=60, status=status,
+            jitsi_room_name=f'notify-{title}'
+        )
+
+    def unread(self, user):
+        return notification_service.unread_count(user)
+
+    def test_fan_out_query_count_is_constant(self):
+        with CaptureQueriesContext(connection) as two:
+            notification_service.notify_assigned(self.session, [s.id for s in self.students[:2]])
+        with CaptureQueriesContext(connection) as ten:
+            created = notification_service.notify_assigned(self.session, [s.id for s in self.students])
+
+        self.assertEqual(created, 10)
+        self.assertEqual(len(two.captured_queries), len(ten.captured_queries))
+        self.assertEqual(self.unread(self.students[0]), 2)
+        self.assertEqual(self.unread(self.students[9]), 1)
+
+    def test_assigning_through_the_api_notifies_new_students_only(self):
+        LiveSessionAssignment.objects.create(session=self.session, student=self.students[0], advisor=self.advisor)
+        self.client.force_authenticate(user=self.advisor)
+
+        self.client.post(
+            f'/api/live-sessions/{self.session.id}/assign/',
+            {'student_ids': [s.id for s in self.students[:3]]}, format='json'
+        )
+
+        recipients = LiveSessionNotification.objects.filter(notification_type='SESSION_ASSIGNED').values_list('recipient_id', flat=True)
+        self.assertEqual(sorted(recipients), [self.students[1].id, self.students[2].id])
+
+    def test_cancelling_notifies_assigned_students(self):
+        for student in self.students[:4]:
+            LiveSessionAssignment.objects.create(session=self.session, student=student, advisor=self.advisor)
+        self.client.force_authenticate(user=self.teacher)
+
+        response = self.client.delete(f'/api/live-sessions/{self.session.id}/cancel/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(LiveSessionNotification.objects.filter(notification_type='SESSION_CANCELLED').count(), 4)
+        self.assertEqual(self.unread(self.students[3]), 1)
+
+    def test_generated_session_notifies_every_student_in_bulk(self):
+        group = StudentGroup.objects.create(name='Notify Group', advisor=self.advisor)
+        group.students.add(*self.students)
+        day = date.today() + timedelta(days=3)
+        template = SessionTemplate.objects.create(
+            title='Weekly Notify', subject='Math', level='10', teacher=self.teacher,
+            day_of_week=day.weekday(), start_time='16:00:00', recurrence_type='WEEKLY', start_date=day
+        )
+        TemplateGroupAssignment.objects.create(template=template, group=group, advisor=self.advisor)
+
+        SessionGeneratorService().generate_sessions_for_dates([day])
+
+        self.assertEqual(LiveSessionNotification.objects.filter(
+            notification_type='SESSION_ASSIGNED', session__title='Weekly Notify'
+        ).count(), 10)
+
+    def test_reminders_are_sent_once(self):
+        soon = self.make_session('Soon', timezone.now() + timedelta(minutes=30), status='ASSIGNED')
+        for student in self.students[:3]:
+            LiveSessionAssignment.objects.create(session=soon, student=student, advisor=self.advisor)
+
+        call_command('send_session_reminders', stdout=open('/dev/null', 'w'))
+        call_command('send_session_reminders', stdout=open('/dev/null', 'w'))
+
+        reminders = LiveSessionNotification.objects.filter(notification_type='SESSION_REMINDER')
+        self.assertEqual(reminders.count(), 4)  # three students and the teacher
+        self.assertEqual(self.unread(self.teacher), 1)
+
+    def test_inbox_is_cursor_paginated(self):
+        student = self.students[0]
+        for index in range(5):
+            notification_service.notify_assigned(self.make_session(f'S{index}', timezone.now() + timedelta(days=index + 2)), [student.id])
+        self.client.force_authenticate(user=student)
+
+        first = self.client.get('/api/live-sessions/notifications/', {'page_size': 3})
+        second = self.client.get('/api/live-sessions/notifications/', {'page_size': 3, 'cursor': first.data['next_cursor']})
+
+        self.assertEqual(first.data['unread_count'], 5)
+        self.assertEqual(len(first.data['results']), 3)
+        self.assertEqual(len(second.data['results']), 2)
+        self.assertIsNone(second.data['next_cursor'])
+        ids = [row['id'] for row in first.data['results'] + second.data['results']]
+        self.assertEqual(ids, sorted(ids, reverse=True))
+
+    def test_bulk_mark_read_updates_counter(self):
+        student = self.students[0]
+        for index in range(4):
+            notification_service.notify_assigned(self.make_session(f'R{index}', timezone.now() + timedelta(days=index + 2)), [student.id])
+        ids = list(LiveSessionNotification.objects.filter(recipient=student).values_list('id', flat=True))
+        self.client.force_authenticate(user=student)
+
+        some = self.client.post('/api/live-sessions/notifications/mark-read/', {'ids': ids[:2] + [999999]}, format='json')
+        again = self.client.post('/api/live-sessions/notifications/mark-read/', {'ids': ids[:2]}, format='json')
+        count = self.client.get('/api/live-sessions/notifications/unread-count/')
+        everything = self.client.post('/api/live-sessions/notifications/mark-read/', {'all': True}, format='json')
+
+        self.assertEqual((some.data['updated'], some.data['unread_count']), (2, 2))
+        self.assertEqual(again.data['updated'], 0)
+        self.assertEqual(count.data['unread_count'], 2)
+        self.assertEqual((everything.data['updated'], everything.data['unread_count']), (2, 0))
+        unread = self.client.get('/api/live-sessions/notifications/', {'unread': 'true'})
+        self.assertEqual(unread.data['results'], [])
+
+    def test_deleting_a_session_and_recount_keep_counters_right(self):
+        student = self.students[0]
+        other = self.make_session('Other', timezone.now() + timedelta(days=4))
+        notification_service.notify_assigned(self.session, [student.id])
+        notification_service.notify_assigned(other, [student.id])
+
+        other.delete()
+        self.assertEqual(self.unread(student), 1)
+
+        NotificationCounter.objects.filter(user=student).update(unread=40)
+        notification_service.recount()
+        self.assertEqual(self.unread(student), 1)
@@ -0,0 +1,146 @@
+# Tests for keyset pagination on live session, student and template list endpoints
+from datetime import timedelta
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+from django.contrib.auth import get_user_model
+
+from eduAPI.models.live_sessions_models import LiveSession, LiveSessionAssignment
+from eduAPI.models.recurring_sessions_models import SessionTemplate, StudentGroup, TemplateGroupAssignment
+
+User = get_user_model()
+
+
+class TestSessionKeysetPagination(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.teacher = User.objects.create_user(
+            username='teacher_page', email='teacher_page@test.com', password='testpass123',
+            first_name='Test', last_name='Teacher', role='teacher', is_email_verified=True
+        )
+        self.advisor = User.objects.create_user(
+            username='advisor_page', email='advisor_page@test.com', password='testpass123',
+            first_name='Test', last_name='Advisor', role='advisor', is_email_verified=True
+        )
+        self.students = [
+            User.objects.create_user(
+                username=f'student_page{i}', email=f'student_page{i}@test.com', password='testpass123',
+                first_name=f'Student{i}', last_name='Page', role='student', is_email_verified=True
+            )
+            for i in range(3)
+        ]
+        start = timezone.now() + timedelta(days=1)
+        self.sessions = []
+        for i in range(7):
+            # Two sessions share each time slot so the id tie-breaker is exercised
+            session = LiveSession.objects.create(
+                title=f'Session {i}', teacher=self.teacher, subject='Math', level='10',
+                scheduled_datetime=start + timedelta(hours=i // 2), duration_minutes=60,
+                jitsi_room_name=f'page-room-{i}'
+            )
+            self.sessions.append(session)
+        for student in self.students:
+            LiveSessionAssignment.objects.create(session=self.sessions[0], student=student, advisor=self.advisor)
+
+    def collect_pages(self, page_size):
+        self.client.force_authenticate(user=self.advisor)
+        ids, cursor, pages = [], None, 0
+        while True:
+            params = {'page_size': page_size}
+            if cursor:
+                params['cursor'] = cursor
+            response = self.client.get('/api/live-sessions/', params)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            ids.extend(row['id'] for row in response.data['results'])
+            pages += 1
+            cursor = response.data['next_cursor']
+            if not cursor:
+                return ids, pages
+
+    def test_pages_cover_every_session_once_in_order(self):
+        ids, pages = self.collect_pages(page_size=3)
+        expected = list(
+            LiveSession.objects.order_by('-scheduled_datetime', '-id').values_list('id', flat=True)
+        )
+        self.assertEqual(ids, expected)
+        self.assertEqual(pages, 3)
+
+    def test_unpaginated_request_still_returns_list(self):
+        self.client.force_authenticate(user=self.advisor)
+        response = self.client.get('/api/live-sessions/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsInstance(response.data, list)
+        self.assertEqual(len(response.data), 7)
+
+    def test_assignment_counts_are_annotated(self):
+        self.client.force_authenticate(user=self.advisor)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/live-sessions/', {'page_size': 50})
+        counts = {row['id']: row['assigned_students_count'] for row in response.data['results']}
+        self.assertEqual(counts[self.sessions[0].id], 3)
+        self.assertEqual(counts[self.sessions[1].id], 0)
+        self.assertLessEqual(len(queries), 2)
+
+    def test_student_sees_full_assignment_count(self):
+        self.client.force_authenticate(user=self.students[0])
+        response = self.client.get('/api/live-sessions/')
+        self.assertEqual([row['id'] for row in response.data], [self.sessions[0].id])
+        self.assertEqual(response.data[0]['assigned_students_count'], 3)
+
+    def test_invalid_cursor_is_rejected(self):
+        self.client.force_authenticate(user=self.advisor)
+        response = self.client.get('/api/live-sessions/', {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class TestRecurringListPagination(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.teacher = User.objects.create_user(
+            username='teacher_page2', email='teacher_page2@test.com', password='testpass123',
+            first_name='Test', last_name='Teacher', role='teacher', is_email_verified=True
+        )
+        self.advisor = User.objects.create_user(
+            username='advisor_page2', email='advisor_page2@test.com', password='testpass123',
+            first_name='Test', last_name='Advisor', role='advisor', is_email_verified=True
+        )
+        for i in range(5):
+            User.objects.create_user(
+                username=f'student_page2_{i}', email=f'student_page2_{i}@test.com', password='testpass123',
+                first_name='Same', last_name='Name', role='student', is_email_verified=True
+            )
+        self.template = SessionTemplate.objects.create(
+            title='Template', teacher=self.teacher, subject='Math', level='10',
+            day_of_week=1, start_time='10:00:00', recurrence_type='WEEKLY',
+            status='PAUSED', start_date=timezone.now().date()
+        )
+        self.group = StudentGroup.objects.create(name='Group A', advisor=self.advisor)
+        self.group.students.set(User.objects.filter(role='student'))
+        TemplateGroupAssignment.objects.create(template=self.template, group=self.group, advisor=self.advisor)
+
+    def test_available_students_pages(self):
+        self.client.force_authenticate(user=self.advisor)
+        first = self.client.get('/api/recurring-sessions/students/available/', {'page_size': 3})
+        self.assertEqual(len(first.data['results']), 3)
+        second = self.client.get('/api/recurring-sessions/students/available/', {'cursor': first.data['next_cursor']})
+        ids = [row['id'] for row in first.data['results'] + second.data['results']]
+        self.assertEqual(len(set(ids)), 5)
+        self.assertIsNone(second.data['next_cursor'])
+
+    def test_template_list_annotated_and_paginated(self):
+        self.client.force_authenticate(user=self.teacher)
+        response = self.client.get('/api/recurring-sessions/templates/', {'page_size': 10})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'][0]['assigned_groups_count'], 1)
+
+    def test_group_list_annotated(self):
+        self.client.force_authenticate(user=self.advisor)
+        response = self.client.get('/api/recurring-sessions/groups/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data[0]['student_count'], 5)
+        self.assertEqual(response.data[0]['template_assignments_count'], 1)
+        self.assertEqual(len(response.data[0]['students_details']), 5)
@@ -0,0 +1,144 @@
+# Tests for the materialized student performance tables
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+
+from eduAPI.models import (
+    Lesson, StudentEnrollment, Quiz, QuizAttempt, StudentLessonStats, StudentStats
+)
+from eduAPI.services import performance_service
+
+User = get_user_model()
+
+
+class TestPerformanceStats(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.teacher = User.objects.create_user(
+            username='perf_teacher', email='perf_teacher@test.com', password='testpass123',
+            first_name='Perf', last_name='Teacher', role='teacher'
+        )
+        self.advisor = User.objects.create_user(
+            username='perf_advisor', email='perf_advisor@test.com', password='testpass123',
+            first_name='Perf', last_name='Advisor', role='advisor'
+        )
+        self.student = self.make_student('perf_student')
+        self.math = Lesson.objects.create(name='Math', subject='Math', level='10', teacher=self.teacher)
+        self.physics = Lesson.objects.create(name='Physics', subject='Physics', level='10', teacher=self.teacher)
+        self.math_quiz = Quiz.objects.create(lesson=self.math, title='Math quiz')
+
+    def make_student(self, username):
+        return User.objects.create_user(
+            username=username, email=f'{username}@test.com', password='testpass123',
+            first_name=username, last_name='Student', role='student', grade_level='10'
+        )
+
+    def complete_attempt(self, student, score):
+        return QuizAttempt.objects.create(
+            student=student, quiz=self.math_quiz, score=score, passed=score >= 70, end_time=timezone.now()
+        )
+
+    def test_enrollment_and_attempts_update_rows(self):
+        StudentEnrollment.objects.create(student=self.student, lesson=self.math, progress=40)
+        StudentEnrollment.objects.create(student=self.student, lesson=self.physics, progress=80)
+        # A started attempt does not count until completed
+        QuizAttempt.objects.create(student=self.student, quiz=self.math_quiz)
+        self.complete_attempt(self.student, 50)
+        self.complete_attempt(self.student, 90)
+
+        math = StudentLessonStats.objects.get(student=self.student, lesson=self.math)
+        self.assertEqual((math.progress, math.attempts, math.best_score, math.pass_rate), (40, 2, 90, 50))
+
+        summary = StudentStats.objects.get(student=self.student)
+        self.assertEqual((summary.lessons, summary.average_progress, summary.attempts), (2, 60, 2))
+        self.assertIsNotNone(summary.last_activity)
+
+    def test_deleting_enrollment_drops_row_after_commit(self):
+        enrollment = StudentEnrollment.objects.create(student=self.student, lesson=self.physics, progress=10)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            enrollment.delete()
+
+        self.assertFalse(StudentLessonStats.objects.filter(student=self.student).exists())
+        self.assertFalse(StudentStats.objects.filter(student=self.student).exists())
+
+    def test_rebuild_matches_incremental_rows(self):
+        StudentEnrollment.objects.create(student=self.student, lesson=self.math, progress=40)
+        self.complete_attempt(self.student, 75)
+        other = self.make_student('perf_other')
+        self.complete_attempt(other, 20)  # attempts without an enrollment still count
+        expected = sorted(StudentLessonStats.objects.values_list(
+            'student_id', 'lesson_id', 'enrolled', 'progress', 'attempts', 'passed_attempts', 'best_score'
+        ))
+
+        StudentLessonStats.objects.all().delete()
+        StudentStats.objects.all().delete()
+        call_command('rebuild_performance_stats', stdout=open('/dev/null', 'w'))
+
+        self.assertEqual(sorted(StudentLessonStats.objects.values_list(
+            'student_id', 'lesson_id', 'enrolled', 'progress', 'attempts', 'passed_attempts', 'best_score'
+        )), expected)
+        self.assertEqual(StudentStats.objects.get(student=other).lessons, 0)
+        self.assertEqual(StudentStats.objects.get(student=self.student).best_score, 75)
+
+    def test_teacher_student_list_reads_stats(self):
+        StudentEnrollment.objects.create(student=self.student, lesson=self.math, progress=30)
+        StudentEnrollment.objects.create(student=self.student, lesson=self.physics, progress=70)
+        self.complete_attempt(self.student, 100)
+        self.client.force_authenticate(user=self.teacher)
+
+        response = self.client.get('/api/user/students/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), 1)
+        row = response.data[0]
+        self.assertEqual(row['progress'], 50)
+        self.assertEqual(sorted(row['enrolled_lessons']), ['Math', 'Physics'])
+        self.assertEqual((row['quiz_attempts'], row['best_score'], row['pass_rate']), (1, 100, 100))
+
+    def test_teacher_student_list_fills_missing_rows(self):
+        # A database that predates the stats tables has enrollments but no rows
+        StudentEnrollment.objects.create(student=self.student, lesson=self.math, progress=30)
+        self.complete_attempt(self.student, 90)
+        StudentLessonStats.objects.all().delete()
+        StudentStats.objects.all().delete()
+        self.client.force_authenticate(user=self.teacher)
+
+        response = self.client.get('/api/user/students/')
+
+        self.assertEqual(len(response.data), 1)
+        self.assertEqual((response.data[0]['progress'], response.data[0]['best_score']), (30, 90))
+        self.assertEqual(StudentStats.objects.get(student=self.student).lessons, 1)
+
+    def test_student_lists_query_count_is_constant(self):
+        self.client.force_authenticate(user=self.teacher)
+        StudentEnrollment.objects.create(student=self.student, lesson=self.math, progress=30)
+        with CaptureQueriesContext(connection) as one_student:
+            self.client.get('/api/user/students/')
+        for index in range(4):
+            StudentEnrollment.objects.create(student=self.make_student(f'perf_{index}'), lesson=self.math)
+        with CaptureQueriesContext(connection) as five_students:
+            response = self.client.get('/api/user/students/')
+
+        self.assertEqual(len(response.data), 5)
+        self.assertEqual(len(one_student.captured_queries), len(five_students.captured_queries))
+
+    def test_advisor_pages_include_summary(self):
+        StudentEnrollment.objects.create(student=self.student, lesson=self.math, progress=40)
+        self.complete_attempt(self.student, 80)
+        self.client.force_authenticate(user=self.advisor)
+
+        listing = self.client.get('/api/user/advisor/students/grade/10/')
+        detail = self.client.get(f'/api/user/advisor/students/{self.student.id}/performance/')
+
+        self.assertEqual(listing.data[0]['performance']['average_progress'], 40)
+        self.assertEqual(detail.data['summary']['best_score'], 80)
+        self.assertEqual(detail.data['enrollments'][0]['pass_rate'], 100)
+
+    def test_refresh_ignores_missing_lesson(self):
+        performance_service.refresh(self.student.id, None)
+        self.assertFalse(StudentStats.objects.exists())
@@ -0,0 +1,218 @@
+# Tests for batch quiz submission and set-based scoring
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+
+from eduAPI.models.lessons_model import (
+    Lesson, StudentEnrollment, Quiz, Question, Answer, QuizAttempt, QuizAnswer
+)
+
+User = get_user_model()
+
+
+class TestBatchQuizSubmission(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.teacher = User.objects.create_user(
+            username='quiz_teacher', email='quiz_teacher@test.com', password='testpass123',
+            first_name='Quiz', last_name='Teacher', role='teacher'
+        )
+        self.student = User.objects.create_user(
+            username='quiz_student', email='quiz_student@test.com', password='testpass123',
+            first_name='Quiz', last_name='Student', role='student'
+        )
+        self.lesson = Lesson.objects.create(name='Lesson', subject='Math', level='10', teacher=self.teacher)
+        self.enrollment = StudentEnrollment.objects.create(student=self.student, lesson=self.lesson, progress=0)
+        self.quiz = self.make_quiz('Quiz 1', 10)
+        self.other_quiz = self.make_quiz('Quiz 2', 2)
+        self.attempt = QuizAttempt.objects.create(student=self.student, quiz=self.quiz)
+        self.client.force_authenticate(user=self.student)
+
+    def make_quiz(self, title, question_count):
+        quiz = Quiz.objects.create(lesson=self.lesson, title=title)
+        for order in range(question_count):
+            question = Question.objects.create(quiz=quiz, question_text=f'Q{order}', order=order)
+            Answer.objects.create(question=question, answer_text='right', is_correct=True)
+            Answer.objects.create(question=question, answer_text='wrong', is_correct=False)
+        return quiz
+
+    def answers(self, quiz, correct):
+        """Pairs for every question of the quiz, the first `correct` answered correctly"""
+        pairs = []
+        for i, question in enumerate(quiz.questions.all()):
+            answer = question.answers.get(is_correct=i < correct)
+            pairs.append({'question_id': question.id, 'answer_id': answer.id})
+        return pairs
+
+    def submit(self, answers, complete=False, attempt=None):
+        attempt = attempt or self.attempt
+        return self.client.post(
+            f'/api/student/quiz-attempts/{attempt.id}/submit-answers/',
+            {'answers': answers, 'complete': complete}, format='json'
+        )
+
+    def test_submit_and_complete_in_one_request(self):
+        response = self.submit(self.answers(self.quiz, 8), complete=True)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['score'], 80)
+        self.assertTrue(response.data['passed'])
+        self.assertEqual(len(response.data['quiz_answers']), 10)
+        # One of the lesson's two quizzes is passed
+        self.enrollment.refresh_from_db()
+        self.assertEqual(self.enrollment.progress, 50)
+
+    def test_resubmitting_replaces_answers(self):
+        self.submit(self.answers(self.quiz, 2))
+        response = self.submit(self.answers(self.quiz, 10))
+
+        self.assertEqual(response.data['saved'], 10)
+        self.assertEqual(QuizAnswer.objects.filter(attempt=self.attempt).count(), 10)
+        self.assertEqual(QuizAnswer.objects.filter(attempt=self.attempt, is_correct=True).count(), 10)
+
+    def test_upsert_omits_conflict_target_on_mysql(self):
+        features = connection.features
+        answers = self.answers(self.quiz, 1)[:1]
+        with mock.patch.object(features, 'supports_update_conflicts_with_target', False), \
+                mock.patch.object(QuizAnswer.objects, 'bulk_create') as bulk_create:
+            self.submit(answers)
+        self.assertNotIn('unique_fields', bulk_create.call_args.kwargs)
+        self.assertTrue(bulk_create.call_args.kwargs['update_conflicts'])
+
+        with mock.patch.object(QuizAnswer.objects, 'bulk_create') as bulk_create:
+            self.submit(answers)
+        self.assertEqual(bulk_create.call_args.kwargs['unique_fields'], ['attempt', 'question'])
+
+    def test_unanswered_questions_count_as_wrong(self):
+        self.submit(self.answers(self.quiz, 10)[:6])
+        response = self.client.post(f'/api/student/quiz-attempts/{self.attempt.id}/complete/')
+
+        self.assertEqual(response.data['score'], 60)
+        self.assertFalse(response.data['passed'])
+        self.enrollment.refresh_from_db()
+        self.assertEqual(self.enrollment.progress, 0)
+
+    def test_answer_from_another_question_is_rejected(self):
+        pairs = self.answers(self.quiz, 10)
+        pairs[0]['answer_id'] = pairs[1]['answer_id']
+        pairs.append(self.answers(self.other_quiz, 1)[0])
+
+        response = self.submit(pairs)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(QuizAnswer.objects.filter(attempt=self.attempt).exists())
+
+    def test_completed_attempt_is_not_changed(self):
+        self.submit(self.answers(self.quiz, 10), complete=True)
+
+        response = self.submit(self.answers(self.quiz, 0))
+
+        self.assertEqual(response.status_code, 400)
+        self.attempt.refresh_from_db()
+        self.assertEqual(self.attempt.score, 100)
+
+    def test_progress_counts_each_passed_quiz_once(self):
+        self.submit(self.answers(self.quiz, 10), complete=True)
+        second = QuizAttempt.objects.create(student=self.student, quiz=self.quiz)
+        self.submit(self.answers(self.quiz, 10), complete=True, attempt=second)
+        other = QuizAttempt.objects.create(student=self.student, quiz=self.other_quiz)
+        self.submit(self.answers(self.other_quiz, 2), complete=True, attempt=other)
+
+        self.enrollment.refresh_from_db()
+        self.assertEqual(self.enrollment.progress, 100)
+
+    def test_query_count_does_not_grow_with_questions(self):
+        small = QuizAttempt.objects.create(student=self.student, quiz=self.other_quiz)
+        # The first completion of the day creates the statistics counter rows
+        warm_up = QuizAttempt.objects.create(student=self.student, quiz=self.other_quiz)
+        self.submit(self.answers(self.other_quiz, 0), complete=True, attempt=warm_up)
+        small_answers, large_answers = self.answers(self.other_quiz, 2), self.answers(self.quiz, 10)
+        with CaptureQueriesContext(connection) as small_quiz:
+            self.submit(small_answers, complete=True, attempt=small)
+        with CaptureQueriesContext(connection) as large_quiz:
+            self.submit(large_answers, complete=True)
+
+        self.assertEqual(len(small_quiz.captured_queries), len(large_quiz.captured_queries))
+
+
+class TestStudentQuizAnswersView(TestCase):
+    """Teacher view of a student's answers: fixed query count, optional pagination"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.teacher = User.objects.create_user(
+            username='answers_teacher', email='answers_teacher@test.com', password='testpass123',
+            first_name='Answers', last_name='Teacher', role='teacher'
+        )
+        self.student = User.objects.create_user(
+            username='answers_student', email='answers_student@test.com', password='testpass123',
+            first_name='Answers', last_name='Student', role='student'
+        )
+        self.lesson = Lesson.objects.create(name='Lesson', subject='Math', level='10', teacher=self.teacher)
+        self.quiz = Quiz.objects.create(lesson=self.lesson, title='Quiz')
+        self.questions = []
+        for order in range(5):
+            question = Question.objects.create(quiz=self.quiz, question_text=f'Q{order}', order=order)
+            Answer.objects.create(question=question, answer_text=f'right {order}', is_correct=True)
+            Answer.objects.create(question=question, answer_text=f'wrong {order}', is_correct=False)
+            self.questions.append(question)
+        self.client.force_authenticate(user=self.teacher)
+        self.url = f'/api/user/students/{self.student.id}/quiz-answers/'
+
+    def add_attempt(self):
+        attempt = QuizAttempt.objects.create(student=self.student, quiz=self.quiz)
+        for question in self.questions:
+            QuizAnswer.objects.create(
+                attempt=attempt, question=question,
+                selected_answer=question.answers.get(is_correct=False), is_correct=False
+            )
+        return attempt
+
+    def test_answers_include_correct_option(self):
+        self.add_attempt()
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        answers = response.data[0]['answers']
+        self.assertEqual(len(answers), 5)
+        self.assertEqual(answers[0]['selected_answer'], 'wrong 0')
+        self.assertEqual(answers[0]['correct_answer'], 'right 0')
+
+    def test_query_count_does_not_grow_with_attempts(self):
+        self.add_attempt()
+        with CaptureQueriesContext(connection) as one_attempt:
+            self.client.get(self.url)
+        for _ in range(4):
+            self.add_attempt()
+        with CaptureQueriesContext(connection) as five_attempts:
+            response = self.client.get(self.url)
+
+        self.assertEqual(len(response.data), 5)
+        self.assertEqual(len(one_attempt.captured_queries), len(five_attempts.captured_queries))
+
+    def test_paginated_by_attempt(self):
+        attempts = [self.add_attempt() for _ in range(3)]
+
+        first = self.client.get(self.url, {'page_size': 2})
+        second = self.client.get(self.url, {'page_size': 2, 'cursor': first.data['next_cursor']})
+
+        self.assertEqual([a['attempt_id'] for a in first.data['results']], [attempts[2].id, attempts[1].id])
+        self.assertEqual([a['attempt_id'] for a in second.data['results']], [attempts[0].id])
+        self.assertIsNone(second.data['next_cursor'])
+
+    def test_other_teachers_attempts_are_hidden(self):
+        other = User.objects.create_user(
+            username='answers_other', email='answers_other@test.com', password='testpass123',
+            first_name='Other', last_name='Teacher', role='teacher'
+        )
+        self.add_attempt()
+        self.client.force_authenticate(user=other)
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.data['status'], 'info')
@@ -0,0 +1,130 @@
+# Tests for the template recurrence rules and horizon generation
+from datetime import date, time, timedelta
+from types import SimpleNamespace
+
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+
+from eduAPI.services import recurrence
+
+User = get_user_model()
+
+
+def make_template(**overrides):
+    values = {
+        'day_of_week': 1,  # Tuesday
+        'start_date': date(2025, 1, 1),
+        'end_date': None,
+        'recurrence_type': 'WEEKLY',
+        'last_generated': None,
+    }
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+class TestRecurrenceRules(TestCase):
+    def test_first_occurrence_is_first_matching_weekday(self):
+        # 2025-01-01 is a Wednesday, the first Tuesday after it is the 7th
+        self.assertEqual(recurrence.first_occurrence(make_template()), date(2025, 1, 7))
+
+    def test_weekly(self):
+        dates = recurrence.occurrences(make_template(), date(2025, 1, 1), date(2025, 1, 31))
+        self.assertEqual(dates, [date(2025, 1, 7), date(2025, 1, 14), date(2025, 1, 21), date(2025, 1, 28)])
+
+    def test_biweekly_is_anchored_on_first_occurrence(self):
+        template = make_template(recurrence_type='BIWEEKLY')
+        dates = recurrence.occurrences(template, date(2025, 1, 10), date(2025, 2, 28))
+        self.assertEqual(dates, [date(2025, 1, 21), date(2025, 2, 4), date(2025, 2, 18)])
+
+    def test_monthly_uses_same_ordinal_weekday(self):
+        # Anchor 2025-01-14 is the 2nd Tuesday of January
+        template = make_template(recurrence_type='MONTHLY', start_date=date(2025, 1, 8))
+        dates = recurrence.occurrences(template, date(2025, 1, 1), date(2025, 4, 30))
+        self.assertEqual(dates, [date(2025, 1, 14), date(2025, 2, 11), date(2025, 3, 11), date(2025, 4, 8)])
+
+    def test_monthly_fifth_week_means_last(self):
+        # 2025-01-28 is the last (4th) Tuesday, 2024-12-31 the 5th Tuesday
+        template = make_template(recurrence_type='MONTHLY', start_date=date(2024, 12, 29))
+        dates = recurrence.occurrences(template, date(2024, 12, 1), date(2025, 3, 31))
+        self.assertEqual(dates, [date(2024, 12, 31), date(2025, 1, 28), date(2025, 2, 25), date(2025, 3, 25)])
+
+    def test_end_date_is_respected(self):
+        template = make_template(end_date=date(2025, 1, 20))
+        dates = recurrence.occurrences(template, date(2025, 1, 1), date(2025, 2, 28))
+        self.assertEqual(dates[-1], date(2025, 1, 14))
+        self.assertIsNone(recurrence.next_occurrence(template, date(2025, 1, 21)))
+
+    def test_spacing_blocks_dates_close_to_last_generated(self):
+        template = make_template(recurrence_type='BIWEEKLY', last_generated=date(2025, 1, 14))
+        self.assertFalse(recurrence.respects_spacing(template, date(2025, 1, 21)))
+        self.assertTrue(recurrence.respects_spacing(template, date(2025, 1, 28)))
+        # Backfilling an earlier occurrence is allowed
+        self.assertTrue(recurrence.respects_spacing(template, date(2024, 12, 31)))
+
+
+class TestHorizonGeneration(TestCase):
+    def setUp(self):
+        from eduAPI.models.recurring_sessions_models import SessionTemplate, StudentGroup, TemplateGroupAssignment
+
+        self.teacher = User.objects.create_user(
+            username='horizon_teacher', email='horizon_teacher@test.com', password='testpass123', role='teacher'
+        )
+        self.advisor = User.objects.create_user(
+            username='horizon_advisor', email='horizon_advisor@test.com', password='testpass123', role='advisor'
+        )
+        student = User.objects.create_user(
+            username='horizon_student', email='horizon_student@test.com', password='testpass123', role='student'
+        )
+        group = StudentGroup.objects.create(name='Horizon Group', advisor=self.advisor)
+        group.students.add(student)
+
+        self.start = date.today() + timedelta(days=1)
+        self.templates = {}
+        # Different hours: the generator will not double-book the teacher
+        for index, recurrence_type in enumerate(('WEEKLY', 'BIWEEKLY', 'MONTHLY')):
+            template = SessionTemplate.objects.create(
+                title=f'{recurrence_type} Template', subject='Math', level='10', teacher=self.teacher,
+                day_of_week=self.start.weekday(), start_time=time(10 + 2 * index, 0), duration_minutes=60,
+                recurrence_type=recurrence_type, start_date=self.start
+            )
+            TemplateGroupAssignment.objects.create(template=template, group=group, advisor=self.advisor)
+            self.templates[recurrence_type] = template
+
+    def generated_dates(self, recurrence_type):
+        from eduAPI.models.recurring_sessions_models import GeneratedSession
+        from django.utils import timezone
+        return sorted(
+            timezone.localtime(g.session.scheduled_datetime).date()
+            for g in GeneratedSession.objects.filter(template=self.templates[recurrence_type]).select_related('session')
+        )
+
+    def generate(self):
+        from eduAPI.services.session_generator import SessionGeneratorService
+        dates = [self.start + timedelta(days=i) for i in range(70)]
+        return SessionGeneratorService().generate_sessions_for_dates(dates)
+
+    def test_horizon_follows_each_rule(self):
+        self.generate()
+        end = self.start + timedelta(days=69)
+        for recurrence_type, template in self.templates.items():
+            self.assertEqual(
+                self.generated_dates(recurrence_type),
+                recurrence.occurrences(template, self.start, end)
+            )
+        self.assertEqual(len(self.generated_dates('WEEKLY')), 10)
+        self.assertEqual(len(self.generated_dates('BIWEEKLY')), 5)
+
+    def test_only_missing_occurrences_are_filled(self):
+        from eduAPI.models.live_sessions_models import LiveSession
+
+        self.generate()
+        total = LiveSession.objects.count()
+        removed = LiveSession.objects.filter(title='WEEKLY Template').order_by('scheduled_datetime')[2]
+        removed_date = removed.scheduled_datetime
+        removed.delete()
+
+        results = self.generate()
+
+        self.assertEqual(sum(r['generated'] for r in results), 1)
+        self.assertEqual(LiveSession.objects.count(), total)
+        self.assertTrue(LiveSession.objects.filter(title='WEEKLY Template', scheduled_datetime=removed_date).exists())
@@ -0,0 +1,146 @@
+# Tests for teacher scheduling-conflict detection
+from datetime import date, datetime, time, timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+from django.contrib.auth import get_user_model
+
+from eduAPI.models.live_sessions_models import LiveSession
+from eduAPI.models.recurring_sessions_models import (
+    SessionTemplate, StudentGroup, TemplateGroupAssignment, TemplateGenerationLog
+)
+from eduAPI.services import schedule_conflicts
+from eduAPI.services.schedule_conflicts import Slot
+from eduAPI.services.session_generator import SessionGeneratorService
+
+User = get_user_model()
+
+
+class TestScheduleConflicts(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.teacher = User.objects.create_user(
+            username='conflict_teacher', email='conflict_teacher@test.com', password='testpass123',
+            first_name='Conflict', last_name='Teacher', role='teacher'
+        )
+        self.other_teacher = User.objects.create_user(
+            username='conflict_other', email='conflict_other@test.com', password='testpass123',
+            first_name='Other', last_name='Teacher', role='teacher'
+        )
+        self.day = date.today() + timedelta(days=2)
+        self.session = self.make_session(self.at(9), 60)
+
+    def at(self, hour, minute=0, day=None):
+        return timezone.make_aware(datetime.combine(day or self.day, time(hour, minute)))
+
+    def make_session(self, start, duration, teacher=None, status='PENDING'):
+        return LiveSession.objects.create(
+            title='Booked', subject='Math', level='10', teacher=teacher or self.teacher,
+            scheduled_datetime=start, duration_minutes=duration, status=status,
+            jitsi_room_name=f'conflict-{LiveSession.objects.count()}-{start:%H%M}'
+        )
+
+    def test_end_time_is_stored(self):
+        self.session.duration_minutes = 90
+        self.session.save(update_fields=['duration_minutes'])
+        self.session.refresh_from_db()
+        self.assertEqual(self.session.end_datetime, self.at(10, 30))
+
+    def test_backfill_fills_missing_end_times(self):
+        # Rows that predate the column
+        LiveSession.objects.filter(id=self.session.id).update(end_datetime=None)
+
+        call_command('backfill_session_end_times', stdout=StringIO())
+
+        self.session.refresh_from_db()
+        self.assertEqual(self.session.end_datetime, self.at(10))
+        self.assertTrue(schedule_conflicts.has_conflict(self.teacher.id, self.at(9, 30), 30))
+
+    def test_many_slots_checked_in_one_query(self):
+        self.make_session(self.at(14), 240)
+        self.make_session(self.at(9), 60, status='CANCELLED')
+        slots = [
+            Slot(self.teacher.id, self.at(8, 30), 60),   # overlaps 9:00-10:00
+            Slot(self.teacher.id, self.at(10), 60),      # starts when it ends
+            Slot(self.teacher.id, self.at(17, 30), 30),  # inside the 4h session
+            Slot(self.other_teacher.id, self.at(9), 60),
+        ]
+
+        with CaptureQueriesContext(connection) as queries:
+            conflicts = schedule_conflicts.find_conflicts(slots)
+
+        self.assertEqual(len(queries.captured_queries), 1)
+        self.assertEqual(sorted(conflicts), [0, 2])
+        self.assertEqual(conflicts[0], [self.session])
+
+    def test_finished_session_in_look_back_window_is_not_a_conflict(self):
+        # 9:00-10:00 is over by 11:00 even though it started within 4 hours
+        self.assertFalse(schedule_conflicts.has_conflict(self.teacher.id, self.at(11), 60))
+        self.assertFalse(schedule_conflicts.has_conflict(self.teacher.id, self.at(9), 60, exclude_id=self.session.id))
+
+    def test_manual_creation_rejects_overlap(self):
+        self.client.force_authenticate(user=self.teacher)
+        payload = {'title': 'Clash', 'subject': 'Math', 'level': '10', 'duration_minutes': 60}
+
+        clash = self.client.post('/api/live-sessions/', {**payload, 'scheduled_datetime': self.at(9, 30).isoformat()}, format='json')
+        free = self.client.post('/api/live-sessions/', {**payload, 'scheduled_datetime': self.at(10).isoformat()}, format='json')
+
+        self.assertEqual(clash.status_code, 400)
+        self.assertEqual(clash.data['error'], schedule_conflicts.CONFLICT_MESSAGE)
+        self.assertEqual(free.status_code, 201)
+
+    def test_update_rejects_overlap_but_not_itself(self):
+        later = self.make_session(self.at(12), 60)
+        self.client.force_authenticate(user=self.teacher)
+        url = f'/api/live-sessions/{later.id}/'
+
+        clash = self.client.put(url, {'scheduled_datetime': self.at(9, 45).isoformat()}, format='json')
+        longer = self.client.put(url, {'duration_minutes': 120}, format='json')
+
+        self.assertEqual(clash.status_code, 400)
+        self.assertEqual(longer.status_code, 200)
+        later.refresh_from_db()
+        self.assertEqual(later.end_datetime, self.at(14))
+
+    def test_generator_does_not_double_book(self):
+        advisor = User.objects.create_user(
+            username='conflict_advisor', email='conflict_advisor@test.com', password='testpass123', role='advisor'
+        )
+        group = StudentGroup.objects.create(name='Conflict Group', advisor=advisor)
+        group.students.add(User.objects.create_user(
+            username='conflict_student', email='conflict_student@test.com', password='testpass123', role='student'
+        ))
+        next_day = self.day + timedelta(days=1)
+
+        def template(title, day, hour):
+            template = SessionTemplate.objects.create(
+                title=title, subject='Math', level='10', teacher=self.teacher,
+                day_of_week=day.weekday(), start_time=time(hour, 30), duration_minutes=60,
+                recurrence_type='WEEKLY', start_date=day
+            )
+            TemplateGroupAssignment.objects.create(template=template, group=group, advisor=advisor)
+            return template
+
+        blocked = template('Blocked', self.day, 9)    # 9:30 clashes with the existing 9:00 session
+        first = template('First', next_day, 9)
+        second = template('Second', next_day, 10)     # 10:30 is free
+        clashing = template('Clashing', next_day, 9)  # same slot as First
+
+        results = SessionGeneratorService().generate_sessions_for_dates([self.day, next_day])
+
+        self.assertEqual(sum(summary['generated'] for summary in results), 2)
+        generated = set(LiveSession.objects.exclude(pk=self.session.pk).values_list('title', flat=True))
+        self.assertEqual(generated, {'First', 'Second'})
+        skipped = TemplateGenerationLog.objects.filter(status='SKIPPED').values_list('template_id', flat=True)
+        self.assertEqual(sorted(skipped), sorted([blocked.id, clashing.id]))
+        self.assertFalse(TemplateGenerationLog.objects.filter(template=second, status='SKIPPED').exists())
+        self.assertTrue(first.generated_sessions.exists())
+
+        # Later passes plan the skipped occurrences again but do not log them twice
+        SessionGeneratorService().generate_sessions_for_dates([self.day, next_day])
+        self.assertEqual(TemplateGenerationLog.objects.filter(status='SKIPPED').count(), 2)
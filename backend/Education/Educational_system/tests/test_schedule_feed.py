@@ -0,0 +1,134 @@
+# Tests for the materialized per-user schedule, the JSON calendar window and the iCalendar feed
+from datetime import date, timedelta
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+from django.contrib.auth import get_user_model
+
+from eduAPI.models.live_sessions_models import LiveSession, LiveSessionAssignment, ScheduleEntry
+from eduAPI.models.recurring_sessions_models import SessionTemplate, StudentGroup, TemplateGroupAssignment
+from eduAPI.services import schedule_service
+from eduAPI.services.session_generator import SessionGeneratorService
+
+User = get_user_model()
+
+
+class TestScheduleFeed(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.teacher = User.objects.create_user(
+            username='feed_teacher', email='feed_teacher@test.com', password='testpass123',
+            first_name='Feed', last_name='Teacher', role='teacher'
+        )
+        self.advisor = User.objects.create_user(
+            username='feed_advisor', email='feed_advisor@test.com', password='testpass123',
+            first_name='Feed', last_name='Advisor', role='advisor'
+        )
+        self.students = [
+            User.objects.create_user(
+                username=f'feed_student{i}', email=f'feed_student{i}@test.com', password='testpass123',
+                first_name=f'Student{i}', last_name='Feed', role='student'
+            )
+            for i in range(3)
+        ]
+        self.start = timezone.now().replace(microsecond=0) + timedelta(days=2)
+        self.session = LiveSession.objects.create(
+            title='Physics, waves; part 1', subject='Physics', level='11', teacher=self.teacher,
+            scheduled_datetime=self.start, duration_minutes=90, status='ASSIGNED', jitsi_room_name='feed-room'
+        )
+        for student in self.students[:2]:
+            LiveSessionAssignment.objects.create(session=self.session, student=student, advisor=self.advisor)
+
+    def entries(self, user):
+        return list(ScheduleEntry.objects.filter(user=user).values_list('session_id', 'role'))
+
+    def test_entries_follow_sessions_and_assignments(self):
+        self.assertEqual(self.entries(self.teacher), [(self.session.id, 'teacher')])
+        self.assertEqual(self.entries(self.students[0]), [(self.session.id, 'student')])
+        self.assertEqual(self.entries(self.students[2]), [])
+
+        self.session.title = 'Renamed'
+        self.session.save()
+        self.assertEqual(ScheduleEntry.objects.get(user=self.students[1]).title, 'Renamed')
+
+        LiveSessionAssignment.objects.filter(student=self.students[0]).delete()
+        self.assertEqual(self.entries(self.students[0]), [])
+
+        self.session.status = 'CANCELLED'
+        self.session.save()
+        self.assertFalse(ScheduleEntry.objects.exists())
+
+    def test_bulk_paths_refresh_entries(self):
+        self.client.force_authenticate(user=self.advisor)
+        self.client.post(f'/api/live-sessions/{self.session.id}/assign/', {'student_ids': [self.students[2].id]}, format='json')
+        self.assertEqual(len(self.entries(self.students[2])), 1)
+        self.client.delete(f'/api/live-sessions/{self.session.id}/unassign/', {'student_ids': [self.students[2].id]}, format='json')
+        self.assertEqual(self.entries(self.students[2]), [])
+
+        group = StudentGroup.objects.create(name='Feed Group', advisor=self.advisor)
+        group.students.add(*self.students)
+        day = date.today() + timedelta(days=5)
+        template = SessionTemplate.objects.create(
+            title='Generated', subject='Math', level='10', teacher=self.teacher,
+            day_of_week=day.weekday(), start_time='07:00:00', recurrence_type='WEEKLY', start_date=day
+        )
+        TemplateGroupAssignment.objects.create(template=template, group=group, advisor=self.advisor)
+        SessionGeneratorService().generate_sessions_for_dates([day])
+
+        self.assertEqual(ScheduleEntry.objects.filter(title='Generated').count(), 4)
+
+    def test_calendar_window_and_etag(self):
+        self.client.force_authenticate(user=self.students[0])
+        params = {'start': (self.start - timedelta(days=1)).isoformat(), 'end': (self.start + timedelta(days=1)).isoformat()}
+
+        response = self.client.get('/api/live-sessions/calendar/', params)
+        with CaptureQueriesContext(connection) as queries:
+            cached = self.client.get('/api/live-sessions/calendar/', params, HTTP_IF_NONE_MATCH=response['ETag'])
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row['title'] for row in response.data['sessions']], ['Physics, waves; part 1'])
+        self.assertEqual(response.data['sessions'][0]['end'], (self.start + timedelta(minutes=90)).isoformat())
+        self.assertEqual(cached.status_code, 304)
+        # Only the revision row (authentication is forced)
+        self.assertEqual(len(queries.captured_queries), 1)
+
+        self.session.duration_minutes = 60
+        self.session.save()
+        changed = self.client.get('/api/live-sessions/calendar/', params, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(changed.status_code, 200)
+
+        outside = self.client.get('/api/live-sessions/calendar/', {'start': (self.start + timedelta(days=3)).isoformat()})
+        self.assertEqual(outside.data['sessions'], [])
+        too_wide = self.client.get('/api/live-sessions/calendar/', {'start': params['start'], 'end': (self.start + timedelta(days=400)).isoformat()})
+        self.assertEqual(too_wide.status_code, 400)
+
+    def test_ics_feed(self):
+        self.client.force_authenticate(user=self.students[0])
+        feed_url = self.client.get('/api/live-sessions/calendar/feed/').data['feed_url']
+        path = feed_url[feed_url.index('/api/'):]
+        self.client.force_authenticate(user=None)
+
+        response = self.client.get(path)
+        body = response.content.decode('utf-8')
+        not_modified = self.client.get(path, HTTP_IF_NONE_MATCH=response['ETag'])
+        unknown = self.client.get('/api/live-sessions/calendar/not-a-token.ics')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/calendar'))
+        self.assertIn(f'UID:session-{self.session.id}@', body)
+        self.assertIn('SUMMARY:Physics\\, waves\\; part 1', body)
+        self.assertIn(f"DTSTART:{self.start.astimezone(timezone.get_fixed_timezone(0)):%Y%m%dT%H%M%SZ}", body)
+        self.assertTrue(all(len(line.encode('utf-8')) <= 75 for line in body.split('\r\n')))
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(unknown.status_code, 404)
+
+    def test_rebuild_restores_missing_rows(self):
+        ScheduleEntry.objects.all().delete()
+
+        checked, changed = schedule_service.rebuild()
+
+        self.assertEqual((checked, changed), (1, 3))
+        self.assertEqual(len(self.entries(self.students[1])), 1)
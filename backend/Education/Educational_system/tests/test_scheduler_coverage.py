@@ -74,21 +74,23 @@ class TestSessionScheduler(TestCase):
         
         # Setup mock
         mock_generator = MagicMock()
-        mock_generator.generate_sessions_for_date.return_value = {
+        mock_generator.generate_sessions_for_dates.return_value = [{
             'generated': 5,
             'skipped': 2,
             'failed': 0
-        }
+        }]
         
         scheduler = SessionScheduler()
         
         # Patch at the module where it's imported (inside the method)
         with patch.dict('sys.modules', {'eduAPI.services.session_generator': MagicMock(SessionGeneratorService=MagicMock(return_value=mock_generator))}):
-            with patch.object(scheduler, '_generate_upcoming_week'):
-                scheduler._generate_sessions_safe()
+            scheduler._generate_sessions_safe()
         
-        # The test passes if no exception is raised
-        self.assertTrue(True)
+        # One pass over today and the horizon instead of one call per day
+        self.assertEqual(mock_generator.generate_sessions_for_dates.call_count, 1)
+        dates = mock_generator.generate_sessions_for_dates.call_args[0][0]
+        self.assertEqual(len(dates), scheduler.horizon_days + 1)
+        self.assertEqual(scheduler.last_generation_date, dates[0])
     
     def test_generate_sessions_safe_exception(self):
         """Test _generate_sessions_safe with exception"""
@@ -101,32 +103,129 @@ class TestSessionScheduler(TestCase):
             # Should not raise exception - it's caught internally
             scheduler._generate_sessions_safe()
     
-    def test_generate_upcoming_week(self):
-        """Test _generate_upcoming_week method"""
-        from eduAPI.services.session_scheduler import SessionScheduler
-        
-        # Setup mock
-        mock_generator = MagicMock()
-        mock_generator.generate_sessions_for_date.return_value = {
-            'generated': 1,
-            'skipped': 0,
-            'failed': 0
-        }
-        
-        scheduler = SessionScheduler()
-        scheduler._generate_upcoming_week(mock_generator)
-        
-        # Should be called 7 times (for each day of the week)
-        self.assertEqual(mock_generator.generate_sessions_for_date.call_count, 7)
-    
-    def test_generate_upcoming_week_exception(self):
-        """Test _generate_upcoming_week with exception"""
+    def test_generate_sessions_safe_generator_error(self):
+        """Test _generate_sessions_safe when the horizon pass raises"""
         from eduAPI.services.session_scheduler import SessionScheduler
         
         # Setup mock to raise exception
         mock_generator = MagicMock()
-        mock_generator.generate_sessions_for_date.side_effect = Exception("Test error")
+        mock_generator.generate_sessions_for_dates.side_effect = Exception("Test error")
         
         scheduler = SessionScheduler()
         # Should not raise exception
-        scheduler._generate_upcoming_week(mock_generator)
+        with patch.dict('sys.modules', {'eduAPI.services.session_generator': MagicMock(SessionGeneratorService=MagicMock(return_value=mock_generator))}):
+            scheduler._generate_sessions_safe()
+        self.assertIsNone(scheduler.last_generation_date)
+
+
+class TestSchedulerLeadership(TestCase):
+    """Leader lease, fire-time queue and early wake-up"""
+
+    def setUp(self):
+        from django.contrib.auth import get_user_model
+        from eduAPI.models.recurring_sessions_models import SessionTemplate
+
+        User = get_user_model()
+        self.teacher = User.objects.create_user(
+            username='lease_teacher', email='lease_teacher@test.com', password='testpass123', role='teacher'
+        )
+        self.today = timezone.now().date()
+        self.template = SessionTemplate.objects.create(
+            title='Lease Template', subject='Math', level='10', teacher=self.teacher,
+            day_of_week=self.today.weekday(), start_time='10:00:00', duration_minutes=60,
+            recurrence_type='WEEKLY', start_date=self.today
+        )
+
+    def test_only_one_instance_holds_the_lease(self):
+        from eduAPI.services.session_scheduler import SessionScheduler
+
+        first, second = SessionScheduler(), SessionScheduler()
+
+        self.assertTrue(first.lease.acquire())
+        self.assertFalse(second.lease.acquire())
+        # Renewal by the holder keeps working
+        self.assertTrue(first.lease.acquire())
+
+        first.lease.release()
+        self.assertTrue(second.lease.acquire())
+        self.assertFalse(first.lease.acquire())
+
+    def test_expired_lease_is_taken_over(self):
+        from eduAPI.models.recurring_sessions_models import SchedulerLease
+        from eduAPI.services.session_scheduler import SessionScheduler, LEASE_NAME
+
+        SchedulerLease.objects.create(
+            name=LEASE_NAME, holder='crashed-node', expires_at=timezone.now() - timedelta(seconds=1)
+        )
+        scheduler = SessionScheduler()
+
+        self.assertTrue(scheduler.lease.acquire())
+        self.assertEqual(SchedulerLease.objects.get(name=LEASE_NAME).holder, scheduler.owner)
+
+    def test_follower_does_not_generate(self):
+        from eduAPI.services.session_scheduler import SessionScheduler
+
+        leader, follower = SessionScheduler(), SessionScheduler()
+        leader.lease.acquire()
+
+        with patch.object(follower, '_generate_sessions_safe') as mock_generate:
+            timeout = follower._tick()
+
+        mock_generate.assert_not_called()
+        self.assertFalse(follower.is_leader)
+        self.assertEqual(timeout, follower.check_interval)
+
+    def test_leader_sleeps_until_next_fire_time(self):
+        from eduAPI.services.session_scheduler import SessionScheduler
+
+        scheduler = SessionScheduler()
+        with patch.object(scheduler, '_generate_sessions_safe') as mock_generate:
+            scheduler._tick()
+            mock_generate.assert_called_once()
+            scheduler.last_generation_date = self.today
+
+            # Nothing due and nothing changed: the next heartbeat does no work
+            scheduler._tick()
+            mock_generate.assert_called_once()
+
+        # Today's occurrence is inside the horizon; the next uncovered one is
+        # two weeks out and enters the horizon at local midnight a week from now
+        fire_at, template_id = scheduler.queue[0]
+        self.assertEqual(template_id, self.template.id)
+        self.assertEqual(timezone.localtime(fire_at).date(), self.today + timedelta(days=7))
+        self.assertLessEqual(scheduler._seconds_until_next(), scheduler.check_interval)
+
+    def test_template_change_wakes_leader(self):
+        from eduAPI.services.session_scheduler import SessionScheduler, LEASE_NAME
+        from eduAPI.services.leader_lease import LeaderLease
+
+        scheduler = SessionScheduler()
+        with patch.object(scheduler, '_generate_sessions_safe') as mock_generate:
+            scheduler._tick()
+            scheduler.last_generation_date = self.today
+
+            # Another instance saved a template
+            LeaderLease.wake(LEASE_NAME)
+            scheduler._tick()
+
+        self.assertEqual(mock_generate.call_count, 2)
+
+    def test_template_save_notifies_scheduler(self):
+        import eduAPI.services.session_scheduler as scheduler_module
+
+        scheduler_module._scheduler_instance = None
+        scheduler = scheduler_module.get_scheduler()
+        try:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.template.title = 'Renamed'
+                self.template.save()
+            self.assertTrue(scheduler.changed)
+            self.assertTrue(scheduler.wakeup.is_set())
+
+            # Bookkeeping writes from the generator do not wake it
+            scheduler.changed = False
+            with self.captureOnCommitCallbacks(execute=True) as callbacks:
+                self.template.save(update_fields=['last_generated', 'total_generated', 'updated_at'])
+            self.assertEqual(callbacks, [])
+        finally:
+            scheduler_module._scheduler_instance = None
@@ -329,3 +329,107 @@ class TestSessionCreation:
         from eduAPI.models.recurring_sessions_models import TemplateGenerationLog
         logs = TemplateGenerationLog.objects.filter(template=template)
         assert logs.count() >= 1
+
+
+class TestBulkSessionGeneration(TestCase):
+    """Tests for the set-based generation path"""
+    
+    def setUp(self):
+        from eduAPI.models.recurring_sessions_models import SessionTemplate, StudentGroup, TemplateGroupAssignment
+        
+        self.teacher = User.objects.create_user(
+            username='bulk_teacher', email='bulk_teacher@test.com', password='testpass123',
+            first_name='Bulk', last_name='Teacher', role='teacher'
+        )
+        self.advisor = User.objects.create_user(
+            username='bulk_advisor', email='bulk_advisor@test.com', password='testpass123',
+            first_name='Bulk', last_name='Advisor', role='advisor'
+        )
+        self.students = [
+            User.objects.create_user(
+                username=f'bulk_student{i}', email=f'bulk_student{i}@test.com', password='testpass123',
+                role='student'
+            )
+            for i in range(4)
+        ]
+        self.start = date.today() + timedelta(days=1)
+        self.groups = [
+            StudentGroup.objects.create(name=f'Bulk Group {i}', advisor=self.advisor)
+            for i in range(2)
+        ]
+        self.groups[0].students.set(self.students[:3])
+        # Student 2 is in both groups and must only be assigned once
+        self.groups[1].students.set(self.students[2:])
+        
+        self.templates = []
+        for i in range(3):
+            template = SessionTemplate.objects.create(
+                title=f'Bulk Template {i}', subject='Math', level='10', teacher=self.teacher,
+                day_of_week=(self.start + timedelta(days=i)).weekday(), start_time=time(9 + i, 0),
+                duration_minutes=60, recurrence_type='WEEKLY', start_date=self.start
+            )
+            for group in self.groups:
+                TemplateGroupAssignment.objects.create(template=template, group=group, advisor=self.advisor)
+            self.templates.append(template)
+    
+    def generate_week(self):
+        from eduAPI.services.session_generator import SessionGeneratorService
+        dates = [self.start + timedelta(days=i) for i in range(7)]
+        return SessionGeneratorService().generate_sessions_for_dates(dates)
+    
+    def test_generates_one_session_per_template_with_assignments(self):
+        from eduAPI.models.live_sessions_models import LiveSession, LiveSessionAssignment
+        from eduAPI.models.recurring_sessions_models import GeneratedSession, TemplateGenerationLog, TemplateGroupAssignment
+        
+        results = self.generate_week()
+        
+        assert len(results) == 7
+        assert sum(r['generated'] for r in results) == 3
+        assert LiveSession.objects.count() == 3
+        assert set(LiveSession.objects.values_list('status', flat=True)) == {'ASSIGNED'}
+        assert GeneratedSession.objects.filter(students_assigned=4, groups_assigned=2).count() == 3
+        assert LiveSessionAssignment.objects.count() == 12
+        assert TemplateGenerationLog.objects.filter(status='SUCCESS', students_assigned=4).count() == 3
+        assert set(TemplateGroupAssignment.objects.values_list('sessions_generated', flat=True)) == {1}
+        
+        for template in self.templates:
+            template.refresh_from_db()
+            assert template.total_generated == 1
+            assert template.last_generated.weekday() == template.day_of_week
+    
+    def test_second_run_creates_nothing(self):
+        from eduAPI.models.live_sessions_models import LiveSession
+        
+        self.generate_week()
+        results = self.generate_week()
+        
+        assert sum(r['generated'] for r in results) == 0
+        assert LiveSession.objects.count() == 3
+    
+    def test_query_count_does_not_grow_with_students(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from eduAPI.models.live_sessions_models import LiveSession
+        from eduAPI.models.recurring_sessions_models import SessionTemplate
+        
+        def reset():
+            LiveSession.objects.all().delete()
+            SessionTemplate.objects.update(last_generated=None, total_generated=0)
+        
+        # The first run of the day creates the statistics counter rows
+        self.generate_week()
+        reset()
+        
+        with CaptureQueriesContext(connection) as small:
+            self.generate_week()
+        
+        reset()
+        for i in range(20):
+            self.groups[0].students.add(User.objects.create_user(
+                username=f'bulk_extra{i}', email=f'bulk_extra{i}@test.com', password='testpass123', role='student'
+            ))
+        
+        with CaptureQueriesContext(connection) as large:
+            self.generate_week()
+        
+        assert len(large) == len(small)
@@ -0,0 +1,124 @@
+# Tests for annotated session serializers: counts come from the query, not one COUNT per row
+from datetime import timedelta
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient, APIRequestFactory
+from django.contrib.auth import get_user_model
+
+from eduAPI.models.live_sessions_models import LiveSession, LiveSessionAssignment, LiveSessionNote
+from eduAPI.models.recurring_sessions_models import (
+    SessionTemplate, StudentGroup, TemplateGroupAssignment, GeneratedSession
+)
+from eduAPI.serializers.live_sessions_serializers import LiveSessionDetailSerializer, with_assignment_counts
+
+User = get_user_model()
+
+
+class TestAnnotatedSessionSerializers(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.teacher = User.objects.create_user(
+            username='annot_teacher', email='annot_teacher@test.com', password='testpass123',
+            first_name='Annot', last_name='Teacher', role='teacher'
+        )
+        self.advisor = User.objects.create_user(
+            username='annot_advisor', email='annot_advisor@test.com', password='testpass123',
+            first_name='Annot', last_name='Advisor', role='advisor'
+        )
+        self.students = [self.make_student(f'annot_student{i}') for i in range(3)]
+        self.template = SessionTemplate.objects.create(
+            title='Annotated Template', teacher=self.teacher, subject='Math', level='10',
+            day_of_week=1, start_time='10:00:00', recurrence_type='WEEKLY',
+            status='ACTIVE', start_date=timezone.now().date()
+        )
+        self.generated_count = 0
+
+    def make_student(self, username):
+        return User.objects.create_user(
+            username=username, email=f'{username}@test.com', password='testpass123',
+            first_name=username, last_name='Student', role='student'
+        )
+
+    def make_session(self, students=()):
+        self.generated_count += 1
+        session = LiveSession.objects.create(
+            title=f'Session {self.generated_count}', teacher=self.teacher, subject='Math', level='10',
+            scheduled_datetime=timezone.now() + timedelta(days=self.generated_count), duration_minutes=60,
+            jitsi_room_name=f'annot-room-{self.generated_count}', status='ASSIGNED'
+        )
+        for student in students:
+            LiveSessionAssignment.objects.create(session=session, student=student, advisor=self.advisor)
+        GeneratedSession.objects.create(template=self.template, session=session)
+        return session
+
+    def test_generated_sessions_query_count_is_constant(self):
+        self.client.force_authenticate(user=self.teacher)
+        self.make_session(self.students)
+        with CaptureQueriesContext(connection) as one:
+            self.client.get('/api/recurring-sessions/generated-sessions/')
+        for _ in range(4):
+            self.make_session(self.students[:2])
+        with CaptureQueriesContext(connection) as five:
+            response = self.client.get('/api/recurring-sessions/generated-sessions/')
+
+        self.assertEqual(len(response.data), 5)
+        counts = sorted(row['session_details']['assigned_students_count'] for row in response.data)
+        self.assertEqual(counts, [2, 2, 2, 2, 3])
+        self.assertEqual(len(one.captured_queries), len(five.captured_queries))
+
+    def test_student_sees_full_assignment_count(self):
+        self.make_session(self.students)
+        self.client.force_authenticate(user=self.students[0])
+
+        response = self.client.get('/api/recurring-sessions/generated-sessions/')
+
+        self.assertEqual(len(response.data), 1)
+        self.assertEqual(response.data[0]['session_details']['assigned_students_count'], 3)
+
+    def test_assignment_list_query_count_is_constant(self):
+        self.client.force_authenticate(user=self.advisor)
+
+        def assign(name, students):
+            group = StudentGroup.objects.create(name=name, advisor=self.advisor)
+            group.students.add(*students)
+            TemplateGroupAssignment.objects.create(template=self.template, group=group, advisor=self.advisor)
+
+        assign('Group 0', self.students)
+        with CaptureQueriesContext(connection) as one:
+            self.client.get('/api/recurring-sessions/assignments/')
+        for i in range(1, 4):
+            assign(f'Group {i}', self.students[:i])
+        with CaptureQueriesContext(connection) as four:
+            response = self.client.get('/api/recurring-sessions/assignments/')
+
+        self.assertEqual(sorted(row['student_count'] for row in response.data), ['1', '2', '3', '3'])
+        self.assertEqual(len(one.captured_queries), len(four.captured_queries))
+
+    def test_my_schedule_counts_every_assigned_student(self):
+        self.make_session(self.students)
+        self.client.force_authenticate(user=self.students[1])
+
+        response = self.client.get('/api/live-sessions/my-schedule/')
+
+        self.assertEqual(response.data[0]['assigned_students_count'], 3)
+
+    def test_detail_serializer_reads_annotated_counts(self):
+        session = self.make_session(self.students)
+        session.assignments.filter(student=self.students[0]).update(attended=True)
+        LiveSessionNote.objects.create(session=session, author=self.teacher, content='Shared')
+        LiveSessionNote.objects.create(session=session, author=self.teacher, content='Private', is_private=True)
+        request = APIRequestFactory().get('/')
+        request.user = self.students[0]
+
+        session = with_assignment_counts(LiveSession.objects.filter(pk=session.pk)).get()
+        with CaptureQueriesContext(connection) as queries:
+            data = LiveSessionDetailSerializer(session, context={'request': request}).data
+
+        self.assertEqual((data['total_assigned_students'], data['attended_students']), (3, 1))
+        self.assertEqual(data['attendance_rate'], 33.33)
+        self.assertEqual([note['content'] for note in data['notes']], ['Shared'])
+        self.assertEqual(len(data['assignments']), 3)
+        self.assertFalse([query for query in queries.captured_queries if 'COUNT(' in query['sql']])
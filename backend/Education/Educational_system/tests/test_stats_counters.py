@@ -0,0 +1,155 @@
+# Tests for the incremental statistics counters behind the dashboards
+import json
+from datetime import timedelta
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+
+from eduAPI.models import (
+    Lesson, StudentEnrollment, Quiz, QuizAttempt, SessionTemplate, StatsTotal, StatsBucket
+)
+from eduAPI.services import stats_service
+
+User = get_user_model()
+
+
+def total(metric, scope=stats_service.SITE):
+    row = StatsTotal.objects.filter(metric=metric, scope=scope).first()
+    return row.value if row else 0
+
+
+class TestStatsCounters(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.teacher = User.objects.create_user(
+            username='stats_teacher', email='stats_teacher@test.com', password='testpass123',
+            first_name='Stats', last_name='Teacher', role='teacher'
+        )
+        self.other_teacher = User.objects.create_user(
+            username='stats_other', email='stats_other@test.com', password='testpass123',
+            first_name='Other', last_name='Teacher', role='teacher'
+        )
+
+    def make_user(self, username, role='student', **extra):
+        return User.objects.create_user(
+            username=username, email=f'{username}@test.com', password='testpass123',
+            first_name=username, last_name='User', role=role, **extra
+        )
+
+    def make_lesson(self, teacher=None, name='Math'):
+        return Lesson.objects.create(name=name, subject='Math', level='10', teacher=teacher or self.teacher)
+
+    def make_template(self, status='ACTIVE'):
+        return SessionTemplate.objects.create(
+            title='Stats Template', teacher=self.teacher, subject='Math', level='10',
+            day_of_week=1, start_time='10:00:00', recurrence_type='WEEKLY',
+            status=status, start_date=timezone.now().date()
+        )
+
+    def test_counters_follow_creates_updates_and_deletes(self):
+        student = self.make_user('stats_student')
+        lesson = self.make_lesson()
+        self.make_lesson(teacher=self.other_teacher)
+        self.assertEqual(total('students'), 1)
+        self.assertEqual(total('lessons', self.teacher.id), 1)
+        self.assertEqual(total('lessons', self.other_teacher.id), 1)
+
+        # Changing role moves the user between counters
+        student.role = 'advisor'
+        student.save()
+        self.assertEqual((total('students'), total('advisors'), total('active_advisors')), (0, 1, 1))
+
+        # Unrelated updates are not tracked
+        student.first_name = 'Renamed'
+        student.save(update_fields=['first_name'])
+        self.assertEqual(total('advisors'), 1)
+
+        lesson.teacher = self.other_teacher
+        lesson.save()
+        self.assertEqual((total('lessons', self.teacher.id), total('lessons', self.other_teacher.id)), (0, 2))
+
+        lesson.delete()
+        student.delete()
+        self.assertEqual((total('lessons', self.other_teacher.id), total('advisors')), (1, 0))
+
+    def test_template_status_counters(self):
+        template = self.make_template()
+        template.status = 'PAUSED'
+        template.save()
+
+        self.assertEqual(total('templates', self.teacher.id), 1)
+        self.assertEqual(total('active_templates', self.teacher.id), 0)
+        self.assertEqual(total('paused_templates', self.teacher.id), 1)
+
+        self.client.force_authenticate(user=self.teacher)
+        stats = self.client.get('/api/recurring-sessions/statistics/').data
+        self.assertEqual((stats['total_templates'], stats['paused_templates']), (1, 1))
+
+    def test_dashboard_reports_totals_and_trends(self):
+        lesson = self.make_lesson()
+        quiz = Quiz.objects.create(lesson=lesson, title='Quiz')
+        student = self.make_user('stats_student')
+        StudentEnrollment.objects.create(student=student, lesson=lesson)
+        QuizAttempt.objects.create(student=student, quiz=quiz)
+        QuizAttempt.objects.create(student=student, quiz=quiz, score=80, passed=True, end_time=timezone.now())
+        # Four lessons existed before this week: one more is +25%
+        for _ in range(3):
+            self.make_lesson()
+        StatsBucket.objects.filter(metric='lessons', scope=self.teacher.id).update(
+            day=timezone.localdate() - timedelta(days=10)
+        )
+        self.make_lesson()
+        self.client.force_authenticate(user=self.teacher)
+
+        data = self.client.get('/api/content/dashboard-stats/').data
+
+        self.assertEqual(data['total_lessons'], 5)
+        self.assertEqual(data['lessons_trend'], 25.0)
+        self.assertEqual(data['trends']['lessons']['month'], 0.0)
+        self.assertEqual((data['graded_assignments'], data['pending_assignments']), (1, 1))
+        self.assertEqual((data['total_students'], data['total_enrollments']), (1, 1))
+
+    def test_dashboard_query_count_is_constant(self):
+        self.client.force_authenticate(user=self.teacher)
+        self.make_lesson()
+        with CaptureQueriesContext(connection) as small:
+            self.client.get('/api/content/dashboard-stats/')
+        for index in range(5):
+            lesson = self.make_lesson(name=f'Lesson {index}')
+            StudentEnrollment.objects.create(student=self.make_user(f'stats_{index}'), lesson=lesson)
+        with CaptureQueriesContext(connection) as large:
+            response = self.client.get('/api/content/dashboard-stats/')
+
+        self.assertEqual(response.data['total_lessons'], 6)
+        self.assertEqual(len(small.captured_queries), len(large.captured_queries))
+
+    def test_reconcile_fixes_drift_and_backfills_buckets(self):
+        self.make_lesson()
+        self.make_user('stats_student')
+        # queryset.update() sends no signals
+        User.objects.filter(role='student').update(role='advisor')
+        StatsBucket.objects.all().delete()
+        StatsTotal.objects.create(metric='lessons', scope=99999, value=4)
+
+        call_command('reconcile_stats', stdout=open('/dev/null', 'w'))
+
+        self.assertEqual((total('students'), total('advisors')), (0, 1))
+        self.assertFalse(StatsTotal.objects.filter(scope=99999).exists())
+        self.assertEqual(StatsBucket.objects.get(metric='lessons', scope=self.teacher.id).delta, 1)
+        self.assertEqual(stats_service.reconcile(), 0)
+
+    def test_advisor_stats_reads_counters(self):
+        admin = User.objects.create_superuser(username='stats_admin', email='stats_admin@test.com', password='testpass123')
+        self.make_user('stats_advisor', role='advisor')
+        self.make_user('stats_inactive', role='advisor', is_active=False)
+        self.client.force_login(admin)
+
+        response = self.client.get('/advisors/stats/')
+
+        data = json.loads(response.content)
+        self.assertEqual((data['total_advisors'], data['active_advisors'], data['inactive_advisors']), (2, 1, 1))
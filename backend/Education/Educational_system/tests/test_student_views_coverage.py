@@ -33,6 +33,40 @@ class TestStudentViewsExtendedCoverage(TestCase):
         response = self.client.get('/api/student/dashboard/lessons/')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
     
+    def test_get_student_dashboard_lessons_query_count_is_constant(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from eduAPI.models.lessons_model import Lesson, LessonContent, Quiz, StudentEnrollment
+
+        def add_lessons(count):
+            for i in range(count):
+                lesson = Lesson.objects.create(name=f'Lesson {i}', subject='Math', level='10', teacher=self.teacher)
+                LessonContent.objects.create(lesson=lesson, title='Notes', content_type='TEXT', text_content='x')
+                LessonContent.objects.create(lesson=lesson, title='More', content_type='TEXT', text_content='y')
+                Quiz.objects.create(lesson=lesson, title='Quiz', passing_score=70)
+                StudentEnrollment.objects.create(student=self.student, lesson=lesson, progress=10)
+
+        self.client.force_authenticate(user=self.student)
+        add_lessons(1)
+        with CaptureQueriesContext(connection) as single:
+            response = self.client.get('/api/student/dashboard/lessons/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        add_lessons(5)
+        with CaptureQueriesContext(connection) as many:
+            response = self.client.get('/api/student/dashboard/lessons/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 6)
+        self.assertEqual(len(many), len(single))
+        self.assertLessEqual(len(many), 2)
+
+        lesson = response.data[0]
+        self.assertEqual(lesson['content_count'], 2)
+        self.assertEqual(lesson['quiz_count'], 1)
+        self.assertEqual(lesson['progress'], 10)
+        self.assertEqual(lesson['teacher_name'], 'Test Teacher')
+        self.assertNotIn('quizzes', lesson)
+
     def test_get_student_lesson_detail_not_found(self):
         self.client.force_authenticate(user=self.student)
         response = self.client.get('/api/student/lessons/99999/')
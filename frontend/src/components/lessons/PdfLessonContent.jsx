@@ -35,7 +35,8 @@ const getPdfProxyUrl = (url) => {
 };
 
 // Helper function to get file serving URL (used for downloads)
-const getFileServingUrl = (url) => {
+// token: the content's download_token - links carry no Authorization header
+const getFileServingUrl = (url, token) => {
   if (!url) return '';
   
   // Extract the relative path from the full URL
@@ -51,7 +52,8 @@ const getFileServingUrl = (url) => {
   }
   
   // Create the file serving URL
-  return `${BACKEND_URL}/api/file-serve/?file=${encodeURIComponent(relativePath)}`;
+  const tokenParam = token ? `&token=${encodeURIComponent(token)}` : '';
+  return `${BACKEND_URL}/api/file-serve/?file=${encodeURIComponent(relativePath)}${tokenParam}`;
 };
 
 // Helper function to get full URL for media files (used for display)
@@ -100,9 +102,9 @@ const PdfLessonContent = ({ pdfContents }) => {
     setPdfError(true);
   };
 
-  const handleDownloadPdf = (pdfUrl, title) => {
+  const handleDownloadPdf = (pdfUrl, title, token) => {
     // Get file serving URL
-    const fileUrl = getFileServingUrl(pdfUrl);
+    const fileUrl = getFileServingUrl(pdfUrl, token);
     console.log("Downloading PDF from URL:", fileUrl);
     
     // Create a link element
@@ -184,7 +186,7 @@ const PdfLessonContent = ({ pdfContents }) => {
                     color="primary"
                     startIcon={<DownloadIcon />}
                     fullWidth
-                    onClick={() => handleDownloadPdf(pdf.file, pdf.title)}
+                    onClick={() => handleDownloadPdf(pdf.file, pdf.title, pdf.download_token)}
                   >
                     Download PDF
                   </Button>
@@ -221,7 +223,7 @@ const PdfLessonContent = ({ pdfContents }) => {
                     The PDF could not be displayed in the browser.
                   </Typography>
                   <Button 
-                    onClick={() => handleDownloadPdf(selectedPdf.file, selectedPdf.title)}
+                    onClick={() => handleDownloadPdf(selectedPdf.file, selectedPdf.title, selectedPdf.download_token)}
                     variant="contained" 
                     color="primary"
                     sx={{ mt: 2 }}
@@ -236,7 +238,7 @@ const PdfLessonContent = ({ pdfContents }) => {
         <DialogActions>
           <Button onClick={handleCloseDialog}>Close</Button>
           <Button 
-            onClick={() => handleDownloadPdf(selectedPdf?.file, selectedPdf?.title)}
+            onClick={() => handleDownloadPdf(selectedPdf?.file, selectedPdf?.title, selectedPdf?.download_token)}
             color="primary"
           >
             Download
@@ -12,7 +12,8 @@ import OndemandVideoIcon from '@mui/icons-material/OndemandVideo';
 const BACKEND_URL = 'http://localhost:8000';
 
 // Helper function to get file serving URL (for downloads)
-const getFileServingUrl = (url) => {
+// token: the content's download_token - links carry no Authorization header
+const getFileServingUrl = (url, token) => {
   if (!url) return '';
   
   // Extract the relative path from the full URL
@@ -28,7 +29,8 @@ const getFileServingUrl = (url) => {
   }
   
   // Create the file serving URL
-  return `${BACKEND_URL}/api/file-serve/?file=${encodeURIComponent(relativePath)}`;
+  const tokenParam = token ? `&token=${encodeURIComponent(token)}` : '';
+  return `${BACKEND_URL}/api/file-serve/?file=${encodeURIComponent(relativePath)}${tokenParam}`;
 };
 
 // Helper function to get full URL for media files
@@ -166,7 +168,7 @@ const VideoLessonContent = ({ videoContents }) => {
                     The video could not be played. It might be in a format not supported by your browser.
                   </Typography>
                   <Button 
-                    href={getFileServingUrl(selectedVideo.file)} 
+                    href={getFileServingUrl(selectedVideo.file, selectedVideo.download_token)} 
                     download 
                     variant="contained" 
                     color="primary"
@@ -182,7 +184,7 @@ const VideoLessonContent = ({ videoContents }) => {
         <DialogActions>
           <Button onClick={handleCloseDialog}>Close</Button>
           <Button 
-            href={getFileServingUrl(selectedVideo?.file)} 
+            href={getFileServingUrl(selectedVideo?.file, selectedVideo?.download_token)} 
             download
             color="primary"
           >
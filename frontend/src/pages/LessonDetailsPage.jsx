@@ -279,6 +279,9 @@ const LessonDetailsPage = () => {
       
       console.log("Starting download process for:", content.title, content.file);
       
+      // Download links send no Authorization header; the token identifies the user
+      const tokenParam = content.download_token ? `token=${encodeURIComponent(content.download_token)}` : '';
+      
       // Try multiple approaches to download the file
       const downloadWithMethod = (method) => {
         let fileUrl;
@@ -292,7 +295,7 @@ const LessonDetailsPage = () => {
             
           case 'api':
             // Use the API endpoint
-            fileUrl = `${BACKEND_URL}/api/files/?file=${encodeURIComponent(content.file)}`;
+            fileUrl = `${BACKEND_URL}/api/files/?file=${encodeURIComponent(content.file)}${tokenParam && `&${tokenParam}`}`;
             console.log("Trying API endpoint URL:", fileUrl);
             break;
             
@@ -314,7 +317,7 @@ const LessonDetailsPage = () => {
             }
             
             // Use the direct download endpoint with base name
-            fileUrl = `${BACKEND_URL}/download/${baseFilename}.${extension}`;
+            fileUrl = `${BACKEND_URL}/download/${baseFilename}.${extension}${tokenParam && `?${tokenParam}`}`;
             console.log("Trying direct download URL with base filename:", fileUrl);
             break;
             